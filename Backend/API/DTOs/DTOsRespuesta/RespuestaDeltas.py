@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+from typing import List, Dict, Any
+
+class RespuestaDeltas(BaseModel):
+    instancia: str
+    cursor: str  # valor para el siguiente ?desde= (o Last-Event-ID)
+    reinicio: bool = False  # True si el cursor es de otra instancia o ya salio del buffer: recargar todo
+    deltas: List[Dict[str, Any]] = []  # {'seq', 'tipo', 'datos'}
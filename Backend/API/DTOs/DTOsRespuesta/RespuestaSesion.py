@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+class RespuestaSesion(BaseModel):
+    id: str
+    creada: float  # epoch en segundos
+    inactiva_segundos: float = 0.0
+    en_uso: int = 0  # peticiones en curso
+    iniciada: bool = False
+    entidades: int = 0  # vertices + aristas + pedidos + rutas
+    prefijo: str  # anteponer a cualquier endpoint, por ejemplo {prefijo}/pedidos/
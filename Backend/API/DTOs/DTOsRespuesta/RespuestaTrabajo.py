@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import List, Optional, Dict
+from Backend.API.DTOs.DTOsRespuesta.RespuestaRuta import RespuestaRuta
+
+class RespuestaTrabajo(BaseModel):
+    id_trabajo: str
+    tipo: str
+    estado: str  # pendiente | en_ejecucion | completado | fallido | cancelado
+    procesados: int = 0
+    total: Optional[int] = None
+    progreso: float = 0.0
+    resultados_parciales: int = 0
+    tiempos: Dict[str, float] = {}
+    tiempo_en_cola: float = 0.0
+    tiempo_ejecucion: Optional[float] = None
+    error: Optional[str] = None
+    resultados: Optional[List[RespuestaRuta]] = None  # solo si se pide incluir_resultados
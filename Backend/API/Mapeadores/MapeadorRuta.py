@@ -22,18 +22,50 @@ class MapeadorRuta:
     def a_dto(ruta: 'Ruta') -> 'RespuestaRuta':
         """
         Convierte Ruta de dominio a RespuestaRuta DTO.
+        El DTO se calcula una vez y queda guardado en ruta.serializados; no debe modificarse.
         Si la ruta es None, lanza una excepción clara para manejo en el endpoint.
         """
         if ruta is None:
             raise ValueError("No se puede mapear una ruta nula. La ruta no fue encontrada o no es válida.")
+        serializados = getattr(ruta, 'serializados', None)
+        if serializados is None:
+            return MapeadorRuta._construir_dto(ruta)
+        dto = serializados.get('dto')
+        if dto is None:
+            dto = serializados['dto'] = MapeadorRuta._construir_dto(ruta)
+        return dto
 
-        logger.info(f"Mapeando ruta: {type(ruta).__name__} - Atributos disponibles: {[attr for attr in dir(ruta) if not attr.startswith('_')]}")
-        logger.info(f"Ruta ID: {getattr(ruta, 'id_ruta', 'NO_ENCONTRADO')}")
-        logger.info(f"Algoritmo: {getattr(ruta, 'algoritmo', 'NO_ENCONTRADO')}")
-        logger.info(f"Peso total: {getattr(ruta, 'peso_total', 'NO_ENCONTRADO')}")
-        logger.info(f"Origen: {getattr(ruta, 'origen', 'NO_ENCONTRADO')}")
-        logger.info(f"Destino: {getattr(ruta, 'destino', 'NO_ENCONTRADO')}")
+    @staticmethod
+    def a_json(ruta: 'Ruta') -> bytes:
+        """
+        Retorna el DTO de la ruta ya codificado en JSON (bytes), guardado en ruta.serializados.
+        """
+        serializados = getattr(ruta, 'serializados', None)
+        if serializados is None:
+            return MapeadorRuta.a_dto(ruta).model_dump_json().encode()
+        codificado = serializados.get('json')
+        if codificado is None:
+            codificado = serializados['json'] = MapeadorRuta.a_dto(ruta).model_dump_json().encode()
+        return codificado
+
+    @staticmethod
+    def lista_a_json(rutas) -> bytes:
+        """
+        Arma el arreglo JSON de una lista de rutas concatenando sus JSON precalculados.
+        """
+        return b'[' + b','.join(MapeadorRuta.a_json(r) for r in rutas if r is not None) + b']'
+
+    @staticmethod
+    def precalcular(ruta: 'Ruta') -> None:
+        """
+        Calcula y guarda en la ruta su DTO, su JSON y su hashmap. Lo llama FabricaRutas al registrar la ruta,
+        de modo que los endpoints de listado solo concatenan resultados ya serializados.
+        """
+        MapeadorRuta.a_json(ruta)
+        MapeadorRuta.a_hashmap(ruta)
 
+    @staticmethod
+    def _construir_dto(ruta: 'Ruta') -> 'RespuestaRuta':
         def extraer_info_vertice(vertice):
             if vertice is None:
                 return None
@@ -169,11 +201,23 @@ class MapeadorRuta:
     def a_hashmap(ruta: 'Ruta') -> dict:
         """
         Convierte Ruta de dominio a diccionario serializable para debugging.
-        Maneja casos donde la ruta puede tener campos nulos.
+        El diccionario se calcula una vez y queda guardado en ruta.serializados; no debe modificarse.
         """
         if ruta is None:
             return {}
-        
+        serializados = getattr(ruta, 'serializados', None)
+        if serializados is None:
+            return MapeadorRuta._construir_hashmap(ruta)
+        hashmap = serializados.get('hashmap')
+        if hashmap is None:
+            hashmap = serializados['hashmap'] = MapeadorRuta._construir_hashmap(ruta)
+        return hashmap
+
+    @staticmethod
+    def _construir_hashmap(ruta: 'Ruta') -> dict:
+        """
+        Arma el diccionario de a_hashmap. Maneja casos donde la ruta puede tener campos nulos.
+        """
         try:
             # Información básica de la ruta
             hashmap = {
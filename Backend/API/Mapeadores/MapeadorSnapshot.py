@@ -1,7 +1,37 @@
 """
-MapeadorSnapshot: Convierte un snapshot de grafo (dict) a RespuestaSnapshot DTO o a hashmaps de objetos reales.
+MapeadorSnapshot: Convierte un snapshot de grafo (dict) a RespuestaSnapshot DTO o a hashmaps de objetos reales,
+y arma el snapshot completo de la simulación (todas las colecciones en una sola respuesta).
 """
+import base64
+import json
+import math
+import sys
+from array import array
+from typing import List
+from pydantic import TypeAdapter
 from Backend.API.DTOs.DTOsRespuesta.RespuestaSnapshot import RespuestaSnapshot
+from Backend.API.DTOs.DTOsRespuesta.RespuestaCliente import RespuestaCliente
+from Backend.API.DTOs.DTOsRespuesta.RespuestaAlmacenamiento import RespuestaAlmacenamiento
+from Backend.API.DTOs.DTOsRespuesta.RespuestaRecarga import RespuestaRecarga
+from Backend.API.DTOs.DTOsRespuesta.RespuestaVertice import RespuestaVertice
+from Backend.API.DTOs.DTOsRespuesta.RespuestaArista import RespuestaArista
+from Backend.API.DTOs.DTOsRespuesta.RespuestaPedido import RespuestaPedido
+from Backend.API.DTOs.DTOsRespuesta.RespuestaEstadisticas import RespuestaEstadisticas
+from Backend.API.Mapeadores.MapeadorVertice import MapeadorVertice
+from Backend.API.Mapeadores.MapeadorArista import MapeadorArista
+from Backend.API.Mapeadores.MapeadorPedido import MapeadorPedido
+from Backend.API.Mapeadores.MapeadorRecarga import MapeadorRecarga
+from Backend.API.Mapeadores.MapeadorRuta import MapeadorRuta
+
+# Serializadores de listas (pydantic-core) para codificar cada colección de una vez
+_LISTAS = {
+    'clientes': TypeAdapter(List[RespuestaCliente]),
+    'almacenamientos': TypeAdapter(List[RespuestaAlmacenamiento]),
+    'recargas': TypeAdapter(List[RespuestaRecarga]),
+    'vertices': TypeAdapter(List[RespuestaVertice]),
+    'aristas': TypeAdapter(List[RespuestaArista]),
+    'pedidos': TypeAdapter(List[RespuestaPedido]),
+}
 
 class MapeadorSnapshot:
     @staticmethod
@@ -21,3 +51,151 @@ class MapeadorSnapshot:
         Devuelve el snapshot original (dict de objetos reales), para uso interno o pruebas.
         """
         return snapshot
+
+    @staticmethod
+    def completo_a_json(service, cursor_deltas=None) -> bytes:
+        """
+        Snapshot completo en JSON: las mismas listas que /clientes/, /pedidos/, /almacenamientos/, /recargas/,
+        /vertices/, /aristas/, /rutas/ y /estadisticas/, más el cursor de deltas tomado antes de leerlas.
+        Los pedidos de clientes y almacenamientos se agrupan en una sola pasada (los Mapeadores individuales
+        recorren todos los pedidos por cada entidad) y las rutas usan su JSON precalculado.
+        """
+        pedidos = [p for _, p in service.iterar_coleccion('pedidos')]
+        por_cliente, por_almacen = MapeadorSnapshot._agrupar_pedidos(pedidos)
+        listas = {
+            'clientes': [RespuestaCliente(
+                id=int(getattr(c, 'id_cliente', 0)), tipo=str(getattr(c, 'tipo_elemento', 'cliente')),
+                nombre=str(getattr(c, 'nombre', '')), pedidos=por_cliente.get(getattr(c, 'id_cliente', None), []))
+                for _, c in service.iterar_coleccion('clientes')],
+            'pedidos': [MapeadorPedido.a_dto(p) for p in pedidos],
+            'almacenamientos': [RespuestaAlmacenamiento(
+                id=int(getattr(a, 'id_almacenamiento', 0)), tipo=str(getattr(a, 'tipo_elemento', 'almacenamiento')),
+                nombre=str(getattr(a, 'nombre', '')), pedidos=por_almacen.get(getattr(a, 'id_almacenamiento', None), []))
+                for _, a in service.iterar_coleccion('almacenamientos')],
+            'recargas': [MapeadorRecarga.a_dto(r) for _, r in service.iterar_coleccion('recargas')],
+            'vertices': [MapeadorVertice.a_dto(v) for _, v in service.iterar_coleccion('vertices')],
+            'aristas': [MapeadorArista.a_dto(a) for _, a in service.iterar_coleccion('aristas')],
+        }
+        partes = [b'"%s":%s' % (nombre.encode(), _LISTAS[nombre].dump_json(lista)) for nombre, lista in listas.items()]
+        partes.append(b'"rutas":' + MapeadorRuta.lista_a_json(r for _, r in service.iterar_coleccion('rutas')))
+        partes.append(b'"estadisticas":' + json.dumps(MapeadorSnapshot._estadisticas(service)).encode())
+        partes.append(b'"cursor_deltas":' + json.dumps(cursor_deltas).encode())
+        return b'{' + b','.join(partes) + b'}'
+
+    @staticmethod
+    def completo_a_compacto(service, cursor_deltas=None) -> bytes:
+        """
+        Snapshot completo en codificación compacta por columnas: ids enteros, categorías como códigos
+        y arreglos tipados little-endian en base64 ({'dtype': '<i4' | '<f8' | 'u1', 'b64': ...}),
+        legibles con numpy.frombuffer o array.array. Los caminos de las rutas van concatenados con sus
+        desplazamientos (como una fila CSR): la ruta i es caminos[desplazamientos[i]:desplazamientos[i+1]].
+        Los pesos o tiempos ausentes se codifican como NaN y los ids ausentes como -1.
+        """
+        vertices = [MapeadorVertice.a_dto(v) for _, v in service.iterar_coleccion('vertices')]
+        tipos_vertice = _Categorias()
+        aristas = [MapeadorArista.a_dto(a) for _, a in service.iterar_coleccion('aristas')]
+        pedidos = [MapeadorPedido.a_dto(p) for _, p in service.iterar_coleccion('pedidos')]
+        estados, prioridades = _Categorias(), _Categorias()
+        rutas = [MapeadorRuta.a_dto(r) for _, r in service.iterar_coleccion('rutas')]
+        algoritmos = _Categorias()
+        caminos, desplazamientos = [], [0]
+        for ruta in rutas:
+            caminos.extend(ruta.camino)
+            desplazamientos.append(len(caminos))
+        documento = {
+            'formato': 'compacto',
+            'vertices': {
+                'id': _columna('i', [_entero(v.id) for v in vertices]),
+                'tipo': _columna('B', [tipos_vertice.codigo(v.tipo) for v in vertices]),
+                'nombre': [v.nombre for v in vertices],
+                'categorias_tipo': tipos_vertice.valores,
+            },
+            'aristas': {
+                'origen': _columna('i', [a.origen for a in aristas]),
+                'destino': _columna('i', [a.destino for a in aristas]),
+                'peso': _columna('d', [a.peso for a in aristas]),
+            },
+            'pedidos': {
+                'id_pedido': _columna('i', [p.id_pedido for p in pedidos]),
+                'origen': _columna('i', [_entero(p.origen) for p in pedidos]),
+                'destino': _columna('i', [_entero(p.destino) for p in pedidos]),
+                'status': _columna('B', [estados.codigo(p.status) for p in pedidos]),
+                'prioridad': _columna('B', [prioridades.codigo(p.prioridad) for p in pedidos]),
+                'peso_total': _columna('d', [_real(p.peso_total) for p in pedidos]),
+                'categorias_status': estados.valores,
+                'categorias_prioridad': prioridades.valores,
+            },
+            'rutas': {
+                'id_ruta': [r.id_ruta for r in rutas],
+                'id_pedido': _columna('i', [_entero(r.id_pedido) for r in rutas]),
+                'algoritmo': _columna('B', [algoritmos.codigo(r.algoritmo) for r in rutas]),
+                'peso_total': _columna('d', [_real(r.peso_total) for r in rutas]),
+                'tiempo_calculo': _columna('d', [_real(r.tiempo_calculo) for r in rutas]),
+                'caminos': _columna('i', caminos),
+                'desplazamientos': _columna('i', desplazamientos),
+                'categorias_algoritmo': algoritmos.valores,
+            },
+            'estadisticas': MapeadorSnapshot._estadisticas(service),
+            'cursor_deltas': cursor_deltas,
+        }
+        return json.dumps(documento, separators=(',', ':')).encode()
+
+    @staticmethod
+    def _agrupar_pedidos(pedidos):
+        """
+        Retorna los ids de pedidos por id de cliente y por id de almacenamiento de origen.
+        """
+        por_cliente, por_almacen = {}, {}
+        for pedido in pedidos:
+            cliente = pedido.obtener_cliente()
+            if cliente is not None:
+                por_cliente.setdefault(getattr(cliente, 'id_cliente', None), []).append(pedido.id_pedido)
+            origen = pedido.obtener_origen()
+            if origen is not None:
+                por_almacen.setdefault(getattr(origen, 'id_almacenamiento', None), []).append(pedido.id_pedido)
+        return por_cliente, por_almacen
+
+    @staticmethod
+    def _estadisticas(service):
+        """
+        Estadísticas como dict serializable, o None si la simulación no está iniciada.
+        """
+        try:
+            return RespuestaEstadisticas(**service.obtener_estadisticas()).model_dump(mode='json')
+        except Exception:
+            return None
+
+
+class _Categorias:
+    """
+    Asigna códigos enteros consecutivos a valores categóricos (estados, tipos, algoritmos).
+    """
+    def __init__(self):
+        self.valores = []
+        self._codigos = {}
+
+    def codigo(self, valor):
+        codigo = self._codigos.get(valor)
+        if codigo is None:
+            codigo = self._codigos[valor] = len(self.valores)
+            self.valores.append(valor)
+        return codigo
+
+
+def _columna(tipo, valores):
+    """
+    Codifica una columna numérica como arreglo tipado little-endian en base64.
+    """
+    datos = array(tipo, valores)
+    if sys.byteorder != 'little':
+        datos.byteswap()
+    dtype = {'i': '<i4', 'd': '<f8', 'B': 'u1'}[tipo]
+    return {'dtype': dtype, 'b64': base64.b64encode(datos.tobytes()).decode('ascii')}
+
+
+def _entero(valor):
+    return -1 if valor is None else int(valor)
+
+
+def _real(valor):
+    return math.nan if valor is None else float(valor)
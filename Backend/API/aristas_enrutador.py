@@ -3,6 +3,7 @@ from Backend.Aplicacion.SimAplicacion.Aplicacion_Simulacion import SimulacionApl
 from Backend.API.Mapeadores.MapeadorArista import MapeadorArista
 from Backend.API.DTOs.BaseArista import BaseArista
 from Backend.API.DTOs.DTOsRespuesta.RespuestaHashMap import RespuestaHashMap
+from Backend.API.paginacion import ParametrosLista, responder_lista
 from typing import List
 import logging
 
@@ -20,10 +21,13 @@ def get_simulacion_service():
     return SimulacionAplicacionService()
 
 @router.get("/", response_model=List[BaseArista])
-def listar_aristas(service=Depends(get_simulacion_service)):
+def listar_aristas(lista: ParametrosLista = Depends(), service=Depends(get_simulacion_service)):
     """
     Devuelve la lista de aristas registradas en la simulación.
+    Admite paginación por cursor (limite, cursor), proyección (fields) y exportación NDJSON (formato=ndjson).
     """
+    if lista.activos():
+        return responder_lista(service, 'aristas', MapeadorArista.a_dto, BaseArista, lista)
     aristas = service.obtener_aristas()
     if aristas is None:
         raise HTTPException(status_code=404, detail="No hay aristas registradas")
@@ -0,0 +1,22 @@
+"""
+Compresión gzip para respuestas grandes armadas como bytes (snapshots completos).
+No se usa un middleware global porque el flujo SSE de /eventos/stream debe enviarse sin buffer.
+"""
+import gzip
+
+from fastapi import Request
+from fastapi.responses import Response
+
+TAMANO_MINIMO = 1024
+NIVEL = 5
+
+
+def respuesta_comprimida(request: Request, contenido: bytes, media_type: str = "application/json") -> Response:
+    """
+    Retorna el contenido comprimido con gzip si el cliente lo acepta (Accept-Encoding) y vale la pena.
+    """
+    headers = {'Vary': 'Accept-Encoding'}
+    if len(contenido) >= TAMANO_MINIMO and 'gzip' in request.headers.get('accept-encoding', ''):
+        contenido = gzip.compress(contenido, compresslevel=NIVEL)
+        headers['Content-Encoding'] = 'gzip'
+    return Response(content=contenido, media_type=media_type, headers=headers)
@@ -0,0 +1,48 @@
+"""
+Lecturas condicionales (ETag / If-None-Match) basadas en la version global de la simulacion.
+"""
+from fastapi import Request
+from fastapi.responses import Response
+
+# Prefijos cuyas respuestas no dependen solo del estado de la simulacion (progreso de trabajos,
+# contadores de la cache de rutas, mediciones del benchmark, flujo de deltas, checkpoints en disco, salud y
+# documentacion): no llevan ETag.
+RUTAS_SIN_VERSION = ('/jobs', '/rutas/cache', '/rutas/benchmark', '/eventos', '/simulaciones', '/simulacion/checkpoints', '/health', '/docs', '/redoc', '/openapi.json', '/swagger-config')
+
+
+def registrar_etag(app, obtener_service):
+    """
+    Agrega a la app un middleware que etiqueta cada GET con el ETag de la version de la simulacion.
+    obtener_service() retorna el servicio de la simulacion activa (la principal o la de la sesion).
+    Si el cliente envia If-None-Match con ese ETag se responde 304 sin ejecutar el endpoint,
+    es decir sin tocar repositorios ni Mapeadores.
+    El ETag se lee antes de ejecutar el endpoint: si la simulacion cambia mientras se arma la
+    respuesta, el cliente queda con un ETag antiguo y la siguiente lectura descarga el estado nuevo.
+    """
+    @app.middleware("http")
+    async def etag_por_version(request: Request, call_next):
+        # scope['path'] es la ruta enrutada: sin el prefijo /simulaciones/{id} de las sesiones (que va en root_path)
+        if request.method not in ('GET', 'HEAD') or request.scope['path'].startswith(RUTAS_SIN_VERSION):
+            return await call_next(request)
+        etag = obtener_service().obtener_etag()
+        if _coincide(request.headers.get('if-none-match'), etag):
+            return Response(status_code=304, headers={'ETag': etag, 'Cache-Control': 'no-cache'})
+        respuesta = await call_next(request)
+        if respuesta.status_code == 200:
+            respuesta.headers['ETag'] = etag
+            respuesta.headers['Cache-Control'] = 'no-cache'
+        return respuesta
+
+
+def _coincide(if_none_match, etag):
+    """
+    Comparacion debil de If-None-Match (admite listas separadas por coma y '*').
+    """
+    if not if_none_match:
+        return False
+    opaco = etag[2:] if etag.startswith('W/') else etag
+    for candidato in if_none_match.split(','):
+        candidato = candidato.strip()
+        if candidato == '*' or (candidato[2:] if candidato.startswith('W/') else candidato) == opaco:
+            return True
+    return False
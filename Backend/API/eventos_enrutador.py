@@ -0,0 +1,140 @@
+import asyncio
+import json
+import time
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from Backend.Aplicacion.SimAplicacion.Aplicacion_Simulacion import SimulacionAplicacionService
+from Backend.API.DTOs.DTOsRespuesta.RespuestaDeltas import RespuestaDeltas
+from Backend.API.Mapeadores.MapeadorRuta import MapeadorRuta
+from Backend.API.Mapeadores.MapeadorPedido import MapeadorPedido
+from typing import Optional
+
+import logging
+
+router = APIRouter(
+    prefix="/eventos",
+    tags=["Eventos"],
+    responses={
+        500: {"description": "Error interno del servidor"}
+    }
+)
+
+def get_simulacion_service():
+    return SimulacionAplicacionService()
+
+# Configuración del logger
+logger = logging.getLogger("API.Eventos")
+if not logger.hasHandlers():
+    handler = logging.StreamHandler()
+    formatter = logging.Formatter('[%(levelname)s] %(asctime)s - %(message)s')
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+logger.setLevel(logging.INFO)
+
+LIMITE_DELTAS = 500
+INTERVALO_SONDEO = 0.25
+INTERVALO_LATIDO = 15.0
+
+def delta_a_dict(delta):
+    """
+    Convierte un delta del dominio al objeto JSON enviado a los clientes.
+    Las rutas y pedidos nuevos incluyen su DTO completo (el de la ruta ya está precalculado).
+    """
+    datos = delta['datos']
+    entidad = delta['entidad']
+    if entidad is not None:
+        if delta['tipo'] == 'ruta_nueva':
+            datos = {**datos, 'ruta': MapeadorRuta.a_dto(entidad).model_dump(mode='json')}
+        elif delta['tipo'] == 'pedido_nuevo':
+            datos = {**datos, 'pedido': MapeadorPedido.a_dto(entidad).model_dump(mode='json')}
+    return {'seq': delta['seq'], 'tipo': delta['tipo'], 'datos': datos}
+
+def leer_cursor(cursor, posicion):
+    """
+    Interpreta un cursor 'instancia:seq' (o solo 'seq'). Retorna (seq, valido);
+    sin cursor se parte de la secuencia actual, es decir solo se reciben cambios nuevos.
+    """
+    if cursor is None or cursor == '':
+        return posicion['seq'], True
+    instancia, _, seq = cursor.rpartition(':')
+    if instancia and instancia != posicion['instancia']:
+        return posicion['seq'], False
+    try:
+        return int(seq), True
+    except ValueError:
+        return posicion['seq'], False
+
+def armar_cursor(instancia, seq):
+    return f"{instancia}:{seq}"
+
+def leer_deltas(service, cursor, limite):
+    """
+    Retorna (deltas, seq_siguiente, reinicio, instancia) a partir de un cursor.
+    Si el cursor no sirve (otra instancia o deltas ya descartados) se indica reinicio y se continúa desde la secuencia actual.
+    """
+    posicion = service.obtener_posicion_deltas()
+    seq, valido = leer_cursor(cursor, posicion)
+    if valido and seq <= posicion['seq']:
+        deltas, completo = service.obtener_deltas(seq, limite)
+        if completo:
+            return deltas, deltas[-1]['seq'] if deltas else seq, False, posicion['instancia']
+    return [], posicion['seq'], True, posicion['instancia']
+
+@router.get("/", response_model=RespuestaDeltas)
+def obtener_deltas(
+    desde: Optional[str] = Query(None, description="Cursor devuelto en la consulta anterior; sin él solo se reciben cambios posteriores"),
+    limite: int = Query(LIMITE_DELTAS, ge=1, le=5000, description="Máximo de deltas por respuesta"),
+    service=Depends(get_simulacion_service)
+):
+    """
+    Devuelve los deltas posteriores al cursor (para clientes que consultan periódicamente en vez de usar /eventos/stream).
+    Si reinicio es True el cliente debe volver a descargar las entidades y seguir con el cursor devuelto.
+    """
+    deltas, seq, reinicio, instancia = leer_deltas(service, desde, limite)
+    return RespuestaDeltas(
+        instancia=instancia,
+        cursor=armar_cursor(instancia, seq),
+        reinicio=reinicio,
+        deltas=[delta_a_dict(d) for d in deltas],
+    )
+
+@router.get("/stream")
+async def stream_deltas(
+    request: Request,
+    desde: Optional[str] = Query(None, description="Cursor inicial; Last-Event-ID tiene prioridad al reconectar"),
+    service=Depends(get_simulacion_service)
+):
+    """
+    Flujo Server-Sent Events con los deltas de pedidos, rutas, frecuencias, grafo y reinicios.
+    Cada mensaje lleva id 'instancia:seq', de modo que EventSource reanuda solo con Last-Event-ID.
+    Un mensaje de tipo 'reinicio' indica que hay que recargar las entidades completas.
+    """
+    cursor = request.headers.get('last-event-id') or desde
+    logger.info(f"GET /eventos/stream llamado (cursor={cursor})")
+
+    async def generar():
+        actual = cursor
+        yield "retry: 3000\n\n"
+        ultimo_envio = time.monotonic()
+        while not await request.is_disconnected():
+            deltas, seq, reinicio, instancia = leer_deltas(service, actual, LIMITE_DELTAS)
+            actual = armar_cursor(instancia, seq)
+            if reinicio:
+                yield f"id: {actual}\ndata: {json.dumps({'seq': seq, 'tipo': 'reinicio', 'datos': {}})}\n\n"
+            for delta in deltas:
+                yield f"id: {armar_cursor(instancia, delta['seq'])}\ndata: {json.dumps(delta_a_dict(delta))}\n\n"
+            if reinicio or deltas:
+                ultimo_envio = time.monotonic()
+                if len(deltas) == LIMITE_DELTAS:
+                    continue
+            elif time.monotonic() - ultimo_envio >= INTERVALO_LATIDO:
+                # Comentario SSE: mantiene viva la conexión a través de proxies
+                yield ": latido\n\n"
+                ultimo_envio = time.monotonic()
+            await asyncio.sleep(INTERVALO_SONDEO)
+
+    return StreamingResponse(
+        generar(),
+        media_type="text/event-stream",
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
@@ -14,9 +14,11 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 from typing import List, Dict, Any
+import anyio.to_thread
+import os
 
 # --- Importar el router de simulacion ---
-from Backend.API.simulacion_endpoints_enrutador import router as simulacion_router
+from Backend.API.simulacion_endpoints_enrutador import router as simulacion_router, marcar_simulacion_restaurada
 
 # --- Importar todos los routers de los módulos API ---
 from Backend.API.rutas_enrutador import router as rutas_router
@@ -27,6 +29,13 @@ from Backend.API.clientes_enrutador import router as clientes_router
 from Backend.API.almacenamientos_enrutador import router as almacenamientos_router
 from Backend.API.aristas_enrutador import router as aristas_router
 from Backend.API.vertices_enrutador import router as vertices_router
+from Backend.API.trabajos_enrutador import router as trabajos_router
+from Backend.API.eventos_enrutador import router as eventos_router
+from Backend.API.simulaciones_enrutador import router as simulaciones_router
+from Backend.API.etag import registrar_etag
+from Backend.API.sesiones import registrar_sesiones
+from Backend.API.persistencia import registrar_persistencia
+from Backend.Infraestructura.Repositorios.almacen_sqlite import AlmacenSQLite
 
 # Configuración detallada de la aplicación FastAPI con documentación completa
 app = FastAPI(
@@ -61,6 +70,9 @@ app = FastAPI(
     * `dijkstra` - Camino más corto ponderado
     * `floydwarshall` - Todos los caminos más cortos
     * `topologicalsort` - Ordenamiento topológico
+    * `bidireccional` - Camino más corto ponderado con búsqueda desde ambos extremos
+    * `alt` - A* con cotas de landmarks (desigualdad triangular)
+    * `ch` - Jerarquía de contracción con recargas en el nivel superior
     
     ### Estados de pedidos:
     * `pendiente` - Recién creado, esperando procesamiento
@@ -115,6 +127,18 @@ app = FastAPI(
             "name": "Estadísticas",
             "description": "Análisis y métricas del sistema logístico"
         },
+        {
+            "name": "Trabajos",
+            "description": "Seguimiento y cancelación de cálculos masivos en segundo plano"
+        },
+        {
+            "name": "Eventos",
+            "description": "Flujo de cambios (deltas) de pedidos, rutas, frecuencias y grafo, por SSE o consulta con cursor"
+        },
+        {
+            "name": "Simulaciones",
+            "description": "Registro de simulaciones aisladas por sesión; cada endpoint se puede usar bajo /simulaciones/{id}/"
+        },
         {
             "name": "Root",
             "description": "Endpoints básicos y de estado de la API"
@@ -133,6 +157,39 @@ app.add_middleware(
 
 sim_service = SimulacionAplicacionService()
 
+# Persistencia compartida: con SIMULACION_PERSISTENCIA=<archivo SQLite> varios workers (uvicorn --workers N)
+# comparten la simulacion principal. Cada worker responde las lecturas desde su memoria y la recarga cuando
+# otro worker confirma una escritura; las sesiones /simulaciones/{id} siguen siendo locales de cada worker.
+RUTA_PERSISTENCIA = os.environ.get("SIMULACION_PERSISTENCIA")
+if RUTA_PERSISTENCIA:
+    sim_service.configurar_persistencia(AlmacenSQLite(RUTA_PERSISTENCIA))
+
+# Arranque en caliente: con SIMULACION_CHECKPOINT=<archivo .ckpt> se restaura la simulacion guardada con
+# POST /simulacion/checkpoint/{nombre} (misma red, pedidos y rutas). Con persistencia compartida solo la
+# restaura si el almacen todavia no tiene una simulacion.
+RUTA_CHECKPOINT = os.environ.get("SIMULACION_CHECKPOINT")
+if RUTA_CHECKPOINT and sim_service.contar_coleccion('vertices') == 0:
+    sim_service.restaurar_checkpoint(RUTA_CHECKPOINT)
+    marcar_simulacion_restaurada(sim_service)
+
+# ETag por version de la simulacion: los GET repetidos sin cambios responden 304
+registrar_etag(app, SimulacionAplicacionService)
+
+# Recarga desde el almacen compartido antes de cada peticion (va despues del ETag: lo envuelve)
+registrar_persistencia(app, SimulacionAplicacionService)
+
+# /simulaciones/{id}/...: cualquier endpoint sobre una simulacion aislada (va despues del ETag: es el mas externo)
+registrar_sesiones(app, sim_service)
+
+# Hilos para los endpoints sincronos (por defecto 40). La simulacion se protege con un cerrojo de
+# lectura/escritura, asi que se puede aumentar con HILOS_API para atender mas lecturas concurrentes.
+HILOS_API = int(os.environ.get("HILOS_API", "0") or 0)
+
+@app.on_event("startup")
+def configurar_hilos_api():
+    if HILOS_API > 0:
+        anyio.to_thread.current_default_thread_limiter().total_tokens = HILOS_API
+
 # --- Incluir el router modular de simulacion y todos los routers de la API ---
 app.include_router(simulacion_router)
 app.include_router(rutas_router)
@@ -143,6 +200,9 @@ app.include_router(clientes_router)
 app.include_router(almacenamientos_router)
 app.include_router(aristas_router)
 app.include_router(vertices_router)
+app.include_router(trabajos_router)
+app.include_router(eventos_router)
+app.include_router(simulaciones_router)
 
 
 @app.get("/", tags=["Root"], summary="Estado de la API", response_description="Información básica de la API")
@@ -174,7 +234,10 @@ def root() -> Dict[str, Any]:
             "/recargas - Estaciones de carga",
             "/pedidos - Gestión de pedidos",
             "/rutas - Cálculo y optimización de rutas",
-            "/estadisticas - Análisis y métricas"
+            "/estadisticas - Análisis y métricas",
+            "/jobs - Trabajos en segundo plano (progreso y cancelación)",
+            "/eventos - Deltas de la simulación (SSE en /eventos/stream)",
+            "/simulaciones - Simulaciones aisladas por sesión (/simulaciones/{id}/<endpoint>)"
         ],
         "documentacion": {
             "swagger_ui": "/docs",
@@ -182,10 +245,10 @@ def root() -> Dict[str, Any]:
             "openapi_json": "/openapi.json"
         },
         "caracteristicas": {
-            "algoritmos_ruta": ["bfs", "dfs", "dijkstra", "floydwarshall", "topologicalsort"],
+            "algoritmos_ruta": ["bfs", "dfs", "dijkstra", "floydwarshall", "topologicalsort", "bidireccional", "alt", "ch"],
             "autonomia_maxima": 50,
-            "vertices_maximos": 150,
-            "aristas_maximas": 300,
+            "vertices_maximos": 20000,
+            "aristas_maximas": 60000,
             "pedidos_maximos": 500
         }
     }
@@ -313,6 +376,24 @@ def obtener_algoritmos() -> Dict[str, Any]:
                 "descripcion": "Para grafos dirigidos acíclicos",
                 "complejidad": "O(V + E)",
                 "uso_recomendado": "Dependencias, flujos dirigidos"
+            },
+            "bidireccional": {
+                "nombre": "Búsqueda Bidireccional",
+                "descripcion": "Camino más corto ponderado buscando a la vez desde el origen y hacia atrás desde el destino",
+                "complejidad": "O((V + E) log V)",
+                "uso_recomendado": "Rutas largas entre dos puntos en redes grandes"
+            },
+            "alt": {
+                "nombre": "ALT (A*, Landmarks, desigualdad Triangular)",
+                "descripcion": "A* guiado por cotas inferiores calculadas con distancias a landmarks preprocesados por versión del grafo",
+                "complejidad": "O(k (V + E) log V) de preproceso; consultas que exploran solo la zona hacia el destino",
+                "uso_recomendado": "Muchas consultas punto a punto sobre un grafo que cambia poco"
+            },
+            "ch": {
+                "nombre": "Jerarquía de Contracción",
+                "descripcion": "Atajos precalculados contrayendo primero los vértices sin recarga; las recargas forman el nivel superior",
+                "complejidad": "Preproceso una vez por versión del grafo; consultas con dos búsquedas ascendentes cortas",
+                "uso_recomendado": "Consultas repetidas entre almacenes y clientes sobre una red estática"
             }
         },
         "autonomia_maxima": 50,
@@ -0,0 +1,149 @@
+"""
+Paginación por cursor, proyección de campos y exportación NDJSON para los endpoints de listas.
+Recorre los repositorios con iterar() en bloques, sin materializar la colección completa.
+"""
+import base64
+import binascii
+import json
+from itertools import islice
+from typing import Optional
+
+from fastapi import HTTPException, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+LIMITE_POR_DEFECTO = 100
+LIMITE_MAXIMO = 1000
+TAMANO_BLOQUE = 500
+
+
+class ParametrosLista:
+    """
+    Dependencia con los parámetros comunes de los endpoints de listas:
+    - limite/cursor: paginación por cursor; la respuesta pasa a ser {'items', 'siguiente_cursor', 'total'}.
+    - fields: proyección, nombres de campo separados por coma.
+    - formato=ndjson (o Accept: application/x-ndjson): un objeto JSON por línea, en streaming.
+    Sin ninguno de ellos el endpoint conserva su respuesta original (lista completa).
+    """
+
+    def __init__(
+        self,
+        request: Request,
+        limite: Optional[int] = Query(None, ge=1, le=LIMITE_MAXIMO, description="Elementos por página"),
+        cursor: Optional[str] = Query(None, description="Cursor opaco devuelto en siguiente_cursor"),
+        fields: Optional[str] = Query(None, description="Campos a incluir, separados por coma"),
+        formato: Optional[str] = Query(None, pattern="^(json|ndjson)$", description="json (por defecto) o ndjson"),
+    ):
+        self.limite = limite
+        self.cursor = cursor
+        self.campos = {c.strip() for c in fields.split(',') if c.strip()} if fields else None
+        if formato is None:
+            formato = 'ndjson' if 'application/x-ndjson' in request.headers.get('accept', '') else 'json'
+        self.ndjson = formato == 'ndjson'
+
+    def paginado(self):
+        return self.limite is not None or self.cursor is not None
+
+    def activos(self):
+        return self.paginado() or self.campos is not None or self.ndjson
+
+
+def responder_lista(service, coleccion, mapear, modelo, parametros):
+    """
+    Responde una colección del servicio según los ParametrosLista.
+    mapear convierte la entidad de dominio en su DTO y modelo es la clase Pydantic de la respuesta,
+    que define los campos válidos para fields (y los emitidos si no se indica proyección).
+    """
+    campos = set(modelo.model_fields)
+    if parametros.campos is not None:
+        desconocidos = parametros.campos - campos
+        if desconocidos:
+            raise HTTPException(status_code=400, detail=f"Campos desconocidos: {', '.join(sorted(desconocidos))}")
+        campos = parametros.campos
+
+    def iterar(desde):
+        return service.iterar_coleccion(coleccion, desde)
+
+    def serializar(entidad):
+        return mapear(entidad).model_dump(mode='json', include=campos)
+
+    desde = _posicion_inicial(iterar, parametros.cursor)
+    hasta = desde + (parametros.limite or LIMITE_POR_DEFECTO) if parametros.paginado() else None
+
+    if parametros.ndjson:
+        cabeceras = {}
+        if hasta is not None:
+            siguiente = list(islice(iterar(hasta - 1), 2))
+            if len(siguiente) == 2:
+                cabeceras['X-Siguiente-Cursor'] = _codificar_cursor(hasta, siguiente[0][0])
+        return StreamingResponse(_lineas_ndjson(iterar, desde, hasta, serializar), media_type="application/x-ndjson", headers=cabeceras)
+
+    items, ultima, recorridos = [], None, 0
+    for bloque in _bloques(iterar, desde, hasta):
+        items.extend(serializar(entidad) for _, entidad in bloque if entidad is not None)
+        ultima = bloque[-1][0]
+        recorridos += len(bloque)
+    if hasta is None:
+        return JSONResponse(items)
+    hay_mas = desde + recorridos == hasta and next(iterar(hasta), None) is not None
+    return JSONResponse({
+        'items': items,
+        'siguiente_cursor': _codificar_cursor(hasta, ultima) if hay_mas else None,
+        'total': service.contar_coleccion(coleccion),
+    })
+
+
+def _bloques(iterar, desde, hasta=None):
+    """
+    Recorre la colección en bloques de TAMANO_BLOQUE reabriendo el iterador en cada bloque:
+    un dict no admite cambios mientras se itera, así que ningún iterador queda abierto entre bloques
+    (por ejemplo mientras un trabajo en segundo plano agrega rutas durante una exportación).
+    """
+    posicion = desde
+    while hasta is None or posicion < hasta:
+        tamano = TAMANO_BLOQUE if hasta is None else min(TAMANO_BLOQUE, hasta - posicion)
+        bloque = list(islice(iterar(posicion), tamano))
+        if not bloque:
+            return
+        yield bloque
+        posicion += len(bloque)
+        if len(bloque) < tamano:
+            return
+
+
+def _lineas_ndjson(iterar, desde, hasta, serializar):
+    for bloque in _bloques(iterar, desde, hasta):
+        yield ''.join(json.dumps(serializar(entidad), ensure_ascii=False) + '\n' for _, entidad in bloque if entidad is not None)
+
+
+def _codificar_cursor(posicion, clave):
+    crudo = json.dumps([posicion, str(clave)]).encode()
+    return base64.urlsafe_b64encode(crudo).decode().rstrip('=')
+
+
+def _decodificar_cursor(cursor):
+    try:
+        crudo = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        posicion, clave = json.loads(crudo)
+        if not isinstance(posicion, int) or posicion < 0:
+            raise ValueError
+        return posicion, clave
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+
+def _posicion_inicial(iterar, cursor):
+    """
+    Traduce el cursor a una posición. El cursor guarda la posición y la clave del último elemento
+    entregado; si la colección cambió antes de esa posición se busca la clave para no repetir ni
+    saltar elementos.
+    """
+    if cursor is None:
+        return 0
+    posicion, clave = _decodificar_cursor(cursor)
+    anterior = next(iterar(posicion - 1), None) if posicion > 0 else None
+    if anterior is not None and str(anterior[0]) == clave:
+        return posicion
+    for i, (k, _) in enumerate(iterar(0)):
+        if str(k) == clave:
+            return i + 1
+    return posicion
@@ -5,6 +5,7 @@ from Backend.API.DTOs.DTOsRespuesta.RespuestaRuta import RespuestaRuta
 from Backend.API.DTOs.DTOsRespuesta.RespuestaHashMap import RespuestaHashMap
 from Backend.API.Mapeadores.MapeadorPedido import MapeadorPedido
 from Backend.API.Mapeadores.MapeadorRuta import MapeadorRuta
+from Backend.API.paginacion import ParametrosLista, responder_lista
 from typing import List, Dict, Any
 import logging
 
@@ -22,10 +23,13 @@ def get_simulacion_service():
     return SimulacionAplicacionService()
 
 @router.get("/", response_model=List[RespuestaPedido])
-def listar_pedidos(service=Depends(get_simulacion_service)):
+def listar_pedidos(lista: ParametrosLista = Depends(), service=Depends(get_simulacion_service)):
     """
     Devuelve la lista de pedidos registrados en la simulación.
+    Admite paginación por cursor (limite, cursor), proyección (fields) y exportación NDJSON (formato=ndjson).
     """
+    if lista.activos():
+        return responder_lista(service, 'pedidos', MapeadorPedido.a_dto, RespuestaPedido, lista)
     pedidos = service.obtener_pedidos()
     if pedidos is None:
         raise HTTPException(status_code=404, detail="No hay pedidos registrados")
@@ -0,0 +1,21 @@
+"""
+Sincronizacion de la simulacion compartida entre procesos del API (ver PersistenciaSimulacion).
+"""
+from fastapi import Request
+from starlette.concurrency import run_in_threadpool
+
+
+def registrar_persistencia(app, obtener_service):
+    """
+    Agrega a la app un middleware que, antes de cada peticion, recarga la simulacion si otro proceso
+    escribio en el almacen de persistencia. La comprobacion es una consulta de la version; la recarga,
+    poco frecuente, corre en el pool de hilos para no detener el bucle de eventos.
+    Sin persistencia configurada (o en una sesion /simulaciones/{id}) no hace nada.
+    Debe quedar por fuera del ETag, para que el ETag se calcule sobre la version ya cargada.
+    """
+    @app.middleware("http")
+    async def sincronizar_persistencia(request: Request, call_next):
+        service = obtener_service()
+        if service.persistencia_desactualizada():
+            await run_in_threadpool(service.sincronizar_persistencia)
+        return await call_next(request)
@@ -5,6 +5,9 @@ from Backend.API.Mapeadores.MapeadorRuta import MapeadorRuta
 from typing import List, Optional, Dict, Any
 from Backend.API.DTOs.DTOsRespuesta.RespuestaFloydWarshall import RespuestaFloydWarshall
 from Backend.API.DTOs.DTOsRespuesta.RespuestaHashMap import RespuestaHashMap
+from Backend.API.DTOs.DTOsRespuesta.RespuestaTrabajo import RespuestaTrabajo
+from Backend.API.trabajos_enrutador import trabajo_a_dto
+from Backend.API.paginacion import ParametrosLista, responder_lista
 
 import logging
 
@@ -31,20 +34,23 @@ if not logger.hasHandlers():
 logger.setLevel(logging.INFO)
 
 @router.get("/", response_model=List[RespuestaRuta])
-def listar_rutas(service=Depends(get_simulacion_service)):
+def listar_rutas(lista: ParametrosLista = Depends(), service=Depends(get_simulacion_service)):
     """
     Devuelve la lista de rutas registradas en la simulación.
+    Admite paginación por cursor (limite, cursor), proyección (fields) y exportación NDJSON (formato=ndjson).
     """
     logger.info("GET /rutas llamado")
+    if lista.activos():
+        return responder_lista(service, 'rutas', MapeadorRuta.a_dto, RespuestaRuta, lista)
     rutas = service.listar_rutas()
     logger.info(f"GET /rutas retornó {len(rutas) if rutas else 0} rutas")
     if rutas is None:
         logger.warning("GET /rutas: Simulación no iniciada")
         raise HTTPException(status_code=400, detail="Simulación no iniciada")
     try:
-        rutas_dto = MapeadorRuta.lista_a_dto(rutas) if rutas else []
-        logger.info(f"GET /rutas: {len(rutas_dto)} rutas serializadas correctamente")
-        return rutas_dto
+        contenido = MapeadorRuta.lista_a_json(rutas or [])
+        logger.info(f"GET /rutas: {len(rutas or [])} rutas serializadas correctamente")
+        return Response(content=contenido, media_type="application/json")
     except Exception as e:
         logger.error(f"GET /rutas: Error de mapeo: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error de mapeo: {str(e)}")
@@ -52,16 +58,49 @@ def listar_rutas(service=Depends(get_simulacion_service)):
 @router.get("/hashmap", response_model=RespuestaHashMap)
 def rutas_hashmap(service=Depends(get_simulacion_service)):
     """
-    Devuelve el hashmap de rutas (objetos reales para debug).
+    Devuelve el hashmap de rutas (clave → forma a_hashmap de la ruta, precalculada al crearla).
     """
     logger.info("GET /rutas/hashmap llamado")
     try:
-        hashmap = service.obtener_rutas_hashmap() or {}
-        return {"rutas": hashmap}
+        return {"hashmap": {str(clave): MapeadorRuta.a_hashmap(ruta) for clave, ruta in service.iterar_coleccion('rutas')}}
     except Exception as e:
         logger.error(f"GET /rutas/hashmap: Error obteniendo hashmap de rutas: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error obteniendo hashmap de rutas: {str(e)}")
 
+@router.get("/cache/estadisticas", response_model=Dict[str, Any])
+def estadisticas_cache_rutas(service=Depends(get_simulacion_service)):
+    """
+    Devuelve el estado de la cache de rutas: capacidad, tamaño, aciertos, fallos, desalojos, expirados y TTL por algoritmo.
+    """
+    logger.info("GET /rutas/cache/estadisticas llamado")
+    try:
+        return service.obtener_estadisticas_cache_rutas()
+    except Exception as e:
+        logger.error(f"GET /rutas/cache/estadisticas: Error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/benchmark", response_model=Dict[str, Any])
+def benchmark_rutas(
+    consultas: int = Query(20, ge=1, le=500, description="Pares (almacén, cliente) de pedidos pendientes a resolver"),
+    algoritmos: str = Query("dijkstra,bidireccional,alt,ch", description="Algoritmos separados por coma"),
+    service=Depends(get_simulacion_service)
+):
+    """
+    Compara algoritmos de ruta resolviendo los mismos pares de pedidos pendientes sin registrar rutas.
+    Por algoritmo devuelve rutas encontradas, tiempo total y medio, aceleración respecto de Dijkstra y si
+    los pesos coinciden; incluye el tiempo de preproceso de los landmarks de ALT y de la jerarquía de
+    contracción para la versión del grafo.
+    """
+    logger.info(f"GET /rutas/benchmark llamado: consultas={consultas}, algoritmos={algoritmos}")
+    try:
+        return service.comparar_algoritmos_rutas(consultas, [a.strip() for a in algoritmos.split(',') if a.strip()])
+    except ValueError as e:
+        logger.warning(f"GET /rutas/benchmark: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"GET /rutas/benchmark: Error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/{id}", response_model=RespuestaRuta)
 def obtener_ruta(id: int, service=Depends(get_simulacion_service)):
     """
@@ -109,9 +148,9 @@ def rutas_por_almacen(id_almacen: int, service=Depends(get_simulacion_service)):
         logger.warning(f"GET /rutas/por_almacen/{id_almacen}: No hay rutas desde el almacenamiento indicado")
         raise HTTPException(status_code=404, detail="No hay rutas desde el almacenamiento indicado")
     try:
-        rutas_dto = [MapeadorRuta.a_dto(r) for r in rutas_filtradas]
-        logger.info(f"GET /rutas/por_almacen/{id_almacen}: {len(rutas_dto)} rutas serializadas correctamente")
-        return rutas_dto
+        contenido = MapeadorRuta.lista_a_json(rutas_filtradas)
+        logger.info(f"GET /rutas/por_almacen/{id_almacen}: {len(rutas_filtradas)} rutas serializadas correctamente")
+        return Response(content=contenido, media_type="application/json")
     except Exception as e:
         logger.error(f"GET /rutas/por_almacen/{id_almacen}: Error de mapeo: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error de mapeo: {str(e)}")
@@ -138,9 +177,9 @@ def rutas_por_algoritmo(algoritmo: str, service=Depends(get_simulacion_service))
         if not rutas_filtradas:
             logger.warning(f"GET /rutas/por_algoritmo/{algoritmo}: No hay rutas para el algoritmo indicado")
             raise HTTPException(status_code=404, detail="No hay rutas para el algoritmo indicado")
-        rutas_dto = [MapeadorRuta.a_dto(r) for r in rutas_filtradas]
-        logger.info(f"GET /rutas/por_algoritmo/{algoritmo}: {len(rutas_dto)} rutas serializadas correctamente")
-        return rutas_dto
+        contenido = MapeadorRuta.lista_a_json(rutas_filtradas)
+        logger.info(f"GET /rutas/por_algoritmo/{algoritmo}: {len(rutas_filtradas)} rutas serializadas correctamente")
+        return Response(content=contenido, media_type="application/json")
     except Exception as e:
         logger.error(f"GET /rutas/por_algoritmo/{algoritmo}: Error de mapeo: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error de mapeo: {str(e)}")
@@ -157,13 +196,32 @@ def rutas_por_pedido(id_pedido: int, service=Depends(get_simulacion_service)):
         if not rutas_filtradas:
             logger.warning(f"GET /rutas/por_pedido/{id_pedido}: No hay rutas para el pedido indicado")
             raise HTTPException(status_code=404, detail="No hay rutas para el pedido indicado")
-        rutas_dto = [MapeadorRuta.a_dto(r) for r in rutas_filtradas]
-        logger.info(f"GET /rutas/por_pedido/{id_pedido}: {len(rutas_dto)} rutas serializadas correctamente")
-        return rutas_dto
+        contenido = MapeadorRuta.lista_a_json(rutas_filtradas)
+        logger.info(f"GET /rutas/por_pedido/{id_pedido}: {len(rutas_filtradas)} rutas serializadas correctamente")
+        return Response(content=contenido, media_type="application/json")
     except Exception as e:
         logger.error(f"GET /rutas/por_pedido/{id_pedido}: Error de mapeo: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error de mapeo: {str(e)}")
 
+# Calcular rutas de todos los pedidos con todos los algoritmos (trabajo en segundo plano).
+# Declarada antes de /calcular/{id_pedido}/... para que "masivo" no se interprete como id de pedido.
+@router.post("/calcular/masivo/todos", response_model=RespuestaTrabajo, status_code=202)
+def calcular_rutas_masivo(
+    max_workers: Optional[int] = Query(None, ge=1, description="Procesos trabajadores (por defecto todos los núcleos)"),
+    service=Depends(get_simulacion_service)
+):
+    """
+    Encola el cálculo de rutas de todos los pedidos pendientes con todos los algoritmos.
+    Retorna de inmediato el trabajo; el progreso se consulta en GET /jobs/{id_trabajo}.
+    """
+    logger.info("POST /rutas/calcular/masivo/todos llamado")
+    try:
+        trabajo = service.encolar_rutas_masivas(max_workers)
+    except RuntimeError as e:
+        logger.warning(f"POST /rutas/calcular/masivo/todos: {str(e)}")
+        raise HTTPException(status_code=429, detail=str(e))
+    return trabajo_a_dto(trabajo)
+
 # Calcular ruta individual con algoritmo específico
 @router.post(
     "/calcular/{id_pedido}/{algoritmo}", 
@@ -178,6 +236,9 @@ def rutas_por_pedido(id_pedido: int, service=Depends(get_simulacion_service)):
     - **dijkstra**: Camino más corto ponderado - Considera pesos de aristas
     - **floydwarshall**: Todos los caminos más cortos - Algoritmo global optimizado
     - **topologicalsort**: Ordenamiento topológico - Para grafos dirigidos acíclicos
+    - **bidireccional**: Camino más corto ponderado buscando desde el almacén y desde el cliente a la vez
+    - **alt**: A* con cotas de landmarks - Camino más corto ponderado dirigido hacia el cliente
+    - **ch**: Jerarquía de contracción - Consultas repetidas almacén-cliente sobre un índice precalculado
     
     ### Validaciones:
     - El pedido debe existir y no estar marcado como entregado
@@ -228,21 +289,36 @@ def calcular_rutas_todos(id_pedido: int, service=Depends(get_simulacion_service)
         logger.error(f"POST /rutas/calcular/{id_pedido}/todos: Error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-# Calcular rutas usando Floyd-Warshall para todos los pedidos
-@router.post("/floydwarshall_pedidos", response_model=List[RespuestaRuta])
+# Calcular rutas usando Floyd-Warshall para todos los pedidos (trabajo en segundo plano)
+@router.post("/floydwarshall_pedidos", response_model=RespuestaTrabajo, status_code=202)
 def floydwarshall_pedidos(service=Depends(get_simulacion_service)):
     """
-    Calcula rutas óptimas para todos los pedidos usando Floyd-Warshall.
+    Encola el cálculo de rutas óptimas para todos los pedidos usando Floyd-Warshall.
+    Retorna de inmediato el trabajo; el progreso y las rutas se consultan en GET /jobs/{id_trabajo}.
     """
     logger.info("POST /rutas/floydwarshall_pedidos llamado")
     try:
-        rutas = service.floydwarshall_para_todos_los_pedidos()
-        from Backend.API.Mapeadores.MapeadorRuta import MapeadorRuta
-        logger.info("POST /rutas/floydwarshall_pedidos: Rutas calculadas correctamente")
-        return MapeadorRuta.lista_a_dto(rutas)
-    except Exception as e:
-        logger.error(f"POST /rutas/floydwarshall_pedidos: Error: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+        trabajo = service.encolar_floydwarshall_pedidos()
+    except RuntimeError as e:
+        logger.warning(f"POST /rutas/floydwarshall_pedidos: {str(e)}")
+        raise HTTPException(status_code=429, detail=str(e))
+    return trabajo_a_dto(trabajo)
+
+# Calcular rutas de los pedidos pendientes con una búsqueda por almacén (trabajo en segundo plano)
+@router.post("/por_almacen", response_model=RespuestaTrabajo, status_code=202)
+def rutas_por_almacen(service=Depends(get_simulacion_service)):
+    """
+    Encola el cálculo de rutas Dijkstra de los pedidos pendientes agrupados por almacén de origen:
+    una búsqueda con batería por almacén y el camino de cada pedido se extrae de su árbol.
+    Retorna de inmediato el trabajo; el progreso y las rutas se consultan en GET /jobs/{id_trabajo}.
+    """
+    logger.info("POST /rutas/por_almacen llamado")
+    try:
+        trabajo = service.encolar_rutas_por_almacen()
+    except RuntimeError as e:
+        logger.warning(f"POST /rutas/por_almacen: {str(e)}")
+        raise HTTPException(status_code=429, detail=str(e))
+    return trabajo_a_dto(trabajo)
 
 # Marcar pedido como entregado
 @router.post(
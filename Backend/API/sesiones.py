@@ -0,0 +1,59 @@
+"""
+Simulaciones aisladas por sesion: /simulaciones/{id}/<endpoint> atiende cualquier endpoint de la API
+sobre la simulacion de esa sesion en vez de la principal.
+"""
+from fastapi.responses import JSONResponse
+
+PREFIJO_SESIONES = '/simulaciones/'
+
+
+def registrar_sesiones(app, service):
+    """
+    Agrega a la app un middleware que quita el prefijo /simulaciones/{id} de la ruta y ejecuta la peticion
+    con la simulacion de esa sesion activa: los routers existentes sirven a todas las sesiones sin cambios.
+    Debe registrarse despues de los demas middlewares (queda como el mas externo) para que el ETag
+    tambien se calcule sobre la sesion.
+    """
+    app.add_middleware(_MiddlewareSesiones, service=service)
+
+
+def separar_sesion(ruta):
+    """
+    Retorna (id_sesion, ruta_sin_prefijo) para '/simulaciones/{id}/...', o (None, ruta) en otro caso
+    ('/simulaciones/' y '/simulaciones/{id}' son endpoints del propio registro).
+    """
+    if not ruta.startswith(PREFIJO_SESIONES):
+        return None, ruta
+    id_sesion, barra, resto = ruta[len(PREFIJO_SESIONES):].partition('/')
+    if not id_sesion or not barra:
+        return None, ruta
+    return id_sesion, '/' + resto
+
+
+class _MiddlewareSesiones:
+    """
+    Middleware ASGI (no BaseHTTPMiddleware) para que la sesion quede activa tambien mientras se envian
+    respuestas en streaming (NDJSON, SSE).
+    """
+
+    def __init__(self, app, service):
+        self.app = app
+        self.service = service
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] not in ('http', 'websocket'):
+            return await self.app(scope, receive, send)
+        id_sesion, ruta = separar_sesion(scope['path'])
+        if id_sesion is None:
+            return await self.app(scope, receive, send)
+        ambito = self.service.obtener_sesion(id_sesion)
+        if ambito is None:
+            respuesta = JSONResponse({'detail': f'Simulación no encontrada o desalojada: {id_sesion}'}, status_code=404)
+            return await respuesta(scope, receive, send)
+        prefijo = PREFIJO_SESIONES + id_sesion
+        scope = dict(scope, path=ruta, raw_path=ruta.encode(), root_path=scope.get('root_path', '') + prefijo)
+        with self.service.activar_sesion(ambito):
+            await self.app(scope, receive, send)
+            if scope.get('method') not in ('GET', 'HEAD'):
+                # Las escrituras (por ejemplo iniciar la simulacion) son las que hacen crecer la memoria
+                self.service.controlar_memoria_sesiones()
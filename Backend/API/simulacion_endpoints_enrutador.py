@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Depends, Body, Query
+from fastapi import APIRouter, HTTPException, Depends, Body, Query, Request, Path
 from Backend.Aplicacion.SimAplicacion.Aplicacion_Simulacion import SimulacionAplicacionService
 from Backend.API.DTOs.DTOsRespuesta.RespuestaSimulacionInit import RespuestaSimulacionInit
 from Backend.API.DTOs.DTOsRespuesta.RespuestaSimulacionEstado import RespuestaSimulacionEstado
@@ -13,7 +13,18 @@ from Backend.API.Mapeadores.MapeadorRuta import MapeadorRuta
 from Backend.API.Mapeadores.MapeadorVertice import MapeadorVertice
 from Backend.API.Mapeadores.MapeadorArista import MapeadorArista
 from Backend.API.DTOs.DTOsRespuesta.RespuestaHashMap import RespuestaHashMap
+from Backend.API.DTOs.DTOsRespuesta.RespuestaCliente import RespuestaCliente
+from Backend.API.DTOs.DTOsRespuesta.RespuestaAlmacenamiento import RespuestaAlmacenamiento
+from Backend.API.DTOs.DTOsRespuesta.RespuestaPedido import RespuestaPedido
+from Backend.API.DTOs.DTOsRespuesta.RespuestaRecarga import RespuestaRecarga
+from Backend.API.DTOs.DTOsRespuesta.RespuestaRuta import RespuestaRuta
+from Backend.API.DTOs.DTOsRespuesta.RespuestaVertice import RespuestaVertice
+from Backend.API.DTOs.DTOsRespuesta.RespuestaArista import RespuestaArista
+from Backend.API.paginacion import ParametrosLista, responder_lista
+from Backend.API.compresion import respuesta_comprimida
+from Backend.API.eventos_enrutador import armar_cursor
 from typing import Dict, Any
+import os
 import time
 import logging
 
@@ -23,6 +34,10 @@ estado_simulacion_global = None
 
 router = APIRouter(prefix="/simulacion", tags=["Simulacion"])
 
+# Directorio de los checkpoints binarios (POST /simulacion/checkpoint/{nombre})
+DIRECTORIO_CHECKPOINTS = os.environ.get("SIMULACION_CHECKPOINTS", "checkpoints")
+EXTENSION_CHECKPOINT = ".ckpt"
+
 # Configurar logging básico
 logging.basicConfig(level=logging.INFO)
 
@@ -52,7 +67,7 @@ def get_simulacion_service():
     según los parámetros especificados.
     
     ### Parámetros:
-    - **n_vertices**: Número total de vértices (10-150)
+    - **n_vertices**: Número total de vértices (10-20000; sobre 150 las aristas candidatas se muestrean)
         - 60% serán clientes 
         - 20% serán almacenamientos
         - 20% serán estaciones de recarga
@@ -223,6 +238,101 @@ def obtener_snapshot(tipo: str, service=Depends(get_simulacion_service)):
         logger.exception("[SNAPSHOT] Error inesperado al procesar snapshot")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/snapshot_completo")
+def obtener_snapshot_completo(
+    request: Request,
+    formato: str = Query("json", pattern="^(json|compacto)$", description="json (mismas listas que los endpoints individuales) o compacto (columnas tipadas en base64)"),
+    service=Depends(get_simulacion_service)
+):
+    """
+    Devuelve en una sola respuesta clientes, pedidos, almacenamientos, recargas, vértices, aristas, rutas y
+    estadísticas, con gzip si el cliente lo acepta. Incluye cursor_deltas para seguir con /eventos/ desde
+    este estado. Todo se lee con el cerrojo de lectura de la simulación, así que las colecciones y el cursor
+    corresponden a un mismo estado aunque haya escrituras concurrentes.
+    """
+    inicio = time.time()
+    with service.lectura():
+        posicion = service.obtener_posicion_deltas()
+        cursor = armar_cursor(posicion['instancia'], posicion['seq'])
+        if formato == "compacto":
+            contenido = MapeadorSnapshot.completo_a_compacto(service, cursor)
+        else:
+            contenido = MapeadorSnapshot.completo_a_json(service, cursor)
+    logger.info(f"[SNAPSHOT] Snapshot completo ({formato}): {len(contenido)} bytes en {time.time() - inicio:.3f}s")
+    return respuesta_comprimida(request, contenido)
+
+def ruta_checkpoint(nombre: str) -> str:
+    """
+    Archivo del checkpoint 'nombre' dentro de DIRECTORIO_CHECKPOINTS.
+    """
+    return os.path.join(DIRECTORIO_CHECKPOINTS, nombre + EXTENSION_CHECKPOINT)
+
+def marcar_simulacion_restaurada(service):
+    """
+    Registra como activa una simulación restaurada desde un checkpoint (como /iniciar).
+    """
+    global simulacion_activa, estado_simulacion_global
+    simulacion_activa = True
+    estado_simulacion_global = service.estado_actual()
+
+@router.get("/checkpoints", response_model=list)
+def listar_checkpoints():
+    """
+    Lista los checkpoints guardados (nombre, bytes y fecha de modificación).
+    """
+    if not os.path.isdir(DIRECTORIO_CHECKPOINTS):
+        return []
+    checkpoints = []
+    for archivo in sorted(os.listdir(DIRECTORIO_CHECKPOINTS)):
+        if archivo.endswith(EXTENSION_CHECKPOINT):
+            ruta = os.path.join(DIRECTORIO_CHECKPOINTS, archivo)
+            checkpoints.append({
+                "nombre": archivo[:-len(EXTENSION_CHECKPOINT)],
+                "bytes": os.path.getsize(ruta),
+                "modificado": os.path.getmtime(ruta),
+            })
+    return checkpoints
+
+@router.post("/checkpoint/{nombre}", response_model=dict)
+def guardar_checkpoint(nombre: str = Path(..., pattern="^[A-Za-z0-9_-]+$"), service=Depends(get_simulacion_service)):
+    """
+    Guarda la simulación completa (grafo, pedidos, rutas y frecuencias del AVL) en un checkpoint binario.
+    """
+    if service.contar_coleccion('vertices') == 0:
+        raise HTTPException(status_code=404, detail="No hay simulación activa.")
+    try:
+        t0 = time.time()
+        os.makedirs(DIRECTORIO_CHECKPOINTS, exist_ok=True)
+        resumen = service.guardar_checkpoint(ruta_checkpoint(nombre))
+        t1 = time.time()
+        logger.info(f"[CHECKPOINT] Guardado '{nombre}': {resumen['bytes']} bytes en {t1 - t0:.3f}s")
+        return {"mensaje": f"Checkpoint '{nombre}' guardado", "nombre": nombre, **resumen, "tiempo_respuesta": round(t1 - t0, 4)}
+    except Exception as e:
+        logger.exception(f"[CHECKPOINT] Error al guardar '{nombre}'")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/checkpoint/{nombre}/restaurar", response_model=dict)
+def restaurar_checkpoint(nombre: str = Path(..., pattern="^[A-Za-z0-9_-]+$"), service=Depends(get_simulacion_service)):
+    """
+    Reemplaza la simulación por la guardada en el checkpoint: la misma red, pedidos, rutas y frecuencias.
+    """
+    ruta = ruta_checkpoint(nombre)
+    if not os.path.isfile(ruta):
+        raise HTTPException(status_code=404, detail=f"No existe el checkpoint '{nombre}'")
+    try:
+        t0 = time.time()
+        meta = service.restaurar_checkpoint(ruta)
+        t1 = time.time()
+        marcar_simulacion_restaurada(service)
+        logger.info(f"[CHECKPOINT] Restaurado '{nombre}' en {t1 - t0:.3f}s")
+        return {"mensaje": f"Checkpoint '{nombre}' restaurado", "nombre": nombre, **meta['conteos'],
+                "parametros": meta['parametros'], "tiempo_respuesta": round(t1 - t0, 4)}
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.exception(f"[CHECKPOINT] Error al restaurar '{nombre}'")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/clientes/hashmap", response_model=RespuestaHashMap)
 def clientes_hashmap(service=Depends(get_simulacion_service)):
     clientes = service.obtener_clientes()
@@ -266,39 +376,51 @@ def aristas_hashmap(service=Depends(get_simulacion_service)):
     return {f"({getattr(a.origen.elemento, 'id_cliente', getattr(a.origen.elemento, 'id_almacenamiento', getattr(a.origen.elemento, 'id_recarga', 0)))}, {getattr(a.destino.elemento, 'id_cliente', getattr(a.destino.elemento, 'id_almacenamiento', getattr(a.destino.elemento, 'id_recarga', 0)))})": MapeadorArista.a_hashmap(a) for a in aristas}
 
 @router.get("/clientes", response_model=list)
-def listar_clientes(service=Depends(get_simulacion_service)):
+def listar_clientes(lista: ParametrosLista = Depends(), service=Depends(get_simulacion_service)):
+    if lista.activos():
+        return responder_lista(service, 'clientes', MapeadorCliente.a_dto, RespuestaCliente, lista)
     clientes = service.obtener_clientes()
-    return [MapeadorCliente.a_dto(c, incluir_pedidos=False) for c in clientes]
+    return [MapeadorCliente.a_dto(c) for c in clientes]
 
 @router.get("/almacenamientos", response_model=list)
-def listar_almacenamientos(service=Depends(get_simulacion_service)):
+def listar_almacenamientos(lista: ParametrosLista = Depends(), service=Depends(get_simulacion_service)):
+    if lista.activos():
+        return responder_lista(service, 'almacenamientos', MapeadorAlmacenamiento.a_dto, RespuestaAlmacenamiento, lista)
     almacenamientos = service.obtener_almacenamientos()
-    return [MapeadorAlmacenamiento.a_dto(a, incluir_pedidos=False) for a in almacenamientos]
+    return [MapeadorAlmacenamiento.a_dto(a) for a in almacenamientos]
 
 @router.get("/pedidos", response_model=list)
-def listar_pedidos(service=Depends(get_simulacion_service)):
+def listar_pedidos(lista: ParametrosLista = Depends(), service=Depends(get_simulacion_service)):
+    if lista.activos():
+        return responder_lista(service, 'pedidos', MapeadorPedido.a_dto, RespuestaPedido, lista)
     pedidos = service.obtener_pedidos()
-    return [MapeadorPedido.a_dto(p, incluir_cliente=False, incluir_almacenamiento=False) for p in pedidos]
+    return [MapeadorPedido.a_dto(p) for p in pedidos]
 
 @router.get("/recargas", response_model=list)
-def listar_recargas(service=Depends(get_simulacion_service)):
+def listar_recargas(lista: ParametrosLista = Depends(), service=Depends(get_simulacion_service)):
+    if lista.activos():
+        return responder_lista(service, 'recargas', MapeadorRecarga.a_dto, RespuestaRecarga, lista)
     recargas = service.obtener_recargas()
     return [MapeadorRecarga.a_dto(r) for r in recargas]
 
 @router.get("/rutas", response_model=list)
-def listar_rutas(service=Depends(get_simulacion_service)):
+def listar_rutas(lista: ParametrosLista = Depends(), service=Depends(get_simulacion_service)):
+    if lista.activos():
+        return responder_lista(service, 'rutas', MapeadorRuta.a_dto, RespuestaRuta, lista)
     rutas = service.obtener_rutas()
-    from Backend.API.Mapeadores.MapeadorRuta import MapeadorRuta
     return [MapeadorRuta.a_dto(r) for r in rutas]
 
 @router.get("/vertices", response_model=list)
-def listar_vertices(service=Depends(get_simulacion_service)):
+def listar_vertices(lista: ParametrosLista = Depends(), service=Depends(get_simulacion_service)):
+    if lista.activos():
+        return responder_lista(service, 'vertices', MapeadorVertice.a_dto, RespuestaVertice, lista)
     vertices = service.obtener_vertices()
-    from Backend.API.Mapeadores.MapeadorVertice import MapeadorVertice
     return [MapeadorVertice.a_dto(v) for v in vertices]
 
 @router.get("/aristas", response_model=list)
-def listar_aristas(service=Depends(get_simulacion_service)):
+def listar_aristas(lista: ParametrosLista = Depends(), service=Depends(get_simulacion_service)):
+    if lista.activos():
+        return responder_lista(service, 'aristas', MapeadorArista.a_dto, RespuestaArista, lista)
     aristas = service.obtener_aristas()
     return [MapeadorArista.a_dto(a) for a in aristas]
 
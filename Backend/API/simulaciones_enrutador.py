@@ -0,0 +1,86 @@
+from fastapi import APIRouter, HTTPException, Depends
+from Backend.Aplicacion.SimAplicacion.Aplicacion_Simulacion import SimulacionAplicacionService
+from Backend.API.DTOs.DTOsRespuesta.RespuestaSesion import RespuestaSesion
+from Backend.API.sesiones import PREFIJO_SESIONES
+from typing import List, Dict, Any
+
+import logging
+
+router = APIRouter(
+    prefix="/simulaciones",
+    tags=["Simulaciones"],
+    responses={
+        404: {"description": "Simulación no encontrada o desalojada"},
+        500: {"description": "Error interno del servidor"}
+    }
+)
+
+def get_simulacion_service():
+    return SimulacionAplicacionService()
+
+# Configuración del logger
+logger = logging.getLogger("API.Simulaciones")
+if not logger.hasHandlers():
+    handler = logging.StreamHandler()
+    formatter = logging.Formatter('[%(levelname)s] %(asctime)s - %(message)s')
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+logger.setLevel(logging.INFO)
+
+def sesion_a_dto(service, ambito):
+    datos = service.resumen_sesion(ambito)
+    return RespuestaSesion(**datos, prefijo=PREFIJO_SESIONES + datos['id'])
+
+@router.post("/", response_model=RespuestaSesion, status_code=201)
+def crear_sesion(service=Depends(get_simulacion_service)):
+    """
+    Crea una simulación aislada con sus propios repositorios, fábricas, grafo y AVL.
+    Todos los endpoints quedan disponibles bajo el prefijo devuelto, por ejemplo
+    POST {prefijo}/simulacion/iniciar y GET {prefijo}/pedidos/.
+    Las sesiones inactivas se desalojan (ver GET /simulaciones/limites).
+    """
+    logger.info("POST /simulaciones llamado")
+    try:
+        ambito = service.crear_sesion()
+    except RuntimeError as e:
+        logger.warning(f"POST /simulaciones: {str(e)}")
+        raise HTTPException(status_code=429, detail=str(e))
+    return sesion_a_dto(service, ambito)
+
+@router.get("/", response_model=List[RespuestaSesion])
+def listar_sesiones(service=Depends(get_simulacion_service)):
+    """
+    Lista la simulación principal ('principal', la de los endpoints sin prefijo) y las sesiones vigentes.
+    """
+    logger.info("GET /simulaciones llamado")
+    return [sesion_a_dto(service, a) for a in service.listar_sesiones()]
+
+@router.get("/limites")
+def limites_sesiones(service=Depends(get_simulacion_service)) -> Dict[str, Any]:
+    """
+    Máximo de sesiones, inactividad antes del desalojo, máximo de entidades y sesiones desalojadas.
+    """
+    return service.limites_sesiones()
+
+@router.get("/{id_sesion}", response_model=RespuestaSesion)
+def obtener_sesion(id_sesion: str, service=Depends(get_simulacion_service)):
+    logger.info(f"GET /simulaciones/{id_sesion} llamado")
+    ambito = service.obtener_sesion(id_sesion)
+    if ambito is None:
+        raise HTTPException(status_code=404, detail=f"Simulación no encontrada o desalojada: {id_sesion}")
+    return sesion_a_dto(service, ambito)
+
+@router.delete("/{id_sesion}", response_model=RespuestaSesion)
+def eliminar_sesion(id_sesion: str, service=Depends(get_simulacion_service)):
+    """
+    Elimina la sesión y libera su memoria. La simulación principal no se puede eliminar.
+    """
+    logger.info(f"DELETE /simulaciones/{id_sesion} llamado")
+    ambito = service.obtener_sesion(id_sesion)
+    if ambito is None:
+        raise HTTPException(status_code=404, detail=f"Simulación no encontrada o desalojada: {id_sesion}")
+    if ambito.id_ambito == 'principal':
+        raise HTTPException(status_code=400, detail="La simulación principal no se puede eliminar")
+    respuesta = sesion_a_dto(service, ambito)
+    service.eliminar_sesion(id_sesion)
+    return respuesta
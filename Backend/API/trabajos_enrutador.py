@@ -0,0 +1,76 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from Backend.Aplicacion.SimAplicacion.Aplicacion_Simulacion import SimulacionAplicacionService
+from Backend.API.DTOs.DTOsRespuesta.RespuestaTrabajo import RespuestaTrabajo
+from Backend.API.Mapeadores.MapeadorRuta import MapeadorRuta
+from typing import List
+
+import logging
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["Trabajos"],
+    responses={
+        404: {"description": "Trabajo no encontrado"},
+        500: {"description": "Error interno del servidor"}
+    }
+)
+
+def get_simulacion_service():
+    return SimulacionAplicacionService()
+
+# Configuración del logger
+logger = logging.getLogger("API.Trabajos")
+if not logger.hasHandlers():
+    handler = logging.StreamHandler()
+    formatter = logging.Formatter('[%(levelname)s] %(asctime)s - %(message)s')
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+logger.setLevel(logging.INFO)
+
+def trabajo_a_dto(trabajo, incluir_resultados=False, desde=0):
+    """
+    Convierte un Trabajo a RespuestaTrabajo; las rutas parciales se mapean solo si se piden.
+    """
+    datos = trabajo.resumen()
+    if incluir_resultados:
+        datos['resultados'] = MapeadorRuta.lista_a_dto(list(trabajo.resultados[desde:]))
+    return RespuestaTrabajo(**datos)
+
+@router.get("/", response_model=List[RespuestaTrabajo])
+def listar_trabajos(service=Depends(get_simulacion_service)):
+    """
+    Lista los trabajos en segundo plano registrados (sin resultados).
+    """
+    logger.info("GET /jobs llamado")
+    return [trabajo_a_dto(t) for t in service.listar_trabajos()]
+
+@router.get("/{id_trabajo}", response_model=RespuestaTrabajo)
+def obtener_trabajo(
+    id_trabajo: str,
+    incluir_resultados: bool = Query(False, description="Incluye las rutas calculadas hasta el momento"),
+    desde: int = Query(0, ge=0, description="Omite las primeras N rutas ya recibidas en consultas anteriores"),
+    service=Depends(get_simulacion_service)
+):
+    """
+    Devuelve estado, progreso, tiempos y opcionalmente los resultados parciales de un trabajo.
+    """
+    logger.info(f"GET /jobs/{id_trabajo} llamado")
+    trabajo = service.obtener_trabajo(id_trabajo)
+    if trabajo is None:
+        raise HTTPException(status_code=404, detail="Trabajo no encontrado")
+    try:
+        return trabajo_a_dto(trabajo, incluir_resultados, desde)
+    except Exception as e:
+        logger.error(f"GET /jobs/{id_trabajo}: Error de mapeo: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error de mapeo: {str(e)}")
+
+@router.delete("/{id_trabajo}", response_model=RespuestaTrabajo)
+def cancelar_trabajo(id_trabajo: str, service=Depends(get_simulacion_service)):
+    """
+    Solicita la cancelación de un trabajo. Si ya está en ejecución se detiene al terminar su lote actual.
+    """
+    logger.info(f"DELETE /jobs/{id_trabajo} llamado")
+    trabajo = service.cancelar_trabajo(id_trabajo)
+    if trabajo is None:
+        raise HTTPException(status_code=404, detail="Trabajo no encontrado")
+    return trabajo_a_dto(trabajo)
@@ -4,6 +4,7 @@ from Backend.API.DTOs.DTOsRespuesta.RespuestaVertice import RespuestaVertice
 from Backend.API.DTOs.DTOsRespuesta.RespuestaHashMap import RespuestaHashMap
 from Backend.Aplicacion.SimAplicacion.Aplicacion_Simulacion import SimulacionAplicacionService
 from Backend.API.Mapeadores.MapeadorVertice import MapeadorVertice
+from Backend.API.paginacion import ParametrosLista, responder_lista
 
 router = APIRouter(prefix="/vertices", tags=["Vertices"])
 
@@ -12,10 +13,13 @@ def get_simulacion_service():
 
 
 @router.get("/", response_model=List[RespuestaVertice])
-def listar_vertices(service=Depends(get_simulacion_service)):
+def listar_vertices(lista: ParametrosLista = Depends(), service=Depends(get_simulacion_service)):
     """
     Devuelve la lista de vertices registrados en la simulación.
+    Admite paginación por cursor (limite, cursor), proyección (fields) y exportación NDJSON (formato=ndjson).
     """
+    if lista.activos():
+        return responder_lista(service, 'vertices', MapeadorVertice.a_dto, RespuestaVertice, lista)
     vertices = service.obtener_vertices()
     if vertices is None:
         raise HTTPException(status_code=404, detail="No hay vertices registrados")
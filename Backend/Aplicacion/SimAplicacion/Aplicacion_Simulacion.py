@@ -1,5 +1,8 @@
 from Backend.Dominio.Interfaces.IntSim.ISimulacionAplicacionService import ISimulacionAplicacionService
 from Backend.Servicios.SimServicios.Servicios_Simulacion import SimulacionDominioService
+from Backend.Servicios.SimServicios.Servicios_Trabajos import GestorTrabajos
+from Backend.Servicios.SimServicios.Servicios_RegistroSimulaciones import RegistroSimulaciones
+from Backend.Infraestructura.ambito_simulacion import activar_ambito
 from Backend.Dominio.Simulacion_dominio import Simulacion
 from Backend.Infraestructura.Repositorios.repositorio_clientes import RepositorioClientes
 from Backend.Infraestructura.Repositorios.repositorio_almacenamientos import RepositorioAlmacenamientos
@@ -50,6 +53,48 @@ class SimulacionAplicacionService(ISimulacionAplicacionService):
     def obtener_rutas(self):
         return self._serv.obtener_rutas()
 
+    def obtener_version(self):
+        return self._serv.obtener_version()
+
+    def obtener_etag(self):
+        return self._serv.obtener_etag()
+
+    def configurar_persistencia(self, almacen):
+        """Comparte la simulación principal entre procesos a través de un almacén de persistencia"""
+        return self._serv.configurar_persistencia(almacen)
+
+    def sincronizar_persistencia(self):
+        """Recarga la simulación si otro proceso escribió en el almacén"""
+        return self._serv.sincronizar_persistencia()
+
+    def persistencia_desactualizada(self):
+        """Indica si otro proceso escribió en el almacén desde la última carga"""
+        return self._serv.persistencia_desactualizada()
+
+    def guardar_checkpoint(self, ruta):
+        """Guarda la simulación en un checkpoint binario"""
+        return self._serv.guardar_checkpoint(ruta)
+
+    def restaurar_checkpoint(self, ruta):
+        """Restaura la simulación desde un checkpoint binario"""
+        return self._serv.restaurar_checkpoint(ruta)
+
+    def obtener_deltas(self, seq: int, limite: int = None):
+        return self._serv.obtener_deltas(seq, limite)
+
+    def obtener_posicion_deltas(self):
+        return self._serv.obtener_posicion_deltas()
+
+    def iterar_coleccion(self, coleccion: str, desde: int = 0):
+        return self._serv.iterar_coleccion(coleccion, desde)
+
+    def lectura(self):
+        """Contexto con el cerrojo de lectura de la simulación (varias consultas sobre un mismo estado)"""
+        return self._serv.lectura()
+
+    def contar_coleccion(self, coleccion: str):
+        return self._serv.contar_coleccion(coleccion)
+
     def set_estrategia_ruta(self, estrategia):
         return self._serv.set_estrategia_ruta(estrategia)
 
@@ -203,14 +248,82 @@ class SimulacionAplicacionService(ISimulacionAplicacionService):
         """Calcula rutas con todos los algoritmos para un pedido"""
         return self._serv.calcular_rutas_todos(id_pedido)
 
-    def calcular_rutas_algoritmos(self, id_pedido: int):
+    def calcular_rutas_algoritmos(self, max_workers: int = None):
         """Calcula todas las rutas de todos los pedidos con todos los algoritmos"""
-        return self._serv.calcular_rutas_algoritmos(id_pedido)
+        return self._serv.calcular_rutas_algoritmos(max_workers)
 
     def floydwarshall_para_todos_los_pedidos(self):
         """Calcula rutas óptimas con Floyd-Warshall para todos los pedidos"""
         return self._serv.floydwarshall_para_todos_los_pedidos()
 
+    def encolar_floydwarshall_pedidos(self):
+        """Encola el cálculo Floyd-Warshall de todos los pedidos como trabajo en segundo plano"""
+        return GestorTrabajos().encolar('floydwarshall_pedidos', self._serv.floydwarshall_por_lotes)
+
+    def calcular_rutas_por_almacen(self):
+        """Calcula rutas Dijkstra de los pedidos pendientes con una búsqueda por almacén de origen"""
+        return self._serv.calcular_rutas_por_almacen()
+
+    def encolar_rutas_por_almacen(self):
+        """Encola el cálculo de rutas por almacén de los pedidos pendientes como trabajo en segundo plano"""
+        return GestorTrabajos().encolar('rutas_por_almacen', self._serv.rutas_por_almacen_por_lotes)
+
+    def encolar_rutas_masivas(self, max_workers: int = None):
+        """Encola el cálculo de rutas de todos los pedidos con todos los algoritmos"""
+        return GestorTrabajos().encolar('rutas_masivas', self._serv.calcular_rutas_algoritmos_por_lotes, max_workers)
+
+    def obtener_trabajo(self, id_trabajo: str):
+        """Obtiene un trabajo en segundo plano por su id"""
+        return GestorTrabajos().obtener(id_trabajo)
+
+    def listar_trabajos(self):
+        """Lista los trabajos en segundo plano registrados"""
+        return GestorTrabajos().listar()
+
+    def cancelar_trabajo(self, id_trabajo: str):
+        """Solicita la cancelación de un trabajo en segundo plano"""
+        return GestorTrabajos().cancelar(id_trabajo)
+
+    def crear_sesion(self):
+        """Crea una simulación aislada (sesión) y retorna su ámbito"""
+        return RegistroSimulaciones().crear()
+
+    def obtener_sesion(self, id_sesion: str):
+        """Obtiene el ámbito de una sesión, o None si no existe o fue desalojada"""
+        return RegistroSimulaciones().obtener(id_sesion)
+
+    def listar_sesiones(self):
+        """Lista la simulación principal y las sesiones registradas"""
+        return RegistroSimulaciones().listar()
+
+    def eliminar_sesion(self, id_sesion: str):
+        """Elimina una sesión y libera su memoria"""
+        return RegistroSimulaciones().eliminar(id_sesion)
+
+    def activar_sesion(self, ambito):
+        """Contexto en el que repositorios, fábricas y Simulacion() resuelven a los de la sesión"""
+        return activar_ambito(ambito)
+
+    def resumen_sesion(self, ambito):
+        """Resumen serializable (uso y tamaño) de una sesión"""
+        return RegistroSimulaciones().resumen(ambito)
+
+    def limites_sesiones(self):
+        """Límites de sesiones y memoria del registro"""
+        return RegistroSimulaciones().limites()
+
+    def controlar_memoria_sesiones(self):
+        """Desaloja sesiones inactivas si se supera el máximo de entidades"""
+        return RegistroSimulaciones().controlar_memoria()
+
+    def comparar_algoritmos_rutas(self, consultas: int = 20, algoritmos: list = None):
+        """Mide los algoritmos de ruta sobre los mismos pares de los pedidos pendientes"""
+        return self._serv.comparar_algoritmos_rutas(consultas, algoritmos)
+
+    def obtener_estadisticas_cache_rutas(self):
+        """Devuelve los contadores de la cache de rutas"""
+        return self._serv.obtener_estadisticas_cache_rutas()
+
     def entregar_pedido(self, id_pedido: int):
         """Marca un pedido como entregado"""
         return self._serv.entregar_pedido(id_pedido)
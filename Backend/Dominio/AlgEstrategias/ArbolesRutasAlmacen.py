@@ -0,0 +1,134 @@
+"""
+Arboles de caminos mas cortos con bateria desde los almacenes, reutilizados por todos sus pedidos.
+"""
+from collections import OrderedDict
+from array import array
+import heapq
+import logging
+import time
+
+
+class ArbolesRutasAlmacen:
+    """
+    Rutas uno-a-muchos: una sola busqueda por etiquetas (ver BusquedaEtiquetasEnergia) desde cada origen,
+    sin detenerse en un destino, deja el arbol de predecesores hacia todos los vertices alcanzables.
+    - La primera etiqueta fijada en cada vertice es la de menor distancia factible, asi que el camino de
+      cualquier pedido con ese origen se reconstruye subiendo por las etiquetas previas del arbol.
+    - El camino puede pasar por etiquetas no primeras de vertices intermedios (por ejemplo, un desvio a
+      una recarga), por eso se conservan todas las etiquetas fijadas y no solo un predecesor por vertice.
+    - Los pedidos salen de pocos almacenes: los pedidos pendientes se resuelven con una busqueda por
+      almacen y los pedidos repetidos hacia el mismo cliente solo repiten la reconstruccion.
+    Vive en csr.derivados, por lo que se descarta junto con el snapshot cuando cambia el grafo.
+    """
+    # Arboles conservados (los de los origenes menos usados recientemente se descartan)
+    CAPACIDAD_ARBOLES = 64
+
+    def __init__(self, csr, autonomia=50):
+        self.logger = logging.getLogger("ArbolesRutasAlmacen")
+        self._csr = csr
+        self.autonomia = autonomia
+        self._arboles = OrderedDict()  # indice_origen -> (primera, fijadas)
+        self.n_busquedas = 0
+        self.tiempo_busquedas = 0.0
+
+    @classmethod
+    def obtener(cls, csr, autonomia=50):
+        """
+        Retorna los arboles asociados al snapshot, creando el contenedor si aun no existe.
+        """
+        clave = ('arboles_almacen', autonomia)
+        arboles = csr.derivados.get(clave)
+        if arboles is None:
+            arboles = cls(csr, autonomia)
+            csr.derivados[clave] = arboles
+        return arboles
+
+    @classmethod
+    def existente(cls, csr, autonomia=50):
+        """
+        Retorna los arboles ya creados para el snapshot, o None.
+        """
+        return csr.derivados.get(('arboles_almacen', autonomia))
+
+    def contiene(self, i_origen):
+        """
+        Indica si el arbol del origen ya fue calculado.
+        """
+        return i_origen in self._arboles
+
+    def posiciones(self, i_origen, i_destino):
+        """
+        Retorna la lista de posiciones de aristas del camino mas corto factible, o None si no existe.
+        """
+        primera, fijadas = self.arbol(i_origen)
+        etiqueta = primera[i_destino]
+        if etiqueta < 0:
+            return None
+        posiciones = []
+        previa, k = fijadas[etiqueta]
+        while previa != -1:
+            posiciones.append(k)
+            previa, k = fijadas[previa]
+        posiciones.reverse()
+        return posiciones
+
+    def arbol(self, i_origen):
+        """
+        Retorna (primera, fijadas) del origen, calculandolo si no esta en cache.
+        primera[v] es el indice en fijadas de la primera etiqueta fijada en v (-1 si es inalcanzable).
+        """
+        arbol = self._arboles.get(i_origen)
+        if arbol is not None:
+            self._arboles.move_to_end(i_origen)
+            return arbol
+        inicio = time.time()
+        arbol = self._buscar(i_origen)
+        self._arboles[i_origen] = arbol
+        if len(self._arboles) > self.CAPACIDAD_ARBOLES:
+            self._arboles.popitem(last=False)
+        self.n_busquedas += 1
+        self.tiempo_busquedas += time.time() - inicio
+        self.logger.info(f"[ArbolesRutasAlmacen] Arbol calculado: origen={i_origen}, etiquetas={len(arbol[1])}, tiempo={time.time() - inicio:.3f}s")
+        return arbol
+
+    def _buscar(self, i_origen):
+        """
+        Busqueda por etiquetas (distancia, energia restante) desde el origen hasta agotar el heap.
+        """
+        csr, autonomia = self._csr, self.autonomia
+        offsets, destinos, pesos, es_recarga = csr.offsets, csr.destinos, csr.pesos, csr.es_recarga
+        mejor_energia = [-1] * csr.n_vertices
+        primera = array('l', [-1]) * csr.n_vertices
+        fijadas = []
+        heap = [(0, -autonomia, i_origen, -1, -1)]
+        while heap:
+            distancia, energia_negativa, u, previa, k_llegada = heapq.heappop(heap)
+            energia = -energia_negativa
+            if energia <= mejor_energia[u]:
+                continue
+            actual = len(fijadas)
+            if mejor_energia[u] < 0:
+                primera[u] = actual
+            mejor_energia[u] = energia
+            fijadas.append((previa, k_llegada))
+            if es_recarga[u]:
+                energia = autonomia
+            for k in range(offsets[u], offsets[u + 1]):
+                peso_arista = pesos[k]
+                if peso_arista > energia:
+                    continue
+                v = destinos[k]
+                energia_siguiente = autonomia if es_recarga[v] else energia - peso_arista
+                if energia_siguiente > mejor_energia[v]:
+                    heapq.heappush(heap, (distancia + peso_arista, -energia_siguiente, v, actual, k))
+        return primera, fijadas
+
+    def resumen(self):
+        """
+        Contadores del contenedor: arboles en cache, busquedas realizadas y su tiempo total.
+        """
+        return {
+            'arboles': len(self._arboles),
+            'busquedas': self.n_busquedas,
+            'tiempo_busquedas': self.tiempo_busquedas,
+        }
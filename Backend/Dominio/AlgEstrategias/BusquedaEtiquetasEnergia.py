@@ -0,0 +1,61 @@
+"""
+Busqueda de caminos con bateria por etiquetas de Pareto (distancia, energia restante).
+"""
+import heapq
+
+
+class BusquedaEtiquetasEnergia:
+    """
+    Label-setting sobre los arreglos de un GrafoCSR (o GrafoCSRCompartido).
+    - Una etiqueta es (distancia, energia restante) en un vertice; al llegar a una recarga la energia
+      vuelve a la autonomia.
+    - Las etiquetas salen del heap por distancia creciente (y, a igual distancia, por mas energia), asi
+      que una etiqueta queda dominada si su vertice ya fijo otra con al menos la misma energia: esa otra
+      tiene menor o igual distancia. Basta con guardar la mayor energia fijada por vertice.
+    - Las etiquetas fijadas en un vertice tienen energia estrictamente creciente, por lo que son pocas
+      (a lo sumo una por nivel de bateria alcanzable) en vez de un estado por cada energia restante.
+    - La primera etiqueta fijada en el destino es la de menor distancia: la busqueda termina ahi.
+    """
+
+    @staticmethod
+    def buscar(i_origen, i_destino, csr, autonomia):
+        """
+        Retorna la lista de posiciones de aristas del camino mas corto factible, o None si no existe.
+        """
+        offsets, destinos, pesos, es_recarga = csr.offsets, csr.destinos, csr.pesos, csr.es_recarga
+        # Mayor energia fijada por vertice (-1: ninguna etiqueta fijada todavia)
+        mejor_energia = [-1] * csr.n_vertices
+        # Etiquetas fijadas: (indice de la etiqueta previa, posicion de la arista), para reconstruir el camino
+        fijadas = []
+        heap = [(0, -autonomia, i_origen, -1, -1)]
+        while heap:
+            distancia, energia_negativa, u, previa, k_llegada = heapq.heappop(heap)
+            energia = -energia_negativa
+            if energia <= mejor_energia[u]:
+                continue
+            mejor_energia[u] = energia
+            fijadas.append((previa, k_llegada))
+            if u == i_destino:
+                return BusquedaEtiquetasEnergia._posiciones(fijadas, len(fijadas) - 1)
+            actual = len(fijadas) - 1
+            if es_recarga[u]:
+                energia = autonomia
+            for k in range(offsets[u], offsets[u + 1]):
+                peso_arista = pesos[k]
+                if peso_arista > energia:
+                    continue
+                v = destinos[k]
+                energia_siguiente = autonomia if es_recarga[v] else energia - peso_arista
+                if energia_siguiente > mejor_energia[v]:
+                    heapq.heappush(heap, (distancia + peso_arista, -energia_siguiente, v, actual, k))
+        return None
+
+    @staticmethod
+    def _posiciones(fijadas, etiqueta):
+        posiciones = []
+        previa, k = fijadas[etiqueta]
+        while previa != -1:
+            posiciones.append(k)
+            previa, k = fijadas[previa]
+        posiciones.reverse()
+        return posiciones
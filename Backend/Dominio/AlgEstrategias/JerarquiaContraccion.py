@@ -0,0 +1,288 @@
+"""
+Jerarquia de contraccion (Contraction Hierarchy) con bateria sobre un snapshot GrafoCSR.
+"""
+from collections import OrderedDict
+import heapq
+import logging
+import time
+
+INF = float('inf')
+
+
+class JerarquiaContraccion:
+    """
+    Indice de consultas punto a punto construido una vez por snapshot del grafo.
+    - Se contraen primero todos los vertices que no son recarga; las recargas quedan al final, como
+      nucleo sin contraer. Asi todo atajo representa un tramo sin recargas intermedias: su consumo de
+      bateria es su peso y los atajos (y aristas) de mas de la autonomia se descartan.
+    - Un camino testigo que evita al vertice contraido y no es mas largo domina al camino por el vertice
+      tambien en bateria (pasar por una recarga solo deja mas energia), por lo que basta la busqueda de
+      testigos habitual, que puede atravesar recargas.
+    - Consulta: busqueda ascendente desde el origen y, sobre las aristas invertidas, desde el destino,
+      ambas acotadas por la autonomia. Se unen en un vertice comun sin recargas (distancia total dentro
+      de la autonomia) o a traves del nucleo: entre recargas cualquier camino de aristas del nucleo es
+      factible, asi que ahi basta un Dijkstra comun.
+    - La busqueda desde un origen y su Dijkstra sobre el nucleo se guardan por origen: las consultas
+      repetidas desde un mismo almacen solo hacen la busqueda ascendente corta desde el cliente.
+    - Cada atajo guarda sus dos aristas hijas para desempaquetar el camino hasta posiciones del CSR.
+    Vive en csr.derivados, por lo que se descarta cuando cambia la version del grafo.
+    """
+    # Vertices asentados como maximo en cada busqueda de testigos; si no aparece testigo se agrega el atajo
+    LIMITE_TESTIGOS = 20
+    # Origenes cuya busqueda (ascendente y sobre el nucleo) se conserva
+    CAPACIDAD_ORIGENES = 256
+    # Si las recargas quedan casi todas a una carga entre si, el nucleo se vuelve casi completo y los atajos
+    # crecen de forma cuadratica: por encima de este numero de atajos por arista el indice se abandona
+    # (completo=False) y las consultas usan la busqueda por etiquetas (BusquedaEtiquetasEnergia)
+    MAX_ATAJOS_POR_ARISTA = 4
+
+    def __init__(self, csr, autonomia=50):
+        self.logger = logging.getLogger("JerarquiaContraccion")
+        inicio = time.time()
+        self.autonomia = autonomia
+        n = csr.n_vertices
+        self.nucleo = bytearray(csr.es_recarga)
+        # Aristas del grafo aumentado: originales (posicion k del CSR) y atajos (aristas hijas)
+        self._posicion = []
+        self._hijas = []
+        # Grafo restante durante la contraccion: u -> {w: (peso, arista)}
+        salida = [dict() for _ in range(n)]
+        entrada = [dict() for _ in range(n)]
+        offsets, destinos, pesos = csr.offsets, csr.destinos, csr.pesos
+        for u in range(n):
+            for k in range(offsets[u], offsets[u + 1]):
+                w, peso = destinos[k], pesos[k]
+                if w == u or peso > autonomia:
+                    continue
+                actual = salida[u].get(w)
+                if actual is None or peso < actual[0]:
+                    arista = self._nueva_arista(k, None)
+                    salida[u][w] = entrada[w][u] = (peso, arista)
+        # Aristas hacia vertices contraidos despues (o al nucleo), por vertice contraido
+        self.arriba_salida = [()] * n
+        self.arriba_entrada = [()] * n
+        self.n_atajos = 0
+        self.completo = True
+        max_atajos = self.MAX_ATAJOS_POR_ARISTA * max(csr.n_aristas, n)
+        contraidos = [0] * n  # vecinos ya contraidos, para repartir la contraccion
+        heap = [(self._prioridad(v, salida, entrada, contraidos), v) for v in range(n) if not self.nucleo[v]]
+        heapq.heapify(heap)
+        while heap:
+            _, v = heapq.heappop(heap)
+            prioridad = self._prioridad(v, salida, entrada, contraidos)
+            if heap and prioridad > heap[0][0]:
+                heapq.heappush(heap, (prioridad, v))
+                continue
+            self._contraer(v, salida, entrada)
+            self.arriba_salida[v] = tuple((w, peso, arista) for w, (peso, arista) in salida[v].items())
+            self.arriba_entrada[v] = tuple((u, peso, arista) for u, (peso, arista) in entrada[v].items())
+            for w in salida[v]:
+                del entrada[w][v]
+                contraidos[w] += 1
+            for u in entrada[v]:
+                del salida[u][v]
+                contraidos[u] += 1
+            salida[v] = entrada[v] = None
+            if self.n_atajos > max_atajos:
+                self.completo = False
+                break
+        # Lo que queda son las recargas y las aristas entre ellas
+        self.nucleo_salida = [tuple((w, peso, arista) for w, (peso, arista) in salida[r].items()) if self.nucleo[r] else () for r in range(n)]
+        self._origenes = OrderedDict()
+        self.tiempo_preproceso = time.time() - inicio
+        if not self.completo:
+            self.arriba_salida = self.arriba_entrada = self.nucleo_salida = None
+            self._posicion = self._hijas = None
+            self.logger.warning(f"[JerarquiaContraccion] Indice abandonado: más de {max_atajos} atajos (nucleo={sum(self.nucleo)}), tiempo={self.tiempo_preproceso:.3f}s")
+            return
+        self.logger.info(f"[JerarquiaContraccion] Indice construido: vertices={n}, nucleo={sum(self.nucleo)}, atajos={self.n_atajos}, tiempo={self.tiempo_preproceso:.3f}s")
+
+    @classmethod
+    def obtener(cls, csr, autonomia=50):
+        """
+        Retorna el indice asociado al snapshot, construyendolo si aun no existe (ver completo).
+        """
+        clave = ('jerarquia_contraccion', autonomia)
+        jerarquia = csr.derivados.get(clave)
+        if jerarquia is None:
+            jerarquia = cls(csr, autonomia)
+            csr.derivados[clave] = jerarquia
+        return jerarquia
+
+    @classmethod
+    def existente(cls, csr, autonomia=50):
+        """
+        Retorna el indice ya construido (o abandonado) para el snapshot, o None si no se intento.
+        """
+        return csr.derivados.get(('jerarquia_contraccion', autonomia))
+
+    def buscar(self, i_origen, i_destino):
+        """
+        Retorna la lista de posiciones de aristas del camino mas corto factible, o None si no existe.
+        """
+        if i_origen == i_destino:
+            return []
+        distancia_origen, previa_origen, distancia_nucleo, previa_nucleo = self._desde_origen(i_origen)
+        distancia_destino, previa_destino = self._ascender(i_destino, self.arriba_entrada)
+        mejor, encuentro = INF, None
+        for v, distancia in distancia_destino.items():
+            if self.nucleo[v]:
+                total = distancia_nucleo.get(v, INF) + distancia
+            else:
+                total = distancia_origen.get(v, INF) + distancia
+                if total > self.autonomia:
+                    continue
+            if total < mejor:
+                mejor, encuentro = total, v
+        if encuentro is None:
+            return None
+        aristas = []
+        if self.nucleo[encuentro]:
+            v = encuentro
+            while v in previa_nucleo:
+                arista, v = previa_nucleo[v]
+                aristas.append(arista)
+        else:
+            v = encuentro
+        while v in previa_origen:
+            arista, v = previa_origen[v]
+            aristas.append(arista)
+        aristas.reverse()
+        v = encuentro
+        while v in previa_destino:
+            arista, v = previa_destino[v]
+            aristas.append(arista)
+        return self._desempaquetar(aristas)
+
+    def _desde_origen(self, i_origen):
+        """
+        Busqueda ascendente desde el origen y Dijkstra sobre el nucleo desde las recargas alcanzadas,
+        guardadas por origen.
+        """
+        resultado = self._origenes.get(i_origen)
+        if resultado is not None:
+            self._origenes.move_to_end(i_origen)
+            return resultado
+        distancia_origen, previa_origen = self._ascender(i_origen, self.arriba_salida)
+        distancia_nucleo, previa_nucleo = {}, {}
+        tentativas = {r: distancia for r, distancia in distancia_origen.items() if self.nucleo[r]}
+        heap = [(distancia, r) for r, distancia in tentativas.items()]
+        heapq.heapify(heap)
+        while heap:
+            distancia, r = heapq.heappop(heap)
+            if r in distancia_nucleo:
+                continue
+            distancia_nucleo[r] = distancia
+            for s, peso, arista in self.nucleo_salida[r]:
+                if s not in distancia_nucleo and distancia + peso < tentativas.get(s, INF):
+                    tentativas[s] = distancia + peso
+                    previa_nucleo[s] = (arista, r)
+                    heapq.heappush(heap, (distancia + peso, s))
+        resultado = (distancia_origen, previa_origen, distancia_nucleo, previa_nucleo)
+        self._origenes[i_origen] = resultado
+        if len(self._origenes) > self.CAPACIDAD_ORIGENES:
+            self._origenes.popitem(last=False)
+        return resultado
+
+    def _ascender(self, fuente, arriba):
+        """
+        Dijkstra por las aristas hacia vertices de mayor rango, acotado por la autonomia (tramo sin recargas).
+        No sigue mas alla de las recargas: desde ahi continua el nucleo.
+        """
+        distancias = {}
+        previas = {}
+        heap = [(0, fuente, -1, -1)]
+        autonomia = self.autonomia
+        while heap:
+            distancia, v, arista, u = heapq.heappop(heap)
+            if v in distancias:
+                continue
+            distancias[v] = distancia
+            if arista != -1:
+                previas[v] = (arista, u)
+            if self.nucleo[v]:
+                continue
+            for w, peso, arista_w in arriba[v]:
+                if w not in distancias and distancia + peso <= autonomia:
+                    heapq.heappush(heap, (distancia + peso, w, arista_w, v))
+        return distancias, previas
+
+    def _desempaquetar(self, aristas):
+        posiciones = []
+        pila = list(reversed(aristas))
+        while pila:
+            arista = pila.pop()
+            k = self._posicion[arista]
+            if k is not None:
+                posiciones.append(k)
+            else:
+                primera, segunda = self._hijas[arista]
+                pila.append(segunda)
+                pila.append(primera)
+        return posiciones
+
+    def _nueva_arista(self, k, hijas):
+        self._posicion.append(k)
+        self._hijas.append(hijas)
+        return len(self._posicion) - 1
+
+    def _prioridad(self, v, salida, entrada, contraidos):
+        """
+        Diferencia de aristas estimada (pares u -> v -> w dentro de la autonomia, candidatos a atajo,
+        menos las aristas que se eliminan) mas vecinos ya contraidos.
+        """
+        autonomia = self.autonomia
+        pesos_salida = [peso for peso, _ in salida[v].values()]
+        candidatos = 0
+        for peso_uv, _ in entrada[v].values():
+            for peso_vw in pesos_salida:
+                if peso_uv + peso_vw <= autonomia:
+                    candidatos += 1
+        return candidatos - len(entrada[v]) - len(salida[v]) + contraidos[v]
+
+    def _contraer(self, v, salida, entrada):
+        """
+        Agrega los atajos u -> w por v que no tienen un camino testigo igual o mas corto sin pasar por v.
+        """
+        autonomia = self.autonomia
+        for u, (peso_uv, arista_uv) in entrada[v].items():
+            objetivos = {}
+            for w, (peso_vw, arista_vw) in salida[v].items():
+                if w != u and peso_uv + peso_vw <= autonomia:
+                    objetivos[w] = (peso_uv + peso_vw, arista_vw)
+            if not objetivos:
+                continue
+            testigos = self._testigos(u, v, objetivos, salida)
+            for w, (peso, arista_vw) in objetivos.items():
+                existente = salida[u].get(w)
+                if testigos.get(w, INF) <= peso or (existente is not None and existente[0] <= peso):
+                    continue
+                atajo = self._nueva_arista(None, (arista_uv, arista_vw))
+                salida[u][w] = entrada[w][u] = (peso, atajo)
+                self.n_atajos += 1
+
+    def _testigos(self, u, v, objetivos, salida):
+        """
+        Dijkstra limitado desde u en el grafo restante sin v, hasta la mayor distancia buscada.
+        """
+        limite = max(peso for peso, _ in objetivos.values())
+        nucleo = self.nucleo
+        distancias = {}
+        heap = [(0, u)]
+        pendientes = len(objetivos)
+        while heap and len(distancias) < self.LIMITE_TESTIGOS:
+            distancia, x = heapq.heappop(heap)
+            if x in distancias:
+                continue
+            distancias[x] = distancia
+            if x in objetivos:
+                pendientes -= 1
+                if pendientes == 0:
+                    break
+            if nucleo[x]:
+                # Las recargas acumulan muchas aristas: no se expanden (sin testigo solo sobra un atajo)
+                continue
+            for y, (peso, _) in salida[x].items():
+                if y != v and y not in distancias and distancia + peso <= limite:
+                    heapq.heappush(heap, (distancia + peso, y))
+        return distancias
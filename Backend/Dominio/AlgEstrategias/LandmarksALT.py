@@ -0,0 +1,148 @@
+"""
+Preproceso de landmarks para ALT (A*, Landmarks, desigualdad Triangular) sobre un snapshot GrafoCSR.
+"""
+from Backend.Infraestructura.TDA.TDA_GrafoCSR import indice_entrantes
+from array import array
+import heapq
+import logging
+import time
+
+INF = float('inf')
+
+
+class LandmarksALT:
+    """
+    Distancias desde y hacia k vertices landmark, sin considerar la bateria.
+    - Landmarks: primero almacenes y luego vertices lejanos, elegidos por el vertice mas lejano a los ya
+      elegidos (mayor distancia minima); un landmark lejano acota bien las consultas que pasan "por detras".
+    - Por la desigualdad triangular, d(v, t) >= d(L, t) - d(L, v) y d(v, t) >= d(v, L) - d(t, L): el maximo
+      sobre los landmarks es una cota inferior consistente de la distancia al destino. Como la distancia con
+      bateria nunca es menor que la distancia sin ella, tambien acota las rutas con autonomia.
+    - Si una distancia al landmark es finita y la otra no, el destino es inalcanzable desde v (cota inf).
+    Vive en csr.derivados, por lo que queda ligado a la version del grafo y se descarta cuando cambia.
+    """
+    N_LANDMARKS = 8
+
+    def __init__(self, csr, k=None):
+        self.logger = logging.getLogger("LandmarksALT")
+        inicio = time.time()
+        self._csr = csr
+        k = min(k or self.N_LANDMARKS, csr.n_vertices)
+        self._entrantes = indice_entrantes(csr)
+        self.landmarks = []
+        self.desde = []  # desde[l][v] = d(landmark l, v)
+        self.hacia = []  # hacia[l][v] = d(v, landmark l)
+        almacenes = self._almacenes(csr)
+        # Distancia minima (ida y vuelta) de cada vertice a los landmarks elegidos, para elegir el siguiente
+        cercania = [INF] * csr.n_vertices
+        while len(self.landmarks) < k:
+            candidatos = almacenes if len(self.landmarks) < k // 2 and almacenes else range(csr.n_vertices)
+            siguiente = self._mas_lejano(candidatos, cercania)
+            if siguiente is None:
+                break
+            self._agregar(siguiente)
+            desde, hacia = self.desde[-1], self.hacia[-1]
+            for v in range(csr.n_vertices):
+                distancia = min(desde[v], hacia[v])
+                if distancia < cercania[v]:
+                    cercania[v] = distancia
+        self.tiempo_preproceso = time.time() - inicio
+        self.logger.info(f"[LandmarksALT] {len(self.landmarks)} landmarks preprocesados: tiempo={self.tiempo_preproceso:.3f}s")
+
+    @classmethod
+    def obtener(cls, csr, k=None):
+        """
+        Retorna los landmarks asociados al snapshot, preprocesandolos si aun no existen.
+        """
+        clave = ('landmarks_alt', k or cls.N_LANDMARKS)
+        landmarks = csr.derivados.get(clave)
+        if landmarks is None:
+            landmarks = cls(csr, k)
+            csr.derivados[clave] = landmarks
+        return landmarks
+
+    @classmethod
+    def existente(cls, csr, k=None):
+        """
+        Retorna los landmarks ya preprocesados para el snapshot, o None.
+        """
+        return csr.derivados.get(('landmarks_alt', k or cls.N_LANDMARKS))
+
+    def cotas(self, i_destino):
+        """
+        Retorna una funcion v -> cota inferior de la distancia de v a i_destino (inf si es inalcanzable).
+        """
+        terminos = [(desde, hacia, desde[i_destino], hacia[i_destino]) for desde, hacia in zip(self.desde, self.hacia)]
+
+        def cota(v):
+            mejor = 0
+            for desde, hacia, desde_destino, hacia_destino in terminos:
+                desde_v, hacia_v = desde[v], hacia[v]
+                if desde_v != INF:
+                    if desde_destino == INF:
+                        return INF
+                    if desde_destino - desde_v > mejor:
+                        mejor = desde_destino - desde_v
+                if hacia_destino != INF:
+                    if hacia_v == INF:
+                        return INF
+                    if hacia_v - hacia_destino > mejor:
+                        mejor = hacia_v - hacia_destino
+            return mejor
+        return cota
+
+    def _agregar(self, landmark):
+        csr = self._csr
+        self.landmarks.append(landmark)
+        self.desde.append(self._distancias(landmark, csr.offsets, csr.destinos, None))
+        offsets_entrantes, entrantes = self._entrantes
+        self.hacia.append(self._distancias(landmark, offsets_entrantes, csr.origenes, entrantes))
+
+    def _distancias(self, fuente, offsets, extremos, posiciones):
+        """
+        Dijkstra completo desde la fuente. Con posiciones recorre el indice de entrantes (grafo invertido).
+        """
+        pesos = self._csr.pesos
+        distancias = array('d', [INF]) * self._csr.n_vertices
+        distancias[fuente] = 0
+        heap = [(0, fuente)]
+        while heap:
+            distancia, u = heapq.heappop(heap)
+            if distancia > distancias[u]:
+                continue
+            for j in range(offsets[u], offsets[u + 1]):
+                k = posiciones[j] if posiciones is not None else j
+                v = extremos[k]
+                nueva = distancia + pesos[k]
+                if nueva < distancias[v]:
+                    distancias[v] = nueva
+                    heapq.heappush(heap, (nueva, v))
+        return distancias
+
+    def _mas_lejano(self, candidatos, cercania):
+        """
+        Candidato no elegido con mayor distancia finita a los landmarks; el primero si aun no hay ninguno.
+        """
+        elegidos = set(self.landmarks)
+        if not elegidos:
+            return next(iter(candidatos), None)
+        mejor, mejor_distancia = None, -1
+        for v in candidatos:
+            if v in elegidos:
+                continue
+            distancia = cercania[v]
+            if distancia != INF and distancia > mejor_distancia:
+                mejor, mejor_distancia = v, distancia
+        if mejor is None and len(self.landmarks) < self._csr.n_vertices:
+            # Componentes sin landmark: cualquier vertice no cubierto mejora las cotas
+            mejor = next((v for v in candidatos if v not in elegidos and cercania[v] == INF), None)
+        return mejor
+
+    @staticmethod
+    def _almacenes(csr):
+        """
+        Indices de los almacenes del snapshot (vacio en un GrafoCSRCompartido, que no conoce los vertices).
+        """
+        if not hasattr(csr, 'vertice'):
+            return []
+        return [i for i in range(csr.n_vertices) if csr.vertice(i).es_tipo('almacenamiento')]
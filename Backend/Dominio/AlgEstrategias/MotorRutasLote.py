@@ -0,0 +1,143 @@
+"""
+Motor de calculo de rutas por lotes en procesos paralelos sobre un grafo en memoria compartida.
+"""
+from Backend.Dominio.AlgEstrategias import RutaEstrategiaBFS, RutaEstrategiaDFS, RutaEstrategiaDijkstra, RutaEstrategiaTopologicalSort, RutaEstrategiaBidireccional
+from Backend.Infraestructura.TDA.TDA_GrafoCSR import GrafoCSRCompartido
+import concurrent.futures
+import logging
+import multiprocessing
+import os
+import time
+
+# Estrategias cuyo nucleo _buscar_csr solo necesita los arreglos del snapshot
+ESTRATEGIAS_LOTE = {
+    'bfs': RutaEstrategiaBFS.RutaEstrategiaBFS,
+    'dfs': RutaEstrategiaDFS.RutaEstrategiaDFS,
+    'dijkstra': RutaEstrategiaDijkstra.RutaEstrategiaDijkstra,
+    'topologicalsort': RutaEstrategiaTopologicalSort.RutaEstrategiaTopologicalSort,
+    'bidireccional': RutaEstrategiaBidireccional.RutaEstrategiaBidireccional,
+}
+
+# Grafo abierto por cada proceso trabajador en su inicializacion
+_grafo_trabajador = None
+
+
+def _inicializar_trabajador(descriptor):
+    """
+    Abre, una sola vez por proceso, la vista del grafo en memoria compartida.
+    """
+    global _grafo_trabajador
+    _grafo_trabajador = GrafoCSRCompartido(descriptor)
+
+
+def _resolver_lote(trabajos, csr=None):
+    """
+    Resuelve una lista de trabajos (clave, algoritmo, i_origen, i_destino, autonomia).
+    Retorna tuplas planas (clave, posiciones_o_None, tiempo) para que viajen baratas entre procesos.
+    """
+    csr = csr if csr is not None else _grafo_trabajador
+    estrategias = {}
+    resultados = []
+    for clave, algoritmo, i_origen, i_destino, autonomia in trabajos:
+        estrategia = estrategias.get(algoritmo)
+        if estrategia is None:
+            estrategia = estrategias[algoritmo] = ESTRATEGIAS_LOTE[algoritmo]()
+        inicio = time.perf_counter()
+        try:
+            posiciones = estrategia._buscar_csr(i_origen, i_destino, csr, autonomia)
+        except Exception:
+            posiciones = None
+        resultados.append((clave, posiciones, time.perf_counter() - inicio))
+    return resultados
+
+
+class MotorRutasLote:
+    """
+    Reparte trabajos de ruta entre procesos trabajadores.
+    - El snapshot CSR se exporta una vez a multiprocessing.shared_memory; los trabajadores lo leen sin copiarlo.
+    - Los trabajadores no tocan repositorios ni objetos de dominio: devuelven posiciones de aristas.
+    - Con un solo trabajador, o con pocos trabajos, se resuelve en el proceso actual.
+    - Los procesos nacen del servidor forkserver y no de un fork del proceso actual: la API corre el motor
+      desde hilos de trabajos o de peticiones, y un fork con cerrojos tomados por otros hilos (logging,
+      cerrojo de la simulacion, conexiones SQLite) puede bloquear a los hijos.
+    - Usado como contexto (with MotorRutasLote() as motor) conserva el pool y el bloque compartido entre
+      llamadas a resolver sobre el mismo snapshot, por ejemplo en los lotes de un trabajo en segundo plano;
+      fuera de un contexto se liberan al terminar cada llamada.
+    """
+    # Metodo de arranque de los procesos trabajadores (ver docstring de la clase)
+    METODO_INICIO = 'forkserver'
+
+    def __init__(self, max_workers=None, trabajos_por_lote=16, minimo_paralelo=64):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.trabajos_por_lote = trabajos_por_lote
+        self.minimo_paralelo = minimo_paralelo
+        self.logger = logging.getLogger("MotorRutasLote")
+        self._persistente = False
+        self._csr = None
+        self._bloque = None
+        self._executor = None
+
+    def __enter__(self):
+        self._persistente = True
+        return self
+
+    def __exit__(self, *exc):
+        self._persistente = False
+        self.cerrar()
+        return False
+
+    def cerrar(self):
+        """
+        Detiene los procesos trabajadores y libera el bloque de memoria compartida.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self._bloque is not None:
+            self._bloque.close()
+            self._bloque.unlink()
+            self._bloque = None
+        self._csr = None
+
+    def _pool(self, csr):
+        """
+        Retorna el pool de trabajadores que leen el snapshot csr, creandolo (y exportando el snapshot)
+        si no existe o si corresponde a otro snapshot.
+        """
+        if self._executor is not None and self._csr is csr:
+            return self._executor
+        self.cerrar()
+        self._bloque, descriptor = csr.exportar_memoria_compartida()
+        self._csr = csr
+        self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context(self.METODO_INICIO),
+                                                                initializer=_inicializar_trabajador, initargs=(descriptor,))
+        return self._executor
+
+    def resolver(self, csr, trabajos):
+        """
+        Ejecuta los trabajos sobre el snapshot csr.
+        Retorna un dict clave -> (posiciones_o_None, tiempo).
+        """
+        if not trabajos:
+            return {}
+        inicio = time.time()
+        if self.max_workers <= 1 or len(trabajos) < self.minimo_paralelo:
+            resultados = _resolver_lote(trabajos, csr)
+            self.logger.info(f"[MotorRutasLote] {len(trabajos)} trabajos resueltos en proceso: tiempo={time.time() - inicio:.3f}s")
+            return {clave: (posiciones, tiempo) for clave, posiciones, tiempo in resultados}
+        # Lotes intercalados para repartir trabajos costosos (BFS) entre todos los procesos
+        n_lotes = max(self.max_workers, len(trabajos) // self.trabajos_por_lote)
+        lotes = [trabajos[i::n_lotes] for i in range(n_lotes)]
+        resueltos = {}
+        try:
+            for resultados in self._pool(csr).map(_resolver_lote, lotes):
+                for clave, posiciones, tiempo in resultados:
+                    resueltos[clave] = (posiciones, tiempo)
+        except BaseException:
+            self.cerrar()
+            raise
+        finally:
+            if not self._persistente:
+                self.cerrar()
+        self.logger.info(f"[MotorRutasLote] {len(trabajos)} trabajos resueltos con {self.max_workers} procesos: tiempo={time.time() - inicio:.3f}s")
+        return resueltos
@@ -0,0 +1,90 @@
+"""
+Estrategia de ruta ALT: A* con cotas de landmarks y desigualdad triangular, respetando la bateria.
+"""
+from Backend.Dominio.Interfaces.IntEstr.IRutaEstrategia import IRutaEstrategia
+from Backend.Dominio.AlgEstrategias.LandmarksALT import LandmarksALT
+from Backend.Dominio.AlgEstrategias.BusquedaEtiquetasEnergia import BusquedaEtiquetasEnergia
+import heapq
+import logging
+
+
+class RutaEstrategiaALT(IRutaEstrategia):
+    """
+    Busqueda por etiquetas (distancia, energia restante) como BusquedaEtiquetasEnergia, pero ordenada por
+    distancia + cota del landmark al destino (ver LandmarksALT).
+    - La cota es consistente, asi que las etiquetas de un mismo vertice siguen saliendo por distancia
+      creciente y la regla de dominancia por energia y el corte en el destino siguen siendo validos.
+    - Los vertices con cota infinita no pueden alcanzar el destino y no se exploran.
+    Los landmarks se preprocesan una vez por snapshot del grafo (la simulacion lo hace al construirlo).
+    """
+
+    def calcular_ruta(self, origen, destino, grafo, autonomia=50, estaciones_recarga=None, usar_csr=False):
+        # La busqueda solo trabaja sobre indices enteros (usar_csr se acepta por compatibilidad)
+        return self._calcular_ruta_csr(origen, destino, grafo.obtener_csr(), autonomia)
+
+    def _calcular_ruta_csr(self, origen, destino, csr, autonomia):
+        """
+        A* sobre el snapshot GrafoCSR; solo al final se mapean las posiciones a objetos Arista.
+        """
+        logger = logging.getLogger("RutaEstrategiaALT")
+        if hasattr(self, 'notificar_observadores'):
+            self.notificar_observadores('inicio_calculo_ruta', {'algoritmo': 'alt', 'origen': origen, 'destino': destino})
+        i_origen = csr.indice(origen)
+        i_destino = csr.indice(destino)
+        assert i_origen is not None, f"El vértice de origen no es único o no existe en el grafo: {origen}"
+        assert i_destino is not None, f"El vértice de destino no es único o no existe en el grafo: {destino}"
+        posiciones = self._buscar_csr(i_origen, i_destino, csr, autonomia)
+        if posiciones is None:
+            logger.warning(f"[ALT] No se encontró ruta de {origen} a {destino}")
+            raise Exception(f"No existe ruta de {origen} a {destino} respetando autonomía y recargas.")
+        aristas_camino = csr.aristas_de(posiciones)
+        peso_total = sum(a.peso for a in aristas_camino)
+        logger.info(f"[ALT] Ruta final (CSR): {len(aristas_camino)} aristas, peso_total: {peso_total}")
+        if hasattr(self, 'notificar_observadores'):
+            self.notificar_observadores('ruta_calculada', {'algoritmo': 'alt', 'camino': aristas_camino, 'peso_total': peso_total})
+        return aristas_camino, peso_total
+
+    def _buscar_csr(self, i_origen, i_destino, csr, autonomia):
+        """
+        Nucleo A* sobre indices enteros.
+        Retorna la lista de posiciones de aristas del camino mas corto factible, o None si no existe.
+        """
+        cota = LandmarksALT.obtener(csr).cotas(i_destino)
+        offsets, destinos, pesos, es_recarga = csr.offsets, csr.destinos, csr.pesos, csr.es_recarga
+        inf = float('inf')
+        # Cota por vertice, calculada la primera vez que se alcanza
+        cotas = {}
+        cota_origen = cotas[i_origen] = cota(i_origen)
+        if cota_origen == inf:
+            return None
+        mejor_energia = [-1] * csr.n_vertices
+        fijadas = []
+        heap = [(cota_origen, -autonomia, 0, i_origen, -1, -1)]
+        while heap:
+            _, energia_negativa, distancia, u, previa, k_llegada = heapq.heappop(heap)
+            energia = -energia_negativa
+            if energia <= mejor_energia[u]:
+                continue
+            mejor_energia[u] = energia
+            fijadas.append((previa, k_llegada))
+            if u == i_destino:
+                return BusquedaEtiquetasEnergia._posiciones(fijadas, len(fijadas) - 1)
+            actual = len(fijadas) - 1
+            if es_recarga[u]:
+                energia = autonomia
+            for k in range(offsets[u], offsets[u + 1]):
+                peso_arista = pesos[k]
+                if peso_arista > energia:
+                    continue
+                v = destinos[k]
+                energia_siguiente = autonomia if es_recarga[v] else energia - peso_arista
+                if energia_siguiente <= mejor_energia[v]:
+                    continue
+                cota_v = cotas.get(v)
+                if cota_v is None:
+                    cota_v = cotas[v] = cota(v)
+                if cota_v == inf:
+                    continue
+                distancia_siguiente = distancia + peso_arista
+                heapq.heappush(heap, (distancia_siguiente + cota_v, -energia_siguiente, distancia_siguiente, v, actual, k))
+        return None
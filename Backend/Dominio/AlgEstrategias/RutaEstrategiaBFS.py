@@ -6,7 +6,11 @@ from collections import deque
 import logging
 
 class RutaEstrategiaBFS(IRutaEstrategia):
-    def calcular_ruta(self, origen, destino, grafo, autonomia=50, estaciones_recarga=None):
+    def calcular_ruta(self, origen, destino, grafo, autonomia=50, estaciones_recarga=None, usar_csr=False):
+        # El recorrido sobre objetos solo sigue origen -> destino: en grafos no dirigidos se usa el
+        # snapshot CSR, que recorre cada arista en ambos sentidos como ValidadorSegmentacion
+        if usar_csr or not grafo.es_dirigido():
+            return self._calcular_ruta_csr(origen, destino, grafo.obtener_csr(), autonomia)
         logger = logging.getLogger("RutaEstrategiaBFS")
         logger.info(f"[BFS] Preparando para calcular ruta: origen={origen}, destino={destino}, autonomia={autonomia}")
         if hasattr(self, 'notificar_observadores'):
@@ -193,6 +197,84 @@ class RutaEstrategiaBFS(IRutaEstrategia):
             logger.exception(f"[BFS] Excepción durante el cálculo de ruta: {e}")
             raise
 
+    def _calcular_ruta_csr(self, origen, destino, csr, autonomia):
+        """
+        BFS sobre el snapshot GrafoCSR con las mismas reglas de poda que calcular_ruta.
+        """
+        logger = logging.getLogger("RutaEstrategiaBFS")
+        if hasattr(self, 'notificar_observadores'):
+            self.notificar_observadores('inicio_calculo_ruta', {'algoritmo': 'bfs', 'origen': origen, 'destino': destino})
+        i_origen = csr.indice(origen)
+        i_destino = csr.indice(destino)
+        assert i_origen is not None, "El vértice de origen no es único o no existe en el grafo."
+        assert i_destino is not None, "El vértice de destino no es único o no existe en el grafo."
+        posiciones = self._buscar_csr(i_origen, i_destino, csr, autonomia)
+        if posiciones is None:
+            logger.warning(f"[BFS] No se encontró ruta entre {origen} y {destino}")
+            if hasattr(self, 'notificar_observadores'):
+                self.notificar_observadores('error_calculo_ruta', {'algoritmo': 'bfs', 'origen': origen, 'destino': destino, 'error': 'No existe una ruta posible'})
+            raise ValueError("No existe una ruta posible entre los vertices seleccionados")
+        camino_final = csr.aristas_de(posiciones)
+        peso_total = sum(a.peso for a in camino_final)
+        if hasattr(self, 'notificar_observadores'):
+            self.notificar_observadores('ruta_calculada', {'algoritmo': 'bfs', 'camino': camino_final, 'peso_total': peso_total})
+        logger.info(f"Ruta BFS calculada (CSR): aristas={len(camino_final)}, peso_total={peso_total}")
+        return camino_final, peso_total
+
+    def _buscar_csr(self, i_origen, i_destino, csr, autonomia):
+        """
+        Nucleo de BFS sobre indices enteros. Los caminos se guardan como punteros a padre
+        (nodo_padre, posicion_arista) en vez de copiar la lista de aristas en cada estado.
+        Retorna la lista de posiciones de aristas del camino, o None si no existe.
+        """
+        offsets, destinos, pesos, es_recarga = csr.offsets, csr.destinos, csr.pesos, csr.es_recarga
+        padres = [(-1, -1)]  # nodo -> (nodo_padre, posicion_arista)
+        queue = deque()
+        queue.append((i_origen, autonomia, 0, 0))  # (indice, energia_restante, nodo, longitud)
+        mejor_energia_por_vertice = {i_origen: autonomia}
+        energy_threshold = 15
+        max_iteraciones = 2000
+        max_longitud_camino = csr.n_vertices * 2
+
+        nodo_final = None
+        iteracion = 0
+        while queue and iteracion < max_iteraciones:
+            iteracion += 1
+            u, energia_actual, nodo, longitud = queue.popleft()
+            if longitud > max_longitud_camino:
+                continue
+            if u == i_destino:
+                nodo_final = nodo
+                break
+            for k in range(offsets[u], offsets[u + 1]):
+                peso = pesos[k]
+                if peso > autonomia:
+                    continue
+                energia_siguiente = energia_actual - peso
+                if energia_siguiente < 0:
+                    continue
+                v = destinos[k]
+                recarga = es_recarga[v]
+                if recarga:
+                    energia_siguiente = autonomia
+                mejor = mejor_energia_por_vertice.get(v)
+                if mejor is not None:
+                    if not (recarga or mejor - energia_siguiente <= energy_threshold or longitud <= 3):
+                        continue
+                    if energia_siguiente > mejor:
+                        mejor_energia_por_vertice[v] = energia_siguiente
+                else:
+                    mejor_energia_por_vertice[v] = energia_siguiente
+                padres.append((nodo, k))
+                queue.append((v, energia_siguiente, len(padres) - 1, longitud + 1))
+        if nodo_final is None:
+            return None
+        posiciones = []
+        while nodo_final > 0:
+            nodo_final, k = padres[nodo_final]
+            posiciones.append(k)
+        posiciones.reverse()
+        return posiciones
     def _insertar_recargas_si_necesario(self, camino, grafo, autonomia, estaciones_recarga):
         if not estaciones_recarga:
             return camino, False
@@ -0,0 +1,149 @@
+"""
+Estrategia de ruta con busqueda bidireccional con bateria: una busqueda hacia adelante desde el origen
+y otra hacia atras desde el destino que se encuentran en el medio.
+"""
+from Backend.Dominio.Interfaces.IntEstr.IRutaEstrategia import IRutaEstrategia
+from Backend.Infraestructura.TDA.TDA_GrafoCSR import indice_entrantes
+import heapq
+import logging
+
+
+class RutaEstrategiaBidireccional(IRutaEstrategia):
+    """
+    Label-setting bidireccional sobre el snapshot GrafoCSR.
+    - Adelante: etiquetas (distancia desde el origen, energia restante), como BusquedaEtiquetasEnergia.
+    - Atras: etiquetas (distancia al destino, energia necesaria al llegar al vertice) sobre las aristas
+      entrantes; al llegar a una recarga la energia necesaria vuelve a 0, y se descartan las etiquetas
+      que necesitan mas que la autonomia.
+    - Cada lado fija etiquetas no dominadas (adelante: mas energia; atras: menos energia necesaria) y,
+      al relajar una arista, la une con las etiquetas ya fijadas del otro lado en el vertice vecino.
+    - Se expande el lado con menor distancia en su heap y se termina cuando la suma de ambos minimos
+      alcanza el mejor camino unido: cada lado explora solo hasta cerca de la mitad del camino.
+    """
+
+    def calcular_ruta(self, origen, destino, grafo, autonomia=50, estaciones_recarga=None, usar_csr=False):
+        # La busqueda solo trabaja sobre indices enteros (usar_csr se acepta por compatibilidad)
+        return self._calcular_ruta_csr(origen, destino, grafo.obtener_csr(), autonomia)
+
+    def _calcular_ruta_csr(self, origen, destino, csr, autonomia):
+        """
+        Busqueda bidireccional sobre el snapshot GrafoCSR; solo al final se mapean las posiciones a objetos Arista.
+        """
+        logger = logging.getLogger("RutaEstrategiaBidireccional")
+        if hasattr(self, 'notificar_observadores'):
+            self.notificar_observadores('inicio_calculo_ruta', {'algoritmo': 'bidireccional', 'origen': origen, 'destino': destino})
+        i_origen = csr.indice(origen)
+        i_destino = csr.indice(destino)
+        assert i_origen is not None, f"El vértice de origen no es único o no existe en el grafo: {origen}"
+        assert i_destino is not None, f"El vértice de destino no es único o no existe en el grafo: {destino}"
+        posiciones = self._buscar_csr(i_origen, i_destino, csr, autonomia)
+        if posiciones is None:
+            logger.warning(f"[Bidireccional] No se encontró ruta de {origen} a {destino}")
+            raise Exception(f"No existe ruta de {origen} a {destino} respetando autonomía y recargas.")
+        aristas_camino = csr.aristas_de(posiciones)
+        peso_total = sum(a.peso for a in aristas_camino)
+        logger.info(f"[Bidireccional] Ruta final (CSR): {len(aristas_camino)} aristas, peso_total: {peso_total}")
+        if hasattr(self, 'notificar_observadores'):
+            self.notificar_observadores('ruta_calculada', {'algoritmo': 'bidireccional', 'camino': aristas_camino, 'peso_total': peso_total})
+        return aristas_camino, peso_total
+
+    def _buscar_csr(self, i_origen, i_destino, csr, autonomia):
+        """
+        Nucleo bidireccional sobre indices enteros.
+        Retorna la lista de posiciones de aristas del camino mas corto factible, o None si no existe.
+        Solo usa los arreglos del snapshot, por lo que tambien corre sobre un GrafoCSRCompartido.
+        """
+        if i_origen == i_destino:
+            return []
+        offsets, destinos, origenes, pesos, es_recarga = csr.offsets, csr.destinos, csr.origenes, csr.pesos, csr.es_recarga
+        offsets_entrantes, entrantes = indice_entrantes(csr)
+        n = csr.n_vertices
+        # Etiquetas fijadas por vertice, en orden de fijacion: adelante (energia, distancia, etiqueta)
+        # con energia creciente; atras (necesaria, distancia, etiqueta) con necesaria decreciente
+        fijadas_adelante = [None] * n
+        fijadas_atras = [None] * n
+        # (indice de la etiqueta previa, posicion de la arista) para reconstruir cada mitad
+        etiquetas_adelante = []
+        etiquetas_atras = []
+        heap_adelante = [(0, -autonomia, i_origen, -1, -1)]
+        heap_atras = [(0, 0, i_destino, -1, -1)]
+        mejor = float('inf')
+        union = None
+        while heap_adelante and heap_atras:
+            if heap_adelante[0][0] + heap_atras[0][0] >= mejor:
+                break
+            if heap_adelante[0][0] <= heap_atras[0][0]:
+                distancia, energia_negativa, u, previa, k_llegada = heapq.heappop(heap_adelante)
+                energia = -energia_negativa
+                fijadas_u = fijadas_adelante[u]
+                if fijadas_u is not None and energia <= fijadas_u[-1][0]:
+                    continue
+                actual = len(etiquetas_adelante)
+                etiquetas_adelante.append((previa, k_llegada))
+                if fijadas_u is None:
+                    fijadas_u = fijadas_adelante[u] = []
+                fijadas_u.append((energia, distancia, actual))
+                if es_recarga[u]:
+                    energia = autonomia
+                for k in range(offsets[u], offsets[u + 1]):
+                    peso_arista = pesos[k]
+                    if peso_arista > energia:
+                        continue
+                    v = destinos[k]
+                    energia_siguiente = autonomia if es_recarga[v] else energia - peso_arista
+                    distancia_siguiente = distancia + peso_arista
+                    # Union con la etiqueta de atras de menor distancia que la energia de llegada cubre
+                    for necesaria, distancia_atras, etiqueta_atras in fijadas_atras[v] or ():
+                        if necesaria <= energia_siguiente:
+                            if distancia_siguiente + distancia_atras < mejor:
+                                mejor = distancia_siguiente + distancia_atras
+                                union = (actual, k, etiqueta_atras)
+                            break
+                    fijadas_v = fijadas_adelante[v]
+                    if fijadas_v is None or energia_siguiente > fijadas_v[-1][0]:
+                        heapq.heappush(heap_adelante, (distancia_siguiente, -energia_siguiente, v, actual, k))
+            else:
+                distancia, necesaria, v, previa, k_salida = heapq.heappop(heap_atras)
+                fijadas_v = fijadas_atras[v]
+                if fijadas_v is not None and necesaria >= fijadas_v[-1][0]:
+                    continue
+                actual = len(etiquetas_atras)
+                etiquetas_atras.append((previa, k_salida))
+                if fijadas_v is None:
+                    fijadas_v = fijadas_atras[v] = []
+                fijadas_v.append((necesaria, distancia, actual))
+                for j in range(offsets_entrantes[v], offsets_entrantes[v + 1]):
+                    k = entrantes[j]
+                    # Energia necesaria al salir de u por la arista k (una recarga en v no exige mas)
+                    necesaria_salida = pesos[k] + necesaria
+                    if necesaria_salida > autonomia:
+                        continue
+                    u = origenes[k]
+                    distancia_siguiente = distancia + pesos[k]
+                    # Union con la etiqueta de adelante de menor distancia cuya energia de salida alcanza
+                    for energia, distancia_adelante, etiqueta_adelante in fijadas_adelante[u] or ():
+                        if (autonomia if es_recarga[u] else energia) >= necesaria_salida:
+                            if distancia_adelante + distancia_siguiente < mejor:
+                                mejor = distancia_adelante + distancia_siguiente
+                                union = (etiqueta_adelante, k, actual)
+                            break
+                    necesaria_llegada = 0 if es_recarga[u] else necesaria_salida
+                    fijadas_u = fijadas_atras[u]
+                    if fijadas_u is None or necesaria_llegada < fijadas_u[-1][0]:
+                        heapq.heappush(heap_atras, (distancia_siguiente, necesaria_llegada, u, actual, k))
+        if union is None:
+            return None
+        etiqueta_adelante, k, etiqueta_atras = union
+        posiciones = []
+        previa, k_llegada = etiquetas_adelante[etiqueta_adelante]
+        while previa != -1:
+            posiciones.append(k_llegada)
+            previa, k_llegada = etiquetas_adelante[previa]
+        posiciones.reverse()
+        posiciones.append(k)
+        # Las etiquetas de atras apuntan hacia el destino: su cadena ya esta en el orden del camino
+        previa, k_salida = etiquetas_atras[etiqueta_atras]
+        while previa != -1:
+            posiciones.append(k_salida)
+            previa, k_salida = etiquetas_atras[previa]
+        return posiciones
@@ -0,0 +1,51 @@
+"""
+Estrategia de ruta sobre la jerarquia de contraccion con bateria (JerarquiaContraccion).
+"""
+from Backend.Dominio.Interfaces.IntEstr.IRutaEstrategia import IRutaEstrategia
+from Backend.Dominio.AlgEstrategias.JerarquiaContraccion import JerarquiaContraccion
+from Backend.Dominio.AlgEstrategias.BusquedaEtiquetasEnergia import BusquedaEtiquetasEnergia
+import logging
+
+
+class RutaEstrategiaCH(IRutaEstrategia):
+    """
+    Consulta la jerarquia de contraccion del snapshot: la primera consulta sobre una version del grafo
+    construye el indice y las siguientes solo hacen dos busquedas ascendentes cortas (y, la primera vez
+    por origen, un Dijkstra sobre el nucleo de recargas).
+    Si el indice se abandono por exceso de atajos, responde con la busqueda por etiquetas.
+    """
+
+    def calcular_ruta(self, origen, destino, grafo, autonomia=50, estaciones_recarga=None, usar_csr=False):
+        # La busqueda solo trabaja sobre indices enteros (usar_csr se acepta por compatibilidad)
+        return self._calcular_ruta_csr(origen, destino, grafo.obtener_csr(), autonomia)
+
+    def _calcular_ruta_csr(self, origen, destino, csr, autonomia):
+        """
+        Consulta sobre el snapshot GrafoCSR; solo al final se mapean las posiciones a objetos Arista.
+        """
+        logger = logging.getLogger("RutaEstrategiaCH")
+        if hasattr(self, 'notificar_observadores'):
+            self.notificar_observadores('inicio_calculo_ruta', {'algoritmo': 'ch', 'origen': origen, 'destino': destino})
+        i_origen = csr.indice(origen)
+        i_destino = csr.indice(destino)
+        assert i_origen is not None, f"El vértice de origen no es único o no existe en el grafo: {origen}"
+        assert i_destino is not None, f"El vértice de destino no es único o no existe en el grafo: {destino}"
+        posiciones = self._buscar_csr(i_origen, i_destino, csr, autonomia)
+        if posiciones is None:
+            logger.warning(f"[CH] No se encontró ruta de {origen} a {destino}")
+            raise Exception(f"No existe ruta de {origen} a {destino} respetando autonomía y recargas.")
+        aristas_camino = csr.aristas_de(posiciones)
+        peso_total = sum(a.peso for a in aristas_camino)
+        logger.info(f"[CH] Ruta final (CSR): {len(aristas_camino)} aristas, peso_total: {peso_total}")
+        if hasattr(self, 'notificar_observadores'):
+            self.notificar_observadores('ruta_calculada', {'algoritmo': 'ch', 'camino': aristas_camino, 'peso_total': peso_total})
+        return aristas_camino, peso_total
+
+    def _buscar_csr(self, i_origen, i_destino, csr, autonomia):
+        """
+        Retorna la lista de posiciones de aristas del camino mas corto factible, o None si no existe.
+        """
+        jerarquia = JerarquiaContraccion.obtener(csr, autonomia)
+        if not jerarquia.completo:
+            return BusquedaEtiquetasEnergia.buscar(i_origen, i_destino, csr, autonomia)
+        return jerarquia.buscar(i_origen, i_destino)
@@ -5,7 +5,11 @@ from Backend.Dominio.Interfaces.IntEstr.IRutaEstrategia import IRutaEstrategia
 import logging
 
 class RutaEstrategiaDFS(IRutaEstrategia):
-    def calcular_ruta(self, origen, destino, grafo, autonomia=50, estaciones_recarga=None):
+    def calcular_ruta(self, origen, destino, grafo, autonomia=50, estaciones_recarga=None, usar_csr=False):
+        # El recorrido sobre objetos solo sigue origen -> destino: en grafos no dirigidos se usa el
+        # snapshot CSR, que recorre cada arista en ambos sentidos como ValidadorSegmentacion
+        if usar_csr or not grafo.es_dirigido():
+            return self._calcular_ruta_csr(origen, destino, grafo.obtener_csr(), autonomia)
         logger = logging.getLogger("RutaEstrategiaDFS")
         if hasattr(self, 'notificar_observadores'):
             self.notificar_observadores('inicio_calculo_ruta', {'algoritmo': 'dfs', 'origen': origen, 'destino': destino})
@@ -73,6 +77,67 @@ class RutaEstrategiaDFS(IRutaEstrategia):
             if hasattr(self, 'notificar_observadores'):
                 self.notificar_observadores('error_calculo_ruta', {'algoritmo': 'dfs', 'origen': origen, 'destino': destino, 'error': str(e)})
             raise
+    def _calcular_ruta_csr(self, origen, destino, csr, autonomia):
+        """
+        DFS sobre el snapshot GrafoCSR; el camino se traduce a objetos Arista solo al final.
+        """
+        logger = logging.getLogger("RutaEstrategiaDFS")
+        if hasattr(self, 'notificar_observadores'):
+            self.notificar_observadores('inicio_calculo_ruta', {'algoritmo': 'dfs', 'origen': origen, 'destino': destino})
+        i_origen = csr.indice(origen)
+        i_destino = csr.indice(destino)
+        assert i_origen is not None, "El vértice de origen no es único o no existe en el grafo."
+        assert i_destino is not None, "El vértice de destino no es único o no existe en el grafo."
+        posiciones = self._buscar_csr(i_origen, i_destino, csr, autonomia)
+        if posiciones is None:
+            if hasattr(self, 'notificar_observadores'):
+                self.notificar_observadores('error_calculo_ruta', {'algoritmo': 'dfs', 'origen': origen, 'destino': destino, 'error': 'No existe una ruta posible'})
+            logger.error(f"DFS no encontró ruta entre {origen} y {destino}")
+            raise ValueError("No existe una ruta posible entre los vertices seleccionados")
+        aristas_camino = csr.aristas_de(posiciones)
+        peso_total = sum(a.peso for a in aristas_camino)
+        if hasattr(self, 'notificar_observadores'):
+            self.notificar_observadores('ruta_calculada', {'algoritmo': 'dfs', 'camino': aristas_camino, 'peso_total': peso_total})
+        logger.info(f"Ruta DFS calculada (CSR): aristas={len(aristas_camino)}, peso_total={peso_total}")
+        return aristas_camino, peso_total
+
+    def _buscar_csr(self, i_origen, i_destino, csr, autonomia):
+        """
+        Nucleo de DFS sobre indices enteros. prev guarda (estado_previo, posicion_arista).
+        Retorna la lista de posiciones de aristas del camino, o None si no existe.
+        """
+        offsets, destinos, pesos, es_recarga = csr.offsets, csr.destinos, csr.pesos, csr.es_recarga
+        stack = [(i_origen, autonomia)]
+        prev = {(i_origen, autonomia): None}
+        visitados = {i_origen: autonomia}
+        estado_final = None
+        while stack:
+            estado = stack.pop()
+            u, energia_actual = estado
+            if u == i_destino:
+                estado_final = estado
+                break
+            for k in range(offsets[u], offsets[u + 1]):
+                peso = pesos[k]
+                if peso > autonomia or energia_actual < peso:
+                    continue
+                v = destinos[k]
+                energia_nueva = autonomia if es_recarga[v] else energia_actual - peso
+                if energia_nueva <= visitados.get(v, -1):
+                    continue
+                prev[(v, energia_nueva)] = (estado, k)
+                visitados[v] = energia_nueva
+                stack.append((v, energia_nueva))
+        if estado_final is None:
+            return None
+        posiciones = []
+        enlace = prev[estado_final]
+        while enlace is not None:
+            estado, k = enlace
+            posiciones.append(k)
+            enlace = prev[estado]
+        posiciones.reverse()
+        return posiciones
     def _insertar_recargas_si_necesario(self, camino, grafo, autonomia, estaciones_recarga):
         if not estaciones_recarga:
             return camino, False
@@ -2,98 +2,78 @@
 Estrategia de ruta usando Dijkstra.
 """
 from Backend.Dominio.Interfaces.IntEstr.IRutaEstrategia import IRutaEstrategia
+from Backend.Dominio.AlgEstrategias.TablaRutasRecarga import TablaRutasRecarga
+from Backend.Dominio.AlgEstrategias.BusquedaEtiquetasEnergia import BusquedaEtiquetasEnergia
+from Backend.Dominio.AlgEstrategias.ArbolesRutasAlmacen import ArbolesRutasAlmacen
 
 class RutaEstrategiaDijkstra(IRutaEstrategia):
-    def calcular_ruta(self, origen, destino, grafo, autonomia=50, estaciones_recarga=None):
-        import heapq
+    def calcular_ruta(self, origen, destino, grafo, autonomia=50, estaciones_recarga=None, usar_csr=False):
+        # La tabla de recargas se construye con la primera consulta sobre un snapshot que la admite
+        csr = grafo.obtener_csr()
+        tabla = TablaRutasRecarga.existente(csr, autonomia)
+        if tabla is None and TablaRutasRecarga.admite(csr):
+            tabla = TablaRutasRecarga.obtener(csr, autonomia)
+        if tabla is not None:
+            return self._calcular_ruta_tabla(origen, destino, tabla)
+        # Sin tabla, la busqueda por etiquetas de Pareto corre sobre el snapshot CSR (usar_csr se acepta
+        # por compatibilidad): cada vertice guarda solo las etiquetas (distancia, energia) no dominadas
+        return self._calcular_ruta_csr(origen, destino, csr, autonomia)
+
+    def _calcular_ruta_tabla(self, origen, destino, tabla):
+        """
+        Responde la consulta con la TablaRutasRecarga: busqueda O(1) de la fila del origen
+        y cosido de los segmentos entre recargas.
+        """
         import logging
         logger = logging.getLogger("RutaEstrategiaDijkstra")
-        logger.info(f"[Dijkstra] Iniciando cálculo de ruta: origen={origen}, destino={destino}, autonomia={autonomia}")
         if hasattr(self, 'notificar_observadores'):
             self.notificar_observadores('inicio_calculo_ruta', {'algoritmo': 'dijkstra', 'origen': origen, 'destino': destino})
-        vertices_grafo = grafo.vertices()
-        logger.debug(f"[Dijkstra] Vértices en grafo: {[str(v) for v in vertices_grafo]}")
-        assert origen in vertices_grafo, f"El vértice de origen no es único o no existe en el grafo: {origen}"
-        assert destino in vertices_grafo, f"El vértice de destino no es único o no existe en el grafo: {destino}"
-
-        dist = dict()  # (vertice, energia_restante) -> distancia_total
-        prev = dict()  # (vertice, energia_restante) -> (predecesor, energia_previa)
-        heap = []  # (distancia_total, energia_restante, vertice)
-
-        energia_inicial = autonomia
-        heapq.heappush(heap, (0, energia_inicial, origen))
-        dist[(origen, energia_inicial)] = 0
-        prev[(origen, energia_inicial)] = (None, None)
-
-        while heap:
-            distancia_actual, energia_actual, vertice_actual = heapq.heappop(heap)
-            logger.debug(f"[Dijkstra] Visitando: {vertice_actual} | Dist: {distancia_actual} | Energia: {energia_actual}")
-
-            # Si llegamos al destino, reconstruimos el camino
-            if vertice_actual == destino:
-                logger.info(f"[Dijkstra] Destino alcanzado: {destino} con distancia {distancia_actual}")
-                break
-
-            # Si es un vértice de recarga, reiniciar energía
-            tipo_elemento = getattr(getattr(vertice_actual, 'elemento', None), 'tipo_elemento', None)
-            if tipo_elemento == 'recarga':
-                energia_actual = autonomia
-                logger.debug(f"[Dijkstra] Recarga en {vertice_actual}, energía reiniciada a {autonomia}")
-
-            for arista in grafo.aristas_incidentes(vertice_actual, salientes=True):
-                v = arista.destino
-                peso_arista = arista.peso
-                # No permitir tomar una arista si el peso excede la autonomía máxima
-                if peso_arista > autonomia:
-                    continue
-                # Solo permitir si la energía actual alcanza para llegar
-                if energia_actual < peso_arista:
-                    continue
-                energia_siguiente = energia_actual - peso_arista
-                tipo_destino = getattr(getattr(v, 'elemento', None), 'tipo_elemento', None)
-                # Si el destino es recarga, al llegar se reinicia la energía
-                if tipo_destino == 'recarga':
-                    energia_siguiente = autonomia
-                distancia_siguiente = distancia_actual + peso_arista
-                estado_siguiente = (v, energia_siguiente)
-                if estado_siguiente not in dist or distancia_siguiente < dist[estado_siguiente]:
-                    dist[estado_siguiente] = distancia_siguiente
-                    prev[estado_siguiente] = (vertice_actual, energia_actual)
-                    heapq.heappush(heap, (distancia_siguiente, energia_siguiente, v))
-                    logger.debug(f"[Dijkstra] Relajando arista {vertice_actual}->{v} | Peso: {peso_arista} | Nueva dist: {distancia_siguiente} | Nueva energia: {energia_siguiente}")
-
-        # Buscar el mejor estado final en el destino
-        estados_destino = [(k, v) for k, v in dist.items() if k[0] == destino]
-        if not estados_destino:
+        aristas_camino, peso_total = tabla.ruta(origen, destino)
+        if peso_total == float('inf'):
             logger.warning(f"[Dijkstra] No se encontró ruta de {origen} a {destino}")
             raise Exception(f"No existe ruta de {origen} a {destino} respetando autonomía y recargas.")
-        # Elegir el estado con menor distancia
-        (destino_final, energia_final), peso_total = min(estados_destino, key=lambda x: x[1])
-
-        # Reconstruir el camino de vértices
-        camino = []
-        estado = (destino_final, energia_final)
-        while estado in prev and prev[estado][0] is not None:
-            vertice, energia = estado
-            camino.append(vertice)
-            estado = prev[estado]
-        camino.append(origen)
-        camino = camino[::-1]
-
-        # Reconstruir el camino de aristas
-        aristas_camino = []
-        for i in range(len(camino) - 1):
-            u = camino[i]
-            v = camino[i+1]
-            arista_uv = next((a for a in grafo.aristas_incidentes(u, salientes=True) if a.destino == v), None)
-            assert arista_uv is not None, f"No se encontró arista entre {u} y {v}"
-            aristas_camino.append(arista_uv)
+        logger.info(f"[Dijkstra] Ruta final (tabla de recargas): {len(aristas_camino)} aristas, peso_total: {peso_total}")
+        if hasattr(self, 'notificar_observadores'):
+            self.notificar_observadores('ruta_calculada', {'algoritmo': 'dijkstra', 'camino': aristas_camino, 'peso_total': peso_total})
+        return aristas_camino, peso_total
 
-        logger.info(f"[Dijkstra] Ruta final: {[str(a) for a in aristas_camino]}, peso_total: {peso_total}")
+    def _calcular_ruta_csr(self, origen, destino, csr, autonomia):
+        """
+        Dijkstra sobre el snapshot GrafoCSR; solo al final se mapean las posiciones a objetos Arista.
+        """
+        import logging
+        logger = logging.getLogger("RutaEstrategiaDijkstra")
+        if hasattr(self, 'notificar_observadores'):
+            self.notificar_observadores('inicio_calculo_ruta', {'algoritmo': 'dijkstra', 'origen': origen, 'destino': destino})
+        i_origen = csr.indice(origen)
+        i_destino = csr.indice(destino)
+        assert i_origen is not None, f"El vértice de origen no es único o no existe en el grafo: {origen}"
+        assert i_destino is not None, f"El vértice de destino no es único o no existe en el grafo: {destino}"
+        # Si ya se calculo el arbol del origen (rutas por almacen), el camino sale de el sin buscar
+        arboles = ArbolesRutasAlmacen.existente(csr, autonomia)
+        if arboles is not None and arboles.contiene(i_origen):
+            posiciones = arboles.posiciones(i_origen, i_destino)
+        else:
+            posiciones = self._buscar_csr(i_origen, i_destino, csr, autonomia)
+        if posiciones is None:
+            logger.warning(f"[Dijkstra] No se encontró ruta de {origen} a {destino}")
+            raise Exception(f"No existe ruta de {origen} a {destino} respetando autonomía y recargas.")
+        aristas_camino = csr.aristas_de(posiciones)
+        peso_total = sum(a.peso for a in aristas_camino)
+        logger.info(f"[Dijkstra] Ruta final (CSR): {len(aristas_camino)} aristas, peso_total: {peso_total}")
         if hasattr(self, 'notificar_observadores'):
             self.notificar_observadores('ruta_calculada', {'algoritmo': 'dijkstra', 'camino': aristas_camino, 'peso_total': peso_total})
         return aristas_camino, peso_total
 
+    def _buscar_csr(self, i_origen, i_destino, csr, autonomia):
+        """
+        Nucleo de Dijkstra sobre indices enteros: busqueda por etiquetas (distancia, energia restante)
+        con descarte de etiquetas dominadas (ver BusquedaEtiquetasEnergia).
+        Retorna la lista de posiciones de aristas del camino, o None si no existe.
+        Solo usa los arreglos del snapshot, por lo que tambien corre sobre un GrafoCSRCompartido.
+        """
+        return BusquedaEtiquetasEnergia.buscar(i_origen, i_destino, csr, autonomia)
+
     def _insertar_recargas_si_necesario(self, camino, grafo, autonomia, estaciones_recarga):
         """
         Inserta vertices de recarga en el camino si la autonomía se excede.
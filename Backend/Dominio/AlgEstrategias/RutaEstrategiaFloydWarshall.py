@@ -1,97 +1,111 @@
 """
-Estrategia de ruta usando Floyd-Warshall (para todos los pares, pero aquí solo reconstruye una ruta).
+Estrategia de ruta usando Floyd-Warshall (NumPy). Las matrices de todos los pares se calculan
+una vez por snapshot del grafo y cada consulta solo reconstruye su ruta.
 """
 from Backend.Dominio.Interfaces.IntEstr.IRutaEstrategia import IRutaEstrategia
-from collections import deque
+import numpy as np
 import logging
+import time
 
 class RutaEstrategiaFloydWarshall(IRutaEstrategia):
-    def calcular_ruta(self, origen, destino, grafo, autonomia=50, estaciones_recarga=None):
+    def calcular_ruta(self, origen, destino, grafo, autonomia=50, estaciones_recarga=None, usar_csr=False):
+        """
+        Reconstruye la ruta origen -> destino a partir de las matrices de todos los pares.
+        Las matrices se calculan una sola vez por snapshot del grafo (ver matrices_todos_los_pares),
+        por lo que usar_csr se acepta por compatibilidad pero el calculo siempre usa el snapshot CSR.
+        """
         logger = logging.getLogger("RutaEstrategiaFloydWarshall")
         if hasattr(self, 'notificar_observadores'):
             self.notificar_observadores('inicio_calculo_ruta', {'algoritmo': 'floydwarshall', 'origen': origen, 'destino': destino})
-        assert origen in grafo.vertices(), "El vértice de origen no es único o no existe en el grafo."
-        assert destino in grafo.vertices(), "El vértice de destino no es único o no existe en el grafo."
-        vertices = list(grafo.vertices())
-        n = len(vertices)
-        idx = {v: i for i, v in enumerate(vertices)}
-        dist = [[float('inf')]*n for _ in range(n)]
-        next_v = [[None]*n for _ in range(n)]
-        for i, v in enumerate(vertices):
-            dist[i][i] = 0
-            next_v[i][i] = v
-        # Solo considerar aristas que cumplen autonomía
-        for arista in grafo.aristas():
-            assert arista in grafo.aristas(), "La arista no es única o no existe en el grafo."
-            i, j = idx[arista.origen], idx[arista.destino]
-            if arista.peso <= autonomia:
-                dist[i][j] = arista.peso
-                next_v[i][j] = arista.destino
-        for k in range(n):
-            for i in range(n):
-                for j in range(n):
-                    if dist[i][k] + dist[k][j] < dist[i][j]:
-                        dist[i][j] = dist[i][k] + dist[k][j]
-                        next_v[i][j] = next_v[i][k]
-        i, j = idx[origen], idx[destino]
-        if dist[i][j] == float('inf'):
+        csr = grafo.obtener_csr()
+        i = csr.indice(origen)
+        j = csr.indice(destino)
+        assert i is not None, "El vértice de origen no es único o no existe en el grafo."
+        assert j is not None, "El vértice de destino no es único o no existe en el grafo."
+        dist, next_k = self.matrices_todos_los_pares(csr, autonomia)
+        if dist[i, j] == np.inf:
             logger.error(f"No existe una ruta posible entre {origen} y {destino}")
             if hasattr(self, 'notificar_observadores'):
                 self.notificar_observadores('error_calculo_ruta', {'algoritmo': 'floydwarshall', 'origen': origen, 'destino': destino, 'error': 'No existe una ruta posible'})
             return [], float('inf')
-        # Reconstruir camino_vertices y validar autonomía/recargas
-        camino_vertices = [origen]
-        actual = origen
+        # Reconstruir posiciones de aristas y validar autonomía/recargas
+        destinos, pesos, es_recarga = csr.destinos, csr.pesos, csr.es_recarga
+        posiciones = []
+        actual = i
         energia_actual = autonomia
         valido = True
-        while actual != destino:
-            siguiente = next_v[idx[actual]][j]
-            if siguiente is None:
-                valido = False
-                break
-            arista = next((a for a in grafo.aristas_incidentes(actual, salientes=True) if a.destino == siguiente), None)
-            if arista is None:
-                valido = False
-                break
-            peso = arista.peso
-            if peso > autonomia:
+        while actual != j:
+            k = int(next_k[actual, j])
+            if k < 0:
                 valido = False
                 break
+            peso = pesos[k]
             if energia_actual < peso:
                 # Intentar recargar en el actual
-                es_recarga = hasattr(actual.elemento, 'tipo_elemento') and getattr(actual.elemento, 'tipo_elemento', None) == 'recarga'
-                if es_recarga:
+                if es_recarga[actual]:
                     energia_actual = autonomia
                 else:
                     valido = False
                     break
             energia_actual -= peso
-            camino_vertices.append(siguiente)
+            posiciones.append(k)
+            actual = destinos[k]
             # Si llegamos a una recarga, reiniciar energía
-            es_recarga = hasattr(siguiente.elemento, 'tipo_elemento') and getattr(siguiente.elemento, 'tipo_elemento', None) == 'recarga'
-            if es_recarga:
+            if es_recarga[actual]:
                 energia_actual = autonomia
-            actual = siguiente
         if not valido:
             logger.error(f"No existe ruta posible entre {origen} y {destino} respetando autonomía y recargas.")
             if hasattr(self, 'notificar_observadores'):
                 self.notificar_observadores('error_calculo_ruta', {'algoritmo': 'floydwarshall', 'origen': origen, 'destino': destino, 'error': 'No existe ruta posible con autonomía y recargas'})
             return [], float('inf')
-        # reconstruir lista de aristas y calcular peso_total
-        aristas_camino = []
-        peso_total = 0
-        for k in range(len(camino_vertices) - 1):
-            u = camino_vertices[k]
-            v = camino_vertices[k+1]
-            arista_uv = next((a for a in grafo.aristas_incidentes(u, salientes=True) if a.destino == v), None)
-            assert arista_uv is not None, f"No se encontró arista entre {u} y {v} en FloydWarshall"
-            aristas_camino.append(arista_uv)
-            peso_total += arista_uv.peso
+        aristas_camino = csr.aristas_de(posiciones)
+        peso_total = sum(a.peso for a in aristas_camino)
         if hasattr(self, 'notificar_observadores'):
             self.notificar_observadores('ruta_calculada', {'algoritmo': 'floydwarshall', 'camino': aristas_camino, 'peso_total': peso_total})
-        logger.info(f"Ruta FloydWarshall calculada: aristas={aristas_camino}, peso_total={peso_total}")
+        logger.info(f"Ruta FloydWarshall calculada: aristas={len(aristas_camino)}, peso_total={peso_total}")
         return aristas_camino, peso_total
 
+    def matrices_todos_los_pares(self, csr, autonomia=50):
+        """
+        Retorna (dist, next_k) para el snapshot dado. next_k[i, j] es la posicion CSR de la
+        primera arista del camino optimo i -> j (-1 si no existe). Se cachean en csr.derivados,
+        de modo que todas las consultas sobre la misma version del grafo comparten un solo calculo.
+        """
+        clave = ('floydwarshall', autonomia)
+        matrices = csr.derivados.get(clave)
+        if matrices is None:
+            matrices = self._floyd_warshall(csr, autonomia)
+            csr.derivados[clave] = matrices
+        return matrices
+
+    def _floyd_warshall(self, csr, autonomia):
+        """
+        Floyd-Warshall vectorizado: para cada k se relaja la matriz completa con un
+        broadcast fila/columna, en vez del triple bucle en Python.
+        """
+        logger = logging.getLogger("RutaEstrategiaFloydWarshall")
+        inicio = time.time()
+        n = csr.n_vertices
+        dist = np.full((n, n), np.inf)
+        next_k = np.full((n, n), -1, dtype=np.int64)
+        np.fill_diagonal(dist, 0)
+        # Solo considerar aristas que cumplen autonomía
+        if csr.n_aristas:
+            origenes = np.asarray(csr.origenes)
+            destinos = np.asarray(csr.destinos)
+            pesos = np.asarray(csr.pesos)
+            posiciones = np.arange(csr.n_aristas)
+            factibles = pesos <= autonomia
+            dist[origenes[factibles], destinos[factibles]] = pesos[factibles]
+            next_k[origenes[factibles], destinos[factibles]] = posiciones[factibles]
+        for k in range(n):
+            candidato = dist[:, k, None] + dist[None, k, :]
+            mejora = candidato < dist
+            np.minimum(dist, candidato, out=dist)
+            next_k = np.where(mejora, next_k[:, k, None], next_k)
+        logger.info(f"[FloydWarshall] Matrices de todos los pares calculadas: n={n}, tiempo={time.time() - inicio:.3f}s")
+        return dist, next_k
+
     def _insertar_recargas_si_necesario(self, camino, grafo, autonomia, estaciones_recarga):
         if not estaciones_recarga:
             return camino, False
@@ -5,7 +5,11 @@ from Backend.Dominio.Interfaces.IntEstr.IRutaEstrategia import IRutaEstrategia
 import logging
 
 class RutaEstrategiaTopologicalSort(IRutaEstrategia):
-    def calcular_ruta(self, origen, destino, grafo, autonomia=50, estaciones_recarga=None):
+    def calcular_ruta(self, origen, destino, grafo, autonomia=50, estaciones_recarga=None, usar_csr=False):
+        # El recorrido sobre objetos solo sigue origen -> destino: en grafos no dirigidos se usa el
+        # snapshot CSR, que recorre cada arista en ambos sentidos como ValidadorSegmentacion
+        if usar_csr or not grafo.es_dirigido():
+            return self._calcular_ruta_csr(origen, destino, grafo.obtener_csr(), autonomia)
         logger = logging.getLogger("RutaEstrategiaTopologicalSort")
         if hasattr(self, 'notificar_observadores'):
             self.notificar_observadores('inicio_calculo_ruta', {'algoritmo': 'topologicalsort', 'origen': origen, 'destino': destino})
@@ -82,6 +86,71 @@ class RutaEstrategiaTopologicalSort(IRutaEstrategia):
                 self.notificar_observadores('error_calculo_ruta', {'algoritmo': 'topologicalsort', 'origen': origen, 'destino': destino, 'error': str(e)})
             return [], float('inf')
 
+    def _calcular_ruta_csr(self, origen, destino, csr, autonomia):
+        """
+        Busqueda en anchura sobre el snapshot GrafoCSR con la misma poda por energia.
+        El orden topologico previo no influye en el resultado, por lo que se omite.
+        """
+        logger = logging.getLogger("RutaEstrategiaTopologicalSort")
+        if hasattr(self, 'notificar_observadores'):
+            self.notificar_observadores('inicio_calculo_ruta', {'algoritmo': 'topologicalsort', 'origen': origen, 'destino': destino})
+        i_origen = csr.indice(origen)
+        i_destino = csr.indice(destino)
+        assert i_origen is not None, "El vértice de origen no es único o no existe en el grafo."
+        assert i_destino is not None, "El vértice de destino no es único o no existe en el grafo."
+        posiciones = self._buscar_csr(i_origen, i_destino, csr, autonomia)
+        if posiciones is None:
+            if hasattr(self, 'notificar_observadores'):
+                self.notificar_observadores('error_calculo_ruta', {'algoritmo': 'topologicalsort', 'origen': origen, 'destino': destino, 'error': 'No existe una ruta posible'})
+            logger.error(f"TopologicalSort no encontró ruta entre {origen} y {destino}")
+            return [], float('inf')
+        aristas_camino = csr.aristas_de(posiciones)
+        peso_total = sum(a.peso for a in aristas_camino)
+        if hasattr(self, 'notificar_observadores'):
+            self.notificar_observadores('ruta_calculada', {'algoritmo': 'topologicalsort', 'camino': aristas_camino, 'peso_total': peso_total})
+        logger.info(f"Ruta TopologicalSort calculada (CSR): aristas={len(aristas_camino)}, peso_total={peso_total}")
+        return aristas_camino, peso_total
+
+    def _buscar_csr(self, i_origen, i_destino, csr, autonomia):
+        """
+        Nucleo sobre indices enteros. Cada estado guarda un puntero a su padre en lugar de una copia del camino.
+        Retorna la lista de posiciones de aristas del camino, o None si no existe.
+        """
+        from collections import deque
+        offsets, destinos, pesos, es_recarga = csr.offsets, csr.destinos, csr.pesos, csr.es_recarga
+        padres = [(-1, -1, i_origen)]  # nodo -> (nodo_padre, posicion_arista, indice_vertice)
+        queue = deque([(i_origen, autonomia, 0)])
+        visitados = {i_origen: autonomia}
+        nodo_final = None
+        while queue:
+            u, energia_actual, nodo = queue.popleft()
+            if u == i_destino:
+                nodo_final = nodo
+                break
+            for k in range(offsets[u], offsets[u + 1]):
+                peso = pesos[k]
+                if peso > autonomia or energia_actual < peso:
+                    continue
+                v = destinos[k]
+                energia_nueva = autonomia if es_recarga[v] else energia_actual - peso
+                if energia_nueva <= visitados.get(v, -1):
+                    continue
+                visitados[v] = energia_nueva
+                # evitar ciclos: v no debe aparecer ya en el camino de este estado
+                ancestro = nodo
+                while ancestro >= 0 and padres[ancestro][2] != v:
+                    ancestro = padres[ancestro][0]
+                if ancestro < 0:
+                    padres.append((nodo, k, v))
+                    queue.append((v, energia_nueva, len(padres) - 1))
+        if nodo_final is None:
+            return None
+        posiciones = []
+        while nodo_final > 0:
+            nodo_final, k, _ = padres[nodo_final]
+            posiciones.append(k)
+        posiciones.reverse()
+        return posiciones
     def _insertar_recargas_si_necesario(self, camino, grafo, autonomia, estaciones_recarga):
         if not estaciones_recarga:
             return camino, False
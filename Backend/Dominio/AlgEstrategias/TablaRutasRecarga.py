@@ -0,0 +1,190 @@
+"""
+Tabla precalculada de rutas factibles con bateria sobre el grafo superpuesto de recargas.
+"""
+import heapq
+import logging
+import time
+import numpy as np
+
+
+class TablaRutasRecarga:
+    """
+    Resuelve rutas respetando la autonomia del dron sin expandir estados (vertice, energia).
+    - Un segmento es un camino mas corto que no atraviesa recargas intermedias y pesa como
+      maximo la autonomia: es lo que el dron puede recorrer con una carga.
+    - El grafo superpuesto une recargas mediante segmentos y se resuelve una vez con
+      Floyd-Warshall; cualquier ruta factible es segmento -> recargas -> segmento.
+    - Por cada origen se guarda una fila (distancia, recarga de entrada, recarga de salida)
+      hacia todos los vertices, asi una consulta es un acceso O(1) mas el cosido del camino.
+    La tabla vive en csr.derivados, por lo que se invalida junto con el snapshot del grafo. Se construye
+    con la primera consulta de Dijkstra sobre el snapshot y cada fila con la primera consulta de su origen.
+    """
+
+    # Las matrices son recargas x vertices y el Floyd-Warshall es O(recargas³): por encima de este
+    # numero de recargas la tabla no se construye y Dijkstra usa la busqueda por etiquetas (BusquedaEtiquetasEnergia)
+    MAX_RECARGAS = 600
+    # Cada fila combina una matriz recargas x vertices: por encima de estas celdas una fila cuesta mas
+    # que una busqueda por etiquetas y la construccion deja de caber en la primera consulta
+    MAX_CELDAS = 100_000
+
+    def __init__(self, csr, autonomia=50):
+        self.logger = logging.getLogger("TablaRutasRecarga")
+        inicio = time.time()
+        self._csr = csr
+        self.autonomia = autonomia
+        self._recargas = [i for i in range(csr.n_vertices) if csr.es_recarga[i]]
+        self._segmentos = {}  # indice_fuente -> (distancias, predecesores)
+        self._filas = {}  # indice_origen -> (distancia, entrada, salida) como arreglos de n elementos
+        m = len(self._recargas)
+        n = csr.n_vertices
+        # Distancias de segmento desde cada recarga hacia todos los vertices (inf si no alcanza)
+        self._desde_recargas = np.full((m, n), np.inf)
+        for p, r in enumerate(self._recargas):
+            self._desde_recargas[p] = self._segmento(r)[0]
+        # Grafo superpuesto entre recargas resuelto con Floyd-Warshall
+        self._dist_recargas = self._desde_recargas[:, self._recargas] if m else np.zeros((0, 0))
+        self._siguiente = np.where(np.isfinite(self._dist_recargas), np.arange(m)[None, :], -1)
+        np.fill_diagonal(self._dist_recargas, 0)
+        for k in range(m):
+            candidato = self._dist_recargas[:, k, None] + self._dist_recargas[None, k, :]
+            mejora = candidato < self._dist_recargas
+            np.minimum(self._dist_recargas, candidato, out=self._dist_recargas)
+            self._siguiente = np.where(mejora, self._siguiente[:, k, None], self._siguiente)
+        self.logger.info(f"[TablaRutasRecarga] Grafo superpuesto construido: recargas={m}, tiempo={time.time() - inicio:.3f}s")
+
+    @classmethod
+    def obtener(cls, csr, autonomia=50):
+        """
+        Retorna la tabla asociada al snapshot, construyendola si aun no existe.
+        """
+        clave = ('tabla_recarga', autonomia)
+        tabla = csr.derivados.get(clave)
+        if tabla is None:
+            tabla = cls(csr, autonomia)
+            csr.derivados[clave] = tabla
+        return tabla
+
+    @classmethod
+    def admite(cls, csr):
+        """
+        Indica si el snapshot es lo bastante pequeño para construir la tabla (recargas y recargas x vertices).
+        """
+        recargas = sum(csr.es_recarga)
+        return recargas <= cls.MAX_RECARGAS and recargas * csr.n_vertices <= cls.MAX_CELDAS
+
+    @classmethod
+    def existente(cls, csr, autonomia=50):
+        """
+        Retorna la tabla ya construida para el snapshot, o None si fue invalidada o nunca se construyo.
+        """
+        return csr.derivados.get(('tabla_recarga', autonomia))
+
+    def precalcular(self, origenes):
+        """
+        Calcula por adelantado las filas de los vertices indicados (por ejemplo, los almacenes).
+        """
+        for vertice in origenes:
+            i = self._csr.indice(vertice)
+            if i is not None:
+                self._fila(i)
+
+    def ruta(self, origen, destino):
+        """
+        Retorna (aristas_camino, peso_total) de la ruta factible mas corta, o ([], inf) si no existe.
+        """
+        i = self._csr.indice(origen)
+        j = self._csr.indice(destino)
+        if i is None or j is None:
+            return [], float('inf')
+        distancias, entradas, salidas = self._fila(i)
+        if not np.isfinite(distancias[j]):
+            return [], float('inf')
+        if i == j:
+            return [], 0
+        if entradas[j] < 0:
+            posiciones = self._camino_segmento(i, j)
+        else:
+            posiciones = self._camino_segmento(i, self._recargas[entradas[j]])
+            p, q = int(entradas[j]), int(salidas[j])
+            while p != q:
+                siguiente = int(self._siguiente[p, q])
+                posiciones.extend(self._camino_segmento(self._recargas[p], self._recargas[siguiente]))
+                p = siguiente
+            posiciones.extend(self._camino_segmento(self._recargas[q], j))
+        aristas_camino = self._csr.aristas_de(posiciones)
+        return aristas_camino, sum(a.peso for a in aristas_camino)
+
+    def _fila(self, i):
+        """
+        Combina el segmento directo desde i con el grafo superpuesto de recargas.
+        """
+        fila = self._filas.get(i)
+        if fila is not None:
+            return fila
+        directo = self._segmento(i)[0]
+        n = self._csr.n_vertices
+        distancias = directo.copy()
+        entradas = np.full(n, -1, dtype=np.int64)
+        salidas = np.full(n, -1, dtype=np.int64)
+        if self._recargas:
+            # llegada[q]: mejor distancia hasta la recarga q pasando por la recarga de entrada p
+            via = directo[self._recargas][:, None] + self._dist_recargas
+            entrada_por_recarga = via.argmin(axis=0)
+            llegada = via.min(axis=0)
+            total = llegada[:, None] + self._desde_recargas
+            salida = total.argmin(axis=0)
+            mejor = total[salida, np.arange(n)]
+            usar_recarga = mejor < distancias
+            distancias = np.where(usar_recarga, mejor, distancias)
+            salidas = np.where(usar_recarga, salida, -1)
+            entradas = np.where(usar_recarga, entrada_por_recarga[salida], -1)
+        distancias[i] = 0
+        fila = (distancias, entradas, salidas)
+        self._filas[i] = fila
+        return fila
+
+    def _segmento(self, fuente):
+        """
+        Dijkstra acotado por la autonomia que no continua a traves de recargas distintas de la fuente.
+        """
+        segmento = self._segmentos.get(fuente)
+        if segmento is not None:
+            return segmento
+        csr = self._csr
+        offsets, destinos, pesos, es_recarga = csr.offsets, csr.destinos, csr.pesos, csr.es_recarga
+        infinito = float('inf')
+        distancias = [infinito] * csr.n_vertices
+        predecesores = [-1] * csr.n_vertices
+        distancias[fuente] = 0
+        heap = [(0, fuente)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > distancias[u]:
+                continue
+            if u != fuente and es_recarga[u]:
+                continue
+            for k in range(offsets[u], offsets[u + 1]):
+                nueva = d + pesos[k]
+                v = destinos[k]
+                if nueva <= self.autonomia and nueva < distancias[v]:
+                    distancias[v] = nueva
+                    predecesores[v] = k
+                    heapq.heappush(heap, (nueva, v))
+        segmento = (np.array(distancias), predecesores)
+        self._segmentos[fuente] = segmento
+        return segmento
+
+    def _camino_segmento(self, fuente, destino):
+        """
+        Reconstruye las posiciones de aristas del segmento fuente -> destino.
+        """
+        predecesores = self._segmento(fuente)[1]
+        origenes = self._csr.origenes
+        posiciones = []
+        actual = destino
+        while actual != fuente:
+            k = predecesores[actual]
+            posiciones.append(k)
+            actual = origenes[k]
+        posiciones.reverse()
+        return posiciones
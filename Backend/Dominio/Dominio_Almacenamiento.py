@@ -2,6 +2,9 @@
 Clase Almacenamiento para representar un vertice de almacenamiento en la simulación logística de drones.
 Incluye soporte para observadores de eventos de dominio.
 """
+from Backend.Servicios.Observer.BusEventos import BusEventos
+
+_bus = BusEventos()
 
 class Almacenamiento:
     """
@@ -16,27 +19,25 @@ class Almacenamiento:
         self.nombre = nombre
         self.tipo_elemento = 'almacenamiento'
         self._pedidos = []  # Lista de objetos Pedido asociados a este almacenamiento
-        self._observadores = set()
         self.notificar_observadores('almacenamiento_creado', {'id_almacenamiento': id_almacenamiento, 'nombre': nombre})
 
     def agregar_observador(self, observador):
         """
         Agrega un observador para recibir notificaciones de eventos de negocio.
         """
-        self._observadores.add(observador)
+        _bus.suscribir(observador)
 
     def quitar_observador(self, observador):
         """
         Quita un observador de la lista de receptores de notificaciones.
         """
-        self._observadores.discard(observador)
+        _bus.desuscribir(observador)
 
     def notificar_observadores(self, evento, datos=None):
         """
         Notifica a todos los observadores registrados sobre un evento de negocio.
         """
-        for obs in self._observadores:
-            obs.actualizar(evento, self, datos)
+        _bus.publicar(evento, self, datos)
 
     def agregar_pedido(self, pedido):
         """
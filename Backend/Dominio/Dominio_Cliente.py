@@ -2,6 +2,9 @@
 Clase Cliente para representar un cliente en la simulación logística de drones.
 Incluye soporte para observadores de eventos de dominio.
 """
+from Backend.Servicios.Observer.BusEventos import BusEventos
+
+_bus = BusEventos()
 
 class Cliente:
     """
@@ -16,27 +19,25 @@ class Cliente:
         self.nombre = nombre
         self.tipo_elemento = 'cliente'
         self._pedidos = []  # Lista de objetos Pedido asociados a este cliente
-        self._observadores = set()
         self.notificar_observadores('cliente_creado', {'id_cliente': id_cliente, 'nombre': nombre})
 
     def agregar_observador(self, observador):
         """
         Agrega un observador para recibir notificaciones de eventos de negocio.
         """
-        self._observadores.add(observador)
+        _bus.suscribir(observador)
         
     def quitar_observador(self, observador):
         """
         Quita un observador, dejando de notificarle sobre eventos futuros.
         """
-        self._observadores.discard(observador)
+        _bus.desuscribir(observador)
 
     def notificar_observadores(self, evento, datos=None):
         """
         Notifica a todos los observadores registrados sobre un evento.
         """
-        for obs in self._observadores:
-            obs.actualizar(evento, self, datos)
+        _bus.publicar(evento, self, datos)
 
     def agregar_pedido(self, pedido):
         """
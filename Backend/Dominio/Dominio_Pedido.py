@@ -5,6 +5,9 @@ Incluye soporte para observadores de eventos de dominio y logging de asociacione
 
 from datetime import datetime
 import logging
+from Backend.Servicios.Observer.BusEventos import BusEventos
+
+_bus = BusEventos()
 
 class Pedido:
     """
@@ -31,20 +34,17 @@ class Pedido:
         self.peso_total = None
         self.status = 'pendiente'
         self.fecha_entrega = None
-        self._observadores = set()
         Pedido.logger.info(f"[Pedido] Creado: id={id_pedido} | cliente={cliente_v} | origen={origen_v} | destino={destino_v} | prioridad={prioridad}")
         self.notificar_observadores('pedido_creado', {'id_pedido': id_pedido, 'cliente': cliente_v, 'origen': origen_v, 'destino': destino_v, 'prioridad': prioridad, 'fecha_creacion': self.fecha_creacion})
 
     def agregar_observador(self, observador):
-        self._observadores.add(observador)
+        _bus.suscribir(observador)
 
     def quitar_observador(self, observador):
-        self._observadores.discard(observador)
+        _bus.desuscribir(observador)
 
     def notificar_observadores(self, evento, datos=None):
-        for obs in self._observadores:
-            obs.actualizar(evento, self, datos)
-        Pedido.logger.info(f"[Pedido] Notificación: evento={evento} | datos={datos}")
+        _bus.publicar(evento, self, datos)
 
     def obtener_cliente(self):
         """
@@ -2,6 +2,9 @@
 Clase Recarga para representar una estacion de recarga en la simulacion logistica de drones.
 Incluye soporte para observadores de eventos de dominio.
 """
+from Backend.Servicios.Observer.BusEventos import BusEventos
+
+_bus = BusEventos()
 
 class Recarga:
     """
@@ -15,18 +18,16 @@ class Recarga:
         self.id_recarga = id_recarga
         self.nombre = nombre
         self.tipo_elemento = 'recarga'
-        self._observadores = set()
         self.notificar_observadores('recarga_creada', {'id_recarga': id_recarga, 'nombre': nombre})
 
     def agregar_observador(self, observador):
-        self._observadores.add(observador)
+        _bus.suscribir(observador)
 
     def quitar_observador(self, observador):
-        self._observadores.discard(observador)
+        _bus.desuscribir(observador)
 
     def notificar_observadores(self, evento, datos=None):
-        for obs in self._observadores:
-            obs.actualizar(evento, self, datos)
+        _bus.publicar(evento, self, datos)
 
     def serializar(self):
         """
@@ -2,6 +2,9 @@
 Clase Ruta para representar una ruta en la simulación logística de drones.
 Incluye soporte para observadores de eventos de dominio.
 """
+from Backend.Servicios.Observer.BusEventos import BusEventos
+
+_bus = BusEventos()
 
 class Ruta:
     """
@@ -23,7 +26,8 @@ class Ruta:
         self.algoritmo = algoritmo  # 'kruskal', 'dijkstra', 'bfs', 'dfs', etc.
         self.tiempo_calculo = tiempo_calculo  # Tiempo en segundos
         self.fecha_creacion = datetime.datetime.now()  # Timestamp de creación
-        self._observadores = set()
+        # Formas serializadas (DTO, JSON, hashmap) calculadas una vez por MapeadorRuta; se descartan si la ruta cambia
+        self.serializados = {}
         # Notificar a los observadores la creación de la ruta
         self.notificar_observadores('ruta_creada', {'origen': origen, 'destino': destino, 'camino': camino, 'peso_total': peso_total, 'algoritmo': algoritmo, 'tiempo_calculo': tiempo_calculo, 'fecha_creacion': self.fecha_creacion})
 
@@ -31,20 +35,25 @@ class Ruta:
         """
         Agrega un observador para recibir notificaciones de eventos de la ruta.
         """
-        self._observadores.add(observador)
+        _bus.suscribir(observador)
 
     def quitar_observador(self, observador):
         """
         Quita un observador para dejar de recibir notificaciones de eventos de la ruta.
         """
-        self._observadores.discard(observador)
+        _bus.desuscribir(observador)
 
     def notificar_observadores(self, evento, datos=None):
         """
         Notifica a todos los observadores registrados sobre un evento ocurrido en la ruta.
         """
-        for obs in self._observadores:
-            obs.actualizar(evento, self, datos)
+        _bus.publicar(evento, self, datos)
+
+    def invalidar_serializados(self):
+        """
+        Descarta las formas serializadas en cache; se llama al modificar origen, destino o camino.
+        """
+        self.serializados.clear()
 
     def es_valida(self):
         """
@@ -4,23 +4,27 @@ Garantiza unicidad y registro de errores.
 """
 from Backend.Dominio.Dominio_Almacenamiento import Almacenamiento
 from Backend.Infraestructura.Repositorios.repositorio_almacenamientos import RepositorioAlmacenamientos
+from Backend.Infraestructura.ambito_simulacion import ambito_actual
 import logging
 from Backend.Dominio.Interfaces.IntFab.FabricaInterfaz import FabricaInterfaz
 
 class FabricaAlmacenamientos(FabricaInterfaz):
-    _instancia = None
     def __new__(cls):
-        if cls._instancia is None:
-            cls._instancia = super().__new__(cls)
-            cls._instancia.errores = []
-            cls._instancia.logger = logging.getLogger("FabricaAlmacenamientos")
-            if not cls._instancia.logger.hasHandlers():
+        # Instancia unica por ambito de simulacion (ver ambito_simulacion)
+        ambito = ambito_actual()
+        instancia = ambito.obtener(cls)
+        if instancia is None:
+            instancia = super().__new__(cls)
+            instancia.errores = []
+            instancia.logger = logging.getLogger("FabricaAlmacenamientos")
+            if not instancia.logger.hasHandlers():
                 handler = logging.StreamHandler()
                 formatter = logging.Formatter('[%(levelname)s] %(asctime)s - %(message)s')
                 handler.setFormatter(formatter)
-                cls._instancia.logger.addHandler(handler)
-            cls._instancia.logger.setLevel(logging.INFO)
-        return cls._instancia
+                instancia.logger.addHandler(handler)
+            instancia.logger.setLevel(logging.INFO)
+            instancia = ambito.registrar(cls, instancia)
+        return instancia
 
     def crear(self, id_almacenamiento, nombre):
         """
@@ -6,22 +6,26 @@ from Backend.Dominio.Dominio_Pedido import Pedido
 from datetime import datetime
 from Backend.Infraestructura.Repositorios.repositorio_pedidos import RepositorioPedidos
 from Backend.Dominio.Interfaces.IntFab.FabricaInterfaz import FabricaInterfaz
+from Backend.Infraestructura.ambito_simulacion import ambito_actual
 import logging
 
 class FabricaPedidos(FabricaInterfaz):
-    _instancia = None
     def __new__(cls):
-        if cls._instancia is None:
-            cls._instancia = super().__new__(cls)
-            cls._instancia.errores = []
-            cls._instancia.logger = logging.getLogger("FabricaPedidos")
-            if not cls._instancia.logger.hasHandlers():
+        # Instancia unica por ambito de simulacion (ver ambito_simulacion)
+        ambito = ambito_actual()
+        instancia = ambito.obtener(cls)
+        if instancia is None:
+            instancia = super().__new__(cls)
+            instancia.errores = []
+            instancia.logger = logging.getLogger("FabricaPedidos")
+            if not instancia.logger.hasHandlers():
                 handler = logging.StreamHandler()
                 formatter = logging.Formatter('[%(levelname)s] %(asctime)s - %(message)s')
                 handler.setFormatter(formatter)
-                cls._instancia.logger.addHandler(handler)
-            cls._instancia.logger.setLevel(logging.INFO)
-        return cls._instancia
+                instancia.logger.addHandler(handler)
+            instancia.logger.setLevel(logging.INFO)
+            instancia = ambito.registrar(cls, instancia)
+        return instancia
 
     def crear(self, id_pedido, vertice_cliente, vertice_almacen, prioridad, fecha_creacion=None):
         """
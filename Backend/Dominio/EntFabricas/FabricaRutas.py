@@ -2,29 +2,63 @@
 FabricaRutas: Fábrica centralizada para la creación y validación de rutas.
 Garantiza unicidad y registro de errores.
 Utiliza FabricaVertices y FabricaAristas para componentes internos.
+Concurrencia: los caminos se calculan con el cerrojo de lectura de la simulación y la ruta se registra
+con el de escritura, validando que el grafo y el pedido sigan siendo los mismos sobre los que se calculó.
 """
 from Backend.Dominio.Dominio_Ruta import Ruta
 from Backend.Dominio.EntFabricas.FabricaVertices import FabricaVertices
 from Backend.Dominio.EntFabricas.FabricaAristas import FabricaAristas
 from Backend.Dominio.Interfaces.IntFab.FabricaInterfaz import FabricaInterfaz
-from Backend.Dominio.AlgEstrategias import RutaEstrategiaBFS, RutaEstrategiaDijkstra, RutaEstrategiaDFS, RutaEstrategiaFloydWarshall, RutaEstrategiaTopologicalSort
-import concurrent.futures
+from Backend.Dominio.AlgEstrategias import RutaEstrategiaBFS, RutaEstrategiaDijkstra, RutaEstrategiaDFS, RutaEstrategiaFloydWarshall, RutaEstrategiaTopologicalSort, RutaEstrategiaBidireccional, RutaEstrategiaALT, RutaEstrategiaCH
+from Backend.Infraestructura.TDA.TDA_CacheLRU import CacheLRU
+from Backend.Infraestructura.TDA.TDA_CerrojoLecturaEscritura import en_escritura
+from Backend.Infraestructura.ambito_simulacion import ambito_actual
 import time
 import logging
 
 class FabricaRutas(FabricaInterfaz):
-    _instancia = None
+    # Cache de rutas calculadas: clave (origen, destino, algoritmo, version_grafo)
+    CAPACIDAD_CACHE_RUTAS = 4096
+    # TTL en segundos por algoritmo; None = solo se invalida por cambio de versión del grafo
+    TTL_CACHE_RUTAS = {
+        'bfs': 300,
+        'dfs': 300,
+        'topologicalsort': 300,
+        'dijkstra': None,
+        'floydwarshall': None,
+        'bidireccional': None,
+        'alt': None,
+        'ch': None,
+    }
+
     def __new__(cls):
-        # Singleton con repositorio de rutas
-        if cls._instancia is None:
-            cls._instancia = super().__new__(cls)
-            cls._instancia.errores = []
-        return cls._instancia
+        # Instancia unica por ambito de simulacion (ver ambito_simulacion)
+        ambito = ambito_actual()
+        instancia = ambito.obtener(cls)
+        if instancia is None:
+            instancia = super().__new__(cls)
+            instancia.errores = []
+            instancia._cache_rutas = CacheLRU(cls.CAPACIDAD_CACHE_RUTAS, cls.TTL_CACHE_RUTAS)
+            instancia = ambito.registrar(cls, instancia)
+        return instancia
+
+    @property
+    def cerrojo(self):
+        """
+        Cerrojo de lectura/escritura de la simulación singleton, que protege repositorios, grafo y AVL.
+        """
+        # Importar Simulacion aquí para evitar dependencias circulares
+        from Backend.Dominio.Simulacion_dominio import Simulacion
+        return Simulacion().cerrojo
 
-    def crear(self, origen, destino, camino, peso_total, algoritmo, tiempo_calculo=None, id_pedido=None):
+    @en_escritura
+    def crear(self, origen, destino, camino, peso_total, algoritmo, tiempo_calculo=None, id_pedido=None, reemplazar=False):
         """
         Crea una ruta y la almacena en el repositorio, garantizando unicidad y validez.
-        Si ya existe una ruta con la misma clave, retorna la instancia existente.
+        Si ya existe una ruta con la misma clave, retorna la instancia existente,
+        salvo que reemplazar=True (la ruta guardada corresponde a una versión anterior del grafo).
+        Al reemplazar, el AVL de frecuencias solo cuenta la ruta nueva si su camino cambió (y descuenta el anterior).
+        La consulta y el alta se hacen con el cerrojo de escritura, así que dos hilos no registran la misma clave.
         """
         from Backend.Infraestructura.Repositorios.repositorio_rutas import RepositorioRutas
         from Backend.Dominio.Dominio_Ruta import Ruta
@@ -37,7 +71,7 @@ class FabricaRutas(FabricaInterfaz):
         id_ruta_key = f"{ori_id}-{dst_id}-{algoritmo}"
         logger.info(f"Intentando crear ruta: clave={id_ruta_key}, origen={origen}, destino={destino}, algoritmo={algoritmo}, id_pedido={id_pedido}")
         existente = repo.obtener(id_ruta_key)
-        if existente:
+        if existente and not reemplazar:
             logger.info(f"[FabricaRutas] Ruta ya existente en repositorio: clave={id_ruta_key}, id_pedido={getattr(existente, 'id_pedido', None)}")
             return existente
         # Validar que el camino es una lista de aristas reales y extremos correctos
@@ -55,10 +89,25 @@ class FabricaRutas(FabricaInterfaz):
             # Asignar id_ruta como clave única definida previamente
             id_ruta = id_ruta_key
             ruta = Ruta(id_ruta_key, id_pedido, origen, destino, camino, peso_total, algoritmo, tiempo_calculo)
+            if existente:
+                repo.eliminar(id_ruta_key)
             # Registrar ruta en repositorio usando clave string uniforme
             repo.agregar(ruta, id_ruta_key)
+            # Serializar una sola vez: los listados de la API reutilizan el DTO y el hashmap guardados en la ruta
+            try:
+                from Backend.API.Mapeadores.MapeadorRuta import MapeadorRuta
+                MapeadorRuta.precalcular(ruta)
+            except Exception as e:
+                logger.warning(f"[FabricaRutas] No se pudo precalcular la serialización de la ruta {id_ruta_key}: {e}")
             # También insertar en el AVL de la simulación singleton para análisis de frecuencias
-            self._actualizar_avl_simulacion(ruta, id_pedido)
+            if not existente:
+                self._actualizar_avl_simulacion(ruta, id_pedido)
+            elif self._generar_clave_camino(existente) != self._generar_clave_camino(ruta):
+                self._descontar_avl_simulacion(existente)
+                self._actualizar_avl_simulacion(ruta, id_pedido)
+            else:
+                # Mismo camino: la ruta ya estaba contada, solo se actualiza el objeto asociado
+                self._actualizar_avl_simulacion(ruta, id_pedido, frecuencia=0)
             logger.info(f"[FabricaRutas] Ruta creada correctamente y registrada en repositorio singleton: {ruta} (id_pedido={id_pedido})")
             return ruta
         except Exception as e:
@@ -77,22 +126,89 @@ class FabricaRutas(FabricaInterfaz):
     def limpiar(self):
         from Backend.Infraestructura.Repositorios.repositorio_rutas import RepositorioRutas
         RepositorioRutas().limpiar()
+        self._cache_rutas.limpiar()
         self.errores.clear()
 
+    def invalidar_cache(self):
+        """
+        Vacía la cache de rutas sin tocar el repositorio (por ejemplo, al aplicar rutas escritas por otro proceso).
+        """
+        self._cache_rutas.limpiar()
+
+    def estadisticas_cache(self):
+        """
+        Retorna los contadores de la cache de rutas (aciertos, fallos, desalojos, expirados).
+        """
+        return self._cache_rutas.estadisticas()
+
+    def configurar_cache(self, capacidad=None, ttl_por_algoritmo=None):
+        """
+        Ajusta la capacidad LRU y/o el TTL por algoritmo de la cache de rutas.
+        """
+        self._cache_rutas.configurar(capacidad, ttl_por_algoritmo)
+        return self._cache_rutas.estadisticas()
+
+    def _clave_cache(self, pedido, grafo, algoritmo):
+        """
+        Clave de cache de una ruta: extremos, algoritmo y versión del grafo sobre el que se calculó.
+        Al mutar el grafo cambia la versión, por lo que nunca se sirve un camino sobre aristas eliminadas.
+        """
+        return (pedido.origen.id_elemento(), pedido.destino.id_elemento(), algoritmo.lower(), grafo.version())
+
+    def _ruta_cacheada(self, pedido, grafo, algoritmo):
+        """
+        Retorna la ruta vigente para (pedido, algoritmo) en la versión actual del grafo, o None.
+        """
+        return self._cache_rutas.obtener(self._clave_cache(pedido, grafo, algoritmo), algoritmo.lower())
+
+    def _calcular_camino(self, estrategia, origen, destino, grafo, autonomia, **opciones):
+        """
+        Ejecuta la estrategia con el cerrojo de lectura; retorna (camino, peso_total, version_grafo).
+        """
+        with self.cerrojo.lectura():
+            version = grafo.version()
+            camino, peso_total = estrategia.calcular_ruta(origen, destino, grafo, autonomia, **opciones)
+        return camino, peso_total, version
+
+    @en_escritura
+    def _registrar_ruta(self, pedido, grafo, camino, peso_total, algoritmo, tiempo_calculo, version=None):
+        """
+        Crea la ruta (reemplazando la de una versión anterior del grafo) y la guarda en la cache.
+        version es la del grafo sobre la que se calculó el camino: si el grafo cambió o el pedido ya no
+        está en el repositorio (la simulación se reinició) la ruta se descarta y se retorna None.
+        Si otro hilo registró antes la misma ruta para esta versión, se retorna esa.
+        """
+        from Backend.Infraestructura.Repositorios.repositorio_pedidos import RepositorioPedidos
+        logger = logging.getLogger("FabricaRutas")
+        if version is not None and grafo.version() != version:
+            logger.warning(f"[FabricaRutas] Ruta descartada: el grafo cambió durante el cálculo (pedido={getattr(pedido, 'id_pedido', None)}, algoritmo={algoritmo})")
+            return None
+        if RepositorioPedidos().obtener(getattr(pedido, 'id_pedido', None)) is not pedido:
+            logger.warning(f"[FabricaRutas] Ruta descartada: el pedido {getattr(pedido, 'id_pedido', None)} ya no pertenece a la simulación")
+            return None
+        vigente = self._ruta_cacheada(pedido, grafo, algoritmo)
+        if vigente:
+            return vigente
+        ruta = self.crear(pedido.origen, pedido.destino, camino, peso_total, algoritmo, tiempo_calculo, id_pedido=getattr(pedido, 'id_pedido', None), reemplazar=True)
+        if ruta is not None:
+            self._cache_rutas.guardar(self._clave_cache(pedido, grafo, algoritmo), ruta, algoritmo.lower())
+        return ruta
+
     def obtener_errores(self):
         """
         Retorna la lista de errores registrados durante la creación o gestión de rutas.
         """
         return self.errores
 
-    def calcular_ruta(self, pedido, grafo, algoritmo, autonomia=50):
+    def calcular_ruta(self, pedido, grafo, algoritmo, autonomia=50, usar_csr=False):
         """
         Calcula y crea una ruta para un pedido usando un algoritmo específico.
-        Si ya existe una ruta con el mismo origen, destino y algoritmo, la retorna.
+        Si la cache tiene una ruta con el mismo origen, destino y algoritmo para la versión
+        actual del grafo, la retorna; si el grafo cambió desde entonces, la recalcula.
         Siempre trabaja con el objeto real de memoria y actualiza el repositorio para unicidad.
         Valida que el pedido no esté entregado antes de calcular.
+        Con usar_csr=True la estrategia trabaja sobre el snapshot compacto grafo.obtener_csr().
         """
-        from Backend.Infraestructura.Repositorios.repositorio_rutas import RepositorioRutas
         import time
         import logging
         logger = logging.getLogger("FabricaRutas")
@@ -107,10 +223,9 @@ class FabricaRutas(FabricaInterfaz):
         ori_id = getattr(pedido.origen.elemento, 'id_cliente', None) or getattr(pedido.origen.elemento, 'id_almacenamiento', None) or getattr(pedido.origen.elemento, 'id_recarga', None)
         dst_id = getattr(pedido.destino.elemento, 'id_cliente', None) or getattr(pedido.destino.elemento, 'id_almacenamiento', None) or getattr(pedido.destino.elemento, 'id_recarga', None)
         id_ruta_key = f"{ori_id}-{dst_id}-{algoritmo}"
-        repo = RepositorioRutas()
-        existente = repo.obtener(id_ruta_key)
+        existente = self._ruta_cacheada(pedido, grafo, algoritmo)
         if existente:
-            logger.info(f"[FabricaRutas] Ruta ya existente en repositorio: clave={id_ruta_key}")
+            logger.info(f"[FabricaRutas] Ruta vigente en cache: clave={id_ruta_key}")
             return existente
         # Si no existe, calcular y crear
         inicio = time.time()
@@ -119,7 +234,10 @@ class FabricaRutas(FabricaInterfaz):
             'dfs': RutaEstrategiaDFS.RutaEstrategiaDFS,
             'dijkstra': RutaEstrategiaDijkstra.RutaEstrategiaDijkstra,
             'floydwarshall': RutaEstrategiaFloydWarshall.RutaEstrategiaFloydWarshall,
-            'topologicalsort': RutaEstrategiaTopologicalSort.RutaEstrategiaTopologicalSort
+            'topologicalsort': RutaEstrategiaTopologicalSort.RutaEstrategiaTopologicalSort,
+            'bidireccional': RutaEstrategiaBidireccional.RutaEstrategiaBidireccional,
+            'alt': RutaEstrategiaALT.RutaEstrategiaALT,
+            'ch': RutaEstrategiaCH.RutaEstrategiaCH
         }
         Estrategia = estrategias.get(algoritmo.lower())
         if not Estrategia:
@@ -127,22 +245,27 @@ class FabricaRutas(FabricaInterfaz):
             self.errores.append(f"Algoritmo de ruta no soportado: {algoritmo}")
             return None
         estrategia = Estrategia()
-        camino, peso_total = estrategia.calcular_ruta(pedido.origen, pedido.destino, grafo, autonomia)
+        try:
+            camino, peso_total, version = self._calcular_camino(estrategia, pedido.origen, pedido.destino, grafo, autonomia, usar_csr=usar_csr)
+        except Exception:
+            self._descartar_ruta(pedido, algoritmo)
+            raise
         tiempo = time.time() - inicio
         if not camino or peso_total is None or peso_total == float('inf'):
             logger.error(f"No existe una ruta posible entre los vertices seleccionados (clave={id_ruta_key})")
             self.errores.append(f"No existe una ruta posible entre los vertices seleccionados (clave={id_ruta_key})")
+            self._descartar_ruta(pedido, algoritmo)
             return None
         # Crear la ruta y asociar correctamente el id_pedido
         # Crear y registrar la nueva ruta usando la clave string uniforme
-        ruta = self.crear(pedido.origen, pedido.destino, camino, peso_total, algoritmo, tiempo_calculo=tiempo, id_pedido=getattr(pedido, 'id_pedido', None))
+        ruta = self._registrar_ruta(pedido, grafo, camino, peso_total, algoritmo, tiempo, version)
         logger.info(f"[FabricaRutas] Ruta calculada y registrada para pedido {getattr(pedido, 'id_pedido', None)}: {ruta}")
         return ruta
 
-    def calcular_ruta_todos(self, pedido, grafo, autonomia=50, max_workers=12):
+    def calcular_ruta_todos(self, pedido, grafo, autonomia=50, max_workers=12, usar_csr=False):
         """
         Calcula rutas para un pedido con todos los algoritmos disponibles.
-        Retorna un dict {algoritmo: Ruta} y reutiliza rutas existentes.
+        Retorna un dict {algoritmo: Ruta} y reutiliza las rutas vigentes en cache.
         """
         import time
         import logging
@@ -152,10 +275,11 @@ class FabricaRutas(FabricaInterfaz):
             'dfs': RutaEstrategiaDFS.RutaEstrategiaDFS,
             'dijkstra': RutaEstrategiaDijkstra.RutaEstrategiaDijkstra,
             'floydwarshall': RutaEstrategiaFloydWarshall.RutaEstrategiaFloydWarshall,
-            'topologicalsort': RutaEstrategiaTopologicalSort.RutaEstrategiaTopologicalSort
+            'topologicalsort': RutaEstrategiaTopologicalSort.RutaEstrategiaTopologicalSort,
+            'bidireccional': RutaEstrategiaBidireccional.RutaEstrategiaBidireccional,
+            'alt': RutaEstrategiaALT.RutaEstrategiaALT,
+            'ch': RutaEstrategiaCH.RutaEstrategiaCH
         }
-        from Backend.Infraestructura.Repositorios.repositorio_rutas import RepositorioRutas
-        repo = RepositorioRutas()
         resultados = {}
         tiempos = {}
         for algoritmo, Estrategia in estrategias_clases.items():
@@ -163,124 +287,284 @@ class FabricaRutas(FabricaInterfaz):
             ori_id = getattr(pedido.origen.elemento, 'id_cliente', None) or getattr(pedido.origen.elemento, 'id_almacenamiento', None) or getattr(pedido.origen.elemento, 'id_recarga', None)
             dst_id = getattr(pedido.destino.elemento, 'id_cliente', None) or getattr(pedido.destino.elemento, 'id_almacenamiento', None) or getattr(pedido.destino.elemento, 'id_recarga', None)
             id_ruta_key = f"{ori_id}-{dst_id}-{algoritmo}"
-            existente = repo.obtener(id_ruta_key)
+            existente = self._ruta_cacheada(pedido, grafo, algoritmo)
             if existente:
-                logger.info(f"[FabricaRutas] Ruta ya existente en repositorio: clave={id_ruta_key}")
+                logger.info(f"[FabricaRutas] Ruta vigente en cache: clave={id_ruta_key}")
                 resultados[algoritmo] = existente
                 tiempos[algoritmo] = 0.0
                 continue
             inicio = time.time()
             estrategia = Estrategia()
-            camino, peso_total = estrategia.calcular_ruta(pedido.origen, pedido.destino, grafo, autonomia)
+            try:
+                camino, peso_total, version = self._calcular_camino(estrategia, pedido.origen, pedido.destino, grafo, autonomia, usar_csr=usar_csr)
+            except Exception:
+                self._descartar_ruta(pedido, algoritmo)
+                raise
             tiempo_alg = time.time() - inicio
             if not camino or peso_total is None or peso_total == float('inf'):
                 logger.error(f"No existe una ruta posible entre los vertices seleccionados (clave={id_ruta_key})")
                 self.errores.append(f"No existe una ruta posible entre los vertices seleccionados (clave={id_ruta_key})")
+                self._descartar_ruta(pedido, algoritmo)
                 resultados[algoritmo] = None
                 tiempos[algoritmo] = tiempo_alg
                 continue
             # Crear y registrar la nueva ruta
-            ruta = self.crear(pedido.origen, pedido.destino, camino, peso_total, algoritmo, tiempo_alg, id_pedido=getattr(pedido, 'id_pedido', None))
+            ruta = self._registrar_ruta(pedido, grafo, camino, peso_total, algoritmo, tiempo_alg, version)
             logger.info(f"[FabricaRutas] Ruta creada y registrada en repositorio singleton: {ruta}")
             resultados[algoritmo] = ruta
             tiempos[algoritmo] = tiempo_alg
         return resultados
 
-    def calcular_rutas_algoritmos(self, pedidos, grafo, autonomia=50, max_workers=12):
+    def calcular_rutas_algoritmos(self, pedidos, grafo, autonomia=50, max_workers=None, usar_csr=False, motor=None):
         """
-        Calcula rutas para todos los pedidos y algoritmos en paralelo, usando chunks por pedido.
-        Cada proceso calcula todas las rutas de un pedido (todos los algoritmos).
+        Calcula rutas para todos los pedidos pendientes con todos los algoritmos.
+        Los trabajos (origen, destino, algoritmo) sin ruta vigente en cache se reparten entre procesos
+        trabajadores (MotorRutasLote) que leen el grafo desde memoria compartida y devuelven posiciones
+        de aristas; este proceso crea las Ruta y actualiza repositorio, cache y AVL.
+        Floyd-Warshall, Dijkstra cuando existe la tabla de recargas, ALT y la jerarquía de contracción se
+        resuelven aquí porque sus consultas se apoyan en estructuras precalculadas del snapshot (matrices,
+        tabla, landmarks, atajos): se construyen una vez y todos los pedidos las comparten.
+        Las rutas se registran solo si el grafo conserva la versión del snapshot CSR usado.
+        max_workers=None usa todos los núcleos disponibles. motor permite reutilizar un MotorRutasLote abierto
+        (pool y memoria compartida) entre varias llamadas, como hacen los lotes de un trabajo.
         Retorna un dict {algoritmo: {id_pedido: ruta}} y un dict de tiempos.
-        Siempre guarda cada ruta en el repositorio para unicidad y persistencia.
         """
-        import concurrent.futures
-        import time
-        from Backend.Infraestructura.Repositorios.repositorio_rutas import RepositorioRutas
+        from Backend.Dominio.AlgEstrategias.MotorRutasLote import MotorRutasLote, ESTRATEGIAS_LOTE
+        from Backend.Dominio.AlgEstrategias.TablaRutasRecarga import TablaRutasRecarga
         logger = logging.getLogger("FabricaRutas")
         estrategias_clases = {
             'bfs': RutaEstrategiaBFS.RutaEstrategiaBFS,
             'dfs': RutaEstrategiaDFS.RutaEstrategiaDFS,
             'dijkstra': RutaEstrategiaDijkstra.RutaEstrategiaDijkstra,
             'floydwarshall': RutaEstrategiaFloydWarshall.RutaEstrategiaFloydWarshall,
-            'topologicalsort': RutaEstrategiaTopologicalSort.RutaEstrategiaTopologicalSort
+            'topologicalsort': RutaEstrategiaTopologicalSort.RutaEstrategiaTopologicalSort,
+            'bidireccional': RutaEstrategiaBidireccional.RutaEstrategiaBidireccional,
+            'alt': RutaEstrategiaALT.RutaEstrategiaALT,
+            'ch': RutaEstrategiaCH.RutaEstrategiaCH
         }
-        repo = RepositorioRutas()
         resultados = {alg: {} for alg in estrategias_clases}
         tiempos = {alg: 0 for alg in estrategias_clases}
-        def tarea_chunk(pedido):
-            """Tarea para calcular rutas de un solo pedido, respetando unicidad por clave string"""
-            id_pedido = getattr(pedido, 'id_pedido', None)
-            res_pedido = {}
-            tiempos_pedido = {}
-            for algoritmo, Estrategia in estrategias_clases.items():
-                # Clave única de ruta como string consistente con crear()
-                ori_id = getattr(pedido.origen.elemento, 'id_cliente', None) or getattr(pedido.origen.elemento, 'id_almacenamiento', None) or getattr(pedido.origen.elemento, 'id_recarga', None)
-                dst_id = getattr(pedido.destino.elemento, 'id_cliente', None) or getattr(pedido.destino.elemento, 'id_almacenamiento', None) or getattr(pedido.destino.elemento, 'id_recarga', None)
-                id_ruta_key = f"{ori_id}-{dst_id}-{algoritmo}"
-                existente = repo.obtener(id_ruta_key)
+        with self.cerrojo.lectura():
+            version = grafo.version()
+            csr = grafo.obtener_csr()
+        en_paralelo = set(ESTRATEGIAS_LOTE)
+        if TablaRutasRecarga.existente(csr, autonomia) is not None:
+            en_paralelo.discard('dijkstra')
+        # Agrupar pedidos por trabajo: pedidos con mismos extremos comparten la ruta calculada
+        trabajos = {}
+        for pedido in [p for p in pedidos if getattr(p, 'status', None) == 'pendiente']:
+            i_origen, i_destino = csr.indice(pedido.origen), csr.indice(pedido.destino)
+            if i_origen is None or i_destino is None:
+                continue
+            for algoritmo in estrategias_clases:
+                existente = self._ruta_cacheada(pedido, grafo, algoritmo)
                 if existente:
-                    logger.info(f"[FabricaRutas] Ruta ya existente en repositorio: clave={id_ruta_key}")
-                    res_pedido[algoritmo] = existente
-                    tiempos_pedido[algoritmo] = 0
+                    resultados[algoritmo][pedido.id_pedido] = existente
                     continue
+                trabajos.setdefault((i_origen, i_destino, algoritmo), []).append(pedido)
+        lote = [(clave, clave[2], clave[0], clave[1], autonomia) for clave in trabajos if clave[2] in en_paralelo]
+        resueltos = (motor or MotorRutasLote(max_workers)).resolver(csr, lote)
+        for clave, pedidos_trabajo in trabajos.items():
+            algoritmo = clave[2]
+            if algoritmo in en_paralelo:
+                posiciones, tiempo_alg = resueltos.get(clave, (None, 0))
+                camino = csr.aristas_de(posiciones) if posiciones else []
+                peso_total = sum(a.peso for a in camino)
+            else:
                 inicio = time.time()
-                estrategia = Estrategia()
-                camino, peso_total = estrategia.calcular_ruta(pedido.origen, pedido.destino, grafo, autonomia)
+                try:
+                    camino, peso_total, _ = self._calcular_camino(estrategias_clases[algoritmo](), pedidos_trabajo[0].origen, pedidos_trabajo[0].destino, grafo, autonomia)
+                except Exception:
+                    camino, peso_total = [], float('inf')
                 tiempo_alg = time.time() - inicio
-                if not camino or peso_total is None or peso_total == float('inf'):
-                    logger.error(f"No existe una ruta posible entre los vertices seleccionados (clave={id_ruta_key})")
-                    res_pedido[algoritmo] = None
-                    tiempos_pedido[algoritmo] = tiempo_alg
-                    continue
-                ruta = self.crear(pedido.origen, pedido.destino, camino, peso_total, algoritmo, tiempo_alg, id_pedido=id_pedido)
-                logger.info(f"[FabricaRutas] Ruta creada y registrada en repositorio singleton: {ruta}")
-                res_pedido[algoritmo] = ruta
-                tiempos_pedido[algoritmo] = tiempo_alg
-            return (id_pedido, res_pedido, tiempos_pedido)
-        pedidos_filtrados = [p for p in pedidos if getattr(p, 'status', None) == 'pendiente']
-        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
-            for id_pedido, res_pedido, tiempos_pedido in executor.map(tarea_chunk, pedidos_filtrados):
-                for algoritmo, ruta in res_pedido.items():
-                    if ruta:
-                        resultados[algoritmo][id_pedido] = ruta
-                        tiempos[algoritmo] += tiempos_pedido[algoritmo]
+            if not camino:
+                logger.error(f"No existe una ruta posible entre los vertices seleccionados (algoritmo={algoritmo}, pedidos={[p.id_pedido for p in pedidos_trabajo]})")
+                self._descartar_ruta(pedidos_trabajo[0], algoritmo)
+                continue
+            for pedido in pedidos_trabajo:
+                ruta = self._ruta_cacheada(pedido, grafo, algoritmo) or self._registrar_ruta(pedido, grafo, camino, peso_total, algoritmo, tiempo_alg, version)
+                if ruta:
+                    resultados[algoritmo][pedido.id_pedido] = ruta
+                    tiempos[algoritmo] += tiempo_alg
         return resultados, tiempos
 
-    def floydwarshall_para_todos_los_pedidos(self, pedidos, grafo, autonomia=50, max_workers=12):
+    def comparar_algoritmos(self, pedidos, grafo, algoritmos=None, consultas=20, autonomia=50):
+        """
+        Benchmark de consultas punto a punto: resuelve los mismos pares (almacén, cliente) de los pedidos
+        pendientes con el núcleo _buscar_csr de cada algoritmo, sin registrar rutas.
+        Dijkstra se mide con su búsqueda por etiquetas (sin la tabla de recargas) como referencia de los demás.
+        Los índices (landmarks de ALT, jerarquía de contracción) se construyen antes de medir y su costo se
+        informa aparte en preproceso.
+        Retorna un dict con la versión del grafo, los preprocesos del snapshot y, por algoritmo, rutas
+        encontradas, tiempos, aceleración respecto de Dijkstra y si los pesos coinciden con los suyos.
         """
-        Calcula rutas óptimas para todos los pedidos usando Floyd-Warshall en paralelo.
+        from Backend.Dominio.AlgEstrategias.MotorRutasLote import ESTRATEGIAS_LOTE
+        from Backend.Dominio.AlgEstrategias.LandmarksALT import LandmarksALT
+        from Backend.Dominio.AlgEstrategias.JerarquiaContraccion import JerarquiaContraccion
+        estrategias_clases = dict(ESTRATEGIAS_LOTE, alt=RutaEstrategiaALT.RutaEstrategiaALT, ch=RutaEstrategiaCH.RutaEstrategiaCH)
+        algoritmos = [a.lower() for a in (algoritmos or ['dijkstra', 'bidireccional', 'alt'])]
+        desconocidos = [a for a in algoritmos if a not in estrategias_clases]
+        if desconocidos:
+            raise ValueError(f"Algoritmos no soportados en el benchmark: {desconocidos}")
+        with self.cerrojo.lectura():
+            version = grafo.version()
+            csr = grafo.obtener_csr()
+        pares = []
+        for pedido in pedidos:
+            if getattr(pedido, 'status', None) != 'pendiente':
+                continue
+            par = (csr.indice(pedido.origen), csr.indice(pedido.destino))
+            if None not in par and par not in pares:
+                pares.append(par)
+                if len(pares) >= consultas:
+                    break
+        preproceso = {}
+        if 'alt' in algoritmos:
+            inicio = time.perf_counter()
+            construidos = LandmarksALT.existente(csr) is None
+            landmarks = LandmarksALT.obtener(csr)
+            preproceso['alt'] = {
+                'landmarks': len(landmarks.landmarks),
+                'tiempo_preproceso': landmarks.tiempo_preproceso,
+                'construido_en_consulta': construidos,
+                'tiempo_espera': time.perf_counter() - inicio,
+            }
+        if 'ch' in algoritmos:
+            inicio = time.perf_counter()
+            construida = JerarquiaContraccion.existente(csr, autonomia) is None
+            jerarquia = JerarquiaContraccion.obtener(csr, autonomia)
+            preproceso['ch'] = {
+                'completo': jerarquia.completo,
+                'nucleo_recargas': sum(jerarquia.nucleo),
+                'atajos': jerarquia.n_atajos,
+                'tiempo_preproceso': jerarquia.tiempo_preproceso,
+                'construido_en_consulta': construida,
+                'tiempo_espera': time.perf_counter() - inicio,
+            }
+        pesos = {}
+        resultados = {}
+        for algoritmo in algoritmos:
+            estrategia = estrategias_clases[algoritmo]()
+            pesos[algoritmo] = []
+            inicio = time.perf_counter()
+            for i_origen, i_destino in pares:
+                try:
+                    posiciones = estrategia._buscar_csr(i_origen, i_destino, csr, autonomia)
+                except Exception:
+                    posiciones = None
+                pesos[algoritmo].append(sum(csr.pesos[k] for k in posiciones) if posiciones is not None else None)
+            tiempo = time.perf_counter() - inicio
+            resultados[algoritmo] = {
+                'encontradas': sum(p is not None for p in pesos[algoritmo]),
+                'tiempo_total': tiempo,
+                'tiempo_medio_ms': 1000 * tiempo / len(pares) if pares else 0.0,
+            }
+        if 'dijkstra' in resultados:
+            referencia = resultados['dijkstra']['tiempo_total']
+            for algoritmo, resultado in resultados.items():
+                resultado['aceleracion'] = referencia / resultado['tiempo_total'] if resultado['tiempo_total'] else None
+                resultado['coincide_con_dijkstra'] = all(
+                    (a is None) == (b is None) and (a is None or abs(a - b) <= 1e-9 * max(1.0, abs(b)))
+                    for a, b in zip(pesos[algoritmo], pesos['dijkstra']))
+        logging.getLogger("FabricaRutas").info(f"[FabricaRutas] Benchmark de rutas: {len(pares)} consultas, algoritmos={algoritmos}")
+        return {
+            'version_grafo': version,
+            'vertices': csr.n_vertices,
+            'aristas': csr.n_aristas,
+            'consultas': len(pares),
+            'autonomia': autonomia,
+            'preproceso': preproceso,
+            'algoritmos': resultados,
+        }
+
+    def floydwarshall_para_todos_los_pedidos(self, pedidos, grafo, autonomia=50, max_workers=12, usar_csr=False):
+        """
+        Calcula rutas óptimas para todos los pedidos usando Floyd-Warshall.
         Retorna (rutas: list Ruta, tiempo_total: float).
-        Optimiza evitando recalcular rutas existentes y guarda en repositorio.
+        Las matrices de todos los pares se calculan una sola vez para la versión actual del grafo
+        y cada pedido solo reconstruye su camino; evita recalcular rutas existentes y guarda en repositorio.
+        max_workers se conserva por compatibilidad de firma.
         """
         from Backend.Dominio.AlgEstrategias.RutaEstrategiaFloydWarshall import RutaEstrategiaFloydWarshall
-        from Backend.Infraestructura.Repositorios.repositorio_rutas import RepositorioRutas
-        import concurrent.futures
         logger = logging.getLogger("FabricaRutas")
-        repo = RepositorioRutas()
         estrategia = RutaEstrategiaFloydWarshall()
         rutas_resultado = []
-        def tarea(pedido):
+        inicio = time.time()
+        # Una sola ejecución O(n³) compartida por todos los pedidos
+        with self.cerrojo.lectura():
+            version = grafo.version()
+            estrategia.matrices_todos_los_pares(grafo.obtener_csr(), autonomia)
+        for pedido in [p for p in pedidos if getattr(p, 'status', None) == 'pendiente']:
             # Generar clave única de ruta como string para consistencia en el HashMap
             ori_id = getattr(pedido.origen.elemento, 'id_cliente', None) or getattr(pedido.origen.elemento, 'id_almacenamiento', None) or getattr(pedido.origen.elemento, 'id_recarga', None)
             dst_id = getattr(pedido.destino.elemento, 'id_cliente', None) or getattr(pedido.destino.elemento, 'id_almacenamiento', None) or getattr(pedido.destino.elemento, 'id_recarga', None)
             clave = f"{ori_id}-{dst_id}-floydwarshall"
-            existente = repo.obtener(clave)
+            existente = self._ruta_cacheada(pedido, grafo, 'floydwarshall')
             if existente:
-                logger.info(f"[FabricaRutas] Ruta FloydWarshall ya existente en repositorio: clave={clave}")
-                return existente
-            camino, peso_total = estrategia.calcular_ruta(pedido.origen, pedido.destino, grafo, autonomia)
+                logger.info(f"[FabricaRutas] Ruta FloydWarshall vigente en cache: clave={clave}")
+                rutas_resultado.append(existente)
+                continue
+            inicio_pedido = time.time()
+            camino, peso_total, _ = self._calcular_camino(estrategia, pedido.origen, pedido.destino, grafo, autonomia)
             if not camino or peso_total is None or peso_total == float('inf'):
                 logger.error(f"No existe una ruta FloydWarshall posible entre los vertices seleccionados (clave={clave})")
-                return None
-            ruta = self.crear(pedido.origen, pedido.destino, camino, peso_total, 'floydwarshall', 0, id_pedido=getattr(pedido, 'id_pedido', None))
+                self._descartar_ruta(pedido, 'floydwarshall')
+                continue
+            ruta = self._registrar_ruta(pedido, grafo, camino, peso_total, 'floydwarshall', time.time() - inicio_pedido, version)
+            if ruta is None:
+                continue
             logger.info(f"[FabricaRutas] Ruta FloydWarshall creada y registrada en repositorio singleton: {ruta}")
-            return ruta
+            rutas_resultado.append(ruta)
+        tiempo_total = time.time() - inicio
+        return rutas_resultado, tiempo_total
+
+    def calcular_rutas_por_almacen(self, pedidos, grafo, autonomia=50):
+        """
+        Calcula rutas Dijkstra para los pedidos pendientes agrupándolos por almacén de origen.
+        Por cada origen se hace una sola búsqueda con batería hacia todos los vértices (ArbolesRutasAlmacen)
+        y el camino de cada pedido se extrae de ese árbol; los árboles quedan en el snapshot, así que los
+        lotes siguientes y los pedidos repetidos al mismo cliente no vuelven a buscar.
+        Las rutas se registran como 'dijkstra' (mismo camino más corto factible) y solo si el grafo
+        conserva la versión del snapshot usado.
+        Retorna (rutas: list Ruta, tiempo_total: float).
+        """
+        from Backend.Dominio.AlgEstrategias.ArbolesRutasAlmacen import ArbolesRutasAlmacen
+        logger = logging.getLogger("FabricaRutas")
+        rutas_resultado = []
         inicio = time.time()
-        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
-            for ruta in executor.map(tarea, [p for p in pedidos if getattr(p, 'status', None) == 'pendiente']):
-                if ruta:
+        with self.cerrojo.lectura():
+            version = grafo.version()
+            csr = grafo.obtener_csr()
+        arboles = ArbolesRutasAlmacen.obtener(csr, autonomia)
+        busquedas_previas = arboles.n_busquedas
+        por_origen = {}
+        for pedido in [p for p in pedidos if getattr(p, 'status', None) == 'pendiente']:
+            existente = self._ruta_cacheada(pedido, grafo, 'dijkstra')
+            if existente:
+                rutas_resultado.append(existente)
+                continue
+            i_origen, i_destino = csr.indice(pedido.origen), csr.indice(pedido.destino)
+            if i_origen is None or i_destino is None:
+                continue
+            por_origen.setdefault(i_origen, []).append((i_destino, pedido))
+        for i_origen, pendientes in por_origen.items():
+            inicio_origen = time.time()
+            arboles.arbol(i_origen)
+            tiempo_arbol = (time.time() - inicio_origen) / len(pendientes)
+            for i_destino, pedido in pendientes:
+                ruta = self._ruta_cacheada(pedido, grafo, 'dijkstra')
+                if ruta is None:
+                    posiciones = arboles.posiciones(i_origen, i_destino)
+                    if not posiciones:
+                        logger.error(f"No existe una ruta posible entre los vertices seleccionados (pedido={pedido.id_pedido}, algoritmo=dijkstra)")
+                        self._descartar_ruta(pedido, 'dijkstra')
+                        continue
+                    camino = csr.aristas_de(posiciones)
+                    ruta = self._registrar_ruta(pedido, grafo, camino, sum(a.peso for a in camino), 'dijkstra', tiempo_arbol, version)
+                if ruta is not None:
                     rutas_resultado.append(ruta)
         tiempo_total = time.time() - inicio
+        logger.info(f"[FabricaRutas] Rutas por almacén: {len(rutas_resultado)} rutas, {len(por_origen)} orígenes, {arboles.n_busquedas - busquedas_previas} búsquedas, tiempo={tiempo_total:.3f}s")
         return rutas_resultado, tiempo_total
 
     def entregar_pedido(self, pedido):
@@ -289,12 +573,14 @@ class FabricaRutas(FabricaInterfaz):
         """
         pedido.status = 'entregado'
         pedido.fecha_entrega = __import__('datetime').datetime.now().isoformat()
+        pedido.notificar_observadores('pedido_entregado', {'fecha_entrega': pedido.fecha_entrega})
         return pedido
 
-    def _actualizar_avl_simulacion(self, ruta, id_pedido):
+    def _actualizar_avl_simulacion(self, ruta, id_pedido, frecuencia=None):
         """
         Actualiza el AVL de la simulación singleton con la nueva ruta.
         Esto asegura que las rutas calculadas se reflejen en el análisis de frecuencias.
+        frecuencia=None suma 1; frecuencia=0 solo actualiza la ruta asociada al camino.
         """
         try:
             # Importar Simulacion aquí para evitar dependencias circulares
@@ -303,11 +589,50 @@ class FabricaRutas(FabricaInterfaz):
             if hasattr(simulacion, '_avl_rutas') and ruta is not None:
                 # Usar el camino de la ruta como clave para el AVL y pasar el objeto ruta completo
                 clave_camino = self._generar_clave_camino(ruta)
-                simulacion._avl_rutas.insertar(clave_camino, ruta=ruta)  # Incrementa frecuencia y almacena ruta
+                simulacion._avl_rutas.insertar(clave_camino, valor=frecuencia, ruta=ruta)  # Incrementa frecuencia y almacena ruta
                 logging.getLogger("FabricaRutas").info(f"[FabricaRutas] Ruta insertada en AVL de simulación: camino={clave_camino}, id_ruta={ruta.id_ruta}")
         except Exception as e:
             logging.getLogger("FabricaRutas").warning(f"[FabricaRutas] No se pudo actualizar AVL de simulación: {e}")
 
+    def _descontar_avl_simulacion(self, ruta):
+        """
+        Resta una ocurrencia del camino de la ruta en el AVL de la simulación (ruta reemplazada o eliminada);
+        el camino se quita del AVL cuando ninguna ruta lo usa.
+        """
+        try:
+            from Backend.Dominio.Simulacion_dominio import Simulacion
+            avl = getattr(Simulacion(), '_avl_rutas', None)
+            if avl is None or ruta is None:
+                return
+            clave_camino = self._generar_clave_camino(ruta)
+            vertice = avl.buscar(clave_camino)
+            if vertice is None:
+                return
+            if vertice.valor <= 1:
+                avl.eliminar(clave_camino)
+            else:
+                avl.insertar(clave_camino, valor=-1)
+        except Exception as e:
+            logging.getLogger("FabricaRutas").warning(f"[FabricaRutas] No se pudo descontar la ruta del AVL de simulación: {e}")
+
+    @en_escritura
+    def _descartar_ruta(self, pedido, algoritmo):
+        """
+        Elimina del repositorio (y descuenta del AVL) la ruta guardada para los extremos del pedido y el
+        algoritmo cuando el recálculo ya no encuentra camino: no debe seguir listándose sobre aristas eliminadas.
+        """
+        from Backend.Infraestructura.Repositorios.repositorio_rutas import RepositorioRutas
+        ori_id = getattr(pedido.origen.elemento, 'id_cliente', None) or getattr(pedido.origen.elemento, 'id_almacenamiento', None) or getattr(pedido.origen.elemento, 'id_recarga', None)
+        dst_id = getattr(pedido.destino.elemento, 'id_cliente', None) or getattr(pedido.destino.elemento, 'id_almacenamiento', None) or getattr(pedido.destino.elemento, 'id_recarga', None)
+        id_ruta_key = f"{ori_id}-{dst_id}-{algoritmo}"
+        repo = RepositorioRutas()
+        existente = repo.obtener(id_ruta_key)
+        if existente is None:
+            return
+        repo.eliminar(id_ruta_key)
+        self._descontar_avl_simulacion(existente)
+        logging.getLogger("FabricaRutas").info(f"[FabricaRutas] Ruta obsoleta eliminada: clave={id_ruta_key}")
+
     def _generar_clave_camino(self, ruta):
         """
         Genera una clave string para el AVL basada en el camino de vértices de la ruta.
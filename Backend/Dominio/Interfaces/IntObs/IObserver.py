@@ -4,6 +4,9 @@ Interfaz Observer para el patron observer en la simulacion logistica de drones.
 from abc import ABC, abstractmethod
 
 class IObserver(ABC):
+    # Nombres (o patrones con '*') de los eventos que el observer recibe desde el BusEventos
+    EVENTOS = ()
+
     @abstractmethod
     def actualizar(self, evento, sujeto=None, datos=None):
         """
@@ -0,0 +1,57 @@
+"""
+Interfaz para los almacenes de persistencia compartida de la simulación.
+Los repositorios (IRepositorio) siguen siendo la cache en memoria de cada proceso; el almacén guarda el
+estado plano (filas por colección y clave) y una versión que crece con cada escritura confirmada,
+de modo que varios procesos del API comparten una misma simulación.
+"""
+from abc import ABC, abstractmethod
+
+class IAlmacenPersistencia(ABC):
+    @abstractmethod
+    def identificador(self):
+        """Retorna un identificador estable del almacén (distingue versiones de almacenes distintos)."""
+        pass
+
+    @abstractmethod
+    def version(self):
+        """Retorna la última versión confirmada (0 si el almacén está vacío)."""
+        pass
+
+    @abstractmethod
+    def iniciar_escritura(self):
+        """Abre una transacción exclusiva entre procesos; otro escritor espera hasta confirmar o cancelar."""
+        pass
+
+    @abstractmethod
+    def guardar(self, filas):
+        """Guarda filas (coleccion, clave, datos) en la transacción abierta; datos None elimina la fila."""
+        pass
+
+    @abstractmethod
+    def reemplazar(self, estado):
+        """Reemplaza todo el contenido por el estado {coleccion: [(clave, datos), ...]}."""
+        pass
+
+    @abstractmethod
+    def confirmar(self, cambios=True):
+        """Cierra la transacción; si hubo cambios avanza la versión. Retorna la versión vigente."""
+        pass
+
+    @abstractmethod
+    def cancelar(self):
+        """Descarta la transacción abierta."""
+        pass
+
+    @abstractmethod
+    def cargar(self):
+        """Retorna (version, estado) con el contenido completo en orden de inserción."""
+        pass
+
+    @abstractmethod
+    def cambios(self, desde):
+        """
+        Retorna (version, filas) con las filas (coleccion, clave, datos) que cambiaron después de la versión
+        desde (datos None si se eliminaron), o None si el registro de cambios no cubre esa versión
+        (por ejemplo, tras reemplazar todo el contenido) y hay que cargar el estado completo.
+        """
+        pass
@@ -25,6 +25,16 @@ class IRepositorio(ABC):
         """Retorna una lista de todas las entidades almacenadas."""
         pass
 
+    @abstractmethod
+    def iterar(self, desde=0):
+        """Itera pares (clave, entidad) en orden de inserción desde la posición indicada."""
+        pass
+
+    @abstractmethod
+    def cantidad(self):
+        """Retorna la cantidad de entidades almacenadas."""
+        pass
+
     @abstractmethod
     def limpiar(self):
         """Elimina todas las entidades del repositorio."""
@@ -6,10 +6,15 @@ from Backend.Infraestructura.Repositorios.repositorio_aristas import Repositorio
 from Backend.Infraestructura.Repositorios.repositorio_pedidos import RepositorioPedidos
 from Backend.Infraestructura.Repositorios.repositorio_rutas import RepositorioRutas
 from Backend.Servicios.Observer.SujetoObservable import SujetoObservable
+from Backend.Servicios.Observer.BusEventos import BusEventos
 from Backend.Servicios.Observer.ObserverEstadisticas import ObserverEstadisticas
 from Backend.Servicios.Observer.ObserverPedidos import ObserverPedidos
+from Backend.Servicios.Observer.ObserverVersion import ObserverVersion
+from Backend.Servicios.Observer.ObserverDeltas import ObserverDeltas
 from Backend.Infraestructura.TDA.TDA_AVL import AVL
 from Backend.Infraestructura.TDA.GrafoConstructor import GrafoConstructor
+from Backend.Infraestructura.TDA.TDA_Arista import Arista
+from Backend.Infraestructura.TDA.TDA_CerrojoLecturaEscritura import CerrojoLecturaEscritura, en_escritura
 from Backend.Dominio.EntFabricas.FabricaVertices import FabricaVertices
 from Backend.Dominio.EntFabricas.FabricaAristas import FabricaAristas
 from Backend.Dominio.EntFabricas.FabricaClientes import FabricaClientes
@@ -17,29 +22,52 @@ from Backend.Dominio.EntFabricas.FabricaAlmacenamientos import FabricaAlmacenami
 from Backend.Dominio.EntFabricas.FabricaRecargas import FabricaRecargas
 from Backend.Dominio.EntFabricas.FabricaPedidos import FabricaPedidos
 from Backend.Dominio.EntFabricas.FabricaRutas import FabricaRutas
+from Backend.Dominio.Simulacion_estado import EstadoSimulacion
+from Backend.Infraestructura.Repositorios.checkpoint_binario import CheckpointBinario
+from Backend.Infraestructura.ambito_simulacion import ambito_actual
 import logging
 import random
 import traceback
 
 class Simulacion(SujetoObservable):
     """
-    Singleton que mantiene una unica instancia de la simulacion.
+    Singleton que mantiene una unica instancia de la simulacion por ambito (ver ambito_simulacion):
+    cada simulacion registrada en RegistroSimulaciones tiene sus propios repositorios, fabricas, grafo y AVL.
     Integra repositorios, logica de negocio, estrategias de ruta y observadores.
+
+    Concurrencia: los endpoints sincronos corren en un pool de hilos y comparten esta instancia.
+    self.cerrojo (lectores-escritor) protege el estado compartido:
+    - Escritura exclusiva: iniciar_simulacion, reiniciar_todo, cambios de estado y entrega de pedidos,
+      y el registro de rutas en FabricaRutas (repositorio de rutas, cache y AVL en un solo paso).
+    - Lectura compartida: las consultas de SimulacionDominioService (listas, estadisticas, snapshots)
+      y el calculo de caminos, que nunca ve un grafo a medio reconstruir.
+    - Una ruta calculada sobre una version del grafo (o para un pedido) que ya no existe al registrarla
+      se descarta en vez de mezclarse con la simulacion nueva.
+    - Las lecturas por bloques (iterar_coleccion) toman el cerrojo por bloque, no durante todo el recorrido.
+
+    Persistencia: con self.persistencia (PersistenciaSimulacion) cada escritura se guarda en un almacen
+    compartido entre procesos y el estado se recarga con restaurar_estado cuando otro proceso escribe.
+    guardar_checkpoint/restaurar_checkpoint llevan el mismo estado a un archivo binario (CheckpointBinario)
+    para reanudar exactamente la misma red, pedidos y rutas tras reiniciar el API.
     """
-    _instancia = None
 
     def __new__(cls, repo_clientes=None, repo_almacenamientos=None,
                 repo_recargas=None, repo_vertices=None,
                 repo_aristas=None, repo_pedidos=None,
                 repo_rutas=None):
-        if cls._instancia is None:
-            cls._instancia = super().__new__(cls)
-        return cls._instancia
+        # Instancia unica por ambito de simulacion (ver ambito_simulacion)
+        ambito = ambito_actual()
+        instancia = ambito.obtener(cls)
+        if instancia is None:
+            instancia = super().__new__(cls)
+            instancia = ambito.registrar(cls, instancia)
+        return instancia
 
     def __init__(self, repo_clientes=None, repo_almacenamientos=None, repo_recargas=None, repo_vertices=None, repo_aristas=None, repo_pedidos=None, repo_rutas=None):
         if hasattr(self, '_inicializado') and self._inicializado:
             return
         super().__init__()
+        self.cerrojo = CerrojoLecturaEscritura()
         self._repo_clientes = repo_clientes or RepositorioClientes()
         self._repo_almacenamientos = repo_almacenamientos or RepositorioAlmacenamientos()
         self._repo_recargas = repo_recargas or RepositorioRecargas()
@@ -50,21 +78,23 @@ class Simulacion(SujetoObservable):
         # Observers
         self.observer_estadisticas = ObserverEstadisticas()
         self.observer_pedidos = ObserverPedidos()
+        self.observer_version = ObserverVersion()
+        self.observer_deltas = ObserverDeltas()
         # AVL rutas
         self._avl_rutas = AVL()
-        # Registrar observers en todos los repositorios y estructuras clave
-        for repo in [self._repo_clientes, self._repo_almacenamientos, self._repo_recargas, self._repo_vertices, self._repo_aristas, self._repo_pedidos, self._repo_rutas]:
-            repo.agregar_observador(self.observer_estadisticas)
-            repo.agregar_observador(self.observer_pedidos)
-        self._avl_rutas.agregar_observador(self.observer_estadisticas)
-        self._avl_rutas.agregar_observador(self.observer_pedidos)
+        # Registrar observers en el bus de eventos: cada uno recibe solo los eventos que declara
         self.agregar_observador(self.observer_estadisticas)
         self.agregar_observador(self.observer_pedidos)
+        self.agregar_observador(self.observer_version)
+        self.agregar_observador(self.observer_deltas)
         # Snapshots de grafos (privados)
         self._snapshots = {}
         self._grafo_n1 = None
         self._grafo_m = None
         self._grafo = None
+        self._parametros = {}
+        # Persistencia compartida entre procesos (None: la simulación vive solo en memoria)
+        self.persistencia = None
         # Fábricas
         self.fabrica_vertices = FabricaVertices()
         self.fabrica_aristas = FabricaAristas()
@@ -85,34 +115,20 @@ class Simulacion(SujetoObservable):
         }
         self._inicializado = True
 
-    def registrar_observadores_global(self, observers=None):
+    def registrar_observadores_global(self, observers=None, eventos=None):
         """
-        Registra todos los observers relevantes en todos los repositorios, TDA y entidades de dominio.
-        Permite auditar y trazar todos los eventos importantes de la simulación.
+        Suscribe observers en el bus de eventos compartido por repositorios, TDA y entidades de dominio.
+        eventos permite ampliar los eventos declarados por cada observer (por ejemplo ['*'] para auditar todo).
         """
         if observers is None:
             observers = [self.observer_estadisticas, self.observer_pedidos]
-        # Repositorios y sus hashmaps
-        for repo in [self._repo_clientes, self._repo_almacenamientos, self._repo_recargas, self._repo_vertices, self._repo_aristas, self._repo_pedidos, self._repo_rutas]:
-            for obs in observers:
-                repo.agregar_observador(obs)
-            # HashMap interno
-            if hasattr(repo, 'obtener_hashmap'):
-                hashmap = repo.obtener_hashmap()
-                if hashmap:
-                    for obs in observers:
-                        hashmap.agregar_observador(obs)
-        # TDA AVL
         for obs in observers:
-            self._avl_rutas.agregar_observador(obs)
-        # Grafo (si existe)
-        if hasattr(self._repo_vertices, 'grafo') and self._repo_vertices.grafo:
-            for obs in observers:
-                self._repo_vertices.grafo.agregar_observador(obs)
+            BusEventos().suscribir(obs, eventos)
 
     def registrar_observadores_entidad(self, entidad, observers=None):
         """
         Registra los observers en una entidad de dominio (Cliente, Almacenamiento, Recarga, Pedido, Arista, etc).
+        Con el bus de eventos equivale a suscribirlos a los eventos que declaran.
         """
         if observers is None:
             observers = [self.observer_estadisticas, self.observer_pedidos]
@@ -120,18 +136,6 @@ class Simulacion(SujetoObservable):
             for obs in observers:
                 entidad.agregar_observador(obs)
 
-    def notificar_observadores(self, evento, datos=None):
-        """
-        Notifica a todos los observers registrados en la simulación.
-        Cumple con la interfaz IObserver (evento, sujeto, datos).
-        """
-        for observador in getattr(self, '_observadores', []):
-            try:
-                observador.actualizar(evento, self, datos)
-            except Exception as e:
-                import logging
-                logging.error(f"Error notificando observer {type(observador).__name__}: {e}")
-
     @property
     def repo_clientes(self):
         return self._repo_clientes
@@ -180,6 +184,11 @@ class Simulacion(SujetoObservable):
     def grafo(self):
         return self._grafo
 
+    @property
+    def parametros(self):
+        """Parámetros (n_vertices, m_aristas, n_pedidos) de la simulación iniciada."""
+        return self._parametros
+
     @property
     def hashmaps(self):
         """Devuelve los hashmaps de cada repositorio si existen."""
@@ -284,7 +293,57 @@ class Simulacion(SujetoObservable):
         """
         return self._repo_rutas.todos()
 
+    def version(self):
+        """
+        Retorna la version global de la simulacion; cambia con cada mutacion del grafo, pedidos o rutas.
+        """
+        return self.observer_version.version
+
+    def etag(self):
+        """
+        Retorna el ETag de la version actual (ver ObserverVersion.etag); con persistencia, el del almacen,
+        que es el mismo en todos los procesos que comparten la simulacion.
+        """
+        if self.persistencia is not None:
+            return self.persistencia.etag()
+        return self.observer_version.etag()
+
+    def deltas_desde(self, seq: int, limite: int = None):
+        """
+        Retorna (deltas, completo) posteriores a la secuencia seq (ver ObserverDeltas.desde).
+        """
+        return self.observer_deltas.desde(seq, limite)
+
+    def posicion_deltas(self):
+        """
+        Retorna la instancia y la última secuencia del flujo de deltas.
+        """
+        return {'instancia': self.observer_deltas.instancia, 'seq': self.observer_deltas.ultimo_seq}
+
+    def obtener_repositorio(self, coleccion: str):
+        """
+        Retorna el repositorio de una colección por nombre ('pedidos', 'rutas', 'vertices', ...), o None si no existe.
+        Se usa para recorrer colecciones grandes con repositorio.iterar() sin materializar listas.
+        """
+        return {
+            'clientes': self._repo_clientes,
+            'almacenamientos': self._repo_almacenamientos,
+            'recargas': self._repo_recargas,
+            'vertices': self._repo_vertices,
+            'aristas': self._repo_aristas,
+            'pedidos': self._repo_pedidos,
+            'rutas': self._repo_rutas,
+        }.get(coleccion)
+
+    @en_escritura
     def iniciar_simulacion(self, n_vertices: int, m_aristas: int, n_pedidos: int):
+        """
+        Reconstruye la simulación; los clientes del flujo de deltas reciben un único reinicio al terminar.
+        """
+        with self.observer_deltas.en_lote():
+            return self._iniciar_simulacion(n_vertices, m_aristas, n_pedidos)
+
+    def _iniciar_simulacion(self, n_vertices: int, m_aristas: int, n_pedidos: int):
         """
         Inicializa la simulación creando entidades de dominio, vértices, aristas y pedidos usando fábricas y repositorios.
         Limpia todos los repositorios y fábricas antes de iniciar.
@@ -304,13 +363,7 @@ class Simulacion(SujetoObservable):
         logger = logging.getLogger("Simulacion")
         logger.info(f"Iniciando simulación: n_vertices={n_vertices}, m_aristas={m_aristas}, n_pedidos={n_pedidos}")
         # 1. Limpiar todas las fábricas y repositorios
-        FabricaClientes().limpiar()
-        FabricaAlmacenamientos().limpiar()
-        FabricaRecargas().limpiar()
-        FabricaVertices().limpiar()
-        FabricaAristas().limpiar()
-        FabricaPedidos().limpiar()
-        FabricaRutas().limpiar()
+        self._limpiar_fabricas()
         # 2. Crear entidades de dominio
         n_almacenamientos = max(1, n_vertices // 5)
         n_recargas = max(1, n_vertices // 5)
@@ -344,17 +397,10 @@ class Simulacion(SujetoObservable):
             if el is None:
                 logger.error(f"Elemento None detectado en la posición {idx} de elementos de dominio. Abortando inicialización.")
                 raise ValueError("No se pudo crear una entidad de dominio válida.")
-        # 4. Crear vértices para cada elemento
-        vertices = [FabricaVertices().crear(el) for el in elementos]
-        logger.info(f"Vértices creados: {len(vertices)}")
-        # 5. Generar todas las aristas posibles (combinaciones de 2 vértices, peso aleatorio 1-50)
-        from itertools import combinations
-        indices = list(range(len(elementos)))  # <--- CORRECCIÓN: Definir indices
-        aristas_candidatas = set()
-        for u, v in combinations(indices, 2):
-            peso = randint(1, 50)
-            aristas_candidatas.add((u, v, peso))
-        aristas_candidatas = list(aristas_candidatas)
+        # 4. Los vértices de cada elemento los crea GrafoConstructor en un solo lote (insertar_vertices_lote)
+        # 5. Generar aristas candidatas (peso aleatorio 1-50): todos los pares en simulaciones
+        #    pequeñas, muestreo disperso O(n + m) en simulaciones grandes
+        aristas_candidatas = GrafoConstructor.generar_aristas_candidatas(len(elementos), m_aristas)
         logger.info(f"Aristas candidatas generadas: {len(aristas_candidatas)}")
         # 6. Construir el grafo usando GrafoConstructor (él filtra y valida segmentación/conectividad)
         grafo_constructor = GrafoConstructor(
@@ -405,19 +451,206 @@ class Simulacion(SujetoObservable):
                 self._repo_almacenamientos.asociar_pedido_a_almacenamiento(vertice_almacen.elemento.id_almacenamiento, pedido)
                 pedidos.append(pedido)
         logger.info(f"Pedidos creados: {len(pedidos)}")
-        self.notificar_observadores('simulacion_iniciada', {
+        self._parametros = {
             'n_vertices': n_vertices,
             'm_aristas': m_aristas,
             'n_pedidos': n_pedidos
-        })
+        }
+        self.notificar_observadores('simulacion_iniciada', dict(self._parametros))
+        return True
+
+    def _limpiar_fabricas(self):
+        """
+        Limpia todas las fábricas y, con ellas, los repositorios de la simulación.
+        """
+        FabricaClientes().limpiar()
+        FabricaAlmacenamientos().limpiar()
+        FabricaRecargas().limpiar()
+        FabricaVertices().limpiar()
+        FabricaAristas().limpiar()
+        FabricaPedidos().limpiar()
+        FabricaRutas().limpiar()
+
+    def exportar_estado(self):
+        """
+        Estado plano de la simulación (ver EstadoSimulacion), tomado con el cerrojo de lectura.
+        """
+        with self.cerrojo.lectura():
+            return EstadoSimulacion.exportar(self)
+
+    @en_escritura
+    def restaurar_estado(self, estado):
+        """
+        Reemplaza la simulación por la descrita en el estado plano (ver EstadoSimulacion) sin generar nada
+        al azar; los clientes del flujo de deltas reciben un único reinicio al terminar.
+        """
+        with self.observer_deltas.en_lote():
+            self._restaurar_estado(estado)
+
+    def guardar_checkpoint(self, ruta):
+        """
+        Guarda la simulación en un checkpoint binario. Retorna el resumen (bytes y conteos).
+        """
+        return CheckpointBinario.guardar(ruta, self.exportar_estado())
+
+    def restaurar_checkpoint(self, ruta):
+        """
+        Reemplaza la simulación por la guardada en el checkpoint. Retorna los metadatos del archivo.
+        """
+        with CheckpointBinario.abrir(ruta) as estado:
+            self.restaurar_estado(estado)
+            return estado.meta
+
+    def _restaurar_estado(self, estado):
+        logger = logging.getLogger("Simulacion")
+        self._limpiar_fabricas()
+        self._avl_rutas = AVL()
+        if not estado.get('elementos'):
+            self._grafo_n1 = self._grafo_m = self._grafo = None
+            self._snapshots = {}
+            self._parametros = {}
+            self.estado = 'reiniciado'
+            self.notificar_observadores('simulacion_reiniciada', {})
+            return
+        # Entidades de dominio y grafos en el orden guardado
+        fabricas = {
+            'cliente': FabricaClientes(),
+            'almacenamiento': FabricaAlmacenamientos(),
+            'recarga': FabricaRecargas(),
+        }
+        elementos = [fabricas[tipo].crear(id_elemento, nombre) for _, (tipo, id_elemento, nombre) in estado['elementos']]
+        aristas = dict(estado.get('grafo', []))
+        grafo_constructor = GrafoConstructor(n_vertices=len(elementos), elementos=elementos)
+        grafo_constructor.reconstruir(aristas.get('n-1', []), aristas.get('m_aristas', []))
+        self._grafo_n1 = grafo_constructor.grafo_n1
+        self._grafo_m = grafo_constructor.grafo_m
+        self._grafo = grafo_constructor.grafo_m
+        self._snapshots = grafo_constructor.snapshots
+        vertices = {v.id_elemento(): v for v in self._grafo_m.vertices()}
+        # Pedidos con su estado y asociaciones
+        pedidos = []
+        rutas_pedido = {}
+        for clave, datos in estado.get('pedidos', []):
+            pedido = self._restaurar_pedido(clave, datos, vertices)
+            if pedido is None:
+                continue
+            if datos.get('ruta') is not None:
+                rutas_pedido[datos['ruta']] = pedido
+            pedidos.append(pedido)
+        # Rutas sobre las aristas del grafo restaurado
+        for clave, datos in estado.get('rutas', []):
+            ruta = self._restaurar_ruta(clave, datos, vertices)
+            if ruta is not None and ruta.id_ruta in rutas_pedido:
+                rutas_pedido[ruta.id_ruta].ruta = ruta
+        # Frecuencias del AVL tal como estaban (crear() las habría contado de nuevo)
+        self._avl_rutas = AVL()
+        for clave, (frecuencia, id_ruta) in estado.get('frecuencias', []):
+            self._avl_rutas.insertar(clave, frecuencia, self._repo_rutas.obtener(id_ruta) if id_ruta is not None else None)
+        self._parametros = dict(estado['parametros'][0][1]) if estado.get('parametros') else {}
+        logger.info(f"[SIMULACION] Simulación restaurada: {len(elementos)} vértices, {len(pedidos)} pedidos, {self._repo_rutas.cantidad()} rutas")
+        self.notificar_observadores('simulacion_iniciada', dict(self._parametros))
+
+    @en_escritura
+    def aplicar_cambios(self, filas):
+        """
+        Aplica sobre la simulación ya cargada las filas (coleccion, clave, datos) de pedidos, rutas y
+        frecuencias escritas por otro proceso (ver PersistenciaSimulacion), sin reconstruir el grafo;
+        datos None elimina la fila. Retorna False sin aplicar nada si la simulación no está iniciada o
+        alguna fila es de otra colección: esos cambios solo llegan con el estado completo.
+        """
+        por_coleccion = {'pedidos': [], 'rutas': [], 'frecuencias': []}
+        if self._grafo_m is None or any(coleccion not in por_coleccion for coleccion, _, _ in filas):
+            return False
+        for coleccion, clave, datos in filas:
+            por_coleccion[coleccion].append((clave, datos))
+        vertices = {v.id_elemento(): v for v in self._grafo_m.vertices()}
+        rutas_pedido = []
+        for clave, datos in por_coleccion['pedidos']:
+            if datos is None:
+                if self.repo_pedidos.obtener(int(clave)) is not None:
+                    self.repo_pedidos.eliminar(int(clave))
+                continue
+            pedido = self._restaurar_pedido(clave, datos, vertices)
+            if pedido is not None:
+                rutas_pedido.append((pedido, datos.get('ruta')))
+        rutas = {}
+        for clave, datos in por_coleccion['rutas']:
+            if datos is None:
+                if self._repo_rutas.obtener(clave) is not None:
+                    self._repo_rutas.eliminar(clave)
+                continue
+            ruta = self._restaurar_ruta(clave, datos, vertices)
+            if ruta is not None:
+                rutas[ruta.id_ruta] = ruta
+        if por_coleccion['rutas']:
+            self.fabricante_rutas.invalidar_cache()
+        # Los pedidos que seguían apuntando a una ruta reemplazada pasan a la instancia nueva
+        if rutas:
+            for _, pedido in self.repo_pedidos.iterar():
+                id_ruta = getattr(pedido.ruta, 'id_ruta', None)
+                if id_ruta in rutas:
+                    pedido.ruta = rutas[id_ruta]
+        for pedido, id_ruta in rutas_pedido:
+            pedido.ruta = self._repo_rutas.obtener(id_ruta) if id_ruta is not None else None
+        # Frecuencias tal como quedaron en el otro proceso (crear() pudo haberlas contado aquí)
+        for clave, datos in por_coleccion['frecuencias']:
+            vertice = self._avl_rutas.buscar(clave)
+            if datos is None:
+                if vertice is not None:
+                    self._avl_rutas.eliminar(clave)
+                continue
+            frecuencia, id_ruta = datos
+            ruta = self._repo_rutas.obtener(id_ruta) if id_ruta is not None else None
+            if vertice is None:
+                self._avl_rutas.insertar(clave, frecuencia, ruta)
+            else:
+                vertice.valor, vertice.ruta = frecuencia, ruta
         return True
 
+    def _restaurar_pedido(self, clave, datos, vertices):
+        """
+        Crea el pedido de una fila del estado plano, o actualiza el existente con el mismo id. Retorna el pedido o None.
+        """
+        pedido = self.repo_pedidos.obtener(int(clave))
+        if pedido is None:
+            vertice_cliente = vertices[datos['cliente']]
+            vertice_almacen = vertices[datos['origen']]
+            pedido = FabricaPedidos().crear(int(clave), vertice_cliente, vertice_almacen, datos['prioridad'],
+                                            EstadoSimulacion.texto_a_fecha(datos['fecha_creacion']))
+            if pedido is None:
+                return None
+            self._repo_clientes.asociar_pedido_a_cliente(vertice_cliente.elemento.id_cliente, pedido)
+            self._repo_almacenamientos.asociar_pedido_a_almacenamiento(vertice_almacen.elemento.id_almacenamiento, pedido)
+        pedido.status = datos['status']
+        pedido.fecha_entrega = EstadoSimulacion.texto_a_fecha(datos['fecha_entrega'])
+        pedido.peso_total = datos['peso_total']
+        return pedido
+
+    def _restaurar_ruta(self, clave, datos, vertices):
+        """
+        Crea (reemplazando la anterior) la ruta de una fila del estado plano sobre las aristas del grafo. Retorna la ruta o None.
+        """
+        camino = []
+        for id_origen, id_destino, peso in datos['camino']:
+            arista = self._repo_aristas.obtener((id_origen, id_destino))
+            camino.append(arista if arista is not None else Arista(vertices[id_origen], vertices[id_destino], peso))
+        ruta = self.fabricante_rutas.crear(camino[0].origen, camino[-1].destino, camino, datos['peso_total'], datos['algoritmo'],
+                                           datos['tiempo_calculo'], id_pedido=datos['id_pedido'], reemplazar=True)
+        if ruta is None:
+            logging.getLogger("Simulacion").warning(f"[SIMULACION] Ruta {clave} no restaurada: camino inválido")
+            return None
+        ruta.fecha_creacion = EstadoSimulacion.texto_a_fecha(datos['fecha_creacion'])
+        ruta.invalidar_serializados()
+        return ruta
+
+    @en_escritura
     def marcar_pedido_entregado(self, id_pedido: int):
         pedido = self.repo_pedidos.obtener(id_pedido)
         pedido.actualizar_status("entregado")
         self.notificar_observadores("entrega_pedido", {"pedido": id_pedido})
         return pedido
 
+    @en_escritura
     def actualizar_estado_pedido(self, id_pedido: int, nuevo_estado: str):
         """
         Actualiza el estado de un pedido específico.
@@ -460,9 +693,7 @@ class Simulacion(SujetoObservable):
                 'estado_nuevo': nuevo_estado
             })
         
-        # Actualizar en el repositorio
-        self._repo_pedidos.agregar(pedido, id_pedido)
-        
+        # El repositorio guarda la misma instancia: el cambio de estado ya queda registrado
         return pedido
 
     def buscar_pedido(self, id_pedido: int):
@@ -495,6 +726,7 @@ class Simulacion(SujetoObservable):
             logging.getLogger("Simulacion").warning(f"Error obteniendo rutas más frecuentes: {e}")
             return []
 
+    @en_escritura
     def reiniciar_todo(self):
         self.repo_vertices.limpiar()
         self.repo_aristas.limpiar()
@@ -503,6 +735,7 @@ class Simulacion(SujetoObservable):
         self.repo_recargas.limpiar()
         self.repo_pedidos.limpiar()
         self.repo_rutas.limpiar()
+        self.fabricante_rutas.limpiar()
         self._avl_rutas = AVL()
         # Set estado flag
         self.estado = 'reiniciado'
@@ -650,6 +883,7 @@ class Simulacion(SujetoObservable):
             resultados[pedido.id_pedido] = ruta
         return resultados
 
+    @en_escritura
     def entregar_pedido(self, id_pedido: int):
         """
         Marca un pedido como entregado usando la fábrica.
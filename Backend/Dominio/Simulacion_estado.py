@@ -0,0 +1,107 @@
+"""
+EstadoSimulacion: conversión de la simulación en memoria a su estado plano y de vuelta.
+El estado plano es {coleccion: [(clave, datos), ...]} con datos de tipos JSON (listas, dicts, números y
+textos); es lo que guardan los almacenes de persistencia y desde donde Simulacion.restaurar_estado
+reconstruye repositorios, grafos, pedidos, rutas y el AVL de frecuencias.
+"""
+from datetime import datetime
+
+
+class EstadoSimulacion:
+    """
+    Colecciones del estado plano:
+    - parametros: 'simulacion' -> {n_vertices, m_aristas, n_pedidos}
+    - elementos: id -> [tipo, id, nombre], en el orden de los vértices (almacenamientos, recargas, clientes)
+    - grafo: 'n-1' y 'm_aristas' -> [[id_origen, id_destino, peso], ...]
+    - pedidos: id -> {cliente, origen, prioridad, status, fechas, peso_total, ruta}
+    - rutas: id_ruta -> {id_pedido, algoritmo, peso_total, tiempo_calculo, fecha_creacion, camino}
+    - frecuencias: clave del AVL -> [frecuencia, id_ruta]
+    """
+    COLECCIONES = ('parametros', 'elementos', 'grafo', 'pedidos', 'rutas', 'frecuencias')
+
+    @staticmethod
+    def exportar(simulacion):
+        """
+        Estado plano completo de la simulación; vacío si no está iniciada.
+        """
+        if simulacion.grafo_m is None:
+            return {}
+        return {
+            'parametros': [('simulacion', dict(simulacion.parametros))],
+            'elementos': [EstadoSimulacion.fila_elemento(v.elemento) for v in simulacion.grafo_m.vertices()],
+            'grafo': [
+                ('n-1', [EstadoSimulacion.datos_arista(a) for a in simulacion.grafo_n1.aristas_propias()]),
+                ('m_aristas', [EstadoSimulacion.datos_arista(a) for a in simulacion.grafo_m.aristas_propias()]),
+            ],
+            'pedidos': [EstadoSimulacion.fila_pedido(p) for _, p in simulacion.repo_pedidos.iterar()],
+            'rutas': [EstadoSimulacion.fila_ruta(r) for _, r in simulacion.repo_rutas.iterar()],
+            'frecuencias': [EstadoSimulacion.fila_frecuencia(simulacion.avl_rutas, clave)
+                            for clave, _ in simulacion.avl_rutas.inorden()],
+        }
+
+    @staticmethod
+    def id_elemento(elemento):
+        for atributo in ('id_cliente', 'id_almacenamiento', 'id_recarga'):
+            valor = getattr(elemento, atributo, None)
+            if valor is not None:
+                return valor
+        return None
+
+    @staticmethod
+    def fila_elemento(elemento):
+        id_elemento = EstadoSimulacion.id_elemento(elemento)
+        return str(id_elemento), [elemento.tipo_elemento, id_elemento, elemento.nombre]
+
+    @staticmethod
+    def datos_arista(arista):
+        return [arista.origen.id_elemento(), arista.destino.id_elemento(), arista.peso]
+
+    @staticmethod
+    def fila_pedido(pedido):
+        return str(pedido.id_pedido), {
+            'cliente': EstadoSimulacion.id_elemento(pedido.obtener_cliente()),
+            'origen': EstadoSimulacion.id_elemento(pedido.obtener_origen()),
+            'prioridad': pedido.prioridad,
+            'status': pedido.status,
+            'fecha_creacion': EstadoSimulacion._fecha_a_texto(pedido.fecha_creacion),
+            'fecha_entrega': EstadoSimulacion._fecha_a_texto(pedido.fecha_entrega),
+            'peso_total': pedido.peso_total,
+            'ruta': getattr(pedido.ruta, 'id_ruta', None),
+        }
+
+    @staticmethod
+    def fila_ruta(ruta):
+        return str(ruta.id_ruta), {
+            'id_pedido': ruta.id_pedido,
+            'algoritmo': ruta.algoritmo,
+            'peso_total': ruta.peso_total,
+            'tiempo_calculo': ruta.tiempo_calculo,
+            'fecha_creacion': EstadoSimulacion._fecha_a_texto(ruta.fecha_creacion),
+            'camino': [EstadoSimulacion.datos_arista(a) for a in ruta.camino],
+        }
+
+    @staticmethod
+    def fila_frecuencia(avl, clave):
+        vertice = avl.buscar(clave)
+        if vertice is None:
+            return str(clave), None
+        return str(clave), [vertice.valor, getattr(vertice.ruta, 'id_ruta', None)]
+
+    @staticmethod
+    def texto_a_fecha(valor):
+        """
+        Convierte una fecha guardada a datetime. Los datetime se guardan con str() (fecha y hora separadas
+        por espacio); los textos ISO con 'T' eran textos en el dominio y se dejan tal cual.
+        """
+        if not isinstance(valor, str) or ' ' not in valor:
+            return valor
+        try:
+            return datetime.fromisoformat(valor)
+        except (TypeError, ValueError):
+            return valor
+
+    @staticmethod
+    def _fecha_a_texto(valor):
+        if valor is None:
+            return None
+        return str(valor)
@@ -0,0 +1,147 @@
+"""
+AlmacenSQLite: almacén de persistencia compartida sobre un archivo SQLite en modo WAL.
+Varios procesos del API abren el mismo archivo: los lectores no se bloquean entre sí ni con el escritor,
+y las escrituras se serializan con BEGIN IMMEDIATE.
+"""
+from Backend.Dominio.Interfaces.IntRepos.IAlmacenPersistencia import IAlmacenPersistencia
+import json
+import sqlite3
+import threading
+import uuid
+
+
+class AlmacenSQLite(IAlmacenPersistencia):
+    """
+    Guarda el estado de la simulación en la tabla filas (coleccion, clave, datos JSON) y la versión en meta.
+    - Una conexión por hilo: las lecturas de versión no compiten por una conexión compartida.
+    - Las filas de una escritura se guardan con executemany en una sola transacción.
+    - El orden de inserción (rowid) se conserva al actualizar una fila existente.
+    - La tabla cambios anota (version, coleccion, clave) de cada fila guardada, así otro proceso aplica solo
+      lo escrito desde la versión que tiene cargada. meta.cambios_desde es la versión desde la que el
+      registro está completo: reemplazar lo reinicia y solo se conservan las últimas MAX_VERSIONES_CAMBIOS.
+    """
+    MAX_VERSIONES_CAMBIOS = 1000
+
+    def __init__(self, ruta, espera=60.0):
+        self.ruta = ruta
+        self.espera = espera
+        self._local = threading.local()
+        conexion = self._conexion()
+        conexion.execute("BEGIN IMMEDIATE")
+        try:
+            conexion.execute("CREATE TABLE IF NOT EXISTS meta (clave TEXT PRIMARY KEY, valor TEXT NOT NULL)")
+            conexion.execute(
+                "CREATE TABLE IF NOT EXISTS filas ("
+                "coleccion TEXT NOT NULL, clave TEXT NOT NULL, datos TEXT NOT NULL, PRIMARY KEY (coleccion, clave))")
+            conexion.execute("INSERT OR IGNORE INTO meta VALUES ('identificador', ?)", (uuid.uuid4().hex[:12],))
+            conexion.execute("INSERT OR IGNORE INTO meta VALUES ('version', '0')")
+            conexion.execute("CREATE TABLE IF NOT EXISTS cambios (version INTEGER NOT NULL, coleccion TEXT NOT NULL, clave TEXT NOT NULL)")
+            conexion.execute("CREATE INDEX IF NOT EXISTS cambios_version ON cambios (version)")
+            # Un almacén creado antes del registro de cambios solo queda cubierto desde su versión actual
+            conexion.execute("INSERT OR IGNORE INTO meta SELECT 'cambios_desde', valor FROM meta WHERE clave = 'version'")
+            conexion.execute("COMMIT")
+        except BaseException:
+            conexion.execute("ROLLBACK")
+            raise
+        self._identificador = self._meta(conexion, 'identificador')
+
+    def _conexion(self):
+        conexion = getattr(self._local, 'conexion', None)
+        if conexion is None:
+            # isolation_level=None: las transacciones se abren y cierran explícitamente
+            conexion = sqlite3.connect(self.ruta, timeout=self.espera, isolation_level=None, check_same_thread=False)
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.execute("PRAGMA synchronous=NORMAL")
+            self._local.conexion = conexion
+        return conexion
+
+    @staticmethod
+    def _meta(conexion, clave):
+        fila = conexion.execute("SELECT valor FROM meta WHERE clave = ?", (clave,)).fetchone()
+        return fila[0] if fila else None
+
+    def identificador(self):
+        return self._identificador
+
+    def version(self):
+        return int(self._meta(self._conexion(), 'version') or 0)
+
+    def iniciar_escritura(self):
+        self._conexion().execute("BEGIN IMMEDIATE")
+
+    def guardar(self, filas):
+        conexion = self._conexion()
+        altas = [(coleccion, str(clave), json.dumps(datos)) for coleccion, clave, datos in filas if datos is not None]
+        bajas = [(coleccion, str(clave)) for coleccion, clave, datos in filas if datos is None]
+        if altas:
+            conexion.executemany(
+                "INSERT INTO filas VALUES (?, ?, ?) ON CONFLICT (coleccion, clave) DO UPDATE SET datos = excluded.datos",
+                altas)
+        if bajas:
+            conexion.executemany("DELETE FROM filas WHERE coleccion = ? AND clave = ?", bajas)
+        # Se anotan con la versión que asignará confirmar
+        version = int(self._meta(conexion, 'version')) + 1
+        conexion.executemany("INSERT INTO cambios VALUES (?, ?, ?)", ((version, coleccion, str(clave)) for coleccion, clave, _ in filas))
+
+    def reemplazar(self, estado):
+        conexion = self._conexion()
+        conexion.execute("DELETE FROM filas")
+        # Las versiones anteriores a este reemplazo solo pueden ponerse al día cargando todo
+        conexion.execute("DELETE FROM cambios")
+        conexion.execute("UPDATE meta SET valor = CAST((SELECT valor FROM meta WHERE clave = 'version') AS INTEGER) + 1 WHERE clave = 'cambios_desde'")
+        conexion.executemany(
+            "INSERT INTO filas VALUES (?, ?, ?)",
+            ((coleccion, str(clave), json.dumps(datos)) for coleccion, filas in estado.items() for clave, datos in filas))
+
+    def confirmar(self, cambios=True):
+        conexion = self._conexion()
+        if cambios:
+            conexion.execute("UPDATE meta SET valor = CAST(valor AS INTEGER) + 1 WHERE clave = 'version'")
+        version = int(self._meta(conexion, 'version'))
+        if cambios and version > self.MAX_VERSIONES_CAMBIOS:
+            limite = version - self.MAX_VERSIONES_CAMBIOS
+            conexion.execute("DELETE FROM cambios WHERE version <= ?", (limite,))
+            conexion.execute("UPDATE meta SET valor = ? WHERE clave = 'cambios_desde' AND CAST(valor AS INTEGER) < ?", (str(limite), limite))
+        conexion.execute("COMMIT")
+        return version
+
+    def cancelar(self):
+        conexion = self._conexion()
+        if conexion.in_transaction:
+            conexion.execute("ROLLBACK")
+
+    def cargar(self):
+        conexion = self._conexion()
+        # Una transacción de lectura: versión y filas corresponden al mismo estado
+        propia = not conexion.in_transaction
+        if propia:
+            conexion.execute("BEGIN")
+        try:
+            version = int(self._meta(conexion, 'version'))
+            estado = {}
+            for coleccion, clave, datos in conexion.execute("SELECT coleccion, clave, datos FROM filas ORDER BY rowid"):
+                estado.setdefault(coleccion, []).append((clave, json.loads(datos)))
+        finally:
+            if propia:
+                conexion.execute("COMMIT")
+        return version, estado
+
+    def cambios(self, desde):
+        conexion = self._conexion()
+        propia = not conexion.in_transaction
+        if propia:
+            conexion.execute("BEGIN")
+        try:
+            version = int(self._meta(conexion, 'version'))
+            if desde is None or desde < int(self._meta(conexion, 'cambios_desde') or 0) or desde > version:
+                return None
+            # Cada fila cambiada una sola vez, en el orden de su último cambio, con los datos vigentes
+            filas = [(coleccion, clave, json.loads(datos) if datos is not None else None)
+                     for coleccion, clave, datos in conexion.execute(
+                         "SELECT c.coleccion, c.clave, f.datos FROM "
+                         "(SELECT coleccion, clave, MAX(version) AS ultima FROM cambios WHERE version > ? GROUP BY coleccion, clave) c "
+                         "LEFT JOIN filas f ON f.coleccion = c.coleccion AND f.clave = c.clave ORDER BY c.ultima", (desde,))]
+        finally:
+            if propia:
+                conexion.execute("COMMIT")
+        return version, filas
@@ -0,0 +1,317 @@
+"""
+CheckpointBinario: guarda el estado plano de la simulación (ver EstadoSimulacion) en un único archivo
+binario versionado y lo vuelve a abrir con mmap. Los grafos van como arreglos CSR y las columnas numéricas
+de pedidos, rutas y frecuencias como arreglos tipados little-endian; los textos van en listas JSON.
+"""
+from Backend.Dominio.Simulacion_estado import EstadoSimulacion
+from array import array
+from collections.abc import Mapping
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+
+MAGICO = b'SIMCKPT\x00'
+VERSION_FORMATO = 1
+# Cabecera: mágico, versión del formato y bytes del directorio JSON que la sigue
+_CABECERA = struct.Struct('<8sII')
+_ALINEACION = 8
+TIPOS_ELEMENTO = ('almacenamiento', 'recarga', 'cliente')
+GRAFOS = (('n-1', 'n1'), ('m_aristas', 'm'))
+SIN_ID = -1
+
+
+class CheckpointBinario:
+    """
+    Formato del archivo:
+    - cabecera (_CABECERA) y directorio JSON: {'meta': {...}, 'secciones': {nombre: [tipo, desplazamiento, bytes]}}
+    - secciones alineadas a 8 bytes a partir del fin del directorio; tipo es un código de array ('B', 'i',
+      'q', 'd') o 'json' para listas de textos y valores opcionales
+    - grafo_<g>_indptr/indices/pesos: CSR por índice de elemento; grafo_<g>_orden guarda la posición de cada
+      arista en el orden de inserción original, así el grafo se reconstruye idéntico
+    - caminos de rutas concatenados con sus desplazamientos: la ruta i es [desplazamientos[i], desplazamientos[i+1])
+    Los ids ausentes se guardan como -1 y los reales ausentes como NaN.
+    """
+
+    @staticmethod
+    def guardar(ruta, estado):
+        """
+        Escribe el estado plano en ruta (reemplazo atómico). Retorna un resumen con bytes y conteos.
+        """
+        meta, secciones = CheckpointBinario._secciones(estado)
+        bloques = []
+        directorio = {}
+        desplazamiento = 0
+        for nombre, (tipo, valores) in secciones.items():
+            contenido = _codificar(tipo, valores)
+            directorio[nombre] = [tipo, desplazamiento, len(contenido)]
+            relleno = -len(contenido) % _ALINEACION
+            bloques.append(contenido + b'\x00' * relleno)
+            desplazamiento += len(contenido) + relleno
+        cabecera = json.dumps({'meta': meta, 'secciones': directorio}).encode()
+        cabecera += b' ' * (-(len(cabecera) + _CABECERA.size) % _ALINEACION)
+        temporal = f"{ruta}.tmp"
+        with open(temporal, 'wb') as archivo:
+            archivo.write(_CABECERA.pack(MAGICO, VERSION_FORMATO, len(cabecera)))
+            archivo.write(cabecera)
+            for bloque in bloques:
+                archivo.write(bloque)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        os.replace(temporal, ruta)
+        return dict(meta['conteos'], bytes=os.path.getsize(ruta), formato=VERSION_FORMATO)
+
+    @staticmethod
+    def abrir(ruta):
+        """
+        Abre un checkpoint con mmap; las colecciones se decodifican al pedirlas (ver EstadoCheckpoint).
+        """
+        return EstadoCheckpoint(ruta)
+
+    @staticmethod
+    def _secciones(estado):
+        elementos = [datos for _, datos in estado.get('elementos', [])]
+        indices = {datos[1]: i for i, datos in enumerate(elementos)}
+        secciones = {
+            'elementos_tipo': ('B', [TIPOS_ELEMENTO.index(tipo) for tipo, _, _ in elementos]),
+            'elementos_id': ('q', [id_elemento for _, id_elemento, _ in elementos]),
+            'elementos_nombre': ('json', [nombre for _, _, nombre in elementos]),
+        }
+        grafos = dict(estado.get('grafo', []))
+        conteos = {'vertices': len(elementos)}
+        for nombre_grafo, sufijo in GRAFOS:
+            aristas = grafos.get(nombre_grafo, [])
+            orden = sorted(range(len(aristas)), key=lambda k: indices[aristas[k][0]])
+            indptr = [0] * (len(elementos) + 1)
+            for id_origen, _, _ in aristas:
+                indptr[indices[id_origen] + 1] += 1
+            for i in range(len(elementos)):
+                indptr[i + 1] += indptr[i]
+            pesos = [aristas[k][2] for k in orden]
+            secciones[f'grafo_{sufijo}_indptr'] = ('i', indptr)
+            secciones[f'grafo_{sufijo}_indices'] = ('i', [indices[aristas[k][1]] for k in orden])
+            secciones[f'grafo_{sufijo}_pesos'] = (_tipo_numerico(pesos), pesos)
+            secciones[f'grafo_{sufijo}_orden'] = ('i', orden)
+            conteos[f'aristas_{sufijo}'] = len(aristas)
+        # Pedidos
+        pedidos = estado.get('pedidos', [])
+        prioridades, estados = _Categorias(), _Categorias()
+        secciones.update({
+            'pedidos_id': ('q', [int(clave) for clave, _ in pedidos]),
+            'pedidos_cliente': ('i', [indices[datos['cliente']] for _, datos in pedidos]),
+            'pedidos_origen': ('i', [indices[datos['origen']] for _, datos in pedidos]),
+            'pedidos_prioridad': ('B', [prioridades.codigo(datos['prioridad']) for _, datos in pedidos]),
+            'pedidos_status': ('B', [estados.codigo(datos['status']) for _, datos in pedidos]),
+            'pedidos_fecha_creacion': ('json', [datos['fecha_creacion'] for _, datos in pedidos]),
+            'pedidos_fecha_entrega': ('json', [datos['fecha_entrega'] for _, datos in pedidos]),
+            'pedidos_peso_total': ('json', [datos['peso_total'] for _, datos in pedidos]),
+            'pedidos_ruta': ('json', [datos['ruta'] for _, datos in pedidos]),
+        })
+        conteos['pedidos'] = len(pedidos)
+        # Rutas
+        rutas = estado.get('rutas', [])
+        algoritmos = _Categorias()
+        origenes, destinos, pesos, desplazamientos = [], [], [], [0]
+        for _, datos in rutas:
+            for id_origen, id_destino, peso in datos['camino']:
+                origenes.append(indices[id_origen])
+                destinos.append(indices[id_destino])
+                pesos.append(peso)
+            desplazamientos.append(len(origenes))
+        secciones.update({
+            'rutas_id': ('json', [clave for clave, _ in rutas]),
+            'rutas_pedido': ('q', [SIN_ID if datos['id_pedido'] is None else datos['id_pedido'] for _, datos in rutas]),
+            'rutas_algoritmo': ('B', [algoritmos.codigo(datos['algoritmo']) for _, datos in rutas]),
+            'rutas_peso_total': ('json', [datos['peso_total'] for _, datos in rutas]),
+            'rutas_tiempo_calculo': ('d', [math.nan if datos['tiempo_calculo'] is None else datos['tiempo_calculo']
+                                           for _, datos in rutas]),
+            'rutas_fecha_creacion': ('json', [datos['fecha_creacion'] for _, datos in rutas]),
+            'rutas_camino_origen': ('i', origenes),
+            'rutas_camino_destino': ('i', destinos),
+            'rutas_camino_peso': (_tipo_numerico(pesos), pesos),
+            'rutas_desplazamientos': ('i', desplazamientos),
+        })
+        conteos['rutas'] = len(rutas)
+        # Frecuencias del AVL (las filas sin datos eran claves eliminadas)
+        frecuencias = [(clave, datos) for clave, datos in estado.get('frecuencias', []) if datos is not None]
+        secciones.update({
+            'frecuencias_clave': ('json', [clave for clave, _ in frecuencias]),
+            'frecuencias_valor': ('q', [datos[0] for _, datos in frecuencias]),
+            'frecuencias_ruta': ('json', [datos[1] for _, datos in frecuencias]),
+        })
+        conteos['frecuencias'] = len(frecuencias)
+        parametros = dict(estado['parametros'][0][1]) if estado.get('parametros') else {}
+        meta = {
+            'parametros': parametros,
+            'conteos': conteos,
+            'categorias': {'prioridad': prioridades.valores, 'status': estados.valores, 'algoritmo': algoritmos.valores},
+        }
+        return meta, secciones
+
+
+class EstadoCheckpoint(Mapping):
+    """
+    Estado plano leído de un checkpoint mapeado en memoria. Cada colección se decodifica la primera vez
+    que se pide (las secciones que no se usan no se leen del disco); cerrar() libera el mapeo.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        with open(ruta, 'rb') as archivo:
+            self._mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self._mapa) < _CABECERA.size:
+                raise ValueError(f"Checkpoint inválido: {ruta}")
+            magico, version, largo = _CABECERA.unpack_from(self._mapa, 0)
+            if magico != MAGICO:
+                raise ValueError(f"Checkpoint inválido: {ruta}")
+            if version != VERSION_FORMATO:
+                raise ValueError(f"Versión de checkpoint no soportada: {version} (se esperaba {VERSION_FORMATO})")
+            directorio = json.loads(self._mapa[_CABECERA.size:_CABECERA.size + largo])
+        except BaseException:
+            self._mapa.close()
+            raise
+        self.meta = directorio['meta']
+        self._secciones = directorio['secciones']
+        self._base = _CABECERA.size + largo
+        self._colecciones = {}
+
+    def cerrar(self):
+        self._mapa.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def __getitem__(self, coleccion):
+        if coleccion not in EstadoSimulacion.COLECCIONES:
+            raise KeyError(coleccion)
+        if coleccion not in self._colecciones:
+            self._colecciones[coleccion] = getattr(self, f'_leer_{coleccion}')()
+        return self._colecciones[coleccion]
+
+    def __iter__(self):
+        return iter(EstadoSimulacion.COLECCIONES)
+
+    def __len__(self):
+        return len(EstadoSimulacion.COLECCIONES)
+
+    def seccion(self, nombre):
+        tipo, desplazamiento, largo = self._secciones[nombre]
+        inicio = self._base + desplazamiento
+        if tipo == 'json':
+            return json.loads(self._mapa[inicio:inicio + largo])
+        valores = array(tipo)
+        valores.frombytes(self._mapa[inicio:inicio + largo])
+        if sys.byteorder != 'little':
+            valores.byteswap()
+        return valores.tolist()
+
+    def _ids(self):
+        if 'ids' not in self._colecciones:
+            self._colecciones['ids'] = self.seccion('elementos_id')
+        return self._colecciones['ids']
+
+    def _leer_parametros(self):
+        parametros = self.meta.get('parametros')
+        return [('simulacion', dict(parametros))] if parametros else []
+
+    def _leer_elementos(self):
+        return [(str(id_elemento), [TIPOS_ELEMENTO[tipo], id_elemento, nombre]) for tipo, id_elemento, nombre
+                in zip(self.seccion('elementos_tipo'), self._ids(), self.seccion('elementos_nombre'))]
+
+    def _leer_grafo(self):
+        ids = self._ids()
+        grafo = []
+        for nombre_grafo, sufijo in GRAFOS:
+            indptr = self.seccion(f'grafo_{sufijo}_indptr')
+            indices = self.seccion(f'grafo_{sufijo}_indices')
+            pesos = self.seccion(f'grafo_{sufijo}_pesos')
+            orden = self.seccion(f'grafo_{sufijo}_orden')
+            aristas = [None] * len(indices)
+            for u in range(len(indptr) - 1):
+                for k in range(indptr[u], indptr[u + 1]):
+                    aristas[orden[k]] = [ids[u], ids[indices[k]], pesos[k]]
+            grafo.append((nombre_grafo, aristas))
+        return grafo
+
+    def _leer_pedidos(self):
+        ids = self._ids()
+        prioridades = self.meta['categorias']['prioridad']
+        estados = self.meta['categorias']['status']
+        columnas = zip(
+            self.seccion('pedidos_id'), self.seccion('pedidos_cliente'), self.seccion('pedidos_origen'),
+            self.seccion('pedidos_prioridad'), self.seccion('pedidos_status'),
+            self.seccion('pedidos_fecha_creacion'), self.seccion('pedidos_fecha_entrega'),
+            self.seccion('pedidos_peso_total'), self.seccion('pedidos_ruta'))
+        return [(str(id_pedido), {
+            'cliente': ids[cliente],
+            'origen': ids[origen],
+            'prioridad': prioridades[prioridad],
+            'status': estados[status],
+            'fecha_creacion': fecha_creacion,
+            'fecha_entrega': fecha_entrega,
+            'peso_total': peso_total,
+            'ruta': ruta,
+        }) for id_pedido, cliente, origen, prioridad, status, fecha_creacion, fecha_entrega, peso_total, ruta in columnas]
+
+    def _leer_rutas(self):
+        ids = self._ids()
+        algoritmos = self.meta['categorias']['algoritmo']
+        origenes = self.seccion('rutas_camino_origen')
+        destinos = self.seccion('rutas_camino_destino')
+        pesos = self.seccion('rutas_camino_peso')
+        desplazamientos = self.seccion('rutas_desplazamientos')
+        columnas = zip(
+            self.seccion('rutas_id'), self.seccion('rutas_pedido'), self.seccion('rutas_algoritmo'),
+            self.seccion('rutas_peso_total'), self.seccion('rutas_tiempo_calculo'), self.seccion('rutas_fecha_creacion'))
+        rutas = []
+        for i, (id_ruta, id_pedido, algoritmo, peso_total, tiempo_calculo, fecha_creacion) in enumerate(columnas):
+            rutas.append((id_ruta, {
+                'id_pedido': None if id_pedido == SIN_ID else id_pedido,
+                'algoritmo': algoritmos[algoritmo],
+                'peso_total': peso_total,
+                'tiempo_calculo': None if math.isnan(tiempo_calculo) else tiempo_calculo,
+                'fecha_creacion': fecha_creacion,
+                'camino': [[ids[origenes[k]], ids[destinos[k]], pesos[k]]
+                           for k in range(desplazamientos[i], desplazamientos[i + 1])],
+            }))
+        return rutas
+
+    def _leer_frecuencias(self):
+        return [(clave, [valor, id_ruta]) for clave, valor, id_ruta in zip(
+            self.seccion('frecuencias_clave'), self.seccion('frecuencias_valor'), self.seccion('frecuencias_ruta'))]
+
+
+class _Categorias:
+    """
+    Asigna códigos 0..n-1 a valores repetidos (prioridades, estados, algoritmos) en orden de aparición.
+    """
+
+    def __init__(self):
+        self.valores = []
+        self._codigos = {}
+
+    def codigo(self, valor):
+        if valor not in self._codigos:
+            self._codigos[valor] = len(self.valores)
+            self.valores.append(valor)
+        return self._codigos[valor]
+
+
+def _tipo_numerico(valores):
+    # Pesos enteros como 'q' para que vuelvan como int (las respuestas del API no cambian de 12 a 12.0)
+    return 'q' if all(type(v) is int for v in valores) else 'd'
+
+
+def _codificar(tipo, valores):
+    if tipo == 'json':
+        return json.dumps(valores).encode()
+    columna = array(tipo, valores)
+    if sys.byteorder != 'little':
+        columna.byteswap()
+    return columna.tobytes()
@@ -4,6 +4,10 @@ Utiliza HashMap para acceso O(1) y garantiza instanciacion unica.
 """
 from Backend.Infraestructura.TDA.TDA_Hash_map import HashMap
 from Backend.Dominio.Interfaces.IntRepos.IRepositorio import IRepositorio
+from Backend.Servicios.Observer.BusEventos import BusEventos
+from Backend.Infraestructura.ambito_simulacion import ambito_actual
+
+_bus = BusEventos()
 
 class RepositorioAlmacenamientos(IRepositorio):
     """
@@ -11,25 +15,26 @@ class RepositorioAlmacenamientos(IRepositorio):
     Garantiza unicidad y acceso O(1) mediante HashMap.
     Notifica a observadores en operaciones CRUD y mapeo.
     """
-    _instancia = None
 
     def __new__(cls):
-        if cls._instancia is None:
-            cls._instancia = super().__new__(cls)
-            cls._instancia._almacenamientos = HashMap()
-            cls._instancia._observadores = set()
-            cls._instancia.notificar_observadores('repositorio_almacenamientos_creado', None)
-        return cls._instancia
+        # Instancia unica por ambito de simulacion (ver ambito_simulacion)
+        ambito = ambito_actual()
+        instancia = ambito.obtener(cls)
+        if instancia is None:
+            instancia = super().__new__(cls)
+            instancia._almacenamientos = HashMap()
+            instancia.notificar_observadores('repositorio_almacenamientos_creado', None)
+            instancia = ambito.registrar(cls, instancia)
+        return instancia
 
     def agregar_observador(self, observador):
-        self._observadores.add(observador)
+        _bus.suscribir(observador)
 
     def quitar_observador(self, observador):
-        self._observadores.discard(observador)
+        _bus.desuscribir(observador)
 
     def notificar_observadores(self, evento, datos=None):
-        for obs in self._observadores:
-            obs.actualizar(evento, self, datos)
+        _bus.publicar(evento, self, datos)
 
     def agregar(self, almacen):
         """
@@ -75,7 +80,8 @@ class RepositorioAlmacenamientos(IRepositorio):
         :return: Instancia de Almacenamiento o None si no existe.
         """
         almacen = self._almacenamientos.buscar(id_almacenamiento)
-        self.notificar_observadores('repositorio_almacenamientos_obtenido', {'id': id_almacenamiento, 'almacen': almacen})
+        if _bus.escucha('repositorio_almacenamientos_obtenido'):
+            self.notificar_observadores('repositorio_almacenamientos_obtenido', {'id': id_almacenamiento, 'almacen': almacen})
         return almacen
 
     def eliminar(self, id_almacenamiento):
@@ -86,6 +92,15 @@ class RepositorioAlmacenamientos(IRepositorio):
         self._almacenamientos.eliminar(id_almacenamiento)
         self.notificar_observadores('repositorio_almacenamientos_eliminado', {'id': id_almacenamiento})
 
+    def iterar(self, desde=0):
+        """
+        Itera pares (clave, Almacenamiento) en orden de inserción a partir de la posición desde, sin copiar el repositorio.
+        """
+        return self._almacenamientos.iterar(desde)
+
+    def cantidad(self):
+        return len(self._almacenamientos)
+
     def todos(self):
         """
         Retorna una lista de todas las instancias de Almacenamiento.
@@ -4,6 +4,10 @@ Utiliza HashMap para acceso O(1) y garantiza instanciacion unica.
 """
 from Backend.Infraestructura.TDA.TDA_Hash_map import HashMap
 from Backend.Dominio.Interfaces.IntRepos.IRepositorio import IRepositorio
+from Backend.Servicios.Observer.BusEventos import BusEventos
+from Backend.Infraestructura.ambito_simulacion import ambito_actual
+
+_bus = BusEventos()
 
 class RepositorioAristas(IRepositorio):
     """
@@ -11,27 +15,28 @@ class RepositorioAristas(IRepositorio):
     Garantiza unicidad y acceso O(1) mediante HashMap.
     Notifica a observadores en operaciones CRUD y mapeo.
     """
-    _instancia = None
 
     def __new__(cls):
-        if cls._instancia is None:
-            cls._instancia = super().__new__(cls)
-            cls._instancia._aristas = HashMap()
-            cls._instancia._aristas_por_origen = HashMap()
-            cls._instancia._aristas_por_destino = HashMap()
-            cls._instancia._observadores = set()
-            cls._instancia.notificar_observadores('repositorio_aristas_creado', None)
-        return cls._instancia
+        # Instancia unica por ambito de simulacion (ver ambito_simulacion)
+        ambito = ambito_actual()
+        instancia = ambito.obtener(cls)
+        if instancia is None:
+            instancia = super().__new__(cls)
+            instancia._aristas = HashMap()
+            instancia._aristas_por_origen = HashMap()
+            instancia._aristas_por_destino = HashMap()
+            instancia.notificar_observadores('repositorio_aristas_creado', None)
+            instancia = ambito.registrar(cls, instancia)
+        return instancia
 
     def agregar_observador(self, observador):
-        self._observadores.add(observador)
+        _bus.suscribir(observador)
 
     def quitar_observador(self, observador):
-        self._observadores.discard(observador)
+        _bus.desuscribir(observador)
 
     def notificar_observadores(self, evento, datos=None):
-        for obs in self._observadores:
-            obs.actualizar(evento, self, datos)
+        _bus.publicar(evento, self, datos)
 
     def _obtener_id_tipo(self, vertice):
         """
@@ -83,12 +88,55 @@ class RepositorioAristas(IRepositorio):
         self.notificar_observadores('repositorio_aristas_agregada', {'clave': clave, 'arista': arista})
         return arista
 
+    def agregar_lote(self, pares):
+        """
+        Agrega varios pares (clave, Arista) en un solo paso: actualiza el mapa y los índices por origen y
+        destino una vez por vértice y emite un único evento. Las claves existentes (o repetidas en el lote)
+        conservan la primera instancia. Retorna las claves agregadas.
+        """
+        pares = list(pares)
+        existentes = self._aristas.buscar_lote([clave for clave, _ in pares])
+        nuevas = {}
+        for (clave, arista), existente in zip(pares, existentes):
+            if existente is None and clave not in nuevas:
+                nuevas[clave] = arista
+        if not nuevas:
+            return []
+        self._aristas.insertar_lote(nuevas.items())
+        por_origen, por_destino = {}, {}
+        for clave, arista in nuevas.items():
+            if isinstance(clave, tuple):
+                id_origen, id_destino = clave
+            else:
+                id_origen, id_destino = self._obtener_id_tipo(arista.origen)[0], self._obtener_id_tipo(arista.destino)[0]
+            lista = por_origen.get(id_origen)
+            if lista is None:
+                lista = por_origen[id_origen] = []
+            lista.append(arista)
+            lista = por_destino.get(id_destino)
+            if lista is None:
+                lista = por_destino[id_destino] = []
+            lista.append(arista)
+        for indice, grupos in ((self._aristas_por_origen, por_origen), (self._aristas_por_destino, por_destino)):
+            actuales = indice.buscar_lote(list(grupos))
+            indice.insertar_lote((id_vertice, (actual or []) + aristas)
+                                 for (id_vertice, aristas), actual in zip(grupos.items(), actuales))
+        self.notificar_observadores('repositorio_aristas_lote_agregada', {'claves': list(nuevas), 'cantidad': len(nuevas)})
+        return list(nuevas)
+
+    def obtener_lote(self, claves):
+        """
+        Retorna las aristas de varias claves en un solo paso (None para las que no existen).
+        """
+        return self._aristas.buscar_lote(claves)
+
     def obtener(self, clave):
         """
         Retorna objeto Arista real por clave.
         """
         arista = self._aristas.buscar(clave)
-        self.notificar_observadores('repositorio_aristas_obtenida', {'clave': clave, 'arista': arista})
+        if _bus.escucha('repositorio_aristas_obtenida'):
+            self.notificar_observadores('repositorio_aristas_obtenida', {'clave': clave, 'arista': arista})
         return arista
 
     def eliminar(self, clave):
@@ -107,6 +155,15 @@ class RepositorioAristas(IRepositorio):
         self._aristas.eliminar(clave)
         self.notificar_observadores('repositorio_aristas_eliminada', {'clave': clave})
 
+    def iterar(self, desde=0):
+        """
+        Itera pares (clave, Arista) en orden de inserción a partir de la posición desde, sin copiar el repositorio.
+        """
+        return self._aristas.iterar(desde)
+
+    def cantidad(self):
+        return len(self._aristas)
+
     def todos(self):
         """
         Lista de todas las aristas reales.
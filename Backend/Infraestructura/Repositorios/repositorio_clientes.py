@@ -4,6 +4,10 @@ Utiliza HashMap para acceso O(1) y garantiza instanciacion unica.
 """
 from Backend.Infraestructura.TDA.TDA_Hash_map import HashMap
 from Backend.Dominio.Interfaces.IntRepos.IRepositorio import IRepositorio
+from Backend.Servicios.Observer.BusEventos import BusEventos
+from Backend.Infraestructura.ambito_simulacion import ambito_actual
+
+_bus = BusEventos()
 
 class RepositorioClientes(IRepositorio):
     """
@@ -11,25 +15,26 @@ class RepositorioClientes(IRepositorio):
     Garantiza unicidad y acceso O(1) mediante HashMap.
     Notifica a observadores en operaciones CRUD y mapeo.
     """
-    _instancia = None
 
     def __new__(cls):
-        if cls._instancia is None:
-            cls._instancia = super().__new__(cls)
-            cls._instancia._clientes = HashMap()
-            cls._instancia._observadores = set()
-            cls._instancia.notificar_observadores('repositorio_clientes_creado', None)
-        return cls._instancia
+        # Instancia unica por ambito de simulacion (ver ambito_simulacion)
+        ambito = ambito_actual()
+        instancia = ambito.obtener(cls)
+        if instancia is None:
+            instancia = super().__new__(cls)
+            instancia._clientes = HashMap()
+            instancia.notificar_observadores('repositorio_clientes_creado', None)
+            instancia = ambito.registrar(cls, instancia)
+        return instancia
 
     def agregar_observador(self, observador):
-        self._observadores.add(observador)
+        _bus.suscribir(observador)
 
     def quitar_observador(self, observador):
-        self._observadores.discard(observador)
+        _bus.desuscribir(observador)
 
     def notificar_observadores(self, evento, datos=None):
-        for obs in self._observadores:
-            obs.actualizar(evento, self, datos)
+        _bus.publicar(evento, self, datos)
 
     def agregar(self, cliente):
         """
@@ -74,7 +79,8 @@ class RepositorioClientes(IRepositorio):
         :return: Instancia de Cliente o None si no existe.
         """
         cliente = self._clientes.buscar(id_cliente)
-        self.notificar_observadores('repositorio_clientes_obtenido', {'id': id_cliente, 'cliente': cliente})
+        if _bus.escucha('repositorio_clientes_obtenido'):
+            self.notificar_observadores('repositorio_clientes_obtenido', {'id': id_cliente, 'cliente': cliente})
         return cliente
 
     def eliminar(self, id_cliente):
@@ -85,6 +91,15 @@ class RepositorioClientes(IRepositorio):
         self._clientes.eliminar(id_cliente)
         self.notificar_observadores('repositorio_clientes_eliminado', {'id': id_cliente})
 
+    def iterar(self, desde=0):
+        """
+        Itera pares (clave, Cliente) en orden de inserción a partir de la posición desde, sin copiar el repositorio.
+        """
+        return self._clientes.iterar(desde)
+
+    def cantidad(self):
+        return len(self._clientes)
+
     def todos(self):
         """
         Retorna todos los clientes registrados en el repositorio.
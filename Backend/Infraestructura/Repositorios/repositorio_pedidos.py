@@ -6,6 +6,10 @@ Incluye logging detallado de operaciones y asociaciones.
 from Backend.Infraestructura.TDA.TDA_Hash_map import HashMap
 from Backend.Dominio.Interfaces.IntRepos.IRepositorio import IRepositorio
 import logging
+from Backend.Servicios.Observer.BusEventos import BusEventos
+from Backend.Infraestructura.ambito_simulacion import ambito_actual
+
+_bus = BusEventos()
 
 class RepositorioPedidos(IRepositorio):
     """
@@ -14,32 +18,33 @@ class RepositorioPedidos(IRepositorio):
     Notifica a observadores en operaciones CRUD y mapeo.
     Incluye logging detallado de asociaciones.
     """
-    _instancia = None
 
     def __new__(cls):
-        if cls._instancia is None:
-            cls._instancia = super().__new__(cls)
-            cls._instancia._pedidos = HashMap()
-            cls._instancia._observadores = set()
-            cls._instancia.logger = logging.getLogger("RepositorioPedidos")
-            if not cls._instancia.logger.hasHandlers():
+        # Instancia unica por ambito de simulacion (ver ambito_simulacion)
+        ambito = ambito_actual()
+        instancia = ambito.obtener(cls)
+        if instancia is None:
+            instancia = super().__new__(cls)
+            instancia._pedidos = HashMap()
+            instancia.logger = logging.getLogger("RepositorioPedidos")
+            if not instancia.logger.hasHandlers():
                 handler = logging.StreamHandler()
                 formatter = logging.Formatter('[%(levelname)s] %(asctime)s - %(message)s')
                 handler.setFormatter(formatter)
-                cls._instancia.logger.addHandler(handler)
-            cls._instancia.logger.setLevel(logging.INFO)
-            cls._instancia.notificar_observadores('repositorio_pedidos_creado', None)
-        return cls._instancia
+                instancia.logger.addHandler(handler)
+            instancia.logger.setLevel(logging.INFO)
+            instancia.notificar_observadores('repositorio_pedidos_creado', None)
+            instancia = ambito.registrar(cls, instancia)
+        return instancia
 
     def agregar_observador(self, observador):
-        self._observadores.add(observador)
+        _bus.suscribir(observador)
 
     def quitar_observador(self, observador):
-        self._observadores.discard(observador)
+        _bus.desuscribir(observador)
 
     def notificar_observadores(self, evento, datos=None):
-        for obs in self._observadores:
-            obs.actualizar(evento, self, datos)
+        _bus.publicar(evento, self, datos)
 
     def agregar(self, pedido):
         """
@@ -93,7 +98,8 @@ class RepositorioPedidos(IRepositorio):
         """
         pedido = self._pedidos.buscar(id_pedido)
         self.logger.info(f"[RepositorioPedidos] Pedido obtenido: id={id_pedido} | pedido={pedido}")
-        self.notificar_observadores('repositorio_pedidos_obtenido', {'id': id_pedido, 'pedido': pedido})
+        if _bus.escucha('repositorio_pedidos_obtenido'):
+            self.notificar_observadores('repositorio_pedidos_obtenido', {'id': id_pedido, 'pedido': pedido})
         return pedido
 
     def eliminar(self, id_pedido):
@@ -105,6 +111,15 @@ class RepositorioPedidos(IRepositorio):
         self.logger.info(f"[RepositorioPedidos] Pedido eliminado: id={id_pedido}")
         self.notificar_observadores('repositorio_pedidos_eliminado', {'id': id_pedido})
 
+    def iterar(self, desde=0):
+        """
+        Itera pares (clave, Pedido) en orden de inserción a partir de la posición desde, sin copiar el repositorio.
+        """
+        return self._pedidos.iterar(desde)
+
+    def cantidad(self):
+        return len(self._pedidos)
+
     def todos(self):
         """
         Retorna todos los pedidos registrados en el repositorio.
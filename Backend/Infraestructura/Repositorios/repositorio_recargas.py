@@ -4,6 +4,10 @@ Utiliza HashMap para acceso O(1) y garantiza instanciacion unica.
 """
 from Backend.Infraestructura.TDA.TDA_Hash_map import HashMap
 from Backend.Dominio.Interfaces.IntRepos.IRepositorio import IRepositorio
+from Backend.Servicios.Observer.BusEventos import BusEventos
+from Backend.Infraestructura.ambito_simulacion import ambito_actual
+
+_bus = BusEventos()
 
 class RepositorioRecargas(IRepositorio):
     """
@@ -11,25 +15,26 @@ class RepositorioRecargas(IRepositorio):
     Garantiza unicidad y acceso O(1) mediante HashMap.
     Notifica a observadores en operaciones CRUD y mapeo.
     """
-    _instancia = None
 
     def __new__(cls):
-        if cls._instancia is None:
-            cls._instancia = super().__new__(cls)
-            cls._instancia._recargas = HashMap()
-            cls._instancia._observadores = set()
-            cls._instancia.notificar_observadores('repositorio_recargas_creado', None)
-        return cls._instancia
+        # Instancia unica por ambito de simulacion (ver ambito_simulacion)
+        ambito = ambito_actual()
+        instancia = ambito.obtener(cls)
+        if instancia is None:
+            instancia = super().__new__(cls)
+            instancia._recargas = HashMap()
+            instancia.notificar_observadores('repositorio_recargas_creado', None)
+            instancia = ambito.registrar(cls, instancia)
+        return instancia
 
     def agregar_observador(self, observador):
-        self._observadores.add(observador)
+        _bus.suscribir(observador)
 
     def quitar_observador(self, observador):
-        self._observadores.discard(observador)
+        _bus.desuscribir(observador)
 
     def notificar_observadores(self, evento, datos=None):
-        for obs in self._observadores:
-            obs.actualizar(evento, self, datos)
+        _bus.publicar(evento, self, datos)
 
     def agregar(self, recarga):
         """
@@ -63,7 +68,8 @@ class RepositorioRecargas(IRepositorio):
         :return: Instancia de Recarga o None si no existe.
         """
         recarga = self._recargas.buscar(id_recarga)
-        self.notificar_observadores('repositorio_recargas_obtenido', {'id': id_recarga, 'recarga': recarga})
+        if _bus.escucha('repositorio_recargas_obtenido'):
+            self.notificar_observadores('repositorio_recargas_obtenido', {'id': id_recarga, 'recarga': recarga})
         return recarga
 
     def eliminar(self, id_recarga):
@@ -74,6 +80,15 @@ class RepositorioRecargas(IRepositorio):
         self._recargas.eliminar(id_recarga)
         self.notificar_observadores('repositorio_recargas_eliminado', {'id': id_recarga})
 
+    def iterar(self, desde=0):
+        """
+        Itera pares (clave, Recarga) en orden de inserción a partir de la posición desde, sin copiar el repositorio.
+        """
+        return self._recargas.iterar(desde)
+
+    def cantidad(self):
+        return len(self._recargas)
+
     def todos(self):
         """
         Retorna una lista de todas las instancias de Recarga.
@@ -4,6 +4,10 @@ Utiliza HashMap para acceso O(1) y garantiza instanciacion unica.
 """
 from Backend.Infraestructura.TDA.TDA_Hash_map import HashMap
 from Backend.Dominio.Interfaces.IntRepos.IRepositorio import IRepositorio
+from Backend.Servicios.Observer.BusEventos import BusEventos
+from Backend.Infraestructura.ambito_simulacion import ambito_actual
+
+_bus = BusEventos()
 
 class RepositorioRutas(IRepositorio):
     """
@@ -11,25 +15,26 @@ class RepositorioRutas(IRepositorio):
     Garantiza unicidad y acceso O(1) mediante HashMap.
     Notifica a observadores en operaciones CRUD y mapeo.
     """
-    _instancia = None
 
     def __new__(cls):
-        if cls._instancia is None:
-            cls._instancia = super().__new__(cls)
-            cls._instancia._rutas = HashMap()
-            cls._instancia._observadores = set()
-            cls._instancia.notificar_observadores('repositorio_rutas_creado', None)
-        return cls._instancia
+        # Instancia unica por ambito de simulacion (ver ambito_simulacion)
+        ambito = ambito_actual()
+        instancia = ambito.obtener(cls)
+        if instancia is None:
+            instancia = super().__new__(cls)
+            instancia._rutas = HashMap()
+            instancia.notificar_observadores('repositorio_rutas_creado', None)
+            instancia = ambito.registrar(cls, instancia)
+        return instancia
 
     def agregar_observador(self, observador):
-        self._observadores.add(observador)
+        _bus.suscribir(observador)
 
     def quitar_observador(self, observador):
-        self._observadores.discard(observador)
+        _bus.desuscribir(observador)
 
     def notificar_observadores(self, evento, datos=None):
-        for observador in self._observadores:
-            observador.actualizar(evento, self, datos)
+        _bus.publicar(evento, self, datos)
 
     def _clave_ruta(self, ruta):
         """
@@ -63,7 +68,8 @@ class RepositorioRutas(IRepositorio):
         :return: Instancia de Ruta o None si no existe.
         """
         ruta = self._rutas.buscar(clave)
-        self.notificar_observadores('repositorio_rutas_obtenida', {'clave': clave, 'ruta': ruta})
+        if _bus.escucha('repositorio_rutas_obtenida'):
+            self.notificar_observadores('repositorio_rutas_obtenida', {'clave': clave, 'ruta': ruta})
         return ruta
 
     def eliminar(self, clave):
@@ -74,6 +80,15 @@ class RepositorioRutas(IRepositorio):
         self._rutas.eliminar(clave)
         self.notificar_observadores('repositorio_rutas_eliminada', {'clave': clave})
 
+    def iterar(self, desde=0):
+        """
+        Itera pares (clave, Ruta) en orden de inserción a partir de la posición desde, sin copiar el repositorio.
+        """
+        return self._rutas.iterar(desde)
+
+    def cantidad(self):
+        return len(self._rutas)
+
     def todos(self):
         """
         Retorna una lista de todas las instancias de Ruta.
@@ -119,6 +134,7 @@ class RepositorioRutas(IRepositorio):
         if ruta:
             ruta.origen = origen
             ruta.destino = destino
+            ruta.invalidar_serializados()
             self._rutas.insertar(clave, ruta)
             self.notificar_observadores('repositorio_rutas_vertices_asociados', {'clave': clave, 'origen': origen, 'destino': destino})
         return ruta
@@ -128,6 +144,7 @@ class RepositorioRutas(IRepositorio):
         ruta = self.obtener(clave)
         if ruta:
             ruta.camino = camino
+            ruta.invalidar_serializados()
             self._rutas.insertar(clave, ruta)
             self.notificar_observadores('repositorio_rutas_camino_asociado', {'clave': clave, 'camino': camino})
         return ruta
@@ -4,6 +4,10 @@ Utiliza HashMap para acceso O(1) y garantiza instanciacion unica.
 """
 from Backend.Infraestructura.TDA.TDA_Hash_map import HashMap
 from Backend.Dominio.Interfaces.IntRepos.IRepositorio import IRepositorio
+from Backend.Servicios.Observer.BusEventos import BusEventos
+from Backend.Infraestructura.ambito_simulacion import ambito_actual
+
+_bus = BusEventos()
 
 class RepositorioVertices(IRepositorio):
     """
@@ -11,25 +15,26 @@ class RepositorioVertices(IRepositorio):
     Garantiza unicidad y acceso O(1) mediante HashMap.
     Notifica a observadores en operaciones CRUD y mapeo.
     """
-    _instancia = None
 
     def __new__(cls):
-        if cls._instancia is None:
-            cls._instancia = super().__new__(cls)
-            cls._instancia._vertices = HashMap()
-            cls._instancia._observadores = set()
-            cls._instancia.notificar_observadores('repositorio_vertices_creado', None)
-        return cls._instancia
+        # Instancia unica por ambito de simulacion (ver ambito_simulacion)
+        ambito = ambito_actual()
+        instancia = ambito.obtener(cls)
+        if instancia is None:
+            instancia = super().__new__(cls)
+            instancia._vertices = HashMap()
+            instancia.notificar_observadores('repositorio_vertices_creado', None)
+            instancia = ambito.registrar(cls, instancia)
+        return instancia
 
     def agregar_observador(self, observador):
-        self._observadores.add(observador)
+        _bus.suscribir(observador)
 
     def quitar_observador(self, observador):
-        self._observadores.discard(observador)
+        _bus.desuscribir(observador)
 
     def notificar_observadores(self, evento, datos=None):
-        for obs in self._observadores:
-            obs.actualizar(evento, self, datos)
+        _bus.publicar(evento, self, datos)
 
     def agregar(self, vertice, id_elemento):
         """
@@ -47,6 +52,29 @@ class RepositorioVertices(IRepositorio):
         self.notificar_observadores('repositorio_vertices_agregado', {'id_elemento': id_elemento, 'vertice': vertice})
         return vertice
 
+    def agregar_lote(self, pares):
+        """
+        Agrega varios pares (id_elemento, vertice) en un solo paso con un único evento.
+        Los id_elemento que ya existen (o se repiten en el lote) conservan la primera instancia.
+        :return: Lista de id_elemento agregados.
+        """
+        pares = list(pares)
+        existentes = self._vertices.buscar_lote([id_elemento for id_elemento, _ in pares])
+        nuevos = {}
+        for (id_elemento, vertice), existente in zip(pares, existentes):
+            if existente is None and id_elemento not in nuevos:
+                nuevos[id_elemento] = vertice
+        if nuevos:
+            self._vertices.insertar_lote(nuevos.items())
+            self.notificar_observadores('repositorio_vertices_lote_agregado', {'ids': list(nuevos), 'cantidad': len(nuevos)})
+        return list(nuevos)
+
+    def obtener_lote(self, ids_elemento):
+        """
+        Obtiene varios vertices por ID en un solo paso (None para los que no existen).
+        """
+        return self._vertices.buscar_lote(ids_elemento)
+
     def obtener(self, id_elemento):
         """
         Obtiene un vertice del repositorio por su ID.
@@ -54,7 +82,8 @@ class RepositorioVertices(IRepositorio):
         :return: Instancia de Vertice o None si no existe.
         """
         vertice = self._vertices.buscar(id_elemento)
-        self.notificar_observadores('repositorio_vertices_obtenido', {'id_elemento': id_elemento, 'vertice': vertice})
+        if _bus.escucha('repositorio_vertices_obtenido'):
+            self.notificar_observadores('repositorio_vertices_obtenido', {'id_elemento': id_elemento, 'vertice': vertice})
         return vertice
 
     def eliminar(self, id_elemento):
@@ -65,6 +94,15 @@ class RepositorioVertices(IRepositorio):
         self._vertices.eliminar(id_elemento)
         self.notificar_observadores('repositorio_vertices_eliminado', {'id_elemento': id_elemento})
 
+    def iterar(self, desde=0):
+        """
+        Itera pares (clave, Vertice) en orden de inserción a partir de la posición desde, sin copiar el repositorio.
+        """
+        return self._vertices.iterar(desde)
+
+    def cantidad(self):
+        return len(self._vertices)
+
     def todos(self):
         """
         Retorna una lista de todas las instancias de Vertice.
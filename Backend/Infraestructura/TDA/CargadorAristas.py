@@ -0,0 +1,91 @@
+"""
+CargadorAristas: lee aristas (id_origen, id_destino, peso) desde archivos CSV o listas de aristas
+y las inserta en un Grafo por lotes con Grafo.insertar_aristas_lote, sin cargar el archivo completo.
+"""
+import csv
+import logging
+from itertools import islice
+
+
+class CargadorAristas:
+    """
+    Formatos aceptados, una arista por línea:
+    - CSV con separador ',' o ';' (detectado en la primera línea con datos), opcionalmente con encabezado
+      (por ejemplo 'origen,destino,peso')
+    - lista de aristas separada por espacios o tabulaciones: 'id_origen id_destino [peso]'
+    Se ignoran las líneas vacías y las que empiezan con '#'. Sin columna de peso se usa peso_defecto.
+    Los pesos enteros se leen como int y los demás como float.
+    """
+    TAMANO_LOTE = 10000
+
+    def __init__(self, peso_defecto=1, tamano_lote=None):
+        self.peso_defecto = peso_defecto
+        self.tamano_lote = tamano_lote or self.TAMANO_LOTE
+        self.logger = logging.getLogger("CargadorAristas")
+
+    def leer(self, ruta, separador=None):
+        """
+        Generador de tuplas (id_origen, id_destino, peso, numero_linea) en el orden del archivo.
+        Lanza ValueError con el número de línea si una fila no tiene el formato esperado.
+        """
+        with open(ruta, newline='', encoding='utf-8') as archivo:
+            numero = [0]
+            def lineas():
+                for numero[0], linea in enumerate(archivo, start=1):
+                    linea = linea.strip()
+                    if linea and not linea.startswith('#'):
+                        yield linea
+            filas = lineas()
+            primera = next(filas, None)
+            if primera is None:
+                return
+            if separador is None:
+                separador = ',' if ',' in primera else ';' if ';' in primera else ''
+            filas = self._con_primera(primera, filas)
+            filas = csv.reader(filas, delimiter=separador) if separador else (linea.split() for linea in filas)
+            peso_defecto = self.peso_defecto
+            for indice, campos in enumerate(filas):
+                try:
+                    if len(campos) == 3:
+                        peso = campos[2]
+                        peso = int(peso) if peso.strip().lstrip('+-').isdigit() else float(peso)
+                    elif len(campos) == 2:
+                        peso = peso_defecto
+                    else:
+                        raise ValueError(campos)
+                    arista = (int(campos[0]), int(campos[1]), peso, numero[0])
+                except ValueError:
+                    if indice == 0:
+                        continue  # encabezado
+                    raise ValueError(f"{ruta}:{numero[0]}: arista inválida: {separador.join(campos) if separador else ' '.join(campos)!r}")
+                yield arista
+
+    def cargar(self, grafo, ruta, vertices=None, separador=None):
+        """
+        Inserta en el grafo las aristas del archivo, de a tamano_lote por llamada a insertar_aristas_lote.
+        vertices: dict id_elemento -> Vertice; por defecto los vértices del repositorio del grafo.
+        Retorna la cantidad de aristas leídas. Un id desconocido lanza ValueError antes de insertar su lote.
+        """
+        if vertices is None:
+            vertices = {vertice.id_elemento(): vertice for vertice in grafo.vertices()}
+        total = 0
+        aristas = self.leer(ruta, separador)
+        while True:
+            lote = list(islice(aristas, self.tamano_lote))
+            if not lote:
+                break
+            tripletas = []
+            for id_origen, id_destino, peso, numero in lote:
+                origen, destino = vertices.get(id_origen), vertices.get(id_destino)
+                if origen is None or destino is None:
+                    raise ValueError(f"{ruta}:{numero}: vértice inexistente en ({id_origen}, {id_destino})")
+                tripletas.append((origen, destino, peso))
+            grafo.insertar_aristas_lote(tripletas)
+            total += len(tripletas)
+        self.logger.info(f"[CARGA] {total} aristas cargadas desde {ruta}")
+        return total
+
+    @staticmethod
+    def _con_primera(primera, lineas):
+        yield primera
+        yield from lineas
@@ -2,13 +2,13 @@ import logging
 from Backend.Infraestructura.TDA.TDA_Grafo import Grafo
 from Backend.Infraestructura.TDA.TDA_Vertice import Vertice
 from Backend.Infraestructura.TDA.TDA_Arista import Arista
+from Backend.Infraestructura.TDA.ValidadorSegmentacion import ValidadorSegmentacion
 from Backend.Infraestructura.Repositorios.repositorio_vertices import RepositorioVertices
 from Backend.Infraestructura.Repositorios.repositorio_aristas import RepositorioAristas
 from Backend.Dominio.EntFabricas.FabricaVertices import FabricaVertices
 from Backend.Dominio.EntFabricas.FabricaAristas import FabricaAristas
 from typing import List, Tuple, Dict, Any
 import random
-from collections import deque
 
 class GrafoConstructor:
     """
@@ -40,6 +40,58 @@ class GrafoConstructor:
             self.logger.addHandler(handler)
         self.logger.setLevel(logging.INFO)
 
+    # Hasta este tamaño se generan todos los pares como candidatos (comportamiento original)
+    MAX_VERTICES_GENERACION_COMPLETA = 150
+
+    @staticmethod
+    def generar_aristas_candidatas(n_vertices: int, m_aristas: int, peso_maximo: int = 50, grado_candidatos: int = 12, modo: str = 'auto') -> List[Tuple[int, int, int]]:
+        """
+        Genera aristas candidatas (u, v, peso) con u < v y peso aleatorio entre 1 y peso_maximo.
+        Un solo sentido por par basta: en el grafo no dirigido el validador y las rutas recorren ambos.
+        - modo 'completo': todos los n·(n-1)/2 pares, como en las simulaciones pequeñas.
+        - modo 'muestreo': cada vértice propone grado_candidatos vecinos al azar (grafo disperso
+          sobre el que Kruskal obtiene el árbol mínimo) y luego se muestrean pares sin reemplazo
+          hasta cubrir m_aristas; la memoria es O(n·grado_candidatos + m) en vez de O(n²).
+        - modo 'auto': 'completo' hasta MAX_VERTICES_GENERACION_COMPLETA vértices o cuando m_aristas
+          se acerca al total de pares (el muestreo por rechazo dejaría de ser eficiente).
+        """
+        total_pares = n_vertices * (n_vertices - 1) // 2
+        if modo == 'auto':
+            denso = n_vertices <= GrafoConstructor.MAX_VERTICES_GENERACION_COMPLETA or 2 * m_aristas > total_pares
+            modo = 'completo' if denso else 'muestreo'
+        if modo == 'completo':
+            return [(u, v, random.randint(1, peso_maximo)) for u in range(n_vertices) for v in range(u + 1, n_vertices)]
+        candidatas = {}
+        for u in range(n_vertices):
+            for v in random.sample(range(n_vertices - 1), min(grado_candidatos, n_vertices - 1)):
+                v = v + 1 if v >= u else v
+                par = (u, v) if u < v else (v, u)
+                if par not in candidatas:
+                    candidatas[par] = random.randint(1, peso_maximo)
+        # Unir componentes que el muestreo haya dejado aisladas
+        parent = list(range(n_vertices))
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        for u, v in candidatas:
+            parent[find(u)] = find(v)
+        raices = list({find(i) for i in range(n_vertices)})
+        for a, b in zip(raices, raices[1:]):
+            par = (min(a, b), max(a, b))
+            candidatas[par] = random.randint(1, peso_maximo)
+        # Pares adicionales sin reemplazo: el árbol usa n-1 candidatas y el resto debe alcanzar m_aristas
+        objetivo = min(total_pares, m_aristas + n_vertices)
+        while len(candidatas) < objetivo:
+            u, v = random.randrange(n_vertices), random.randrange(n_vertices)
+            if u == v:
+                continue
+            par = (u, v) if u < v else (v, u)
+            if par not in candidatas:
+                candidatas[par] = random.randint(1, peso_maximo)
+        return [(u, v, peso) for (u, v), peso in candidatas.items()]
+
     def construir(self):
         """
         Construye el grafo válido, generando dos snapshots:
@@ -52,12 +104,9 @@ class GrafoConstructor:
         grafo = Grafo(dirigido=self._dirigido)
         grafo._repositorio_vertices = self._repositorio_vertices
         grafo._repositorio_aristas = self._repositorio_aristas
-        # Insertar todos los vértices de dominio
-        vertices = []
-        for elem in self.elementos:
-            vert = grafo.insertar_vertice(elem)
-            vertices.append(vert)
-        self.logger.info(f"[VERTICES] Insertados {len(vertices)} vértices en el grafo: {[getattr(v.elemento, 'nombre', str(v)) for v in vertices]}")
+        # Insertar todos los vértices de dominio (un solo lote: sin fábrica ni eventos por vértice)
+        vertices = grafo.insertar_vertices_lote(self.elementos)
+        self.logger.info(f"[VERTICES] Insertados {len(vertices)} vértices en el grafo")
         # Filtrar aristas candidatas según peso individual <= autonomía
         valid_aristas = [(u, v, w) for u, v, w in self.aristas_candidatas if w <= 50]
         self.logger.info(f"[ARISTAS] Candidatas filtradas por peso<=50: {len(valid_aristas)} de {len(self.aristas_candidatas)}")
@@ -82,12 +131,9 @@ class GrafoConstructor:
         grafo_n1 = Grafo(dirigido=self._dirigido)
         grafo_n1._repositorio_vertices = self._repositorio_vertices
         grafo_n1._repositorio_aristas = self._repositorio_aristas
-        # Insertar vértices en grafo_n1
-        for v in vertices:
-            grafo_n1.insertar_vertice(v.elemento)
-        # Insertar aristas del MST
-        for u_idx, v_idx, peso in arbol_edges:
-            grafo_n1.insertar_arista(vertices[u_idx], vertices[v_idx], peso)
+        # Insertar vértices y aristas del MST en grafo_n1
+        grafo_n1.insertar_vertices_lote(self.elementos)
+        grafo_n1.insertar_aristas_lote((vertices[u_idx], vertices[v_idx], peso) for u_idx, v_idx, peso in arbol_edges)
         # Guardar snapshot n-1 con arbol_edges únicamente
         self.grafo_n1 = grafo_n1
         snapshot_n1 = grafo_n1.snapshot()
@@ -97,30 +143,40 @@ class GrafoConstructor:
         grafo_final = Grafo(dirigido=self._dirigido)
         grafo_final._repositorio_vertices = self._repositorio_vertices
         grafo_final._repositorio_aristas = self._repositorio_aristas
-        # Insertar vértices en grafo_final
-        for v in vertices:
-            grafo_final.insertar_vertice(v.elemento)
-        # Insertar todas las aristas del MST en grafo_final
-        for u_idx, v_idx, peso in arbol_edges:
-            grafo_final.insertar_arista(vertices[u_idx], vertices[v_idx], peso)
-        # Agregar aristas adicionales hasta alcanzar m_aristas, evitando duplicados
-        adicionales = [e for e in valid_aristas if e not in arbol_edges]
+        # Insertar vértices y todas las aristas del MST en grafo_final
+        grafo_final.insertar_vertices_lote(self.elementos)
+        grafo_final.insertar_aristas_lote((vertices[u_idx], vertices[v_idx], peso) for u_idx, v_idx, peso in arbol_edges)
+        # Validación completa sobre el árbol; las aristas extra solo revalidan los pares pendientes
+        validador = ValidadorSegmentacion(grafo_final, vertices)
+        pendientes = validador.validar()
+        self.logger.info(f"[VALIDACION] Árbol mínimo: {len(pendientes)} pares (almacén, cliente) sin camino segmentado")
+        # Agregar aristas adicionales hasta alcanzar m_aristas, evitando duplicados. El validador lleva su
+        # propia adyacencia, así que las aristas elegidas se insertan en el grafo en un solo lote al final
+        en_arbol = set(arbol_edges)
+        adicionales = [e for e in valid_aristas if e not in en_arbol]
         random.shuffle(adicionales)
         count = len(arbol_edges)
-        seen = set((u, v, w) for u, v, w in arbol_edges)
+        seen = en_arbol
+        extra = []
         for u_idx, v_idx, peso in adicionales:
             if count >= self.m_aristas:
                 break
             key = (u_idx, v_idx, peso)
             if key not in seen:
-                grafo_final.insertar_arista(vertices[u_idx], vertices[v_idx], peso)
+                extra.append((vertices[u_idx], vertices[v_idx], peso))
+                if pendientes and validador.agregar_arista(vertices[u_idx], vertices[v_idx], peso):
+                    pendientes = validador.inalcanzables()
                 seen.add(key)
                 count += 1
                 self.logger.debug(f"[GRAFO] Arista extra agregada: ({u_idx}, {v_idx}, peso={peso})")
-        # Validar conectividad final
-        if not self._validar_segmentacion_total(grafo_final, vertices):
+        grafo_final.insertar_aristas_lote(extra)
+        # Validar conectividad final con el estado incremental del validador
+        if not self._reportar_segmentacion(pendientes):
             self.logger.error("[GRAFO] El grafo final no cumple la segmentación ni la conectividad requerida.")
             raise Exception("El grafo final no cumple la segmentación ni la conectividad requerida")
+        # Preconstruir el snapshot compacto CSR que usan las estrategias de ruta
+        csr = grafo_final.obtener_csr()
+        self.logger.info(f"[CSR] Snapshot compacto construido: vértices={csr.n_vertices}, aristas={csr.n_aristas}")
         # Guardar snapshot m_aristas desde grafo_final
         self.grafo_m = grafo_final
         snapshot_m = grafo_final.snapshot()
@@ -130,6 +186,26 @@ class GrafoConstructor:
         # Limpiar referencias a instancias temporales
         del grafo_n1, grafo_final, vertices
 
+    def reconstruir(self, aristas_n1, aristas_m):
+        """
+        Reconstruye grafo_n1, grafo_m y sus snapshots con aristas ya elegidas (id_origen, id_destino, peso),
+        sin generar candidatas ni validar segmentación: se usa al restaurar una simulación guardada.
+        Las aristas se insertan en el mismo orden que en construir(), primero el árbol y luego el grafo final.
+        """
+        for tipo, aristas in (('n-1', aristas_n1), ('m_aristas', aristas_m)):
+            grafo = Grafo(dirigido=self._dirigido)
+            grafo._repositorio_vertices = self._repositorio_vertices
+            grafo._repositorio_aristas = self._repositorio_aristas
+            vertices = {vertice.id_elemento(): vertice for vertice in grafo.insertar_vertices_lote(self.elementos)}
+            grafo.insertar_aristas_lote((vertices[id_origen], vertices[id_destino], peso) for id_origen, id_destino, peso in aristas)
+            self.snapshots[tipo] = grafo.snapshot()
+            if tipo == 'n-1':
+                self.grafo_n1 = grafo
+            else:
+                grafo.obtener_csr()
+                self.grafo_m = grafo
+        self.logger.info(f"[RECONSTRUIR] Grafo restaurado: vértices={len(self.elementos)}, aristas n-1={len(aristas_n1)}, aristas m={len(aristas_m)}")
+
     def construir_grafo(self, vertices_data, aristas_data):
         """
         Construye un grafo a partir de listas de datos de vértices y aristas.
@@ -217,66 +293,21 @@ class GrafoConstructor:
         return True
 
     def _validar_segmentacion_total(self, grafo: Grafo, vertices: List[Vertice]) -> bool:
+        """
+        Valida que todos los pares (almacén, cliente) tengan un camino segmentado por la autonomía.
+        Usa una búsqueda por almacén (ValidadorSegmentacion) y reporta todos los pares fallidos a la vez.
+        """
         self.logger.info("[VALIDACION] Validando segmentación total para todos los pares (almacén, cliente)...")
-        def obtener_tipo(elemento):
-            if isinstance(elemento, dict):
-                return elemento.get('tipo', None)
-            return getattr(elemento, 'tipo', None)
-        def obtener_id(elemento):
-            if isinstance(elemento, dict):
-                return elemento.get('id', None)
-            return getattr(elemento, 'id_almacenamiento', None) or getattr(elemento, 'id_cliente', None) or getattr(elemento, 'id_recarga', None)
-        idxs_almacen = [i for i, v in enumerate(vertices) if obtener_tipo(v.elemento) == 'almacenamiento']
-        idxs_cliente = [i for i, v in enumerate(vertices) if obtener_tipo(v.elemento) == 'cliente']
-        idxs_recarga = set(i for i, v in enumerate(vertices) if obtener_tipo(v.elemento) == 'recarga')
-        for i in idxs_almacen:
-            for j in idxs_cliente:
-                origen = vertices[i]
-                destino = vertices[j]
-                if not self._camino_segmentado(grafo, origen, destino, idxs_recarga, obtener_id=obtener_id):
-                    self.logger.warning(f"[VALIDACION] No existe camino segmentado válido entre almacén {obtener_id(origen.elemento)} y cliente {obtener_id(destino.elemento)}")
-                    return False
+        return self._reportar_segmentacion(ValidadorSegmentacion(grafo, vertices).validar())
+
+    def _reportar_segmentacion(self, inalcanzables) -> bool:
+        if inalcanzables:
+            detalle = ", ".join(f"({self._obtener_id_debug(a)}, {self._obtener_id_debug(c)})" for a, c in inalcanzables)
+            self.logger.warning(f"[VALIDACION] {len(inalcanzables)} pares (almacén, cliente) sin camino segmentado válido: {detalle}")
+            return False
         self.logger.info("[VALIDACION] Todos los pares (almacén, cliente) tienen camino segmentado válido")
         return True
 
-    def _camino_segmentado(self, grafo: Grafo, origen: Vertice, destino: Vertice, recarga_idxs: set, obtener_id=None) -> bool:
-        visitados = set()
-        cola = deque()
-        cola.append((origen, 0))
-        def extraer_id(vertice):
-            elemento = vertice.elemento
-            if obtener_id is not None:
-                return obtener_id(elemento)
-            if isinstance(elemento, dict):
-                return elemento.get('id')
-            return getattr(elemento, 'id_almacenamiento', None) or getattr(elemento, 'id_cliente', None) or getattr(elemento, 'id_recarga', None)
-        while cola:
-            actual, peso_actual = cola.popleft()
-            if actual == destino:
-                self.logger.info(f"[CAMINO] Camino segmentado válido encontrado de {self._obtener_id_debug(origen)} a {self._obtener_id_debug(destino)}")
-                return True
-            visitados.add((actual, peso_actual))
-            for vecino in grafo.vecinos(actual):
-                arista = grafo.obtener_arista(actual, vecino)
-                if hasattr(arista, 'peso'):
-                    peso = arista.peso
-                elif isinstance(arista.elemento, dict):
-                    peso = arista.elemento.get('peso', 1)
-                else:
-                    peso = 1
-                # Validar ANTES de tomar la arista: si el peso de la arista o la suma supera 50, no se puede tomar
-                if peso > 50 or (peso_actual + peso) > 50:
-                    continue  # No es válido, supera el máximo permitido antes de llegar
-                id_vecino = extraer_id(vecino)
-                if id_vecino in recarga_idxs:
-                    nuevo_peso = 0  # Reinicio por recarga
-                else:
-                    nuevo_peso = peso_actual + peso
-                if (vecino, nuevo_peso) not in visitados:
-                    cola.append((vecino, nuevo_peso))
-        self.logger.warning(f"[CAMINO] No existe camino segmentado válido de {self._obtener_id_debug(origen)} a {self._obtener_id_debug(destino)}")
-        return False
-
     def _obtener_id_debug(self, vertice):
         elemento = getattr(vertice, 'elemento', vertice)
         if isinstance(elemento, dict):
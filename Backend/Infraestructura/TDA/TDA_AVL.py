@@ -2,6 +2,9 @@
 Clase AVL para almacenar rutas más frecuentes.
 Implementación de un árbol AVL para registrar rutas y su frecuencia.
 """
+from Backend.Servicios.Observer.BusEventos import BusEventos
+
+_bus = BusEventos()
 
 class verticeAVL:
     def __init__(self, clave, valor=None, ruta=None):
@@ -22,18 +25,16 @@ class AVL:
     """
     def __init__(self):
         self.raiz = None
-        self._observadores = set()
         self.notificar_observadores('avl_creado', None)
 
     def agregar_observador(self, observador):
-        self._observadores.add(observador)
+        _bus.suscribir(observador)
 
     def quitar_observador(self, observador):
-        self._observadores.discard(observador)
+        _bus.desuscribir(observador)
 
     def notificar_observadores(self, evento, datos=None):
-        for obs in self._observadores:
-            obs.actualizar(evento, self, datos)
+        _bus.publicar(evento, self, datos)
 
     def insertar(self, clave, valor=None, ruta=None):
         # Aseguro que la clave sea simple antes de insertar
@@ -75,14 +76,15 @@ class AVL:
             elif not vertice.derecha:
                 return vertice.izquierda
             temp = self._minimo(vertice.derecha)
-            vertice.clave, vertice.valor = temp.clave, temp.valor
+            vertice.clave, vertice.valor, vertice.ruta = temp.clave, temp.valor, temp.ruta
             vertice.derecha = self._eliminar(vertice.derecha, temp.clave)
         vertice.altura = 1 + max(self._altura(vertice.izquierda), self._altura(vertice.derecha))
         return self._balancear(vertice)
 
     def buscar(self, clave):
         resultado = self._buscar(self.raiz, clave)
-        self.notificar_observadores('avl_buscar', {'clave': clave, 'resultado': resultado})
+        if _bus.escucha('avl_buscar'):
+            self.notificar_observadores('avl_buscar', {'clave': clave, 'resultado': resultado})
         return resultado
 
     def _buscar(self, vertice, clave):
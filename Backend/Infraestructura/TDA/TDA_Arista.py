@@ -2,13 +2,16 @@
 Clase Arista para representar una conexión entre vertices en el grafo.
 Basado en Docs/edge.py
 """
+from Backend.Servicios.Observer.BusEventos import BusEventos
+
+_bus = BusEventos()
 
 class Arista:
     """
     Representa una arista (conexion) entre dos vertices en el grafo.
     Notifica a observadores en operaciones CRUD y mapeo.
     """
-    __slots__ = ['_origen', '_destino', '_peso', '_observadores']
+    __slots__ = ['_origen', '_destino', '_peso']
 
     def __init__(self, origen, destino, peso):
         """
@@ -17,8 +20,25 @@ class Arista:
         self._origen = origen
         self._destino = destino
         self._peso = peso
-        self._observadores = set()
-        self.notificar_observadores('arista_creada', {'origen': origen, 'destino': destino, 'peso': peso})
+        if _bus.escucha('arista_creada'):
+            self.notificar_observadores('arista_creada', {'origen': origen, 'destino': destino, 'peso': peso})
+
+    @classmethod
+    def crear_lote(cls, tripletas):
+        """
+        Crea aristas para varias tripletas (origen, destino, peso) consultando una sola vez si
+        algún observador escucha 'arista_creada' (en ese caso cada arista se notifica como siempre).
+        """
+        if _bus.escucha('arista_creada'):
+            return [cls(origen, destino, peso) for origen, destino, peso in tripletas]
+        aristas = []
+        for origen, destino, peso in tripletas:
+            arista = cls.__new__(cls)
+            arista._origen = origen
+            arista._destino = destino
+            arista._peso = peso
+            aristas.append(arista)
+        return aristas
 
     @property
     def origen(self):
@@ -51,14 +71,13 @@ class Arista:
         self.notificar_observadores('peso_actualizado', {'peso': nuevo_peso})
 
     def agregar_observador(self, observador):
-        self._observadores.add(observador)
+        _bus.suscribir(observador)
 
     def quitar_observador(self, observador):
-        self._observadores.discard(observador)
+        _bus.desuscribir(observador)
 
     def notificar_observadores(self, evento, datos=None):
-        for observador in self._observadores:
-            observador.actualizar(evento, self, datos)
+        _bus.publicar(evento, self, datos)
 
     def serializar(self):
         """
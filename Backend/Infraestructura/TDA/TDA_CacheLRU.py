@@ -0,0 +1,112 @@
+"""
+Clase CacheLRU: cache acotada con desalojo LRU, TTL por grupo y contadores de uso.
+"""
+from collections import OrderedDict
+import threading
+import time
+
+
+class CacheLRU:
+    """
+    Cache de capacidad fija. Al superar la capacidad se desaloja la entrada usada hace mas tiempo.
+    Cada entrada pertenece a un grupo (por ejemplo, el algoritmo de ruta) que define su TTL en segundos;
+    un TTL None significa que la entrada no expira por tiempo.
+    Lleva contadores de aciertos, fallos, desalojos y expiraciones.
+    Es segura entre hilos: obtener tambien modifica el orden LRU, asi que cada operacion toma un lock propio.
+    """
+
+    def __init__(self, capacidad=1024, ttl_por_grupo=None, ttl_defecto=None, reloj=time.monotonic):
+        if capacidad <= 0:
+            raise ValueError("La capacidad de la cache debe ser mayor que cero")
+        self._capacidad = capacidad
+        self._ttl_por_grupo = dict(ttl_por_grupo or {})
+        self._ttl_defecto = ttl_defecto
+        self._reloj = reloj
+        self._entradas = OrderedDict()  # clave -> (valor, instante_expiracion)
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.expirados = 0
+        self._lock = threading.Lock()
+
+    def obtener(self, clave, grupo=None):
+        """
+        Retorna el valor asociado a la clave, o None si no existe o ya expiro.
+        Un acierto marca la entrada como la usada mas recientemente.
+        """
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                self.fallos += 1
+                return None
+            valor, expiracion = entrada
+            if expiracion is not None and self._reloj() >= expiracion:
+                del self._entradas[clave]
+                self.expirados += 1
+                self.fallos += 1
+                return None
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return valor
+
+    def guardar(self, clave, valor, grupo=None):
+        """
+        Inserta o reemplaza la entrada y desaloja las menos usadas si se supera la capacidad.
+        """
+        with self._lock:
+            ttl = self._ttl_por_grupo.get(grupo, self._ttl_defecto)
+            expiracion = self._reloj() + ttl if ttl is not None else None
+            self._entradas[clave] = (valor, expiracion)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self._capacidad:
+                self._entradas.popitem(last=False)
+                self.desalojos += 1
+
+    def invalidar(self, clave):
+        """
+        Elimina la entrada si existe.
+        """
+        with self._lock:
+            self._entradas.pop(clave, None)
+
+    def limpiar(self):
+        """
+        Vacia la cache sin reiniciar los contadores.
+        """
+        with self._lock:
+            self._entradas.clear()
+
+    def configurar(self, capacidad=None, ttl_por_grupo=None):
+        """
+        Ajusta la capacidad y/o los TTL por grupo. Reducir la capacidad desaloja de inmediato.
+        """
+        if capacidad is not None and capacidad <= 0:
+            raise ValueError("La capacidad de la cache debe ser mayor que cero")
+        with self._lock:
+            if ttl_por_grupo is not None:
+                self._ttl_por_grupo.update(ttl_por_grupo)
+            if capacidad is not None:
+                self._capacidad = capacidad
+                while len(self._entradas) > self._capacidad:
+                    self._entradas.popitem(last=False)
+                    self.desalojos += 1
+
+    def estadisticas(self):
+        """
+        Retorna un dict serializable con el estado y los contadores de la cache.
+        """
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                'capacidad': self._capacidad,
+                'tamano': len(self._entradas),
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'desalojos': self.desalojos,
+                'expirados': self.expirados,
+                'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+                'ttl_por_grupo': dict(self._ttl_por_grupo),
+            }
+
+    def __len__(self):
+        return len(self._entradas)
@@ -0,0 +1,157 @@
+"""
+Clase CerrojoLecturaEscritura: cerrojo de lectores-escritor para el estado compartido de la simulacion.
+"""
+from contextlib import contextmanager
+import functools
+import threading
+
+
+class CerrojoLecturaEscritura:
+    """
+    Permite muchos lectores simultaneos o un unico escritor.
+    - Prioridad de escritura: cuando un escritor espera, los lectores nuevos esperan detras de el,
+      de modo que un flujo continuo de lecturas no posterga indefinidamente a iniciar_simulacion.
+    - Reentrante por hilo: un lector puede volver a leer y el escritor puede leer o volver a escribir
+      (por ejemplo iniciar_simulacion llama a metodos que toman el cerrojo de lectura).
+    - No se puede pasar de lectura a escritura: dos hilos que lo intentaran a la vez se bloquearian
+      mutuamente, por lo que se lanza RuntimeError. Quien necesite escribir debe soltar antes la lectura.
+    - Ganchos de escritura (agregar_ganchos): se ejecutan al tomar y antes de soltar la escritura mas
+      externa, con el cerrojo tomado; la persistencia los usa para abrir y confirmar su transaccion.
+    """
+
+    def __init__(self):
+        self._condicion = threading.Condition(threading.Lock())
+        self._lectores = {}  # id de hilo -> lecturas anidadas
+        self._escritor = None  # id del hilo escritor
+        self._escrituras = 0  # escrituras anidadas del escritor
+        self._escritores_esperando = 0
+        self._al_iniciar_escritura = []
+        self._al_terminar_escritura = []
+
+    def agregar_ganchos(self, al_iniciar=None, al_terminar=None):
+        """
+        Registra funciones sin argumentos que se llaman al iniciar y al terminar cada escritura externa
+        (no las anidadas). Si al_iniciar falla se suelta el cerrojo y se propaga el error.
+        """
+        if al_iniciar is not None:
+            self._al_iniciar_escritura.append(al_iniciar)
+        if al_terminar is not None:
+            self._al_terminar_escritura.append(al_terminar)
+
+    def adquirir_lectura(self):
+        hilo = threading.get_ident()
+        with self._condicion:
+            if hilo == self._escritor or hilo in self._lectores:
+                self._lectores[hilo] = self._lectores.get(hilo, 0) + 1
+                return
+            while self._escritor is not None or self._escritores_esperando:
+                self._condicion.wait()
+            self._lectores[hilo] = 1
+
+    def liberar_lectura(self):
+        hilo = threading.get_ident()
+        with self._condicion:
+            cantidad = self._lectores.get(hilo)
+            if not cantidad:
+                raise RuntimeError("El hilo no tiene el cerrojo de lectura")
+            if cantidad == 1:
+                del self._lectores[hilo]
+                if not self._lectores:
+                    self._condicion.notify_all()
+            else:
+                self._lectores[hilo] = cantidad - 1
+
+    def adquirir_escritura(self):
+        hilo = threading.get_ident()
+        with self._condicion:
+            if hilo == self._escritor:
+                self._escrituras += 1
+                return
+            if hilo in self._lectores:
+                raise RuntimeError("No se puede pasar de lectura a escritura; suelte primero el cerrojo de lectura")
+            self._escritores_esperando += 1
+            try:
+                while self._escritor is not None or self._lectores:
+                    self._condicion.wait()
+            except BaseException:
+                # Si la espera se interrumpe, los lectores retenidos por este escritor pueden continuar
+                self._escritores_esperando -= 1
+                self._condicion.notify_all()
+                raise
+            self._escritores_esperando -= 1
+            self._escritor = hilo
+            self._escrituras = 1
+        try:
+            for gancho in self._al_iniciar_escritura:
+                gancho()
+        except BaseException:
+            self._soltar_escritura()
+            raise
+
+    def liberar_escritura(self):
+        if self._escritor != threading.get_ident():
+            raise RuntimeError("El hilo no tiene el cerrojo de escritura")
+        if self._escrituras == 1 and self._al_terminar_escritura:
+            try:
+                for gancho in self._al_terminar_escritura:
+                    gancho()
+            finally:
+                self._soltar_escritura()
+        else:
+            self._soltar_escritura()
+
+    def _soltar_escritura(self):
+        with self._condicion:
+            self._escrituras -= 1
+            if self._escrituras == 0:
+                self._escritor = None
+                self._condicion.notify_all()
+
+    @contextmanager
+    def lectura(self):
+        self.adquirir_lectura()
+        try:
+            yield
+        finally:
+            self.liberar_lectura()
+
+    @contextmanager
+    def escritura(self):
+        self.adquirir_escritura()
+        try:
+            yield
+        finally:
+            self.liberar_escritura()
+
+    def estado(self):
+        """
+        Retorna lectores activos, si hay escritor y cuantos escritores esperan (diagnostico).
+        """
+        with self._condicion:
+            return {
+                'lectores': sum(self._lectores.values()),
+                'escritor_activo': self._escritor is not None,
+                'escritores_esperando': self._escritores_esperando,
+            }
+
+
+def en_lectura(metodo):
+    """
+    Decorador: ejecuta el metodo con el cerrojo de lectura de self.cerrojo.
+    """
+    @functools.wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        with self.cerrojo.lectura():
+            return metodo(self, *args, **kwargs)
+    return envoltura
+
+
+def en_escritura(metodo):
+    """
+    Decorador: ejecuta el metodo con el cerrojo de escritura de self.cerrojo.
+    """
+    @functools.wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        with self.cerrojo.escritura():
+            return metodo(self, *args, **kwargs)
+    return envoltura
@@ -4,35 +4,73 @@ Basado en Docs/graph.py y plan de mejora 4.4 (unicidad de instancias).
 """
 from Backend.Infraestructura.TDA.TDA_Vertice import Vertice
 from Backend.Infraestructura.TDA.TDA_Arista import Arista
+from Backend.Infraestructura.TDA.TDA_GrafoCSR import GrafoCSR
 from Backend.Infraestructura.Repositorios.repositorio_vertices import RepositorioVertices
 from Backend.Infraestructura.Repositorios.repositorio_aristas import RepositorioAristas
 from Backend.Dominio.EntFabricas.FabricaVertices import FabricaVertices
 from Backend.Dominio.EntFabricas.FabricaAristas import FabricaAristas
+from contextlib import contextmanager
+import gc
+import itertools
+from Backend.Servicios.Observer.BusEventos import BusEventos
+
+_bus = BusEventos()
+
+def _id_elemento(elemento):
+    # Obtener identificador sin descartar valores 0
+    for atributo in ('id_cliente', 'id_almacenamiento', 'id_recarga'):
+        valor = getattr(elemento, atributo, None)
+        if valor is not None:
+            return valor
+    return None
+
+@contextmanager
+def _sin_recolector():
+    """
+    Pausa el recolector de ciclos mientras dura una inserción por lote: las miles de instancias nuevas
+    (aristas, dicts de adyacencia) disparan recolecciones completas que no liberan nada.
+    """
+    activo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if activo:
+            gc.enable()
 
 class Grafo:
     """
     Grafo dirigido/no dirigido con soporte para observadores.
     Notifica en insercion/eliminacion de vertices/aristas y serializacion.
     """
+    # Contador global de versiones: cada mutación de cualquier grafo toma un número nuevo,
+    # así una versión identifica un estado concreto de un grafo concreto
+    _generador_versiones = itertools.count(1)
+
     def __init__(self, dirigido=False):
         self._dirigido = dirigido
         self._repositorio_vertices = RepositorioVertices()
         self._repositorio_aristas = RepositorioAristas()
-        self._observadores = set()
+        # Índices de adyacencia por ID de vértice: id -> {id_vecino: Arista}
+        # Se mantienen incrementalmente para que vecinos/grado/aristas_incidentes sean O(grado)
+        self._salientes = {}
+        self._entrantes = {}
+        # Snapshot CSR perezoso, se descarta ante cualquier mutación
+        self._csr = None
+        self._version = next(Grafo._generador_versiones)
         self.notificar_observadores('grafo_creado', {'dirigido': dirigido})
 
     def es_dirigido(self):
         return self._dirigido
 
     def agregar_observador(self, observador):
-        self._observadores.add(observador)
+        _bus.suscribir(observador)
 
     def quitar_observador(self, observador):
-        self._observadores.discard(observador)
+        _bus.desuscribir(observador)
 
     def notificar_observadores(self, evento, datos=None):
-        for obs in self._observadores:
-            obs.actualizar(evento, self, datos)
+        _bus.publicar(evento, self, datos)
 
     def insertar_vertice(self, elemento):
         """
@@ -48,10 +86,8 @@ class Grafo:
         if vertice is None:
             vertice = FabricaVertices().crear(elemento)
             self._repositorio_vertices.agregar(vertice, id_elemento)
+            self._registrar_mutacion()
             self.notificar_observadores('vertice_insertado', {'vertice': vertice})
-            if hasattr(vertice, 'agregar_observador'):
-                for obs in self._observadores:
-                    vertice.agregar_observador(obs)
         return vertice
 
     def buscar_vertice_por_elemento(self, elemento):
@@ -74,11 +110,74 @@ class Grafo:
             arista = FabricaAristas().crear(u, v, peso)
             self._repositorio_aristas.agregar(arista, clave)
             self.notificar_observadores('arista_insertada', {'arista': arista})
-            if hasattr(arista, 'agregar_observador'):
-                for obs in self._observadores:
-                    arista.agregar_observador(obs)
+        if arista is not None and self._salientes.get(clave[0], {}).get(clave[1]) is not arista:
+            self._indexar_arista(clave, arista)
+            self._registrar_mutacion()
         return arista
     
+    def insertar_vertices_lote(self, elementos):
+        """
+        Inserta los vértices de varios elementos de una vez: valida todos los identificadores antes de
+        insertar, crea los vértices nuevos sin pasar por la fábrica, los registra en el repositorio en un
+        solo paso y emite un único evento 'vertices_insertados'.
+        Retorna los vértices en el orden recibido; los que ya existían se reutilizan, como en insertar_vertice.
+        """
+        with _sin_recolector():
+            pares = [(_id_elemento(elemento), elemento) for elemento in elementos]
+            invalidos = [elemento for id_elemento, elemento in pares if id_elemento is None]
+            if invalidos:
+                raise ValueError(f"{len(invalidos)} elementos sin identificador, por ejemplo: {invalidos[0]}")
+            ids = [id_elemento for id_elemento, _ in pares]
+            existentes = self._repositorio_vertices.obtener_lote(ids)
+            agregados = self._repositorio_vertices.agregar_lote(
+                (id_elemento, Vertice(elemento)) for (id_elemento, elemento), existente in zip(pares, existentes)
+                if existente is None)
+            vertices = self._repositorio_vertices.obtener_lote(ids)
+            if agregados:
+                self._registrar_mutacion()
+                self.notificar_observadores('vertices_insertados', {'vertices': self._repositorio_vertices.obtener_lote(agregados)})
+            return vertices
+
+    def insertar_aristas_lote(self, aristas):
+        """
+        Inserta varias aristas (u, v, peso) de una vez: valida todos los vértices antes de insertar, crea las
+        aristas nuevas sin pasar por la fábrica, las registra en el repositorio y en los índices de adyacencia
+        en una pasada, avanza la versión una sola vez y emite un único evento 'aristas_insertadas'.
+        Retorna las aristas en el orden recibido; las que ya existían se reutilizan, como en insertar_arista.
+        """
+        with _sin_recolector():
+            tripletas = list(aristas)
+            # IDs por vértice calculados una sola vez (un vértice suele aparecer en muchas aristas)
+            ids = {}
+            claves = []
+            for u, v, _ in tripletas:
+                id_u, id_v = ids.get(id(u)), ids.get(id(v))
+                if id_u is None or id_v is None:
+                    self._validar_origen_destino(u, v)
+                    id_u = ids[id(u)] = u.id_elemento()
+                    id_v = ids[id(v)] = v.id_elemento()
+                claves.append((id_u, id_v))
+            existentes = self._repositorio_aristas.obtener_lote(claves)
+            nuevas = [(clave, tripleta) for clave, tripleta, existente in zip(claves, tripletas, existentes) if existente is None]
+            agregadas = self._repositorio_aristas.agregar_lote(
+                zip((clave for clave, _ in nuevas), Arista.crear_lote(tripleta for _, tripleta in nuevas)))
+            resultado = self._repositorio_aristas.obtener_lote(claves)
+            salientes, entrantes = self._salientes, self._entrantes
+            indexadas = 0
+            for (id_origen, id_destino), arista in zip(claves, resultado):
+                destinos = salientes.get(id_origen)
+                if destinos is None:
+                    destinos = salientes[id_origen] = {}
+                if destinos.get(id_destino) is not arista:
+                    destinos[id_destino] = arista
+                    entrantes.setdefault(id_destino, {})[id_origen] = arista
+                    indexadas += 1
+            if indexadas:
+                self._registrar_mutacion()
+            if agregadas:
+                self.notificar_observadores('aristas_insertadas', {'aristas': self._repositorio_aristas.obtener_lote(agregadas)})
+            return resultado
+
     def eliminar_arista(self, u, v):
         """
         Elimina la arista entre los vértices u y v si existe.
@@ -87,6 +186,8 @@ class Grafo:
         self._validar_origen_destino(u, v)
         clave = (self._id_vertice(u), self._id_vertice(v))
         self._repositorio_aristas.eliminar(clave)
+        self._desindexar_arista(clave)
+        self._registrar_mutacion()
         self.notificar_observadores('arista_eliminada', {'origen': u, 'destino': v})
 
     def eliminar_vertice(self, v):
@@ -99,11 +200,15 @@ class Grafo:
             raise TypeError("v debe ser instancia de Vertice")
         id_v = self._id_vertice(v)
         self._repositorio_vertices.eliminar(id_v)
-        # Eliminar aristas asociadas
-        aristas_a_eliminar = [a for a in self.aristas() if a.origen == v or a.destino == v]
-        for arista in aristas_a_eliminar:
-            clave = (self._id_vertice(arista.origen), self._id_vertice(arista.destino))
+        # Eliminar aristas asociadas usando los índices de adyacencia (O(grado))
+        claves_a_eliminar = [(id_v, id_dst) for id_dst in self._salientes.get(id_v, {})]
+        claves_a_eliminar += [(id_ori, id_v) for id_ori in self._entrantes.get(id_v, {}) if id_ori != id_v]
+        for clave in claves_a_eliminar:
             self._repositorio_aristas.eliminar(clave)
+            self._desindexar_arista(clave)
+        self._salientes.pop(id_v, None)
+        self._entrantes.pop(id_v, None)
+        self._registrar_mutacion()
         self.notificar_observadores('vertice_eliminado', {'vertice': v})
 
     def obtener_arista(self, u, v):
@@ -131,39 +236,75 @@ class Grafo:
         Retorna los vecinos del vértice v.
         Si el grafo es no dirigido, también considera a v como destino.
         """
-        vecinos = []
-        for arista in self.aristas():
-            if arista.origen == v:
-                vecinos.append(arista.destino)
-            elif not self._dirigido and arista.destino == v:
-                vecinos.append(arista.origen)
-        return vecinos
+        return [a.destino if a.origen == v else a.origen for a in self.aristas_incidentes(v)]
 
     def grado(self, v, salientes=True):
         """
         Retorna el grado del vértice v.
         En grafos dirigidos, puede ser el grado de salida (salientes=True) o de entrada (salientes=False).
         """
-        if self._dirigido:
-            if salientes:
-                return len([a for a in self.aristas() if a.origen == v])
-            else:
-                return len([a for a in self.aristas() if a.destino == v])
-        else:
-            return len([a for a in self.aristas() if a.origen == v or a.destino == v])
+        return len(self.aristas_incidentes(v, salientes))
 
     def aristas_incidentes(self, v, salientes=True):
         """
         Retorna las aristas incidentes al vértice v.
         En grafos dirigidos, puede retornar las de salida (salientes=True) o las de entrada (salientes=False).
+        Consulta los índices de adyacencia, por lo que el costo es O(grado) y no O(E).
         """
+        id_v = self._id_vertice(v)
         if self._dirigido:
-            if salientes:
-                return [a for a in self.aristas() if a.origen == v]
-            else:
-                return [a for a in self.aristas() if a.destino == v]
-        else:
-            return [a for a in self.aristas() if a.origen == v or a.destino == v]
+            indice = self._salientes if salientes else self._entrantes
+            return list(indice.get(id_v, {}).values())
+        incidentes = list(self._salientes.get(id_v, {}).values())
+        incidentes.extend(a for id_ori, a in self._entrantes.get(id_v, {}).items() if id_ori != id_v)
+        return incidentes
+
+    def aristas_propias(self):
+        """
+        Retorna las aristas indexadas en este grafo, en orden de inserción. Los grafos de una simulación
+        comparten el repositorio de aristas, por lo que aristas() incluye también las de los demás.
+        """
+        return [arista for (id_origen, id_destino), arista in self._repositorio_aristas.iterar()
+                if self._salientes.get(id_origen, {}).get(id_destino) is arista]
+
+    def version(self):
+        """
+        Retorna la versión actual del grafo. Cambia con cada inserción o eliminación,
+        por lo que sirve como clave para invalidar cálculos derivados (rutas, snapshots).
+        """
+        return self._version
+
+    def obtener_csr(self):
+        """
+        Retorna el snapshot compacto GrafoCSR del grafo actual.
+        Se construye una sola vez y se reutiliza hasta la siguiente mutación del grafo.
+        """
+        if self._csr is None:
+            self._csr = GrafoCSR(self)
+        return self._csr
+
+    def _registrar_mutacion(self):
+        """
+        Avanza la versión del grafo y descarta el snapshot CSR (y con él sus derivados).
+        """
+        self._version = next(Grafo._generador_versiones)
+        self._csr = None
+
+    def _indexar_arista(self, clave, arista):
+        """
+        Registra la arista en los índices de adyacencia de salida y entrada.
+        """
+        id_origen, id_destino = clave
+        self._salientes.setdefault(id_origen, {})[id_destino] = arista
+        self._entrantes.setdefault(id_destino, {})[id_origen] = arista
+
+    def _desindexar_arista(self, clave):
+        """
+        Quita la arista de los índices de adyacencia si estaba registrada.
+        """
+        id_origen, id_destino = clave
+        self._salientes.get(id_origen, {}).pop(id_destino, None)
+        self._entrantes.get(id_destino, {}).pop(id_origen, None)
 
     def _validar_origen_destino(self, origen, destino):
         """
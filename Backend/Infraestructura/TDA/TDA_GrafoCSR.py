@@ -0,0 +1,191 @@
+"""
+Clase GrafoCSR: representacion compacta e inmutable (Compressed Sparse Row) de un Grafo.
+Permite que las estrategias de ruta trabajen con indices enteros en vez de objetos Vertice/Arista.
+"""
+from array import array
+from multiprocessing import shared_memory
+from Backend.Infraestructura.TDA.TDA_Arista import Arista
+
+
+class GrafoCSR:
+    """
+    Snapshot congelado de un Grafo indexado por enteros.
+    - offsets[i]:offsets[i+1] delimita las aristas salientes del vertice i.
+    - origenes[k], destinos[k], pesos[k] y aristas[k] describen la k-esima arista saliente.
+    - es_recarga[i] vale 1 si el vertice i es una estacion de recarga.
+    Las aristas se recorren en sentido origen -> destino. En un grafo no dirigido cada arista se
+    emite tambien en sentido inverso (salvo que el grafo ya tenga la arista opuesta), igual que la
+    recorre ValidadorSegmentacion; aristas[k] es entonces una copia invertida de la arista real, para
+    que el camino de la Ruta siga encadenado de origen a destino.
+    derivados guarda estructuras calculadas a partir del snapshot (por ejemplo las matrices de
+    Floyd-Warshall); se descartan junto con el snapshot cuando el grafo cambia.
+    """
+    __slots__ = ['_vertices', '_indice', 'offsets', 'origenes', 'destinos', 'pesos', 'es_recarga', '_aristas', '_invertidas', 'derivados']
+
+    def __init__(self, grafo):
+        """
+        Construye el snapshot recorriendo una sola vez los indices de adyacencia del grafo.
+        """
+        self._vertices = list(grafo.vertices())
+        self._indice = {}
+        for i, v in enumerate(self._vertices):
+            self._indice[v.id_elemento()] = i
+        self.offsets = array('i', [0])
+        self.origenes = array('i')
+        self.destinos = array('i')
+        self.pesos = array('d')
+        self.es_recarga = bytearray(len(self._vertices))
+        self._aristas = []
+        self._invertidas = set()  # posiciones cuya arista se recorre de destino a origen
+        self.derivados = {}
+        dirigido = grafo.es_dirigido()
+        for i, v in enumerate(self._vertices):
+            if v.es_tipo('recarga'):
+                self.es_recarga[i] = 1
+            # Las salientes van antes que las entrantes, asi que una entrante solo se invierte
+            # si el vertice no tiene ya una saliente hacia el mismo vecino
+            vecinos = set()
+            for arista in grafo.aristas_incidentes(v, salientes=True):
+                invertida = arista.origen != v
+                if invertida and dirigido:
+                    continue
+                otro = arista.origen if invertida else arista.destino
+                j = self._indice.get(otro.id_elemento())
+                if j is None or j in vecinos:
+                    continue
+                vecinos.add(j)
+                if invertida:
+                    self._invertidas.add(len(self._aristas))
+                self.origenes.append(i)
+                self.destinos.append(j)
+                self.pesos.append(arista.peso)
+                self._aristas.append(arista)
+            self.offsets.append(len(self.destinos))
+
+    @property
+    def n_vertices(self):
+        return len(self._vertices)
+
+    @property
+    def n_aristas(self):
+        return len(self.destinos)
+
+    def indice(self, vertice):
+        """
+        Retorna el indice entero del vertice, o None si no pertenece al snapshot.
+        """
+        return self._indice.get(vertice.id_elemento())
+
+    def vertice(self, i):
+        """
+        Retorna el objeto Vertice asociado al indice i.
+        """
+        return self._vertices[i]
+
+    def arista(self, k):
+        """
+        Retorna el objeto Arista asociado a la posicion k, orientado como se recorre en el snapshot.
+        Las posiciones invertidas se reemplazan por su copia invertida la primera vez que se piden.
+        """
+        arista = self._aristas[k]
+        if k in self._invertidas:
+            arista = self._aristas[k] = Arista.crear_lote([(arista.destino, arista.origen, arista.peso)])[0]
+            self._invertidas.discard(k)
+        return arista
+
+    def aristas_de(self, posiciones):
+        """
+        Mapea una secuencia de posiciones de aristas a los objetos Arista del camino.
+        Solo se usa al final del calculo para construir el camino de la Ruta.
+        """
+        return [self.arista(k) for k in posiciones]
+
+    def salientes(self, i):
+        """
+        Retorna el rango de posiciones de las aristas salientes del vertice i.
+        """
+        return range(self.offsets[i], self.offsets[i + 1])
+
+    def exportar_memoria_compartida(self):
+        """
+        Copia los arreglos del snapshot a un bloque multiprocessing.shared_memory.
+        Retorna (bloque, descriptor): el descriptor es un dict serializable con el que cada
+        proceso trabajador abre un GrafoCSRCompartido sin copiar el grafo. Quien exporta
+        debe llamar a bloque.close() y bloque.unlink() al terminar.
+        """
+        # pesos ('d', 8 bytes) primero para mantener la alineacion de todas las vistas
+        arreglos = [('pesos', self.pesos), ('offsets', self.offsets), ('origenes', self.origenes),
+                    ('destinos', self.destinos), ('es_recarga', array('B', self.es_recarga))]
+        partes = []
+        inicio = 0
+        for nombre, arreglo in arreglos:
+            tamano = len(arreglo) * arreglo.itemsize
+            partes.append((nombre, arreglo.typecode, inicio, tamano))
+            inicio += tamano
+        bloque = shared_memory.SharedMemory(create=True, size=max(inicio, 1))
+        for (nombre, _, desde, tamano), (_, arreglo) in zip(partes, arreglos):
+            bloque.buf[desde:desde + tamano] = arreglo.tobytes()
+        descriptor = {
+            'nombre': bloque.name,
+            'n_vertices': self.n_vertices,
+            'n_aristas': self.n_aristas,
+            'partes': partes,
+        }
+        return bloque, descriptor
+
+
+class GrafoCSRCompartido:
+    """
+    Vista de solo lectura de un GrafoCSR exportado a memoria compartida.
+    Expone los mismos arreglos (offsets, origenes, destinos, pesos, es_recarga) que usan los
+    nucleos _buscar_csr de las estrategias, pero no conoce objetos Vertice ni Arista:
+    los procesos trabajadores solo devuelven posiciones de aristas.
+    """
+
+    def __init__(self, descriptor):
+        self._bloque = self._abrir_bloque(descriptor['nombre'])
+        self.n_vertices = descriptor['n_vertices']
+        self.n_aristas = descriptor['n_aristas']
+        self.derivados = {}
+        for nombre, codigo, inicio, tamano in descriptor['partes']:
+            setattr(self, nombre, self._bloque.buf[inicio:inicio + tamano].cast(codigo))
+
+    @staticmethod
+    def _abrir_bloque(nombre):
+        """
+        Abre el bloque existente sin registrarlo para limpieza: el proceso que lo exporto es su dueño.
+        """
+        try:
+            return shared_memory.SharedMemory(name=nombre, track=False)
+        except TypeError:
+            # Python < 3.13 no acepta track; los trabajadores comparten el resource_tracker del
+            # proceso padre, donde el bloque ya esta registrado, asi que no hace falta mas
+            return shared_memory.SharedMemory(name=nombre)
+
+    def salientes(self, i):
+        """
+        Retorna el rango de posiciones de las aristas salientes del vertice i.
+        """
+        return range(self.offsets[i], self.offsets[i + 1])
+
+
+def indice_entrantes(csr):
+    """
+    Indice de aristas entrantes de un GrafoCSR o GrafoCSRCompartido: offsets_entrantes[v]:offsets_entrantes[v + 1]
+    delimita, en entrantes, las posiciones k de las aristas que llegan a v. Se cachea en csr.derivados.
+    """
+    indice = csr.derivados.get('entrantes')
+    if indice is None:
+        n = csr.n_vertices
+        conteo = [0] * (n + 1)
+        for v in csr.destinos:
+            conteo[v + 1] += 1
+        for i in range(n):
+            conteo[i + 1] += conteo[i]
+        offsets_entrantes = array('i', conteo)
+        entrantes = array('i', bytes(4 * len(csr.destinos)))
+        for k, v in enumerate(csr.destinos):
+            entrantes[conteo[v]] = k
+            conteo[v] += 1
+        indice = csr.derivados['entrantes'] = (offsets_entrantes, entrantes)
+    return indice
@@ -2,6 +2,10 @@
 Clase HashMap para acceso rápido a clientes y Pedidos.
 Basado en Docs/TDA-Map.py
 """
+from itertools import islice
+from Backend.Servicios.Observer.BusEventos import BusEventos
+
+_bus = BusEventos()
 
 class HashMap:
     """
@@ -10,18 +14,16 @@ class HashMap:
     """
     def __init__(self):
         self._mapa = dict()
-        self._observadores = set()
         self.notificar_observadores('hashmap_creado', None)
 
     def agregar_observador(self, observador):
-        self._observadores.add(observador)
+        _bus.suscribir(observador)
 
     def quitar_observador(self, observador):
-        self._observadores.discard(observador)
+        _bus.desuscribir(observador)
 
     def notificar_observadores(self, evento, datos=None):
-        for obs in self._observadores:
-            obs.actualizar(evento, self, datos)
+        _bus.publicar(evento, self, datos)
 
     def insertar(self, clave, valor):
         self._mapa[clave] = valor
@@ -32,9 +34,25 @@ class HashMap:
         Busca un elemento en el HashMap. Retorna el valor o None si no existe.
         """
         resultado = self._mapa.get(clave)
-        self.notificar_observadores('hashmap_buscar', {'clave': clave, 'resultado': resultado})
+        if _bus.escucha('hashmap_buscar'):
+            self.notificar_observadores('hashmap_buscar', {'clave': clave, 'resultado': resultado})
         return resultado
 
+    def insertar_lote(self, pares):
+        """
+        Inserta varios pares (clave, valor) en un solo paso con un único evento.
+        """
+        antes = len(self._mapa)
+        self._mapa.update(pares)
+        self.notificar_observadores('hashmap_insertar_lote', {'cantidad': len(self._mapa) - antes})
+
+    def buscar_lote(self, claves):
+        """
+        Busca varias claves de una vez. Retorna los valores en el mismo orden (None si no existe).
+        """
+        obtener = self._mapa.get
+        return [obtener(clave) for clave in claves]
+
     def eliminar(self, clave):
         """
         Elimina un elemento del HashMap. No lanza excepción si la clave no existe.
@@ -60,6 +78,16 @@ class HashMap:
         self.notificar_observadores('hashmap_valores', None)
         return self._mapa.values()
 
+    def iterar(self, desde=0):
+        """
+        Itera los pares (clave, valor) en orden de inserción a partir de la posición desde.
+        No copia el mapa: quien itera debe consumir en bloques si el mapa puede cambiar entretanto.
+        """
+        return islice(self._mapa.items(), desde, None)
+
+    def __len__(self):
+        return len(self._mapa)
+
     def serializar(self):
         self.notificar_observadores('hashmap_serializado', None)
         return dict(self._mapa)
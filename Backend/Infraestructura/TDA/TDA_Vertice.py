@@ -2,21 +2,24 @@
 Clase Vertice para representar un vertice en el grafo.
 Basado en Docs/vertex.py
 """
+from Backend.Servicios.Observer.BusEventos import BusEventos
+
+_bus = BusEventos()
 
 class Vertice:
     """
     Representa un vertice en el grafo. Solo almacena el elemento asociado (Cliente, Almacenamiento o Recarga).
     Notifica a observadores en operaciones CRUD y mapeo.
     """
-    __slots__ = ['_elemento', '_observadores']
+    __slots__ = ['_elemento']
 
     def __init__(self, elemento):
         """
         Inicializa un vertice con el elemento asociado.
         """
         self._elemento = elemento
-        self._observadores = set()
-        self.notificar_observadores('vertice_creado', {'elemento': elemento})
+        if _bus.escucha('vertice_creado'):
+            self.notificar_observadores('vertice_creado', {'elemento': elemento})
 
     @property
     def elemento(self):
@@ -36,26 +39,26 @@ class Vertice:
         """
         Agrega un observador para recibir notificaciones de este vertice.
         """
-        self._observadores.add(observador)
+        _bus.suscribir(observador)
 
     def quitar_observador(self, observador):
         """
         Quita un observador para dejar de recibir notificaciones de este vertice.
         """
-        self._observadores.discard(observador)
+        _bus.desuscribir(observador)
 
     def notificar_observadores(self, evento, datos=None):
         """
         Notifica a todos los observadores registrados sobre un evento.
         """
-        for obs in self._observadores:
-            obs.actualizar(evento, self, datos)
+        _bus.publicar(evento, self, datos)
 
     def serializar(self):
         """
         Serializa el vertice y notifica a los observadores sobre la serializacion.
         """
-        self.notificar_observadores('vertice_serializado', {'elemento': self._elemento})
+        if _bus.escucha('vertice_serializado'):
+            self.notificar_observadores('vertice_serializado', {'elemento': self._elemento})
         return {'elemento': str(self._elemento)}
 
     def __hash__(self):
@@ -0,0 +1,210 @@
+"""
+Clase ValidadorSegmentacion: verifica que cada cliente sea alcanzable desde cada almacén
+respetando la autonomía del dron, con soporte para revalidación incremental al agregar aristas.
+"""
+import heapq
+import logging
+
+
+class ValidadorSegmentacion:
+    """
+    Una búsqueda por almacén sobre el estado (vértice, carga usada desde la última recarga):
+    - Un tramo solo se toma si la carga usada más su peso no supera la autonomía.
+    - Al llegar a una estación de recarga la carga usada vuelve a 0.
+    - Basta con la menor carga usada por vértice: un estado con menos carga domina a los demás,
+      así que cada búsqueda es un Dijkstra O((V + E) log V) en vez de un BFS por par (almacén, cliente).
+    - En grafos no dirigidos la búsqueda exacta solo se ejecuta para los almacenes que no comparten
+      una componente de recargas con todos los clientes, por lo que el costo habitual es un par de
+      búsquedas multi-origen y no una por almacén.
+    En modo incremental (agregar_arista) solo se propagan las mejoras que habilita la nueva arista,
+    y solo desde las búsquedas que todavía tienen pares pendientes.
+    """
+
+    def __init__(self, grafo, vertices, autonomia=50):
+        self.logger = logging.getLogger("ValidadorSegmentacion")
+        self.autonomia = autonomia
+        self._dirigido = getattr(grafo, '_dirigido', False)
+        self._vertices = list(vertices)
+        self._indice = {v.id_elemento(): i for i, v in enumerate(self._vertices)}
+        self._es_recarga = [v.es_tipo('recarga') for v in self._vertices]
+        self._almacenes = [i for i, v in enumerate(self._vertices) if v.es_tipo('almacenamiento')]
+        self._clientes = [i for i, v in enumerate(self._vertices) if v.es_tipo('cliente')]
+        # Lista de adyacencia por índice: se consulta el grafo una sola vez
+        self._adyacencia = [[] for _ in self._vertices]
+        for i, v in enumerate(self._vertices):
+            for arista in grafo.aristas_incidentes(v):
+                otro = arista.destino if arista.origen == v else arista.origen
+                if self._dirigido and arista.origen != v:
+                    continue
+                j = self._indice.get(otro.id_elemento())
+                if j is not None:
+                    self._adyacencia[i].append((j, arista.peso))
+        self._usado = {}  # indice_fuente -> carga usada mínima por vértice (None si no se alcanza)
+        self._pendientes = {}  # indice_fuente -> objetivos aún inalcanzables
+
+    def validar(self):
+        """
+        Retorna la lista de pares (almacén, cliente) inalcanzables como tuplas de Vertice.
+        Una lista vacía significa que la segmentación es válida.
+        En grafos no dirigidos primero se descartan los pares que comparten una componente de
+        recargas (ver _componentes_recarga). Los pares restantes se resuelven con búsquedas
+        exactas desde el lado con menos vértices por revisar: como la alcanzabilidad es simétrica,
+        una búsqueda desde un cliente responde por todos los almacenes a la vez.
+        """
+        self._usado, self._pendientes = {}, {}
+        if self._dirigido or not any(self._es_recarga):
+            self._buscar_desde(self._almacenes, self._clientes)
+            return self.inalcanzables()
+        cobertura = self._componentes_recarga()
+        por_firma = {}
+        for a in self._almacenes:
+            por_firma.setdefault(frozenset(cobertura[a]), []).append(a)
+        almacenes, clientes = [], set()
+        for firma, grupo in por_firma.items():
+            sin_cubrir = [c for c in self._clientes if firma.isdisjoint(cobertura[c])]
+            if sin_cubrir:
+                almacenes.extend(grupo)
+                clientes.update(sin_cubrir)
+        if len(clientes) < len(almacenes):
+            self._buscar_desde(sorted(clientes), almacenes)
+        else:
+            self._buscar_desde(almacenes, sorted(clientes))
+        return self.inalcanzables()
+
+    def _buscar_desde(self, fuentes, objetivos):
+        """
+        Búsqueda exacta desde cada fuente; conserva el estado solo de las fuentes con objetivos pendientes.
+        """
+        for f in fuentes:
+            usado = [None] * len(self._vertices)
+            usado[f] = 0
+            self._propagar(usado, [(0, f)])
+            pendientes = [o for o in objetivos if usado[o] is None]
+            if pendientes:
+                self._usado[f] = usado
+                self._pendientes[f] = pendientes
+
+    def _componentes_recarga(self):
+        """
+        Agrupa las recargas unidas por tramos que no superan la autonomía y retorna, por vértice,
+        las componentes de recargas a las que llega (o desde las que se llega) con una sola carga.
+        Dos vértices que comparten componente están conectados: el dron llega a una recarga de la
+        componente, salta entre recargas y termina el último tramo con la batería llena.
+        - Una búsqueda multi-origen desde todas las recargas asigna a cada vértice su recarga más
+          cercana; una arista (x, y) entre regiones une sus recargas si dist(x) + peso + dist(y) cabe
+          en la autonomía, lo que basta para unir cualquier par de recargas a un tramo de distancia.
+        - Luego una búsqueda acotada por componente marca los vértices a un tramo de ella.
+        """
+        n = len(self._vertices)
+        adyacencia, autonomia = self._adyacencia, self.autonomia
+        recargas = [i for i in range(n) if self._es_recarga[i]]
+        distancia = [float('inf')] * n
+        region = [-1] * n
+        for r in recargas:
+            distancia[r] = 0
+            region[r] = r
+        heap = [(0, r) for r in recargas]
+        while heap:
+            d, x = heapq.heappop(heap)
+            if d > distancia[x]:
+                continue
+            for y, peso in adyacencia[x]:
+                if d + peso < distancia[y]:
+                    distancia[y] = d + peso
+                    region[y] = region[x]
+                    heapq.heappush(heap, (d + peso, y))
+        parent = {r: r for r in recargas}
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        for x in range(n):
+            for y, peso in adyacencia[x]:
+                if region[x] != region[y] and region[x] >= 0 and region[y] >= 0 and distancia[x] + peso + distancia[y] <= autonomia:
+                    parent[find(region[x])] = find(region[y])
+        componentes = {}
+        for r in recargas:
+            componentes.setdefault(find(r), []).append(r)
+        cobertura = [[] for _ in range(n)]
+        for raiz, miembros in componentes.items():
+            alcance = {r: 0 for r in miembros}
+            heap = [(0, r) for r in miembros]
+            while heap:
+                d, x = heapq.heappop(heap)
+                if d > alcance[x]:
+                    continue
+                cobertura[x].append(raiz)
+                if d > 0 and self._es_recarga[x]:
+                    continue
+                for y, peso in adyacencia[x]:
+                    nueva = d + peso
+                    if nueva <= autonomia and nueva < alcance.get(y, float('inf')):
+                        alcance[y] = nueva
+                        heapq.heappush(heap, (nueva, y))
+        return cobertura
+
+    def agregar_arista(self, u, v, peso):
+        """
+        Registra una arista nueva entre los vértices u y v y revalida solo los pares pendientes. Retorna los pares (almacén, cliente) que pasaron a ser alcanzables.
+        """
+        i, j = self._indice.get(u.id_elemento()), self._indice.get(v.id_elemento())
+        if i is None or j is None:
+            return []
+        self._adyacencia[i].append((j, peso))
+        if not self._dirigido and i != j:
+            self._adyacencia[j].append((i, peso))
+        nuevos = []
+        for f, usado in self._usado.items():
+            pendientes = self._pendientes[f]
+            if not pendientes:
+                continue
+            heap = []
+            for x, y in ((i, j), (j, i)) if not self._dirigido else ((i, j),):
+                if usado[x] is None:
+                    continue
+                carga = usado[x] + peso
+                if carga > self.autonomia:
+                    continue
+                carga = 0 if self._es_recarga[y] else carga
+                if usado[y] is None or carga < usado[y]:
+                    usado[y] = carga
+                    heapq.heappush(heap, (carga, y))
+            if heap:
+                self._propagar(usado, heap)
+                nuevos.extend(self._par(f, o) for o in pendientes if usado[o] is not None)
+                self._pendientes[f] = [o for o in pendientes if usado[o] is None]
+        return nuevos
+
+    def inalcanzables(self):
+        """
+        Retorna los pares (almacén, cliente) sin camino segmentado según el último estado calculado.
+        """
+        return [self._par(f, o) for f, pendientes in self._pendientes.items() for o in pendientes]
+
+    def _par(self, fuente, objetivo):
+        """
+        Orienta un par fuente-objetivo como (almacén, cliente).
+        """
+        if not self._vertices[fuente].es_tipo('almacenamiento'):
+            fuente, objetivo = objetivo, fuente
+        return self._vertices[fuente], self._vertices[objetivo]
+
+    def _propagar(self, usado, heap):
+        """
+        Dijkstra sobre la carga usada, partiendo de los estados ya presentes en el heap.
+        """
+        adyacencia, es_recarga, autonomia = self._adyacencia, self._es_recarga, self.autonomia
+        while heap:
+            carga, x = heapq.heappop(heap)
+            if carga > usado[x]:
+                continue
+            for y, peso in adyacencia[x]:
+                nueva = carga + peso
+                if nueva > autonomia:
+                    continue
+                if es_recarga[y]:
+                    nueva = 0
+                if usado[y] is None or nueva < usado[y]:
+                    usado[y] = nueva
+                    heapq.heappush(heap, (nueva, y))
@@ -0,0 +1,81 @@
+"""
+Ambito de simulacion: conjunto de instancias unicas (repositorios, fabricas, suscripciones del bus de
+eventos y la Simulacion) que pertenecen a una misma simulacion.
+Las clases singleton obtienen su instancia del ambito activo en el contexto actual (contextvars), de modo
+que un mismo proceso puede alojar varias simulaciones aisladas. Sin ambito activo se usa AMBITO_PRINCIPAL,
+que es la simulacion de los endpoints sin prefijo /simulaciones/{id}.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+import threading
+import time
+
+
+class AmbitoSimulacion:
+    """
+    Instancias unicas por clase de una simulacion, con datos de uso para el desalojo por inactividad.
+    """
+
+    def __init__(self, id_ambito):
+        self.id_ambito = id_ambito
+        self.creado = time.time()
+        self.ultimo_acceso = time.monotonic()
+        self.en_uso = 0
+        self._instancias = {}  # clase -> instancia
+        self._lock = threading.Lock()
+
+    def obtener(self, clase):
+        """
+        Retorna la instancia de clase en este ambito, o None si aun no se creo.
+        """
+        return self._instancias.get(clase)
+
+    def registrar(self, clase, instancia):
+        """
+        Guarda la instancia de clase si no existia y retorna la instancia vigente.
+        """
+        with self._lock:
+            return self._instancias.setdefault(clase, instancia)
+
+    def inactivo(self):
+        """
+        Segundos desde el ultimo uso; 0 mientras atiende alguna peticion.
+        """
+        return 0.0 if self.en_uso else time.monotonic() - self.ultimo_acceso
+
+    def liberar(self):
+        """
+        Suelta todas las instancias del ambito (la simulacion queda vacia y se libera su memoria).
+        """
+        with self._lock:
+            self._instancias.clear()
+
+
+AMBITO_PRINCIPAL = AmbitoSimulacion('principal')
+
+_ambito_actual = ContextVar('ambito_simulacion', default=None)
+
+
+def ambito_actual():
+    """
+    Ambito activo en el contexto actual, o AMBITO_PRINCIPAL si no se activo ninguno.
+    """
+    return _ambito_actual.get() or AMBITO_PRINCIPAL
+
+
+@contextmanager
+def activar_ambito(ambito):
+    """
+    Activa el ambito en el contexto actual mientras dura el bloque y lo marca en uso.
+    Las tareas e hilos lanzados desde el bloque con el contexto copiado heredan el ambito.
+    """
+    token = _ambito_actual.set(ambito)
+    with ambito._lock:
+        ambito.en_uso += 1
+    try:
+        yield ambito
+    finally:
+        with ambito._lock:
+            ambito.en_uso -= 1
+            ambito.ultimo_acceso = time.monotonic()
+        _ambito_actual.reset(token)
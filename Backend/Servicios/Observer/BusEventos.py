@@ -0,0 +1,141 @@
+"""
+Bus de eventos unico para el patron observer en la simulacion logistica de drones.
+Reemplaza los conjuntos de observadores por objeto: los sujetos publican en el bus y
+cada observador declara los nombres de evento que le interesan.
+"""
+from Backend.Infraestructura.ambito_simulacion import ambito_actual
+import fnmatch
+import logging
+import threading
+import time
+
+
+class BusEventos:
+    """
+    Singleton que despacha eventos a los observadores suscritos.
+    - Un observador se suscribe a nombres de evento exactos o a patrones con '*'
+      (por ejemplo 'repositorio_*_agregado'); si no indica eventos se usan los de su atributo EVENTOS.
+    - Publicar un evento sin suscriptores cuesta una sola consulta a un dict.
+    - Los eventos de alto volumen (EVENTOS_AGREGADOS) no se despachan uno a uno: se acumulan
+      en contadores que se entregan a sus suscriptores cada intervalo_vaciado segundos
+      como un unico evento con datos {'cantidad': n, 'agregado': True}.
+    - Las suscripciones son por ambito de simulacion (ver ambito_simulacion): un evento publicado mientras
+      una simulacion esta activa solo llega a los observadores suscritos en esa simulacion. Por eso el bus
+      puede guardarse en variables de modulo aunque el proceso aloje varias simulaciones.
+    """
+    _instancia = None
+    EVENTOS_AGREGADOS = ('hashmap_buscar', 'avl_buscar', 'vertice_serializado', 'repositorio_*_obtenida', 'repositorio_*_obtenido')
+
+    def __new__(cls):
+        if cls._instancia is None:
+            cls._instancia = super().__new__(cls)
+            cls._instancia.intervalo_vaciado = 5.0
+            cls._instancia.logger = logging.getLogger("BusEventos")
+        return cls._instancia
+
+    def _tabla(self):
+        """
+        Suscripciones y contadores del ambito de simulacion activo.
+        """
+        ambito = ambito_actual()
+        tabla = ambito.obtener(_TablaEventos)
+        if tabla is None:
+            tabla = ambito.registrar(_TablaEventos, _TablaEventos())
+        return tabla
+
+    def suscribir(self, observador, eventos=None):
+        """
+        Suscribe el observador a los eventos indicados (o a observador.EVENTOS).
+        Volver a suscribir un observador amplia su lista de eventos.
+        """
+        eventos = tuple(eventos if eventos is not None else getattr(observador, 'EVENTOS', ()))
+        tabla = self._tabla()
+        with tabla.lock:
+            previos = tabla.suscripciones.get(observador, ())
+            tabla.suscripciones[observador] = previos + tuple(e for e in eventos if e not in previos)
+            tabla.resueltos = {}
+
+    def desuscribir(self, observador):
+        tabla = self._tabla()
+        with tabla.lock:
+            if tabla.suscripciones.pop(observador, None) is not None:
+                tabla.resueltos = {}
+
+    def escucha(self, evento):
+        """
+        Indica si algun observador recibe el evento; permite omitir el armado de datos en rutas calientes.
+        """
+        tabla = self._tabla()
+        suscriptores = tabla.resueltos.get(evento)
+        if suscriptores is None:
+            suscriptores = self._resolver(tabla, evento)
+        return bool(suscriptores)
+
+    def publicar(self, evento, sujeto=None, datos=None):
+        """
+        Entrega el evento a sus suscriptores. Los errores de un observador se registran y no se propagan.
+        """
+        tabla = self._tabla()
+        suscriptores = tabla.resueltos.get(evento)
+        if suscriptores is None:
+            suscriptores = self._resolver(tabla, evento)
+        if not suscriptores:
+            return
+        if evento in tabla.agregados:
+            # Con el lock: vaciar() reemplaza el dict y los lectores concurrentes no deben perder incrementos
+            with tabla.lock:
+                tabla.contadores[evento] = tabla.contadores.get(evento, 0) + 1
+                vencido = time.monotonic() - tabla.ultimo_vaciado >= self.intervalo_vaciado
+            if vencido:
+                self.vaciar()
+            return
+        self._despachar(suscriptores, evento, sujeto, datos)
+
+    def vaciar(self):
+        """
+        Entrega a sus suscriptores los contadores acumulados de los eventos agregados (del ambito activo).
+        """
+        tabla = self._tabla()
+        with tabla.lock:
+            contadores, tabla.contadores = tabla.contadores, {}
+            tabla.ultimo_vaciado = time.monotonic()
+        for evento, cantidad in contadores.items():
+            suscriptores = tabla.resueltos.get(evento) or self._resolver(tabla, evento)
+            self._despachar(suscriptores, evento, self, {'cantidad': cantidad, 'agregado': True})
+
+    def contadores_pendientes(self):
+        tabla = self._tabla()
+        with tabla.lock:
+            return dict(tabla.contadores)
+
+    def _resolver(self, tabla, evento):
+        """
+        Calcula y memoriza los suscriptores de un nombre de evento.
+        """
+        suscriptores = tuple(obs for obs, patrones in list(tabla.suscripciones.items())
+                             if any(p == evento or fnmatch.fnmatchcase(evento, p) for p in patrones))
+        if any(fnmatch.fnmatchcase(evento, p) for p in self.EVENTOS_AGREGADOS):
+            tabla.agregados.add(evento)
+        tabla.resueltos[evento] = suscriptores
+        return suscriptores
+
+    def _despachar(self, suscriptores, evento, sujeto, datos):
+        for observador in suscriptores:
+            try:
+                observador.actualizar(evento, sujeto, datos)
+            except Exception as e:
+                self.logger.error(f"Error notificando observer {type(observador).__name__}: {e}")
+
+
+class _TablaEventos:
+    """
+    Estado del bus para un ambito de simulacion.
+    """
+
+    def __init__(self):
+        self.suscripciones = {}  # observador -> tuple de nombres/patrones
+        self.resueltos = {}  # evento -> tuple de observadores (vacia si nadie escucha)
+        self.agregados = set()  # eventos resueltos como agregados
+        self.contadores = {}  # evento agregado -> cantidad pendiente de vaciar
+        self.lock = threading.Lock()
+        self.ultimo_vaciado = time.monotonic()
@@ -0,0 +1,155 @@
+"""
+ObserverDeltas: Observador que convierte los eventos de la simulacion logistica de drones en deltas
+compactos (cambios de estado de pedidos, rutas nuevas, frecuencias del AVL, cambios del grafo y
+reinicios) numerados con una secuencia creciente, para que los dashboards apliquen los cambios
+localmente en vez de volver a descargar todas las entidades.
+"""
+from Backend.Dominio.Interfaces.IntObs.IObserver import IObserver
+from collections import deque
+from contextlib import contextmanager
+import itertools
+import threading
+import uuid
+
+class ObserverDeltas(IObserver):
+    EVENTOS = (
+        'simulacion_iniciada', 'simulacion_reiniciada',
+        # Pedidos
+        'pedido_status_actualizado', 'pedido_ruta_asignada', 'pedido_entregado', 'estado_actualizado',
+        'repositorio_pedidos_agregado', 'repositorio_pedidos_eliminado',
+        # Rutas y AVL de frecuencias
+        'repositorio_rutas_agregada', 'repositorio_rutas_eliminada', 'avl_insertar',
+        # Grafo
+        'vertice_insertado', 'vertice_eliminado', 'arista_insertada', 'arista_eliminada', 'peso_actualizado',
+        'vertices_insertados', 'aristas_insertadas',
+    )
+    # Cantidad de deltas que se conservan para reanudar; un cliente mas atrasado recibe un reinicio
+    CAPACIDAD = 20000
+
+    def __init__(self, capacidad=None):
+        # Distingue instancias del proceso: una secuencia de otra instancia obliga a recargar todo
+        self.instancia = uuid.uuid4().hex[:12]
+        self._contador = itertools.count(1)
+        self._deltas = deque(maxlen=capacidad or self.CAPACIDAD)
+        self._lock = threading.Lock()
+        self._pausado = 0
+        self._datos_inicio = None
+        self.ultimo_seq = 0
+
+    def actualizar(self, evento, sujeto=None, datos=None):
+        datos = datos or {}
+        if evento in ('simulacion_iniciada', 'simulacion_reiniciada'):
+            if self._pausado:
+                self._datos_inicio = dict(datos)
+            else:
+                self._agregar('simulacion_reiniciada', dict(datos))
+            return
+        if self._pausado:
+            return
+        if evento in ('pedido_status_actualizado', 'pedido_ruta_asignada', 'pedido_entregado', 'estado_actualizado'):
+            self._agregar_estado_pedido(sujeto)
+        elif evento == 'repositorio_pedidos_agregado':
+            self._agregar('pedido_nuevo', {'id_pedido': getattr(datos.get('pedido'), 'id_pedido', None)}, datos.get('pedido'))
+        elif evento == 'repositorio_pedidos_eliminado':
+            self._agregar('pedido_eliminado', {'id_pedido': datos.get('id')})
+        elif evento == 'repositorio_rutas_agregada':
+            self._agregar('ruta_nueva', {'id_ruta': str(datos.get('clave'))}, datos.get('ruta'))
+        elif evento == 'repositorio_rutas_eliminada':
+            self._agregar('ruta_eliminada', {'id_ruta': str(datos.get('clave'))})
+        elif evento == 'avl_insertar':
+            clave = datos.get('clave')
+            self._agregar('ruta_frecuencia', {'clave': clave, 'frecuencia': sujeto.obtener_frecuencia(clave) if sujeto else None})
+        elif evento in ('vertice_insertado', 'vertice_eliminado'):
+            self._agregar(evento, {'id': self._id_vertice(datos.get('vertice'))})
+        elif evento == 'arista_insertada':
+            arista = datos.get('arista')
+            self._agregar(evento, self._datos_arista(arista.origen, arista.destino, arista.peso))
+        elif evento == 'vertices_insertados':
+            # Las inserciones por lote se publican como las individuales para los clientes del flujo
+            for vertice in datos.get('vertices', []):
+                self._agregar('vertice_insertado', {'id': self._id_vertice(vertice)})
+        elif evento == 'aristas_insertadas':
+            for arista in datos.get('aristas', []):
+                self._agregar('arista_insertada', self._datos_arista(arista.origen, arista.destino, arista.peso))
+        elif evento == 'arista_eliminada':
+            self._agregar(evento, self._datos_arista(datos.get('origen'), datos.get('destino')))
+        elif evento == 'peso_actualizado':
+            self._agregar('arista_peso', self._datos_arista(sujeto.origen, sujeto.destino, datos.get('peso')))
+
+    @contextmanager
+    def en_lote(self):
+        """
+        Suspende los deltas mientras se reconstruye la simulacion: en vez de miles de altas de
+        vertices, aristas y pedidos se emite un unico 'simulacion_reiniciada' al terminar
+        (tambien si la reconstruccion falla, porque el estado anterior ya no es valido).
+        """
+        with self._lock:
+            self._pausado += 1
+            self._datos_inicio = None
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._pausado -= 1
+                emitir = not self._pausado
+                datos = self._datos_inicio if self._datos_inicio is not None else {'completa': False}
+            if emitir:
+                self._agregar('simulacion_reiniciada', datos)
+
+    def desde(self, seq, limite=None):
+        """
+        Retorna (deltas, completo) con los deltas posteriores a seq, a lo sumo limite.
+        completo es False si alguno ya salio del buffer: el cliente debe recargar todo y seguir desde ultimo_seq.
+        """
+        with self._lock:
+            if not self._deltas or seq >= self.ultimo_seq:
+                return [], True
+            primero = self._deltas[0]['seq']
+            if seq < primero - 1:
+                return [], False
+            inicio = max(0, seq - primero + 1)
+            fin = None if limite is None else inicio + limite
+            return list(itertools.islice(self._deltas, inicio, fin)), True
+
+    def _agregar_estado_pedido(self, pedido):
+        id_pedido = getattr(pedido, 'id_pedido', None)
+        if id_pedido is None:
+            return
+        fecha_entrega = getattr(pedido, 'fecha_entrega', None)
+        datos = {
+            'id_pedido': id_pedido,
+            'status': pedido.status,
+            'fecha_entrega': fecha_entrega.isoformat() if hasattr(fecha_entrega, 'isoformat') else fecha_entrega,
+        }
+        # Un mismo cambio de estado suele publicarse por el pedido y por la simulacion: se emite una vez
+        self._agregar('pedido_estado', datos, omitir_repetido=True)
+
+    def _agregar(self, tipo, datos, entidad=None, omitir_repetido=False):
+        """
+        Numera y guarda un delta; entidad es el objeto de dominio que el API serializa si hace falta.
+        Con omitir_repetido no se guarda si el ultimo delta es identico (comparado con el lock tomado,
+        para que dos escritores concurrentes no emitan ambos el mismo delta).
+        """
+        with self._lock:
+            if omitir_repetido and self._deltas:
+                ultimo = self._deltas[-1]
+                if ultimo['tipo'] == tipo and ultimo['datos'] == datos:
+                    return
+            seq = next(self._contador)
+            self._deltas.append({'seq': seq, 'tipo': tipo, 'datos': datos, 'entidad': entidad})
+            self.ultimo_seq = seq
+
+    def _datos_arista(self, origen, destino, peso=None):
+        datos = {'origen': self._id_vertice(origen), 'destino': self._id_vertice(destino)}
+        if peso is not None:
+            datos['peso'] = peso
+        return datos
+
+    @staticmethod
+    def _id_vertice(vertice):
+        elemento = getattr(vertice, 'elemento', vertice)
+        for atributo in ('id_cliente', 'id_almacenamiento', 'id_recarga'):
+            valor = getattr(elemento, atributo, None)
+            if valor is not None:
+                return valor
+        return None
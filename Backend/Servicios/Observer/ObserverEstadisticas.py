@@ -7,6 +7,8 @@ import logging
 import os
 
 class ObserverEstadisticas(IObserver):
+    EVENTOS = ('simulacion_iniciada', 'entrega_pedido', 'calculo_ruta', 'simulacion_reiniciada')
+
     def __init__(self, servicio_estadisticas=None):
         self.logger = logging.getLogger("ObserverEstadisticas")
         self.servicio_estadisticas = servicio_estadisticas  # Puede ser None o un servicio real
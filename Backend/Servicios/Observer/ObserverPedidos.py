@@ -6,6 +6,8 @@ from Backend.Dominio.Interfaces.IntObs.IObserver import IObserver
 import logging
 
 class ObserverPedidos(IObserver):
+    EVENTOS = ('simulacion_iniciada', 'calculo_ruta', 'entrega_pedido', 'simulacion_reiniciada', 'nuevo_pedido', 'actualizacion_pedido')
+
     def __init__(self):
         self.logger = logging.getLogger("ObserverPedidos")
 
@@ -0,0 +1,81 @@
+"""
+ObserverPersistencia: Observador que anota qué partes de la simulacion logistica de drones cambiaron
+desde la ultima escritura en el almacen de persistencia (pedidos, rutas, frecuencias del AVL, o la
+simulacion completa al iniciarla, reiniciarla o modificar el grafo).
+"""
+from Backend.Dominio.Interfaces.IntObs.IObserver import IObserver
+from contextlib import contextmanager
+import threading
+
+class ObserverPersistencia(IObserver):
+    EVENTOS = (
+        'simulacion_iniciada', 'simulacion_reiniciada', 'repositorio_*_limpiado',
+        # Pedidos
+        'pedido_status_actualizado', 'pedido_ruta_asignada', 'pedido_entregado', 'estado_actualizado',
+        'repositorio_pedidos_agregado', 'repositorio_pedidos_eliminado',
+        # Rutas y AVL de frecuencias
+        'repositorio_rutas_agregada', 'repositorio_rutas_eliminada', 'avl_insertar', 'avl_eliminar',
+        # Grafo
+        'vertice_insertado', 'vertice_eliminado', 'arista_insertada', 'arista_eliminada', 'peso_actualizado',
+        'vertices_insertados', 'aristas_insertadas',
+    )
+    EVENTOS_COMPLETOS = (
+        'simulacion_iniciada', 'simulacion_reiniciada',
+        'vertice_insertado', 'vertice_eliminado', 'arista_insertada', 'arista_eliminada', 'peso_actualizado',
+        'vertices_insertados', 'aristas_insertadas',
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pausado = 0
+        self._vaciar()
+
+    def actualizar(self, evento, sujeto=None, datos=None):
+        if self._pausado:
+            return
+        datos = datos or {}
+        with self._lock:
+            if evento in self.EVENTOS_COMPLETOS or evento.endswith('_limpiado'):
+                self.completo = True
+            elif evento in ('pedido_status_actualizado', 'pedido_ruta_asignada', 'pedido_entregado', 'estado_actualizado'):
+                if getattr(sujeto, 'id_pedido', None) is not None:
+                    self.pedidos.add(sujeto.id_pedido)
+            elif evento == 'repositorio_pedidos_agregado':
+                self.pedidos.add(getattr(datos.get('pedido'), 'id_pedido', None))
+            elif evento == 'repositorio_pedidos_eliminado':
+                self.pedidos.add(datos.get('id'))
+            elif evento in ('repositorio_rutas_agregada', 'repositorio_rutas_eliminada'):
+                self.rutas.add(str(datos.get('clave')))
+            elif evento in ('avl_insertar', 'avl_eliminar'):
+                self.frecuencias.add(datos.get('clave'))
+
+    def extraer(self):
+        """
+        Retorna los cambios anotados (completo, pedidos, rutas, frecuencias) y empieza de cero.
+        """
+        with self._lock:
+            cambios = (self.completo, self.pedidos, self.rutas, self.frecuencias)
+            self._vaciar()
+        return cambios
+
+    def hay_cambios(self):
+        return self.completo or bool(self.pedidos or self.rutas or self.frecuencias)
+
+    @contextmanager
+    def pausado(self):
+        """
+        No anota cambios mientras dura el bloque (al cargar la simulacion desde el almacen).
+        """
+        with self._lock:
+            self._pausado += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._pausado -= 1
+
+    def _vaciar(self):
+        self.completo = False
+        self.pedidos = set()
+        self.rutas = set()
+        self.frecuencias = set()
@@ -0,0 +1,39 @@
+"""
+ObserverVersion: Observador que mantiene la version global de la simulacion logistica de drones.
+La version crece con cada mutacion del grafo, de los pedidos o de las rutas y se usa para
+responder lecturas condicionales (ETag / If-None-Match) sin consultar repositorios.
+"""
+from Backend.Dominio.Interfaces.IntObs.IObserver import IObserver
+import itertools
+import uuid
+
+class ObserverVersion(IObserver):
+    EVENTOS = (
+        'simulacion_iniciada',
+        # Grafo y sus elementos
+        'vertice_insertado', 'vertice_eliminado', 'vertice_elemento_actualizado', 'vertices_insertados',
+        'arista_insertada', 'arista_eliminada', 'arista_actualizada', 'peso_actualizado', 'aristas_insertadas',
+        # Pedidos
+        'pedido_status_actualizado', 'pedido_ruta_asignada', 'pedido_entregado', 'estado_actualizado',
+        # Repositorios (altas, bajas, asociaciones y limpieza) y AVL de frecuencias de rutas
+        'repositorio_*_agregado', 'repositorio_*_agregada', 'repositorio_*_eliminado', 'repositorio_*_eliminada',
+        'repositorio_*_limpiado', 'repositorio_*_asociado', 'repositorio_*_asociados',
+        'avl_insertar', 'avl_eliminar',
+    )
+
+    def __init__(self):
+        # Distingue instancias del proceso: una version no se repite aunque el backend se reinicie
+        self.instancia = uuid.uuid4().hex[:12]
+        # next() sobre itertools.count es atomico bajo el GIL: dos mutaciones concurrentes nunca comparten version
+        self._contador = itertools.count(1)
+        self.version = 0
+
+    def actualizar(self, evento, sujeto=None, datos=None):
+        self.version = next(self._contador)
+
+    def etag(self):
+        """
+        ETag debil de la version actual; es debil porque algunas respuestas (por ejemplo las
+        estadisticas) incluyen tiempos de consulta que cambian sin que cambie el estado.
+        """
+        return f'W/"{self.instancia}-{self.version}"'
@@ -1,32 +1,31 @@
 """
 Implementacion base de Sujeto Observable para el patron observer.
+Los observadores se registran en el BusEventos compartido.
 """
 from Backend.Dominio.Interfaces.IntObs.ISujeto import ISujeto
+from Backend.Servicios.Observer.BusEventos import BusEventos
 
 class SujetoObservable(ISujeto):
     def __init__(self):
         """
-        Inicializa la lista de observadores.
+        Obtiene el bus de eventos compartido.
         """
-        self._observadores = []
+        self._bus = BusEventos()
 
     def agregar_observador(self, observador):
         """
-        Agrega un observador si no esta ya registrado.
+        Suscribe un observador a los eventos que declara.
         """
-        if observador not in self._observadores:
-            self._observadores.append(observador)
+        self._bus.suscribir(observador)
 
     def quitar_observador(self, observador):
         """
-        Quita un observador si esta registrado.
+        Quita la suscripcion del observador.
         """
-        if observador in self._observadores:
-            self._observadores.remove(observador)
+        self._bus.desuscribir(observador)
 
     def notificar_observadores(self, evento, datos=None):
         """
-        Notifica a todos los observadores registrados sobre un evento.
+        Publica el evento en el bus; solo lo reciben los observadores suscritos a el.
         """
-        for observador in self._observadores:
-            observador.actualizar(evento, self, datos)
+        self._bus.publicar(evento, self, datos)
@@ -0,0 +1,112 @@
+"""
+Persistencia compartida de la simulación: varios procesos del API (workers) comparten una misma
+simulación a través de un almacén (IAlmacenPersistencia, por ejemplo AlmacenSQLite).
+"""
+from Backend.Dominio.Simulacion_estado import EstadoSimulacion
+from Backend.Servicios.Observer.ObserverPersistencia import ObserverPersistencia
+import logging
+
+
+class PersistenciaSimulacion:
+    """
+    Enlaza una Simulacion con un almacén de persistencia.
+    - Lecturas: se responden desde los repositorios en memoria del proceso, que actúan como cache;
+      sincronizar() los recarga solo cuando la versión del almacén avanzó (otro proceso escribió).
+    - Escrituras: cada escritura externa del cerrojo de la simulación es una transacción del almacén.
+      Al empezar se toma el cerrojo de escritura entre procesos y, si la versión cambió, se recarga la
+      simulación antes de modificarla; al terminar se guardan en un solo lote las filas de los pedidos,
+      rutas y frecuencias que cambiaron (o el estado completo tras iniciar, reiniciar o tocar el grafo).
+    - Recargas: si el registro de cambios del almacén cubre la versión cargada, solo se aplican las filas
+      escritas desde entonces (Simulacion.aplicar_cambios); si no, se restaura el estado completo.
+    """
+
+    def __init__(self, simulacion, almacen):
+        self.simulacion = simulacion
+        self.almacen = almacen
+        self.observer = ObserverPersistencia()
+        # Versión del almacén que refleja la simulación en memoria (None: no se ha cargado)
+        self.version_cargada = None
+        self.logger = logging.getLogger("PersistenciaSimulacion")
+        simulacion.agregar_observador(self.observer)
+        simulacion.cerrojo.agregar_ganchos(self._al_iniciar_escritura, self._al_terminar_escritura)
+
+    def desactualizada(self):
+        """
+        True si otro proceso confirmó una versión que este proceso aún no cargó (una consulta a meta).
+        """
+        return self.almacen.version() != self.version_cargada
+
+    def sincronizar(self):
+        """
+        Recarga la simulación desde el almacén si está desactualizada. Retorna True si la recargó.
+        """
+        if not self.desactualizada():
+            return False
+        # El gancho de inicio de escritura compara versiones y recarga dentro de la transacción
+        with self.simulacion.cerrojo.escritura():
+            pass
+        return True
+
+    def etag(self):
+        """
+        ETag común a todos los procesos: identificador del almacén y versión cargada.
+        """
+        return f'W/"{self.almacen.identificador()}-{self.version_cargada}"'
+
+    def _al_iniciar_escritura(self):
+        self.almacen.iniciar_escritura()
+        try:
+            if self.almacen.version() != self.version_cargada:
+                self._cargar()
+        except BaseException:
+            self.almacen.cancelar()
+            raise
+
+    def _cargar(self):
+        cambios = self.almacen.cambios(self.version_cargada)
+        with self.observer.pausado():
+            if cambios is not None and self.simulacion.aplicar_cambios(cambios[1]):
+                version = cambios[0]
+                self.logger.info(f"[Persistencia] Cambios aplicados desde el almacén: version={version}, filas={len(cambios[1])}")
+            else:
+                version, estado = self.almacen.cargar()
+                self.simulacion.restaurar_estado(estado)
+                self.logger.info(f"[Persistencia] Simulación cargada desde el almacén: version={version}")
+        self.version_cargada = version
+
+    def _al_terminar_escritura(self):
+        try:
+            completo, pedidos, rutas, frecuencias = self.observer.extraer()
+            if completo:
+                self.almacen.reemplazar(EstadoSimulacion.exportar(self.simulacion))
+                cambios = True
+            else:
+                filas = self._filas(pedidos, rutas, frecuencias)
+                if filas:
+                    self.almacen.guardar(filas)
+                cambios = bool(filas)
+            self.version_cargada = self.almacen.confirmar(cambios)
+        except BaseException:
+            self.almacen.cancelar()
+            # La memoria tiene cambios que no llegaron al almacén: la próxima escritura recarga
+            self.version_cargada = None
+            self.logger.error("[Persistencia] No se pudieron guardar los cambios; se recargará la simulación", exc_info=True)
+            raise
+
+    def _filas(self, pedidos, rutas, frecuencias):
+        """
+        Filas (coleccion, clave, datos) de lo que cambió, leídas del estado actual; datos None si se eliminó.
+        """
+        filas = []
+        for id_pedido in pedidos:
+            pedido = self.simulacion.repo_pedidos.obtener(id_pedido)
+            clave, datos = EstadoSimulacion.fila_pedido(pedido) if pedido is not None else (id_pedido, None)
+            filas.append(('pedidos', clave, datos))
+        for id_ruta in rutas:
+            ruta = self.simulacion.repo_rutas.obtener(id_ruta)
+            clave, datos = EstadoSimulacion.fila_ruta(ruta) if ruta is not None else (id_ruta, None)
+            filas.append(('rutas', clave, datos))
+        for clave_camino in frecuencias:
+            clave, datos = EstadoSimulacion.fila_frecuencia(self.simulacion.avl_rutas, clave_camino)
+            filas.append(('frecuencias', clave, datos))
+        return filas
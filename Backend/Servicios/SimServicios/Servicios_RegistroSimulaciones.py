@@ -0,0 +1,156 @@
+"""
+Registro de simulaciones aisladas: varias simulaciones (escenarios) en un mismo proceso, cada una con sus
+propios repositorios, fabricas, grafo y AVL, identificadas por un id de sesion.
+"""
+from Backend.Dominio.Simulacion_dominio import Simulacion
+from Backend.Infraestructura.ambito_simulacion import AmbitoSimulacion, AMBITO_PRINCIPAL, activar_ambito
+import logging
+import os
+import threading
+import time
+import uuid
+
+
+class RegistroSimulaciones:
+    """
+    Singleton con las simulaciones creadas por sesion y su desalojo.
+    - MAX_SIMULACIONES limita las simulaciones registradas (sin contar la principal).
+    - Una simulacion sin peticiones durante INACTIVIDAD_MAXIMA segundos se desaloja.
+    - MAX_ENTIDADES acota la memoria: si la suma de vertices, aristas, pedidos y rutas de todas las
+      simulaciones lo supera, se desalojan las inactivas usadas hace mas tiempo.
+    - Nunca se desaloja una simulacion que esta atendiendo una peticion ni la principal.
+    Los limites se pueden ajustar con las variables de entorno SIMULACIONES_MAX,
+    SIMULACIONES_INACTIVIDAD y SIMULACIONES_MAX_ENTIDADES.
+    """
+    _instancia = None
+    MAX_SIMULACIONES = int(os.environ.get("SIMULACIONES_MAX", "16"))
+    INACTIVIDAD_MAXIMA = float(os.environ.get("SIMULACIONES_INACTIVIDAD", "1800"))
+    MAX_ENTIDADES = int(os.environ.get("SIMULACIONES_MAX_ENTIDADES", "2000000"))
+    COLECCIONES_MEDIDAS = ('vertices', 'aristas', 'pedidos', 'rutas')
+
+    def __new__(cls):
+        if cls._instancia is None:
+            cls._instancia = super().__new__(cls)
+            cls._instancia._ambitos = {}  # id -> AmbitoSimulacion
+            cls._instancia._lock = threading.Lock()
+            cls._instancia.desalojadas = 0
+            cls._instancia.logger = logging.getLogger("RegistroSimulaciones")
+        return cls._instancia
+
+    def crear(self):
+        """
+        Crea y registra una simulacion vacia (se inicia con /simulaciones/{id}/simulacion/iniciar).
+        Lanza RuntimeError si se alcanzo MAX_SIMULACIONES y ninguna se puede desalojar.
+        """
+        with self._lock:
+            self._desalojar_inactivas()
+            if len(self._ambitos) >= self.MAX_SIMULACIONES and not self._desalojar_menos_reciente():
+                raise RuntimeError(f"Límite de simulaciones alcanzado ({self.MAX_SIMULACIONES} en uso)")
+            ambito = AmbitoSimulacion(uuid.uuid4().hex[:12])
+            # La Simulacion se construye aqui, antes de publicar el ambito, para que dos peticiones
+            # concurrentes no la inicialicen a la vez
+            with activar_ambito(ambito):
+                Simulacion()
+            self._ambitos[ambito.id_ambito] = ambito
+        self.logger.info(f"[RegistroSimulaciones] Simulación creada: id={ambito.id_ambito}")
+        return ambito
+
+    def obtener(self, id_simulacion):
+        """
+        Retorna el ambito de la simulacion, o None si no existe o fue desalojada.
+        'principal' corresponde a la simulacion de los endpoints sin prefijo.
+        """
+        if id_simulacion == AMBITO_PRINCIPAL.id_ambito:
+            return AMBITO_PRINCIPAL
+        with self._lock:
+            self._desalojar_inactivas()
+            ambito = self._ambitos.get(id_simulacion)
+            if ambito is not None:
+                # Cuenta como uso: la peticion que la pidio no la pierde por un desalojo concurrente
+                ambito.ultimo_acceso = time.monotonic()
+            return ambito
+
+    def eliminar(self, id_simulacion):
+        """
+        Elimina la simulacion y libera sus instancias. Retorna False si no existia.
+        """
+        with self._lock:
+            ambito = self._ambitos.pop(id_simulacion, None)
+        if ambito is None:
+            return False
+        ambito.liberar()
+        self.logger.info(f"[RegistroSimulaciones] Simulación eliminada: id={id_simulacion}")
+        return True
+
+    def listar(self):
+        """
+        Retorna el ambito principal seguido de las simulaciones registradas.
+        """
+        with self._lock:
+            self._desalojar_inactivas()
+            return [AMBITO_PRINCIPAL] + list(self._ambitos.values())
+
+    def resumen(self, ambito):
+        """
+        Dict serializable con id, fechas de uso y tamaño de una simulacion.
+        """
+        simulacion = ambito.obtener(Simulacion)
+        return {
+            'id': ambito.id_ambito,
+            'creada': ambito.creado,
+            'inactiva_segundos': round(ambito.inactivo(), 3),
+            'en_uso': ambito.en_uso,
+            'iniciada': simulacion is not None and simulacion.grafo is not None,
+            'entidades': self._entidades(ambito),
+        }
+
+    def limites(self):
+        return {
+            'max_simulaciones': self.MAX_SIMULACIONES,
+            'inactividad_maxima': self.INACTIVIDAD_MAXIMA,
+            'max_entidades': self.MAX_ENTIDADES,
+            'desalojadas': self.desalojadas,
+        }
+
+    def controlar_memoria(self):
+        """
+        Desaloja simulaciones inactivas (de la menos a la mas reciente) mientras el total de entidades
+        supere MAX_ENTIDADES. Se llama despues de iniciar una simulacion, que es cuando crece el total.
+        """
+        with self._lock:
+            total = sum(self._entidades(a) for a in [AMBITO_PRINCIPAL] + list(self._ambitos.values()))
+            while total > self.MAX_ENTIDADES:
+                liberadas = self._desalojar_menos_reciente()
+                if not liberadas:
+                    break
+                total -= liberadas
+
+    def _entidades(self, ambito):
+        simulacion = ambito.obtener(Simulacion)
+        if simulacion is None:
+            return 0
+        return sum(simulacion.obtener_repositorio(c).cantidad() for c in self.COLECCIONES_MEDIDAS)
+
+    def _desalojar_inactivas(self):
+        for id_simulacion, ambito in list(self._ambitos.items()):
+            if ambito.inactivo() >= self.INACTIVIDAD_MAXIMA:
+                self._desalojar(id_simulacion, 'inactividad')
+
+    def _desalojar_menos_reciente(self):
+        """
+        Desaloja la simulacion inactiva usada hace mas tiempo. Retorna sus entidades liberadas
+        (al menos 1), o 0 si todas estan atendiendo peticiones.
+        """
+        candidatas = [a for a in self._ambitos.values() if not a.en_uso]
+        if not candidatas:
+            return 0
+        ambito = min(candidatas, key=lambda a: a.ultimo_acceso)
+        entidades = self._entidades(ambito)
+        self._desalojar(ambito.id_ambito, 'capacidad')
+        return max(entidades, 1)
+
+    def _desalojar(self, id_simulacion, motivo):
+        ambito = self._ambitos.pop(id_simulacion)
+        ambito.liberar()
+        self.desalojadas += 1
+        self.logger.info(f"[RegistroSimulaciones] Simulación desalojada por {motivo}: id={id_simulacion}")
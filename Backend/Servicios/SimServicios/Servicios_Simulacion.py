@@ -1,15 +1,32 @@
 from Backend.Dominio.Interfaces.IntSim.ISimulacionDominioService import ISimulacionDominioService
 from Backend.Dominio.Simulacion_dominio import Simulacion
+from Backend.Infraestructura.TDA.TDA_CerrojoLecturaEscritura import en_lectura
+from Backend.Servicios.SimServicios.Servicios_Persistencia import PersistenciaSimulacion
+from itertools import islice
 import time
 
 class SimulacionDominioService(ISimulacionDominioService):
     """
     Servicio de dominio para la simulacion.
     Orquesta la logica de negocio usando la instancia de Simulacion inyectada.
+    Las consultas compuestas toman el cerrojo de lectura de la simulacion (ver Simulacion).
     """
+    # Entidades copiadas por cada toma del cerrojo al recorrer una colección
+    TAMANO_BLOQUE_LECTURA = 500
+
     def __init__(self, simulacion: Simulacion):
         self._sim = simulacion
 
+    @property
+    def cerrojo(self):
+        return self._sim.cerrojo
+
+    def lectura(self):
+        """
+        Contexto con el cerrojo de lectura: agrupa varias consultas sobre un mismo estado.
+        """
+        return self._sim.cerrojo.lectura()
+
     def iniciar_simulacion(self, n_vertices: int, m_aristas: int, n_pedidos: int) -> None:
         self._sim.iniciar_simulacion(n_vertices, m_aristas, n_pedidos)
         return {
@@ -22,27 +39,105 @@ class SimulacionDominioService(ISimulacionDominioService):
         "mensaje": None
     }
 
+    @en_lectura
     def obtener_vertices(self):
         return self._sim.obtener_vertices()
 
+    @en_lectura
     def obtener_aristas(self):
         return self._sim.obtener_aristas()
 
+    @en_lectura
     def obtener_clientes(self):
         return self._sim.obtener_clientes()
 
+    @en_lectura
     def obtener_almacenamientos(self):
         return self._sim.obtener_almacenamientos()
 
+    @en_lectura
     def obtener_recargas(self):
         return self._sim.obtener_recargas()
 
+    @en_lectura
     def obtener_pedidos(self):
         return self._sim.obtener_pedidos()
 
+    @en_lectura
     def obtener_rutas(self):
         return self._sim.obtener_rutas()
 
+    def obtener_version(self):
+        return self._sim.version()
+
+    def obtener_etag(self):
+        return self._sim.etag()
+
+    def configurar_persistencia(self, almacen):
+        """
+        Comparte la simulación con otros procesos a través del almacén (IAlmacenPersistencia) y carga
+        lo que ya tenga guardado. Llamarlo otra vez no cambia el almacén configurado.
+        """
+        if self._sim.persistencia is None:
+            self._sim.persistencia = PersistenciaSimulacion(self._sim, almacen)
+            self._sim.persistencia.sincronizar()
+        return self._sim.persistencia
+
+    def sincronizar_persistencia(self):
+        """
+        Recarga la simulación si otro proceso la modificó; sin persistencia no hace nada.
+        """
+        persistencia = self._sim.persistencia
+        return persistencia is not None and persistencia.sincronizar()
+
+    def persistencia_desactualizada(self):
+        persistencia = self._sim.persistencia
+        return persistencia is not None and persistencia.desactualizada()
+
+    def guardar_checkpoint(self, ruta):
+        """
+        Guarda la simulación completa en un checkpoint binario (grafo, pedidos, rutas y frecuencias).
+        """
+        return self._sim.guardar_checkpoint(ruta)
+
+    def restaurar_checkpoint(self, ruta):
+        """
+        Reemplaza la simulación por la guardada en un checkpoint binario, sin generar nada al azar.
+        """
+        return self._sim.restaurar_checkpoint(ruta)
+
+    def obtener_deltas(self, seq: int, limite: int = None):
+        return self._sim.deltas_desde(seq, limite)
+
+    def obtener_posicion_deltas(self):
+        return self._sim.posicion_deltas()
+
+    def iterar_coleccion(self, coleccion: str, desde: int = 0):
+        """
+        Itera pares (clave, entidad) de una colección desde la posición indicada.
+        Cada bloque se copia con el cerrojo de lectura y se entrega sin retenerlo, de modo que un
+        recorrido lento (por ejemplo una exportación NDJSON) no bloquea a los escritores.
+        """
+        repo = self._sim.obtener_repositorio(coleccion)
+        if repo is None:
+            raise ValueError(f"Colección desconocida: {coleccion}")
+        return self._iterar_por_bloques(repo, desde)
+
+    def _iterar_por_bloques(self, repo, desde):
+        while True:
+            with self._sim.cerrojo.lectura():
+                bloque = list(islice(repo.iterar(desde), self.TAMANO_BLOQUE_LECTURA))
+            yield from bloque
+            if len(bloque) < self.TAMANO_BLOQUE_LECTURA:
+                return
+            desde += len(bloque)
+
+    def contar_coleccion(self, coleccion: str):
+        repo = self._sim.obtener_repositorio(coleccion)
+        if repo is None:
+            raise ValueError(f"Colección desconocida: {coleccion}")
+        return repo.cantidad()
+
     def calcular_ruta_pedido(self, id_pedido: int, algoritmo: str = None):
         return self._sim.calcular_ruta_pedido(id_pedido, algoritmo)
 
@@ -67,6 +162,7 @@ class SimulacionDominioService(ISimulacionDominioService):
     def obtener_ruta(self, id_ruta: int):
         return self._sim.repo_rutas.obtener(id_ruta)
 
+    @en_lectura
     def obtener_rutas_mas_frecuentes(self, top: int = 5):
         return self._sim.obtener_rutas_mas_frecuentes(top)
 
@@ -133,6 +229,7 @@ class SimulacionDominioService(ISimulacionDominioService):
     def obtener_rutas_hashmap(self):
         return self.simulacion_aplicacion_service.obtener_rutas_hashmap()
 
+    @en_lectura
     def obtener_estadisticas(self):
         """
         Compila estadísticas generales de la simulación:
@@ -222,8 +319,9 @@ class SimulacionDominioService(ISimulacionDominioService):
         """
         Devuelve la lista de algoritmos de ruta disponibles en el sistema.
         """
-        return ['BFS', 'DFS', 'Dijkstra', 'FloydWarshall', 'TopologicalSort']
+        return ['BFS', 'DFS', 'Dijkstra', 'FloydWarshall', 'TopologicalSort', 'Bidireccional', 'ALT', 'CH']
 
+    @en_lectura
     def obtener_snapshot(self, tipo: str) -> dict:
         """
         Devuelve el snapshot serializado del grafo según el tipo ('n-1' o 'm_aristas').
@@ -258,14 +356,15 @@ class SimulacionDominioService(ISimulacionDominioService):
         fabrica_rutas = self._sim.fabricante_rutas
         return fabrica_rutas.calcular_ruta_todos(pedido, grafo)
 
-    def calcular_rutas_algoritmos(self):
+    def calcular_rutas_algoritmos(self, max_workers: int = None):
         """
         Calcula rutas para todos los pedidos y algoritmos en paralelo.
+        max_workers limita los procesos trabajadores (None = todos los núcleos).
         """
         pedidos = self._sim.repo_pedidos.todos()
         grafo = self._sim.grafo
         fabrica_rutas = self._sim.fabricante_rutas
-        return fabrica_rutas.calcular_rutas_algoritmos(pedidos, grafo)
+        return fabrica_rutas.calcular_rutas_algoritmos(pedidos, grafo, max_workers=max_workers)
 
     def floydwarshall_para_todos_los_pedidos(self):
         """
@@ -276,6 +375,82 @@ class SimulacionDominioService(ISimulacionDominioService):
         fabrica_rutas = self._sim.fabricante_rutas
         return fabrica_rutas.floydwarshall_para_todos_los_pedidos(pedidos, grafo)
 
+    def floydwarshall_por_lotes(self, trabajo, tamano_lote: int = 25):
+        """
+        Versión por lotes de floydwarshall_para_todos_los_pedidos para ejecutarse como Trabajo.
+        Reporta progreso y rutas parciales tras cada lote y se detiene si se solicita la cancelación.
+        """
+        pedidos = [p for p in self._sim.repo_pedidos.todos() if getattr(p, 'status', None) == 'pendiente']
+        grafo = self._sim.grafo
+        fabrica_rutas = self._sim.fabricante_rutas
+        trabajo.iniciar_progreso(len(pedidos))
+        for i in range(0, len(pedidos), tamano_lote):
+            if trabajo.cancelacion_solicitada():
+                return
+            lote = pedidos[i:i + tamano_lote]
+            rutas, tiempo_lote = fabrica_rutas.floydwarshall_para_todos_los_pedidos(lote, grafo)
+            trabajo.avanzar(len(lote), rutas, {'floydwarshall': tiempo_lote})
+
+    def calcular_rutas_por_almacen(self):
+        """
+        Calcula rutas Dijkstra para los pedidos pendientes con una búsqueda por almacén de origen.
+        """
+        pedidos = self._sim.repo_pedidos.todos()
+        grafo = self._sim.grafo
+        fabrica_rutas = self._sim.fabricante_rutas
+        return fabrica_rutas.calcular_rutas_por_almacen(pedidos, grafo)
+
+    def rutas_por_almacen_por_lotes(self, trabajo, tamano_lote: int = 25):
+        """
+        Versión por lotes de calcular_rutas_por_almacen para ejecutarse como Trabajo.
+        Los árboles de cada almacén se conservan entre lotes, por lo que cada origen se busca una sola vez.
+        """
+        pedidos = [p for p in self._sim.repo_pedidos.todos() if getattr(p, 'status', None) == 'pendiente']
+        grafo = self._sim.grafo
+        fabrica_rutas = self._sim.fabricante_rutas
+        trabajo.iniciar_progreso(len(pedidos))
+        for i in range(0, len(pedidos), tamano_lote):
+            if trabajo.cancelacion_solicitada():
+                return
+            lote = pedidos[i:i + tamano_lote]
+            rutas, tiempo_lote = fabrica_rutas.calcular_rutas_por_almacen(lote, grafo)
+            trabajo.avanzar(len(lote), rutas, {'dijkstra': tiempo_lote})
+
+    def calcular_rutas_algoritmos_por_lotes(self, trabajo, max_workers: int = None, tamano_lote: int = 25):
+        """
+        Versión por lotes de calcular_rutas_algoritmos para ejecutarse como Trabajo.
+        Reporta progreso, rutas parciales y tiempos por algoritmo tras cada lote de pedidos.
+        Un solo MotorRutasLote (procesos y memoria compartida) sirve a todos los lotes del trabajo.
+        """
+        from Backend.Dominio.AlgEstrategias.MotorRutasLote import MotorRutasLote
+        pedidos = [p for p in self._sim.repo_pedidos.todos() if getattr(p, 'status', None) == 'pendiente']
+        grafo = self._sim.grafo
+        fabrica_rutas = self._sim.fabricante_rutas
+        trabajo.iniciar_progreso(len(pedidos))
+        with MotorRutasLote(max_workers) as motor:
+            for i in range(0, len(pedidos), tamano_lote):
+                if trabajo.cancelacion_solicitada():
+                    return
+                lote = pedidos[i:i + tamano_lote]
+                resultados, tiempos = fabrica_rutas.calcular_rutas_algoritmos(lote, grafo, max_workers=max_workers, motor=motor)
+                rutas = [ruta for por_pedido in resultados.values() for ruta in por_pedido.values()]
+                trabajo.avanzar(len(lote), rutas, tiempos)
+
+    def comparar_algoritmos_rutas(self, consultas: int = 20, algoritmos: list = None):
+        """
+        Mide los algoritmos de ruta sobre los mismos pares (almacén, cliente) de los pedidos pendientes.
+        """
+        pedidos = self._sim.repo_pedidos.todos()
+        grafo = self._sim.grafo
+        fabrica_rutas = self._sim.fabricante_rutas
+        return fabrica_rutas.comparar_algoritmos(pedidos, grafo, algoritmos=algoritmos, consultas=consultas)
+
+    def obtener_estadisticas_cache_rutas(self):
+        """
+        Devuelve los contadores de la cache de rutas (aciertos, fallos, desalojos, expirados).
+        """
+        return self._sim.fabricante_rutas.estadisticas_cache()
+
     def entregar_pedido(self, id_pedido: int):
         """
         Marca un pedido como entregado.
@@ -288,6 +463,7 @@ class SimulacionDominioService(ISimulacionDominioService):
         """
         return self._sim.actualizar_estado_pedido(id_pedido, nuevo_estado)
 
+    @en_lectura
     def calcular_mst_kruskal(self):
         """
         Calcula el Árbol de Expansión Mínima (MST) usando el algoritmo de Kruskal.
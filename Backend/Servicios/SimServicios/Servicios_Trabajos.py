@@ -0,0 +1,165 @@
+"""
+Trabajos en segundo plano para operaciones masivas (cálculo de rutas por lotes).
+"""
+import concurrent.futures
+import contextvars
+import logging
+import threading
+import time
+import uuid
+
+
+class Trabajo:
+    """
+    Estado de un trabajo encolado: progreso, resultados parciales, tiempos y cancelación.
+    La función del trabajo recibe esta instancia y reporta su avance con iniciar_progreso/avanzar;
+    la cancelación es cooperativa: la función consulta cancelacion_solicitada() entre lotes.
+    """
+    ESTADOS_FINALES = ('completado', 'fallido', 'cancelado')
+
+    def __init__(self, tipo):
+        self.id_trabajo = uuid.uuid4().hex
+        self.tipo = tipo
+        self.estado = 'pendiente'
+        self.total = None
+        self.procesados = 0
+        self.resultados = []
+        self.tiempos = {}
+        self.error = None
+        self.creado = time.time()
+        self.iniciado = None
+        self.finalizado = None
+        self._cancelar = threading.Event()
+        self._lock = threading.Lock()
+        self._future = None
+
+    def iniciar_progreso(self, total):
+        with self._lock:
+            self.total = total
+            self.procesados = 0
+
+    def avanzar(self, cantidad, resultados=None, tiempos=None):
+        """
+        Suma elementos procesados y acumula resultados parciales y tiempos por clave.
+        """
+        with self._lock:
+            self.procesados += cantidad
+            if resultados:
+                self.resultados.extend(resultados)
+            for clave, tiempo in (tiempos or {}).items():
+                self.tiempos[clave] = self.tiempos.get(clave, 0) + tiempo
+
+    def cancelacion_solicitada(self):
+        return self._cancelar.is_set()
+
+    def terminado(self):
+        return self.estado in self.ESTADOS_FINALES
+
+    def resumen(self):
+        """
+        Retorna un dict con el estado del trabajo (sin los resultados, que se mapean en la API).
+        """
+        with self._lock:
+            fin = self.finalizado or time.time()
+            return {
+                'id_trabajo': self.id_trabajo,
+                'tipo': self.tipo,
+                'estado': self.estado,
+                'procesados': self.procesados,
+                'total': self.total,
+                'progreso': (self.procesados / self.total) if self.total else (1.0 if self.estado == 'completado' else 0.0),
+                'resultados_parciales': len(self.resultados),
+                'tiempos': dict(self.tiempos),
+                'tiempo_en_cola': (self.iniciado or fin) - self.creado,
+                'tiempo_ejecucion': (fin - self.iniciado) if self.iniciado else None,
+                'error': self.error,
+            }
+
+
+class GestorTrabajos:
+    """
+    Singleton que ejecuta trabajos en un executor acotado.
+    - MAX_TRABAJOS_CONCURRENTES limita los trabajos en ejecución simultánea.
+    - MAX_TRABAJOS_EN_COLA limita los trabajos pendientes; al superarlo encolar() lanza RuntimeError.
+    - Se conserva el historial de los últimos MAX_TRABAJOS_REGISTRADOS trabajos.
+    """
+    _instancia = None
+    MAX_TRABAJOS_CONCURRENTES = 1
+    MAX_TRABAJOS_EN_COLA = 8
+    MAX_TRABAJOS_REGISTRADOS = 100
+
+    def __new__(cls):
+        if cls._instancia is None:
+            cls._instancia = super().__new__(cls)
+            cls._instancia._executor = concurrent.futures.ThreadPoolExecutor(max_workers=cls.MAX_TRABAJOS_CONCURRENTES, thread_name_prefix="trabajo")
+            cls._instancia._trabajos = {}
+            cls._instancia._lock = threading.Lock()
+            cls._instancia.logger = logging.getLogger("GestorTrabajos")
+        return cls._instancia
+
+    def encolar(self, tipo, funcion, *args):
+        """
+        Registra y encola un trabajo. funcion(trabajo, *args) se ejecuta en segundo plano.
+        Retorna el Trabajo creado.
+        """
+        with self._lock:
+            pendientes = sum(1 for t in self._trabajos.values() if t.estado == 'pendiente')
+            if pendientes >= self.MAX_TRABAJOS_EN_COLA:
+                raise RuntimeError(f"Cola de trabajos llena ({pendientes} pendientes)")
+            trabajo = Trabajo(tipo)
+            self._trabajos[trabajo.id_trabajo] = trabajo
+            self._podar_historial()
+            # El trabajo corre con el contexto de quien lo encola, es decir sobre la misma simulacion (ambito)
+            trabajo._future = self._executor.submit(contextvars.copy_context().run, self._ejecutar, trabajo, funcion, args)
+        self.logger.info(f"[GestorTrabajos] Trabajo encolado: id={trabajo.id_trabajo}, tipo={tipo}")
+        return trabajo
+
+    def obtener(self, id_trabajo):
+        return self._trabajos.get(id_trabajo)
+
+    def listar(self):
+        return list(self._trabajos.values())
+
+    def cancelar(self, id_trabajo):
+        """
+        Solicita la cancelación. Un trabajo pendiente no llega a ejecutarse;
+        uno en ejecución se detiene al terminar su lote actual.
+        """
+        trabajo = self._trabajos.get(id_trabajo)
+        if trabajo is None or trabajo.terminado():
+            return trabajo
+        trabajo._cancelar.set()
+        if trabajo._future is not None and trabajo._future.cancel():
+            trabajo.estado = 'cancelado'
+            trabajo.finalizado = time.time()
+        self.logger.info(f"[GestorTrabajos] Cancelación solicitada: id={id_trabajo}, estado={trabajo.estado}")
+        return trabajo
+
+    def _ejecutar(self, trabajo, funcion, args):
+        if trabajo.cancelacion_solicitada():
+            trabajo.estado = 'cancelado'
+            trabajo.finalizado = time.time()
+            return
+        trabajo.estado = 'en_ejecucion'
+        trabajo.iniciado = time.time()
+        try:
+            funcion(trabajo, *args)
+            trabajo.estado = 'cancelado' if trabajo.cancelacion_solicitada() else 'completado'
+        except Exception as e:
+            self.logger.error(f"[GestorTrabajos] Trabajo {trabajo.id_trabajo} falló: {e}")
+            trabajo.error = str(e)
+            trabajo.estado = 'fallido'
+        finally:
+            trabajo.finalizado = time.time()
+            self.logger.info(f"[GestorTrabajos] Trabajo {trabajo.id_trabajo} terminado: estado={trabajo.estado}, procesados={trabajo.procesados}/{trabajo.total}")
+
+    def _podar_historial(self):
+        """
+        Elimina los trabajos terminados más antiguos si se supera el máximo registrado.
+        """
+        exceso = len(self._trabajos) - self.MAX_TRABAJOS_REGISTRADOS
+        if exceso <= 0:
+            return
+        terminados = sorted((t for t in self._trabajos.values() if t.terminado()), key=lambda t: t.creado)
+        for trabajo in terminados[:exceso]:
+            del self._trabajos[trabajo.id_trabajo]
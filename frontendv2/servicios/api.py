@@ -2,6 +2,35 @@ import requests
 
 API_URL = "http://localhost:8000"
 
+# Última respuesta por URL para lecturas condicionales: url -> (etag, json)
+_respuestas_etag = {}
+
+def _get_condicional(url, vacio):
+    """
+    GET con If-None-Match: si el backend responde 304 se reutiliza el JSON ya descargado.
+    """
+    previo = _respuestas_etag.get(url)
+    resp = requests.get(url, headers={'If-None-Match': previo[0]} if previo else {})
+    if resp.status_code == 304 and previo:
+        return previo[1]
+    if not resp.ok:
+        return vacio
+    datos = resp.json()
+    if resp.headers.get('ETag'):
+        _respuestas_etag[url] = (resp.headers['ETag'], datos)
+    return datos
+
+def obtener_deltas(cursor=None, limite: int = 500):
+    """
+    Cambios de la simulación posteriores al cursor; sin cursor solo retorna el cursor actual.
+    """
+    params = {"limite": limite}
+    if cursor:
+        params["desde"] = cursor
+    resp = requests.get(f"{API_URL}/eventos/", params=params)
+    resp.raise_for_status()
+    return resp.json()
+
 def iniciar_simulacion(n_vertices, m_aristas, n_pedidos):
     resp = requests.post(f"{API_URL}/simulacion/iniciar", json={
         "n_vertices": n_vertices,
@@ -30,6 +59,21 @@ def floydwarshall_para_todos_los_pedidos():
     resp.raise_for_status()
     return resp.json()
 
+def calcular_rutas_por_almacen():
+    resp = requests.post(f"{API_URL}/rutas/por_almacen")
+    resp.raise_for_status()
+    return resp.json()
+
+def obtener_trabajo(id_trabajo: str, incluir_resultados: bool = False, desde: int = 0):
+    resp = requests.get(f"{API_URL}/jobs/{id_trabajo}", params={"incluir_resultados": incluir_resultados, "desde": desde})
+    resp.raise_for_status()
+    return resp.json()
+
+def cancelar_trabajo(id_trabajo: str):
+    resp = requests.delete(f"{API_URL}/jobs/{id_trabajo}")
+    resp.raise_for_status()
+    return resp.json()
+
 def entregar_pedido(id_pedido: int):
     resp = requests.post(f"{API_URL}/rutas/entregar/{id_pedido}")
     resp.raise_for_status()
@@ -59,36 +103,34 @@ def obtener_info_simulacion():
     return resp.json() if resp.ok else None
 
 def obtener_clientes_dto():
-    resp = requests.get(f"{API_URL}/clientes/")
-    return resp.json() if resp.ok else []
+    return _get_condicional(f"{API_URL}/clientes/", [])
 
 def obtener_pedidos_dto():
-    resp = requests.get(f"{API_URL}/pedidos/")
-    return resp.json() if resp.ok else []
+    return _get_condicional(f"{API_URL}/pedidos/", [])
 
 def obtener_almacenamientos_dto():
-    resp = requests.get(f"{API_URL}/almacenamientos/")
-    return resp.json() if resp.ok else []
+    return _get_condicional(f"{API_URL}/almacenamientos/", [])
 
 def obtener_recargas_dto():
-    resp = requests.get(f"{API_URL}/recargas/")
-    return resp.json() if resp.ok else []
+    return _get_condicional(f"{API_URL}/recargas/", [])
 
 def obtener_vertices_dto():
-    resp = requests.get(f"{API_URL}/vertices/")
-    return resp.json() if resp.ok else []
+    return _get_condicional(f"{API_URL}/vertices/", [])
 
 def obtener_aristas_dto():
-    resp = requests.get(f"{API_URL}/aristas/")
-    return resp.json() if resp.ok else []
+    return _get_condicional(f"{API_URL}/aristas/", [])
 
 def obtener_rutas_dto():
-    resp = requests.get(f"{API_URL}/rutas/")
-    return resp.json() if resp.ok else []
+    return _get_condicional(f"{API_URL}/rutas/", [])
 
 def obtener_estadisticas_dto():
-    resp = requests.get(f"{API_URL}/estadisticas/")
-    return resp.json() if resp.ok else None
+    return _get_condicional(f"{API_URL}/estadisticas/", None)
+
+def obtener_snapshot_completo():
+    """
+    Todas las colecciones y las estadísticas en una sola respuesta (gzip), más el cursor de deltas; None si falla.
+    """
+    return _get_condicional(f"{API_URL}/simulacion/snapshot_completo", None)
 
 def obtener_snapshot(tipo: str = 'todo'):
     """
@@ -7,7 +7,9 @@ from frontendv2.servicios.api import (
     obtener_vertices_dto,
     obtener_aristas_dto,
     obtener_rutas_dto,
-    obtener_estadisticas_dto
+    obtener_estadisticas_dto,
+    obtener_snapshot_completo,
+    obtener_deltas
 )
 
 @st.cache_data(ttl=10, show_spinner=False)
@@ -42,11 +44,28 @@ def cachear_rutas():
 def cachear_estadisticas():
     return obtener_estadisticas_dto()
 
+@st.cache_data(ttl=10, show_spinner=False)
+def cachear_snapshot_completo():
+    return obtener_snapshot_completo()
+
 def inicializar_snapshot_datos():
     """
     Inicializa el snapshot de datos de red en st.session_state['datos_red'].
-    Carga todos los datos relevantes y los almacena para acceso global en la app.
+    Carga todos los datos relevantes con una sola llamada a /simulacion/snapshot_completo y los almacena
+    para acceso global en la app, junto con el cursor de deltas del mismo estado.
+    Si el snapshot completo no está disponible, consulta cada colección por separado.
     """
+    snapshot = cachear_snapshot_completo()
+    if snapshot:
+        datos = {clave: valor for clave, valor in snapshot.items() if clave != 'cursor_deltas'}
+        st.session_state['cursor_deltas'] = snapshot.get('cursor_deltas')
+        st.session_state['datos_red'] = datos
+        return datos
+    # El cursor se toma antes de cargar: los cambios ocurridos durante la carga se vuelven a aplicar
+    try:
+        st.session_state['cursor_deltas'] = obtener_deltas()['cursor']
+    except Exception:
+        st.session_state.pop('cursor_deltas', None)
     datos = {
         'clientes': cachear_clientes(),
         'pedidos': cachear_pedidos(),
@@ -67,6 +86,8 @@ def limpiar_cache_y_snapshot():
     Llamar esta función cada vez que se requiera refrescar los datos en toda la app.
     """
     st.session_state.pop('datos_red', None)
+    st.session_state.pop('cursor_deltas', None)
+    cachear_snapshot_completo.clear()
     cachear_clientes.clear()
     cachear_pedidos.clear()
     cachear_almacenamientos.clear()
@@ -74,4 +95,68 @@ def limpiar_cache_y_snapshot():
     cachear_vertices.clear()
     cachear_aristas.clear()
     cachear_rutas.clear()
-    cachear_estadisticas.clear()
\ No newline at end of file
+    cachear_estadisticas.clear()
+
+LIMITE_DELTAS = 500
+
+
+def _reemplazar(lista, clave, valor, nuevo=None):
+    """
+    Quita de la lista los dicts con lista[clave] == valor y agrega nuevo si se indica.
+    """
+    resultado = [item for item in lista if item.get(clave) != valor]
+    if nuevo is not None:
+        resultado.append(nuevo)
+    return resultado
+
+
+def actualizar_snapshot_con_deltas():
+    """
+    Actualiza st.session_state['datos_red'] aplicando los deltas del backend (/eventos/) en vez de
+    volver a descargar todas las entidades. Si la simulación se reinició o el cursor ya no es válido,
+    recarga el snapshot completo.
+    """
+    if 'datos_red' not in st.session_state or 'cursor_deltas' not in st.session_state:
+        limpiar_cache_y_snapshot()
+        return inicializar_snapshot_datos()
+    datos = st.session_state['datos_red']
+    recargar = set()
+    while True:
+        respuesta = obtener_deltas(st.session_state['cursor_deltas'], LIMITE_DELTAS)
+        deltas = respuesta['deltas']
+        if respuesta['reinicio'] or any(d['tipo'] == 'simulacion_reiniciada' for d in deltas):
+            limpiar_cache_y_snapshot()
+            return inicializar_snapshot_datos()
+        for delta in deltas:
+            tipo, d = delta['tipo'], delta['datos']
+            if tipo == 'pedido_estado':
+                for pedido in datos['pedidos']:
+                    if pedido.get('id_pedido') == d['id_pedido']:
+                        pedido['status'] = d['status']
+                        pedido['fecha_entrega'] = d.get('fecha_entrega')
+            elif tipo == 'pedido_nuevo':
+                datos['pedidos'] = _reemplazar(datos['pedidos'], 'id_pedido', d['id_pedido'], d.get('pedido'))
+            elif tipo == 'pedido_eliminado':
+                datos['pedidos'] = _reemplazar(datos['pedidos'], 'id_pedido', d['id_pedido'])
+            elif tipo == 'ruta_nueva':
+                datos['rutas'] = _reemplazar(datos['rutas'], 'id_ruta', d['id_ruta'], d.get('ruta'))
+            elif tipo == 'ruta_eliminada':
+                datos['rutas'] = _reemplazar(datos['rutas'], 'id_ruta', d['id_ruta'])
+            elif tipo in ('arista_insertada', 'arista_eliminada', 'arista_peso'):
+                datos['aristas'] = [a for a in datos['aristas']
+                                    if (a.get('origen'), a.get('destino')) != (d['origen'], d['destino'])]
+                if tipo != 'arista_eliminada':
+                    datos['aristas'].append(d)
+            elif tipo in ('vertice_insertado', 'vertice_eliminado'):
+                recargar.add('vertices')
+        if deltas:
+            recargar.add('estadisticas')
+        st.session_state['cursor_deltas'] = respuesta['cursor']
+        if len(deltas) < LIMITE_DELTAS:
+            break
+    # Los vértices y las estadísticas (incluye frecuencias del AVL) se vuelven a pedir; el ETag evita descargas repetidas
+    if 'vertices' in recargar:
+        datos['vertices'] = obtener_vertices_dto()
+    if 'estadisticas' in recargar:
+        datos['estadisticas'] = obtener_estadisticas_dto()
+    return datos
@@ -1,14 +1,13 @@
 import streamlit as st
-from frontendv2.servicios.cache import limpiar_cache_y_snapshot, inicializar_snapshot_datos
+from frontendv2.servicios.cache import actualizar_snapshot_con_deltas
 from streamlit.runtime.scriptrunner import RerunException, RerunData
 
 def boton_actualizar_datos(key_suffix: str = ''):
     """
     Botón para actualizar datos de la aplicación desde cualquier vista.
-    Limpia el caché, inicializa el snapshot y fuerza un rerun.
+    Aplica al snapshot los cambios ocurridos en el backend (o lo recarga si la simulación se reinició) y fuerza un rerun.
     key_suffix: sufijo único para la key del botón.
     """
     if st.button("Actualizar datos de red", key=f"actualizar{key_suffix}"):
-        limpiar_cache_y_snapshot()
-        inicializar_snapshot_datos()
+        actualizar_snapshot_con_deltas()
         raise RerunException(RerunData())
@@ -155,6 +155,9 @@ def mostrar():
         ("Dijkstra", "dijkstra"),
         ("Floyd-Warshall", "floydwarshall"),
         ("Topological Sort", "topologicalsort"),
+        ("Bidireccional", "bidireccional"),
+        ("ALT", "alt"),
+        ("Jerarquía de contracción", "ch"),
         ("Todos", "todos")
     ]
     algoritmo_opciones = [a[0] for a in algoritmos]
@@ -218,7 +221,7 @@ def mostrar():
                                        font_size=8, ax=ax2)
             
             # Colores por algoritmo
-            color_map = {'bfs':'blue','dfs':'purple','dijkstra':'red','floydwarshall':'green','topologicalsort':'orange'}
+            color_map = {'bfs':'blue','dfs':'purple','dijkstra':'red','floydwarshall':'green','topologicalsort':'orange','bidireccional':'brown','alt':'cyan','ch':'olive'}
             legend_elements = []
             aristas_resaltadas_totales = 0
             
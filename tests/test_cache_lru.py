@@ -0,0 +1,106 @@
+"""
+Pruebas de CacheLRU y de la cache de rutas de FabricaRutas (clave con la version del grafo).
+"""
+from Backend.Infraestructura.TDA.TDA_CacheLRU import CacheLRU
+from Backend.Aplicacion.SimAplicacion.Aplicacion_Simulacion import SimulacionAplicacionService
+from Backend.Dominio.Simulacion_dominio import Simulacion
+
+
+class Reloj:
+    """Reloj manual para avanzar el tiempo sin esperar."""
+
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+
+def test_ttl_por_grupo_expira_y_cuenta():
+    reloj = Reloj()
+    cache = CacheLRU(10, {'bfs': 300, 'dijkstra': None}, reloj=reloj)
+    cache.guardar('a', 1, 'bfs')
+    cache.guardar('b', 2, 'dijkstra')
+    reloj.ahora = 299.9
+    assert cache.obtener('a', 'bfs') == 1
+    reloj.ahora = 300.0
+    assert cache.obtener('a', 'bfs') is None
+    # TTL None: solo se invalida explicitamente o por desalojo
+    reloj.ahora = 10 ** 6
+    assert cache.obtener('b', 'dijkstra') == 2
+    estadisticas = cache.estadisticas()
+    assert estadisticas['expirados'] == 1
+    assert estadisticas['aciertos'] == 2
+    assert estadisticas['fallos'] == 1
+
+
+def test_desalojo_lru_respeta_el_uso_reciente():
+    cache = CacheLRU(2)
+    cache.guardar('a', 1)
+    cache.guardar('b', 2)
+    assert cache.obtener('a') == 1  # 'a' pasa a ser la mas reciente
+    cache.guardar('c', 3)
+    assert cache.obtener('b') is None
+    assert cache.obtener('a') == 1
+    assert cache.obtener('c') == 3
+    assert cache.estadisticas()['desalojos'] == 1
+
+
+def test_reducir_capacidad_desaloja_de_inmediato():
+    cache = CacheLRU(3)
+    for clave in 'abc':
+        cache.guardar(clave, clave)
+    cache.configurar(capacidad=1)
+    assert len(cache) == 1
+    assert cache.obtener('c') == 'c'
+    assert cache.estadisticas()['desalojos'] == 2
+
+
+def test_ruta_cacheada_se_invalida_al_cambiar_la_version_del_grafo():
+    servicio = SimulacionAplicacionService()
+    servicio.iniciar_simulacion(30, 60, 10)
+    simulacion = Simulacion()
+    grafo = simulacion.grafo
+    fabrica = simulacion.fabricante_rutas
+    pedido, ruta = None, None
+    for candidato in servicio.obtener_pedidos():
+        try:
+            ruta = fabrica.calcular_ruta(candidato, grafo, 'dijkstra')
+        except Exception:
+            continue  # sin ruta factible con la autonomia
+        if ruta is not None:
+            pedido = candidato
+            break
+    assert pedido is not None
+    assert fabrica._ruta_cacheada(pedido, grafo, 'dijkstra') is ruta
+    assert fabrica.calcular_ruta(pedido, grafo, 'dijkstra') is ruta
+    arista = next(iter(grafo.aristas()))
+    grafo.eliminar_arista(arista.origen, arista.destino)
+    assert fabrica._ruta_cacheada(pedido, grafo, 'dijkstra') is None
+
+
+def test_recalcular_tras_fallo_de_cache_no_repite_la_frecuencia_en_el_avl():
+    servicio = SimulacionAplicacionService()
+    servicio.iniciar_simulacion(30, 60, 10)
+    simulacion = Simulacion()
+    grafo = simulacion.grafo
+    fabrica = simulacion.fabricante_rutas
+    pedido, ruta = None, None
+    for candidato in servicio.obtener_pedidos():
+        try:
+            ruta = fabrica.calcular_ruta(candidato, grafo, 'bfs')
+        except Exception:
+            continue  # sin ruta factible con la autonomia
+        if ruta is not None:
+            pedido = candidato
+            break
+    assert pedido is not None
+    clave_camino = fabrica._generar_clave_camino(ruta)
+    # iniciar_simulacion no reinicia el AVL: se compara contra la frecuencia tras el primer calculo
+    frecuencia = simulacion._avl_rutas.buscar(clave_camino).valor
+    for _ in range(3):
+        # Equivale a la expiracion del TTL de bfs: la ruta se recalcula y se reemplaza
+        fabrica._cache_rutas.limpiar()
+        fabrica.calcular_ruta(pedido, grafo, 'bfs')
+    assert simulacion._avl_rutas.buscar(clave_camino).valor == frecuencia
+    assert len(fabrica.todos()) == 1
@@ -0,0 +1,113 @@
+"""
+Pruebas de CerrojoLecturaEscritura: reentrancia, prioridad de escritura y paso de lectura a escritura.
+"""
+import threading
+import time
+
+import pytest
+
+from Backend.Infraestructura.TDA.TDA_CerrojoLecturaEscritura import CerrojoLecturaEscritura
+
+ESPERA = 2.0
+
+
+def esperar_hasta(condicion, limite=ESPERA):
+    fin = time.monotonic() + limite
+    while not condicion():
+        if time.monotonic() > fin:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def test_lectura_y_escritura_reentrantes():
+    cerrojo = CerrojoLecturaEscritura()
+    with cerrojo.lectura():
+        with cerrojo.lectura():
+            assert cerrojo.estado()['lectores'] == 2
+    with cerrojo.escritura():
+        with cerrojo.escritura():
+            # El escritor tambien puede leer
+            with cerrojo.lectura():
+                assert cerrojo.estado()['escritor_activo']
+        assert cerrojo.estado()['escritor_activo']
+    assert cerrojo.estado() == {'lectores': 0, 'escritor_activo': False, 'escritores_esperando': 0}
+
+
+def test_pasar_de_lectura_a_escritura_lanza_runtime_error():
+    cerrojo = CerrojoLecturaEscritura()
+    with cerrojo.lectura():
+        with pytest.raises(RuntimeError):
+            cerrojo.adquirir_escritura()
+        assert cerrojo.estado()['escritores_esperando'] == 0
+    # Tras soltar la lectura se puede escribir
+    with cerrojo.escritura():
+        pass
+
+
+def test_lectores_simultaneos():
+    cerrojo = CerrojoLecturaEscritura()
+    dentro = threading.Barrier(3, timeout=ESPERA)
+
+    def leer():
+        with cerrojo.lectura():
+            dentro.wait()
+
+    hilos = [threading.Thread(target=leer) for _ in range(3)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join(ESPERA)
+    assert not dentro.broken
+
+
+def test_escritor_en_espera_tiene_prioridad_sobre_lectores_nuevos():
+    cerrojo = CerrojoLecturaEscritura()
+    orden = []
+    soltar_lector = threading.Event()
+
+    def lector_inicial():
+        with cerrojo.lectura():
+            soltar_lector.wait(ESPERA)
+
+    def escritor():
+        with cerrojo.escritura():
+            orden.append('escritor')
+
+    def lector_nuevo():
+        with cerrojo.lectura():
+            orden.append('lector')
+
+    primero = threading.Thread(target=lector_inicial)
+    primero.start()
+    assert esperar_hasta(lambda: cerrojo.estado()['lectores'] == 1)
+    hilo_escritor = threading.Thread(target=escritor)
+    hilo_escritor.start()
+    assert esperar_hasta(lambda: cerrojo.estado()['escritores_esperando'] == 1)
+    hilo_lector = threading.Thread(target=lector_nuevo)
+    hilo_lector.start()
+    # El lector nuevo no entra mientras el escritor espera, aunque haya otro lector activo
+    time.sleep(0.1)
+    assert orden == []
+    soltar_lector.set()
+    for hilo in (primero, hilo_escritor, hilo_lector):
+        hilo.join(ESPERA)
+    assert orden == ['escritor', 'lector']
+
+
+def test_ganchos_solo_en_la_escritura_externa():
+    cerrojo = CerrojoLecturaEscritura()
+    llamadas = []
+    cerrojo.agregar_ganchos(lambda: llamadas.append('inicio'), lambda: llamadas.append('fin'))
+    with cerrojo.escritura():
+        with cerrojo.escritura():
+            pass
+    assert llamadas == ['inicio', 'fin']
+
+
+def test_liberar_sin_tener_el_cerrojo_lanza_runtime_error():
+    cerrojo = CerrojoLecturaEscritura()
+    with pytest.raises(RuntimeError):
+        cerrojo.liberar_lectura()
+    with pytest.raises(RuntimeError):
+        cerrojo.liberar_escritura()
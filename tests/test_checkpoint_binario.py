@@ -0,0 +1,54 @@
+"""
+Pruebas de ida y vuelta de la simulación por un checkpoint binario.
+"""
+import random
+
+from Backend.Aplicacion.SimAplicacion.Aplicacion_Simulacion import SimulacionAplicacionService
+from Backend.Dominio.AlgEstrategias.LandmarksALT import LandmarksALT
+from Backend.Dominio.AlgEstrategias.TablaRutasRecarga import TablaRutasRecarga
+from Backend.Dominio.Simulacion_dominio import Simulacion
+from Backend.Infraestructura.ambito_simulacion import AmbitoSimulacion, activar_ambito
+
+
+def capturar(simulacion):
+    aristas = lambda grafo: [(a.origen.id_elemento(), a.destino.id_elemento(), a.peso) for a in grafo.aristas_propias()]
+    return {
+        'vertices': [v.id_elemento() for v in simulacion.grafo_m.vertices()],
+        'n-1': aristas(simulacion.grafo_n1),
+        'm_aristas': aristas(simulacion.grafo_m),
+        'pedidos': {p.id_pedido: (p.status, str(p.fecha_creacion), str(p.fecha_entrega), p.peso_total, getattr(p.ruta, 'id_ruta', None))
+                    for _, p in simulacion.repo_pedidos.iterar()},
+        'rutas': {r.id_ruta: (r.id_pedido, r.algoritmo, r.peso_total, [(a.origen.id_elemento(), a.destino.id_elemento(), a.peso) for a in r.camino])
+                  for _, r in simulacion.repo_rutas.iterar()},
+        'frecuencias': [(clave, vertice.valor, getattr(vertice.ruta, 'id_ruta', None))
+                        for clave, vertice in ((clave, simulacion.avl_rutas.buscar(clave)) for clave, _ in simulacion.avl_rutas.inorden())],
+    }
+
+
+def test_guardar_y_restaurar_conserva_grafo_pedidos_rutas_y_frecuencias(tmp_path):
+    # Ambito propio: iniciar_simulacion no reinicia el AVL, que arrastraria frecuencias de otras pruebas
+    with activar_ambito(AmbitoSimulacion('checkpoint_binario')):
+        _ida_y_vuelta(tmp_path)
+
+
+def _ida_y_vuelta(tmp_path):
+    random.seed(4)
+    servicio = SimulacionAplicacionService()
+    servicio.iniciar_simulacion(50, 100, 15)
+    pedidos = list(servicio.obtener_pedidos())
+    for pedido in pedidos[:6]:
+        for algoritmo in ('dijkstra', 'bfs'):
+            servicio.calcular_ruta(pedido.id_pedido, algoritmo)
+    servicio.actualizar_estado_pedido(pedidos[0].id_pedido, 'enviado')
+    simulacion = Simulacion()
+    antes = capturar(simulacion)
+    assert antes['rutas'] and antes['frecuencias']
+    archivo = str(tmp_path / "simulacion.ckpt")
+    servicio.guardar_checkpoint(archivo)
+
+    servicio.iniciar_simulacion(20, 40, 5)
+    servicio.restaurar_checkpoint(archivo)
+    assert capturar(simulacion) == antes
+    # La restauración no precalcula índices de rutas: se construyen con la primera consulta
+    csr = simulacion.grafo.obtener_csr()
+    assert TablaRutasRecarga.existente(csr) is None and LandmarksALT.existente(csr) is None
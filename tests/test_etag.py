@@ -0,0 +1,93 @@
+"""
+Pruebas del middleware de ETag por version de la simulacion (Backend/API/etag.py).
+"""
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from Backend.API.etag import registrar_etag
+
+
+class ServicioFalso:
+    """Solo expone obtener_etag, como el servicio de la simulacion activa."""
+
+    def __init__(self):
+        self.version = 1
+        self.llamadas = 0
+
+    def obtener_etag(self):
+        return f'W/"v{self.version}"'
+
+
+def crear_cliente():
+    servicio = ServicioFalso()
+    app = FastAPI()
+    registrar_etag(app, lambda: servicio)
+
+    @app.get("/clientes/")
+    def clientes():
+        servicio.llamadas += 1
+        return [servicio.llamadas]
+
+    @app.get("/rutas/benchmark")
+    def benchmark():
+        servicio.llamadas += 1
+        return {'llamada': servicio.llamadas}
+
+    @app.get("/simulacion/checkpoints")
+    def checkpoints():
+        return []
+
+    @app.get("/jobs/{id_trabajo}")
+    def trabajo(id_trabajo: str):
+        return {'id': id_trabajo}
+
+    @app.post("/clientes/")
+    def crear():
+        return {}
+
+    return TestClient(app), servicio
+
+
+def test_if_none_match_vigente_responde_304_sin_ejecutar_el_endpoint():
+    cliente, servicio = crear_cliente()
+    respuesta = cliente.get("/clientes/")
+    etag = respuesta.headers['etag']
+    assert respuesta.status_code == 200 and etag == 'W/"v1"'
+    condicional = cliente.get("/clientes/", headers={'If-None-Match': etag})
+    assert condicional.status_code == 304
+    assert condicional.headers['etag'] == etag
+    assert servicio.llamadas == 1
+
+
+def test_cambio_de_version_invalida_el_etag():
+    cliente, servicio = crear_cliente()
+    etag = cliente.get("/clientes/").headers['etag']
+    servicio.version += 1
+    respuesta = cliente.get("/clientes/", headers={'If-None-Match': etag})
+    assert respuesta.status_code == 200
+    assert respuesta.headers['etag'] == 'W/"v2"'
+
+
+def test_comparacion_debil_y_listas():
+    cliente, _ = crear_cliente()
+    assert cliente.get("/clientes/", headers={'If-None-Match': '"v1"'}).status_code == 304
+    assert cliente.get("/clientes/", headers={'If-None-Match': '"otro", W/"v1"'}).status_code == 304
+    assert cliente.get("/clientes/", headers={'If-None-Match': '*'}).status_code == 304
+    assert cliente.get("/clientes/", headers={'If-None-Match': '"v0"'}).status_code == 200
+
+
+def test_rutas_excluidas_no_llevan_etag_ni_responden_304():
+    cliente, servicio = crear_cliente()
+    for ruta in ("/rutas/benchmark", "/simulacion/checkpoints", "/jobs/abc"):
+        respuesta = cliente.get(ruta, headers={'If-None-Match': '*'})
+        assert respuesta.status_code == 200, ruta
+        assert 'etag' not in respuesta.headers, ruta
+    # El benchmark se vuelve a ejecutar en cada consulta
+    assert cliente.get("/rutas/benchmark", headers={'If-None-Match': '*'}).json() == {'llamada': 2}
+
+
+def test_solo_get_y_head_son_condicionales():
+    cliente, _ = crear_cliente()
+    respuesta = cliente.post("/clientes/", headers={'If-None-Match': '*'})
+    assert respuesta.status_code == 200
+    assert 'etag' not in respuesta.headers
@@ -0,0 +1,42 @@
+"""
+Pruebas de la generacion de aristas candidatas por muestreo para simulaciones grandes.
+"""
+import random
+
+from Backend.Aplicacion.SimAplicacion.Aplicacion_Simulacion import SimulacionAplicacionService
+from Backend.Dominio.AlgEstrategias.RutaEstrategiaDijkstra import RutaEstrategiaDijkstra
+from Backend.Dominio.Simulacion_dominio import Simulacion
+from Backend.Infraestructura.TDA.GrafoConstructor import GrafoConstructor
+
+
+def test_muestreo_genera_pares_unicos_conexos_y_acotados():
+    random.seed(11)
+    n, m = 2000, 4000
+    candidatas = GrafoConstructor.generar_aristas_candidatas(n, m, modo='muestreo')
+    pares = [(u, v) for u, v, _ in candidatas]
+    assert all(u < v for u, v in pares)
+    assert len(set(pares)) == len(pares)
+    assert all(1 <= peso <= 50 for _, _, peso in candidatas)
+    # O(n·grado_candidatos + m) en vez de los n·(n-1)/2 pares
+    assert m <= len(candidatas) <= n * 12 + m + n
+    parent = list(range(n))
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    for u, v in pares:
+        parent[find(u)] = find(v)
+    assert len({find(i) for i in range(n)}) == 1
+
+
+def test_simulacion_por_muestreo_rutea_todos_los_pedidos():
+    random.seed(5)
+    n = 4 * GrafoConstructor.MAX_VERTICES_GENERACION_COMPLETA
+    servicio = SimulacionAplicacionService()
+    servicio.iniciar_simulacion(n, 2 * n, 60)
+    simulacion = Simulacion()
+    estrategia = RutaEstrategiaDijkstra()
+    for pedido in servicio.obtener_pedidos():
+        camino, peso = estrategia.calcular_ruta(pedido.origen, pedido.destino, simulacion.grafo)
+        assert camino and peso == sum(a.peso for a in camino)
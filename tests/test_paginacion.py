@@ -0,0 +1,98 @@
+"""
+Pruebas de la paginacion por cursor (Backend/API/paginacion.py) sobre un HashMap que cambia entre paginas.
+"""
+import json
+
+import pytest
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from Backend.API.paginacion import responder_lista
+from Backend.Infraestructura.TDA.TDA_Hash_map import HashMap
+
+
+class Elemento(BaseModel):
+    id: int
+    nombre: str
+
+
+class ServicioFalso:
+    """Expone iterar_coleccion/contar_coleccion como el servicio de la simulacion, sobre un HashMap."""
+
+    def __init__(self, n):
+        self.mapa = HashMap()
+        for i in range(n):
+            self.mapa.insertar(i, {'id': i, 'nombre': f"e{i}"})
+
+    def iterar_coleccion(self, coleccion, desde=0):
+        return self.mapa.iterar(desde)
+
+    def contar_coleccion(self, coleccion):
+        return len(self.mapa)
+
+
+class Parametros:
+    """Equivalente de ParametrosLista sin Request."""
+
+    def __init__(self, limite=None, cursor=None, campos=None):
+        self.limite = limite
+        self.cursor = cursor
+        self.campos = campos
+        self.ndjson = False
+
+    def paginado(self):
+        return self.limite is not None or self.cursor is not None
+
+
+def pagina(servicio, limite, cursor=None, campos=None):
+    respuesta = responder_lista(servicio, 'elementos', lambda e: Elemento(**e), Elemento, Parametros(limite, cursor, campos))
+    return json.loads(respuesta.body)
+
+
+def ids(cuerpo):
+    return [item['id'] for item in cuerpo['items']]
+
+
+def test_recorrido_completo_por_paginas():
+    servicio = ServicioFalso(10)
+    vistos, cursor = [], None
+    while True:
+        cuerpo = pagina(servicio, 4, cursor)
+        vistos += ids(cuerpo)
+        assert cuerpo['total'] == 10
+        cursor = cuerpo['siguiente_cursor']
+        if cursor is None:
+            break
+    assert vistos == list(range(10))
+
+
+def test_eliminar_antes_del_cursor_no_salta_elementos():
+    servicio = ServicioFalso(10)
+    primera = pagina(servicio, 4)
+    assert ids(primera) == [0, 1, 2, 3]
+    servicio.mapa.eliminar(1)
+    segunda = pagina(servicio, 4, primera['siguiente_cursor'])
+    assert ids(segunda) == [4, 5, 6, 7]
+
+
+def test_agregar_despues_del_cursor_no_repite_elementos():
+    servicio = ServicioFalso(6)
+    primera = pagina(servicio, 4)
+    servicio.mapa.insertar(100, {'id': 100, 'nombre': 'nuevo'})
+    segunda = pagina(servicio, 4, primera['siguiente_cursor'])
+    assert ids(segunda) == [4, 5, 100]
+    assert segunda['siguiente_cursor'] is None
+
+
+def test_proyeccion_de_campos():
+    cuerpo = pagina(ServicioFalso(3), 2, campos={'id'})
+    assert cuerpo['items'] == [{'id': 0}, {'id': 1}]
+    with pytest.raises(HTTPException) as error:
+        pagina(ServicioFalso(3), 2, campos={'id', 'otro'})
+    assert error.value.status_code == 400
+
+
+def test_cursor_invalido_responde_400():
+    with pytest.raises(HTTPException) as error:
+        pagina(ServicioFalso(3), 2, cursor='no-es-un-cursor')
+    assert error.value.status_code == 400
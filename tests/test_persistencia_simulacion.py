@@ -0,0 +1,98 @@
+"""
+Pruebas de PersistenciaSimulacion: dos simulaciones (como dos workers del API) comparten un AlmacenSQLite.
+Cada una vive en su propio ambito y abre su propio AlmacenSQLite sobre el mismo archivo.
+"""
+from Backend.Aplicacion.SimAplicacion.Aplicacion_Simulacion import SimulacionAplicacionService
+from Backend.Dominio.Simulacion_dominio import Simulacion
+from Backend.Infraestructura.Repositorios.almacen_sqlite import AlmacenSQLite
+from Backend.Infraestructura.ambito_simulacion import AmbitoSimulacion, activar_ambito
+
+
+class Worker:
+    """Simulacion aislada con su propia conexion al almacen compartido."""
+
+    def __init__(self, nombre, archivo):
+        self.ambito = AmbitoSimulacion(nombre)
+        with activar_ambito(self.ambito):
+            self.servicio = SimulacionAplicacionService()
+            self.servicio.configurar_persistencia(AlmacenSQLite(str(archivo)))
+
+    def __call__(self, metodo, *args):
+        with activar_ambito(self.ambito):
+            return getattr(self.servicio, metodo)(*args)
+
+    def simulacion(self):
+        with activar_ambito(self.ambito):
+            return Simulacion()
+
+
+def resumen(worker):
+    pedidos = {p.id_pedido: p.status for p in worker('obtener_pedidos')}
+    rutas = {r.id_ruta: (r.peso_total, [(a.origen.id_elemento(), a.destino.id_elemento()) for a in r.camino]) for r in worker('obtener_rutas')}
+    return len(worker('obtener_vertices')), len(worker('obtener_aristas')), pedidos, rutas
+
+
+def calcular_alguna_ruta(worker):
+    for pedido in worker('obtener_pedidos'):
+        try:
+            ruta = worker('calcular_ruta', pedido.id_pedido, 'dijkstra')
+        except Exception:
+            continue  # sin ruta factible en el grafo generado
+        if ruta is not None:
+            return ruta
+    return None
+
+
+def test_ida_y_vuelta_entre_dos_almacenes(tmp_path):
+    archivo = tmp_path / "simulacion.db"
+    a = Worker('worker_a', archivo)
+    b = Worker('worker_b', archivo)
+    a('iniciar_simulacion', 60, 150, 20)
+
+    # b carga el estado completo que guardo a
+    assert b('persistencia_desactualizada')
+    assert b('sincronizar_persistencia')
+    assert resumen(b) == resumen(a)
+    assert b('obtener_etag') == a('obtener_etag')
+
+    # Cambios incrementales de b (estado de un pedido y una ruta) llegan a a
+    id_pedido = next(iter(b('obtener_pedidos'))).id_pedido
+    b('actualizar_estado_pedido', id_pedido, 'enviado')
+    ruta = calcular_alguna_ruta(b)
+    assert a('persistencia_desactualizada')
+    assert a('sincronizar_persistencia')
+    assert a('buscar_pedido', id_pedido).status == 'enviado'
+    assert ruta is not None
+    assert ruta.id_ruta in {r.id_ruta for r in a('obtener_rutas')}
+    assert resumen(a) == resumen(b)
+    assert a('obtener_etag') == b('obtener_etag')
+
+    # Sin escrituras nuevas no se recarga
+    assert not a('sincronizar_persistencia')
+    assert not b('sincronizar_persistencia')
+
+
+def test_sincronizar_aplica_solo_las_filas_cambiadas(tmp_path):
+    archivo = tmp_path / "simulacion.db"
+    a = Worker('worker_a', archivo)
+    b = Worker('worker_b', archivo)
+    a('iniciar_simulacion', 60, 150, 20)
+    assert b('sincronizar_persistencia')
+    grafo_b = b.simulacion().grafo
+
+    id_pedido = next(iter(a('obtener_pedidos'))).id_pedido
+    a('actualizar_estado_pedido', id_pedido, 'enviado')
+    assert calcular_alguna_ruta(a) is not None
+    assert b('sincronizar_persistencia')
+    # b aplico las filas nuevas sin restaurar el estado completo (el grafo es el mismo objeto)
+    assert b.simulacion().grafo is grafo_b
+    assert resumen(b) == resumen(a)
+    assert list(b.simulacion().avl_rutas.inorden()) == list(a.simulacion().avl_rutas.inorden())
+    assert b('obtener_etag') == a('obtener_etag')
+
+    # Reiniciar reemplaza todo el almacen: el registro de cambios ya no cubre la version de b
+    a('iniciar_simulacion', 40, 80, 10)
+    assert b('sincronizar_persistencia')
+    assert b.simulacion().grafo is not grafo_b
+    assert resumen(b) == resumen(a)
+
@@ -0,0 +1,146 @@
+"""
+Pruebas de los nucleos de ruta con bateria contra una busqueda de referencia sobre estados (vertice, energia)
+en grafos pequeños al azar con estaciones de recarga.
+"""
+import heapq
+import random
+
+import pytest
+
+from Backend.Dominio.Dominio_Almacenamiento import Almacenamiento
+from Backend.Dominio.Dominio_Cliente import Cliente
+from Backend.Dominio.Dominio_Recarga import Recarga
+from Backend.Dominio.AlgEstrategias.ArbolesRutasAlmacen import ArbolesRutasAlmacen
+from Backend.Dominio.AlgEstrategias.BusquedaEtiquetasEnergia import BusquedaEtiquetasEnergia
+from Backend.Dominio.AlgEstrategias.JerarquiaContraccion import JerarquiaContraccion
+from Backend.Dominio.AlgEstrategias.RutaEstrategiaALT import RutaEstrategiaALT
+from Backend.Dominio.AlgEstrategias.RutaEstrategiaBidireccional import RutaEstrategiaBidireccional
+from Backend.Dominio.AlgEstrategias.TablaRutasRecarga import TablaRutasRecarga
+from Backend.Infraestructura.TDA.TDA_Grafo import Grafo
+from Backend.Infraestructura.ambito_simulacion import AmbitoSimulacion, activar_ambito
+
+SEMILLAS = range(24)
+
+
+def grafo_al_azar(semilla):
+    """
+    Grafo de 8 a 18 vertices (un cuarto recargas) con pesos enteros que obligan a recargar; alterna dirigido y no dirigido.
+    """
+    azar = random.Random(semilla)
+    n = azar.randint(8, 18)
+    n_recargas = max(1, n // 4)
+    elementos = [Almacenamiento(0, "A0")] + [Recarga(i, f"R{i}") for i in range(1, n_recargas + 1)]
+    elementos += [Cliente(i, f"C{i}") for i in range(n_recargas + 1, n)]
+    grafo = Grafo(dirigido=semilla % 2 == 1)
+    vertices = grafo.insertar_vertices_lote(elementos)
+    pares = {(azar.randrange(n), azar.randrange(n)) for _ in range(3 * n)}
+    grafo.insertar_aristas_lote((vertices[u], vertices[v], azar.randint(5, 45)) for u, v in pares if u != v)
+    return grafo, azar.choice((30, 50))
+
+
+def referencia(csr, i_origen, i_destino, autonomia):
+    """
+    Dijkstra exacto sobre todos los estados (vertice, energia restante); retorna el peso minimo o None.
+    """
+    distancias = {(i_origen, autonomia): 0}
+    heap = [(0, i_origen, autonomia)]
+    while heap:
+        d, u, energia = heapq.heappop(heap)
+        if d > distancias[(u, energia)]:
+            continue
+        if u == i_destino:
+            return d
+        for k in range(csr.offsets[u], csr.offsets[u + 1]):
+            peso = csr.pesos[k]
+            if peso > energia:
+                continue
+            v = csr.destinos[k]
+            estado = (v, autonomia if csr.es_recarga[v] else energia - peso)
+            if d + peso < distancias.get(estado, float('inf')):
+                distancias[estado] = d + peso
+                heapq.heappush(heap, (d + peso, *estado))
+    return None
+
+
+def tramos_de_posiciones(csr, posiciones):
+    return None if posiciones is None else [(csr.origenes[k], csr.destinos[k], csr.pesos[k]) for k in posiciones]
+
+
+def peso_factible(csr, tramos, i_origen, i_destino, autonomia):
+    """
+    Verifica que los tramos formen un camino de origen a destino que la bateria puede recorrer; retorna su peso.
+    """
+    actual, energia = i_origen, autonomia
+    for u, v, peso in tramos:
+        assert u == actual, "el camino no esta encadenado"
+        assert peso <= energia, "el dron se queda sin bateria"
+        actual, energia = v, autonomia if csr.es_recarga[v] else energia - peso
+    assert actual == i_destino
+    return sum(peso for _, _, peso in tramos)
+
+
+def nucleos(csr, autonomia):
+    """
+    Por estrategia, una funcion (i_origen, i_destino) -> tramos (u, v, peso) del camino, o None si no hay.
+    """
+    tabla = TablaRutasRecarga(csr, autonomia)
+    jerarquia = JerarquiaContraccion(csr, autonomia)
+    arboles = ArbolesRutasAlmacen(csr, autonomia)
+    alt, bidireccional = RutaEstrategiaALT(), RutaEstrategiaBidireccional()
+
+    def por_tabla(i, j):
+        aristas, peso = tabla.ruta(csr.vertice(i), csr.vertice(j))
+        if peso == float('inf'):
+            return None
+        return [(csr.indice(a.origen), csr.indice(a.destino), a.peso) for a in aristas]
+
+    resultado = {
+        'etiquetas': lambda i, j: tramos_de_posiciones(csr, BusquedaEtiquetasEnergia.buscar(i, j, csr, autonomia)),
+        'tabla_recargas': por_tabla,
+        'alt': lambda i, j: tramos_de_posiciones(csr, alt._buscar_csr(i, j, csr, autonomia)),
+        'bidireccional': lambda i, j: tramos_de_posiciones(csr, bidireccional._buscar_csr(i, j, csr, autonomia)),
+        'arboles_almacen': lambda i, j: tramos_de_posiciones(csr, arboles.posiciones(i, j)),
+        'ch': lambda i, j: tramos_de_posiciones(csr, jerarquia.buscar(i, j)),
+    }
+    # En grafos de este tamaño el indice nunca se abandona por exceso de atajos
+    assert jerarquia.completo
+    return resultado
+
+
+@pytest.mark.parametrize("semilla", SEMILLAS)
+def test_nucleos_con_bateria_coinciden_con_la_referencia(semilla):
+    with activar_ambito(AmbitoSimulacion(f'rutas_bateria_{semilla}')):
+        grafo, autonomia = grafo_al_azar(semilla)
+        csr = grafo.obtener_csr()
+        estrategias = nucleos(csr, autonomia)
+        diferencias = []
+        for i in range(csr.n_vertices):
+            for j in range(csr.n_vertices):
+                if i == j:
+                    continue
+                esperado = referencia(csr, i, j, autonomia)
+                for nombre, buscar in estrategias.items():
+                    tramos = buscar(i, j)
+                    obtenido = None if tramos is None else peso_factible(csr, tramos, i, j, autonomia)
+                    if obtenido != esperado:
+                        diferencias.append((nombre, i, j, esperado, obtenido))
+        assert diferencias == []
+
+
+def test_la_referencia_ejercita_recargas_y_pares_inalcanzables():
+    # Sin este control la comparacion podria pasar con grafos triviales (todo alcanzable sin recargar)
+    usan_recarga = inalcanzables = 0
+    for semilla in SEMILLAS:
+        with activar_ambito(AmbitoSimulacion(f'rutas_bateria_control_{semilla}')):
+            grafo, autonomia = grafo_al_azar(semilla)
+            csr = grafo.obtener_csr()
+            for i in range(csr.n_vertices):
+                for j in range(csr.n_vertices):
+                    if i == j:
+                        continue
+                    esperado = referencia(csr, i, j, autonomia)
+                    if esperado is None:
+                        inalcanzables += 1
+                    elif esperado > autonomia:
+                        usan_recarga += 1
+    assert usan_recarga > 0 and inalcanzables > 0
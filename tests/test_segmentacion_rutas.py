@@ -0,0 +1,58 @@
+"""
+Pruebas de coherencia entre ValidadorSegmentacion y las estrategias de ruta: en un grafo no dirigido
+ambos recorren cada arista en los dos sentidos.
+"""
+import random
+
+from Backend.Dominio.Dominio_Almacenamiento import Almacenamiento
+from Backend.Dominio.Dominio_Cliente import Cliente
+from Backend.Dominio.Dominio_Recarga import Recarga
+from Backend.Dominio.AlgEstrategias.RutaEstrategiaBFS import RutaEstrategiaBFS
+from Backend.Dominio.AlgEstrategias.RutaEstrategiaDijkstra import RutaEstrategiaDijkstra
+from Backend.Infraestructura.TDA.GrafoConstructor import GrafoConstructor
+from Backend.Infraestructura.TDA.TDA_Grafo import Grafo
+from Backend.Infraestructura.TDA.ValidadorSegmentacion import ValidadorSegmentacion
+from Backend.Infraestructura.ambito_simulacion import AmbitoSimulacion, activar_ambito
+
+
+def elementos(n_almacenes, n_recargas, n_clientes):
+    return ([Almacenamiento(i, f"A{i}") for i in range(n_almacenes)]
+            + [Recarga(n_almacenes + i, f"R{i}") for i in range(n_recargas)]
+            + [Cliente(n_almacenes + n_recargas + i, f"C{i}") for i in range(n_clientes)])
+
+
+def test_csr_no_dirigido_recorre_cada_arista_en_ambos_sentidos():
+    with activar_ambito(AmbitoSimulacion('csr_no_dirigido')):
+        for dirigido, esperadas in ((False, 2), (True, 1)):
+            grafo = Grafo(dirigido=dirigido)
+            almacen, cliente = grafo.insertar_vertices_lote(elementos(1, 0, 1))
+            grafo.insertar_arista(almacen, cliente, 10)
+            csr = grafo.obtener_csr()
+            assert csr.n_aristas == esperadas
+            camino, peso = RutaEstrategiaDijkstra().calcular_ruta(almacen, cliente, grafo)
+            assert peso == 10 and camino[0].origen is almacen and camino[-1].destino is cliente
+            if not dirigido:
+                # El sentido inverso se entrega como una arista orientada de cliente a almacen
+                camino, peso = RutaEstrategiaBFS().calcular_ruta(cliente, almacen, grafo)
+                assert peso == 10 and camino[0].origen is cliente and camino[-1].destino is almacen
+
+
+def test_grafo_validado_tiene_ruta_para_cada_par_almacen_cliente():
+    random.seed(7)
+    with activar_ambito(AmbitoSimulacion('segmentacion_rutas')):
+        datos = elementos(4, 6, 30)
+        n = len(datos)
+        constructor = GrafoConstructor(n, 2 * n, aristas_candidatas=GrafoConstructor.generar_aristas_candidatas(n, 2 * n), elementos=datos)
+        constructor.construir()
+        grafo = constructor.grafo_m
+        vertices = list(grafo.vertices())
+        assert ValidadorSegmentacion(grafo, vertices).validar() == []
+        almacenes = [v for v in vertices if v.es_tipo('almacenamiento')]
+        clientes = [v for v in vertices if v.es_tipo('cliente')]
+        estrategia = RutaEstrategiaDijkstra()
+        for almacen in almacenes:
+            for cliente in clientes:
+                camino, peso = estrategia.calcular_ruta(almacen, cliente, grafo)
+                assert camino[0].origen is almacen and camino[-1].destino is cliente
+                assert all(a.destino is b.origen for a, b in zip(camino, camino[1:]))
+                assert peso == sum(a.peso for a in camino)
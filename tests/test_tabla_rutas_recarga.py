@@ -0,0 +1,33 @@
+"""
+Pruebas de la construccion perezosa de TablaRutasRecarga.
+"""
+import random
+
+from Backend.Aplicacion.SimAplicacion.Aplicacion_Simulacion import SimulacionAplicacionService
+from Backend.Dominio.AlgEstrategias.RutaEstrategiaDijkstra import RutaEstrategiaDijkstra
+from Backend.Dominio.AlgEstrategias.TablaRutasRecarga import TablaRutasRecarga
+from Backend.Dominio.Simulacion_dominio import Simulacion
+
+
+def iniciar(n_vertices):
+    random.seed(2)
+    servicio = SimulacionAplicacionService()
+    servicio.iniciar_simulacion(n_vertices, 2 * n_vertices, 20)
+    simulacion = Simulacion()
+    return simulacion, simulacion.grafo.obtener_csr(), servicio.obtener_pedidos()
+
+
+def test_la_tabla_se_construye_con_la_primera_consulta():
+    simulacion, csr, pedidos = iniciar(60)
+    assert TablaRutasRecarga.admite(csr)
+    assert TablaRutasRecarga.existente(csr) is None
+    RutaEstrategiaDijkstra().calcular_ruta(pedidos[0].origen, pedidos[0].destino, simulacion.grafo)
+    assert TablaRutasRecarga.existente(csr) is not None
+
+
+def test_snapshot_grande_usa_la_busqueda_por_etiquetas(monkeypatch):
+    simulacion, csr, pedidos = iniciar(60)
+    monkeypatch.setattr(TablaRutasRecarga, 'MAX_CELDAS', sum(csr.es_recarga) * csr.n_vertices - 1)
+    assert not TablaRutasRecarga.admite(csr)
+    camino, peso = RutaEstrategiaDijkstra().calcular_ruta(pedidos[0].origen, pedidos[0].destino, simulacion.grafo)
+    assert camino and TablaRutasRecarga.existente(csr) is None